@@ -0,0 +1,114 @@
+"""
+Columnar frame benchmark: vectorized aggregates vs the list-of-dicts path.
+
+Builds an in-memory database with N transactions, then for each path:
+- loads the ledger (dicts from sqlite3.Row vs typed NumPy columns)
+- computes monthly distribution totals, donor totals and per-item
+  weighted consumption rates
+and reports time (untraced) and memory held by the loaded data (tracemalloc).
+
+Usage:
+    python scripts/benchmark_columnar.py [--rows 1000000]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from benchmark_models import build_database
+from database.columnar import ColumnarFrame
+
+START = datetime(2024, 1, 1)
+YEAR = 2024
+
+
+def dict_load(conn):
+    conn.row_factory = sqlite3.Row
+    return [dict(row) for row in conn.execute("SELECT * FROM inventory_transactions ORDER BY id")]
+
+
+def dict_aggregate(rows):
+    monthly = [0.0] * 12
+    donors = defaultdict(lambda: [0, 0.0, 0])
+    daily = defaultdict(lambda: defaultdict(float))
+    for row in rows:
+        if row['is_voided']:
+            continue
+        when = datetime.fromisoformat(row['transaction_date'])
+        kind = row['transaction_type']
+        if kind == 'DISTRIBUTION':
+            if when.year == YEAR:
+                monthly[when.month - 1] += abs(row['quantity_change'])
+            if when >= START:
+                daily[row['item_id']][when.date()] += abs(row['quantity_change'])
+        elif kind == 'DONATION' and row['donor']:
+            totals = donors[row['donor']]
+            totals[0] += 1
+            totals[1] += row['quantity_change']
+            totals[2] += row['fair_market_value_cents']
+
+    rates = {}
+    for item_id, days in daily.items():
+        values = [days[d] for d in sorted(days)]
+        weights = [0.7 ** (len(values) - 1 - i) for i in range(len(values))]
+        rates[item_id] = sum(v * w for v, w in zip(values, weights)) / sum(weights)
+    return monthly, dict(donors), rates
+
+
+def columnar_load(conn):
+    frame = ColumnarFrame()
+    frame.load(conn)
+    return frame
+
+
+def columnar_aggregate(frame):
+    monthly = frame.monthly_totals(YEAR, 'DISTRIBUTION', 'total_financial_impact_cents')
+    donors = frame.donor_totals()
+    rates = frame.consumption_rates(START)
+    return monthly, donors, rates
+
+
+def run(name, conn, load, aggregate):
+    start = time.perf_counter()
+    data = load(conn)
+    loaded = time.perf_counter()
+    aggregate(data)
+    done = time.perf_counter()
+    del data
+
+    # Memory is measured on a second load; tracing slows loading down
+    tracemalloc.start()
+    data = load(conn)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{name:<10}{(loaded - start) * 1000:>12,.0f}{(done - loaded) * 1000:>14,.1f}"
+          f"{memory / 1e6:>14,.1f}")
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar frame benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"Building in-memory database with {args.rows:,} transactions...")
+    conn = build_database(args.rows)
+
+    print(f"{'path':<10}{'load ms':>12}{'aggregate ms':>14}{'memory MB':>14}")
+    rows = run("dicts", conn, dict_load, dict_aggregate)
+    del rows
+    frame = run("columnar", conn, columnar_load, columnar_aggregate)
+    print(f"ledger column arrays: {frame.ledger.nbytes / 1e6:,.1f} MB "
+          f"({frame.ledger.nbytes / max(len(frame.ledger), 1):.0f} bytes/row)")
+
+
+if __name__ == "__main__":
+    main()
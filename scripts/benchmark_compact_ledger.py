@@ -0,0 +1,132 @@
+"""
+Compact ledger benchmark: wide inventory_transactions vs the compact layout.
+
+Builds a database file with N transactions, measures it, converts it with
+the online migration (database.compact_ledger) and measures it again:
+- pages used by the ledger's tables and indexes (after VACUUM)
+- scan speed of typical report queries through inventory_transactions
+- working set vs page cache: the share of the pages a full-ledger scan
+  touches that fit in the connection's page cache. Python's sqlite3 does
+  not expose the cache hit/miss counters, so this is the estimate of the
+  hit rate for repeated scans rather than a measured one.
+
+Usage:
+    python scripts/benchmark_compact_ledger.py [--rows 1000000] [--cache-mb 2]
+        [--keep PATH]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from benchmark_models import build_database
+from database.compact_ledger import ledger_storage_stats, migrate_to_compact_ledger
+
+QUERIES = {
+    'type totals': """
+        SELECT transaction_type, SUM(quantity_change) FROM inventory_transactions
+        WHERE is_voided = 0 GROUP BY transaction_type
+    """,
+    'monthly dist.': """
+        SELECT strftime('%m', transaction_date), SUM(-quantity_change)
+        FROM inventory_transactions
+        WHERE transaction_type = 'DISTRIBUTION' AND is_voided = 0
+          AND transaction_date BETWEEN '2024-03-01' AND '2024-06-30'
+        GROUP BY 1
+    """,
+    'donor totals': """
+        SELECT donor_id, COUNT(*), SUM(fair_market_value_cents)
+        FROM inventory_transactions
+        WHERE transaction_type = 'DONATION' AND is_voided = 0
+        GROUP BY donor_id
+    """,
+    'item history': """
+        SELECT * FROM inventory_transactions WHERE item_id = 42
+        ORDER BY transaction_date DESC
+    """,
+    'full rows': "SELECT * FROM inventory_transactions",
+}
+
+
+def time_queries(db_path: str, cache_kib: int, repeat: int = 3) -> dict:
+    """Best-of-N milliseconds per query, each run on a fresh connection."""
+    timings = {}
+    for name, query in QUERIES.items():
+        best = float('inf')
+        for _ in range(repeat):
+            conn = sqlite3.connect(db_path)
+            conn.execute(f"PRAGMA cache_size = -{cache_kib}")
+            start = time.perf_counter()
+            for _row in conn.execute(query):
+                pass
+            best = min(best, time.perf_counter() - start)
+            conn.close()
+        timings[name] = best * 1000
+    return timings
+
+
+def measure(label: str, db_path: str, cache_kib: int) -> dict:
+    conn = sqlite3.connect(db_path)
+    conn.execute("VACUUM")
+    conn.execute("ANALYZE")
+    stats = ledger_storage_stats(conn)
+    conn.close()
+
+    cache_pages = cache_kib * 1024 // stats['page_size']
+    stats['cache_coverage'] = min(1.0, cache_pages / max(stats['table_pages'], 1))
+    stats['timings'] = time_queries(db_path, cache_kib)
+
+    page_kib = stats['page_size'] / 1024
+    print(f"\n{label}")
+    print(f"  database:  {stats['page_count']:>9,} pages ({stats['page_count'] * page_kib / 1024:,.1f} MB)")
+    print(f"  ledger:    {stats['table_pages']:>9,} table pages, {stats['index_pages']:,} index pages")
+    print(f"  page cache covers {stats['cache_coverage']:.1%} of a full-ledger scan")
+    for name, ms in stats['timings'].items():
+        print(f"  {name:<14}{ms:>10.1f} ms")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact ledger benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--cache-mb", type=float, default=2,
+                        help="Page cache per connection (SQLite default: 2 MB)")
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    parser.add_argument("--keep", help="Write the converted database here")
+    args = parser.parse_args()
+    cache_kib = int(args.cache_mb * 1024)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.keep or os.path.join(tmp, "ledger.db")
+        print(f"Building database with {args.rows:,} transactions...")
+        memory = build_database(args.rows)
+        target = sqlite3.connect(db_path)
+        memory.backup(target)
+        target.close()
+        memory.close()
+
+        wide = measure("wide layout", db_path, cache_kib)
+
+        start = time.perf_counter()
+        result = migrate_to_compact_ledger(db_path, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"\nOnline migration: {result['rows']:,} rows in {result['batches']:,} batches, "
+              f"{elapsed:.1f} s")
+
+        compact = measure("compact layout", db_path, cache_kib)
+
+        print("\ncompact / wide")
+        for key in ('table_pages', 'index_pages', 'total_pages'):
+            print(f"  {key:<14}{compact[key] / max(wide[key], 1):>10.2f}x")
+        for name in QUERIES:
+            print(f"  {name:<14}{compact['timings'][name] / wide['timings'][name]:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
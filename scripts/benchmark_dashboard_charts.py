@@ -0,0 +1,110 @@
+"""
+Frame-time benchmark for the dashboard charts.
+
+Compares three ways of refreshing the dashboard pie and bar charts:
+- legacy:   clear the figure and rebuild every artist, then draw (old behavior)
+- update:   reuse figures/artists, change only the data, then draw
+- skip:     data unchanged, so no draw happens at all
+
+All rendering is offscreen (Agg), so no display is needed.
+
+Usage:
+    python scripts/benchmark_dashboard_charts.py [--frames 50] [--categories 9]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ui.components.chart_renderer import CategoryPieChart, TopItemsBarChart
+
+
+def make_stats(rng: random.Random, n_categories: int) -> dict:
+    """Generate dashboard stats with the shape of get_dashboard_stats()."""
+    categories = [
+        {'category': f"Category {i}", 'value_dollars': round(rng.uniform(50, 5000), 2)}
+        for i in range(n_categories)
+    ]
+    categories.sort(key=lambda c: c['value_dollars'], reverse=True)
+    items = [
+        {'name': f"Distributed Item With A Long Name {i}", 'quantity': rng.randint(10, 500)}
+        for i in range(5)
+    ]
+    items.sort(key=lambda i: i['quantity'], reverse=True)
+    return {'value_by_category': categories, 'top_distributed_items': items}
+
+
+def time_frames(fn, frames: int) -> list:
+    """Run fn once per frame and return per-frame times in milliseconds."""
+    times = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        fn(frame)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def summarize(name: str, times: list):
+    ordered = sorted(times)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{name:<8} mean {statistics.mean(times):8.2f} ms   "
+          f"median {statistics.median(times):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard chart frame-time benchmark")
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--categories", type=int, default=9)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    datasets = [make_stats(rng, args.categories) for _ in range(args.frames)]
+
+    # Legacy: a fresh rebuild every visit
+    pie, bar = CategoryPieChart(), TopItemsBarChart()
+
+    def legacy(frame):
+        stats = datasets[frame]
+        pie._rebuild(pie._normalize(stats['value_by_category']))
+        bar._rebuild(bar._normalize(stats['top_distributed_items']))
+        pie.render()
+        bar.render()
+
+    # Update: persistent artists, data-only changes
+    pie2, bar2 = CategoryPieChart(), TopItemsBarChart()
+    pie2.update(datasets[0]['value_by_category'])
+    bar2.update(datasets[0]['top_distributed_items'])
+    pie2.render()
+    bar2.render()
+
+    def update(frame):
+        stats = datasets[frame]
+        if pie2.update(stats['value_by_category']):
+            pie2.render()
+        if bar2.update(stats['top_distributed_items']):
+            bar2.render()
+
+    # Skip: revisiting the dashboard with unchanged stats
+    def skip(frame):
+        stats = datasets[-1]
+        if pie2.update(stats['value_by_category']):
+            pie2.render()
+        if bar2.update(stats['top_distributed_items']):
+            bar2.render()
+
+    print(f"Dashboard chart refresh, {args.frames} frames, "
+          f"{args.categories} categories (pie + bar)")
+    summarize("legacy", time_frames(legacy, args.frames))
+    summarize("update", time_frames(update, args.frames))
+    summarize("skip", time_frames(skip, args.frames))
+
+
+if __name__ == "__main__":
+    main()
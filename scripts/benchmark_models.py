@@ -0,0 +1,151 @@
+"""
+Model loading benchmark: dataclass models vs compact slotted models.
+
+Builds an in-memory database with N transactions and measures:
+- rows/second when loading every row into model objects
+- bytes per object (tracemalloc, including timestamps and strings)
+
+Variants:
+- dataclass:     Transaction.from_db_row() on sqlite3.Row (current behavior)
+- compact-row:   CompactTransaction via a compiled mapper on sqlite3.Row
+- compact-tuple: CompactTransaction via a compiled mapper on plain tuples
+
+Usage:
+    python scripts/benchmark_models.py [--rows 1000000] [--memory-sample 100000]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.transaction import Transaction
+from models.compact import CompactTransaction, compile_row_mapper
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'src', 'database', 'schema.sql')
+
+
+def build_database(rows: int, items: int = 500, seed: int = 42) -> sqlite3.Connection:
+    """Create an in-memory database with synthetic transactions."""
+    conn = sqlite3.connect(":memory:")
+    with open(SCHEMA_PATH) as f:
+        conn.executescript(f.read())
+
+    conn.executemany(
+        "INSERT INTO inventory_items (sku, name, category_id) VALUES (?, ?, 1)",
+        [(f"BENCH-{i:05d}", f"Bench Item {i}") for i in range(items)]
+    )
+
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+
+    def generate():
+        for n in range(rows):
+            when = (start + timedelta(minutes=n)).isoformat(sep=' ')
+            item_id = rng.randint(1, items)
+            if n % 3 == 0:
+                yield (item_id, 'DISTRIBUTION', -rng.randint(1, 10), 0, 0, 150, 'CLIENT', None, None, when)
+            elif n % 3 == 1:
+                yield (item_id, 'PURCHASE', rng.randint(1, 50), 125, 0, 0, None, 'Acme Foods', None, when)
+            else:
+                yield (item_id, 'DONATION', rng.randint(1, 50), 0, 200, 0, None, None, 'Local Church', when)
+
+    conn.executemany("""
+        INSERT INTO inventory_transactions
+            (item_id, transaction_type, quantity_change, unit_cost_cents,
+             fair_market_value_cents, total_financial_impact_cents,
+             reason_code, supplier, donor, transaction_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, generate())
+    conn.commit()
+    return conn
+
+
+def load_dataclass(conn, limit=None):
+    conn.row_factory = sqlite3.Row
+    cursor = conn.execute(_query(limit))
+    return (Transaction.from_db_row(row) for row in cursor)
+
+
+def load_compact_row(conn, limit=None):
+    conn.row_factory = sqlite3.Row
+    cursor = conn.execute(_query(limit))
+    mapper = compile_row_mapper(cursor.description, CompactTransaction)
+    return map(mapper, cursor)
+
+
+def load_compact_tuple(conn, limit=None):
+    conn.row_factory = None
+    cursor = conn.execute(_query(limit))
+    mapper = compile_row_mapper(cursor.description, CompactTransaction)
+    return map(mapper, cursor)
+
+
+def _query(limit):
+    sql = "SELECT * FROM inventory_transactions ORDER BY id"
+    return sql + f" LIMIT {int(limit)}" if limit else sql
+
+
+VARIANTS = [
+    ("dataclass", load_dataclass),
+    ("compact-row", load_compact_row),
+    ("compact-tuple", load_compact_tuple),
+]
+
+
+def measure_throughput(conn, loader) -> float:
+    """Load every row (discarding objects) and return rows/second."""
+    start = time.perf_counter()
+    count = 0
+    for _obj in loader(conn):
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def measure_bytes(conn, loader, sample: int) -> float:
+    """Keep `sample` objects alive and return traced bytes per object."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    objects = list(loader(conn, sample))
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    # Exclude the list's own pointer array
+    used -= sys.getsizeof(objects)
+    return used / len(objects)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model loading benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--memory-sample", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"Building in-memory database with {args.rows:,} transactions...")
+    conn = build_database(args.rows)
+
+    print(f"{'variant':<15}{'rows/s':>14}{'bytes/object':>16}")
+    for name, loader in VARIANTS:
+        rate = measure_throughput(conn, loader)
+        size = measure_bytes(conn, loader, min(args.memory_sample, args.rows))
+        print(f"{name:<15}{rate:>14,.0f}{size:>16,.0f}")
+
+    # Timestamps are only parsed when read
+    conn.row_factory = None
+    cursor = conn.execute(_query(args.rows))
+    mapper = compile_row_mapper(cursor.description, CompactTransaction)
+    start = time.perf_counter()
+    for row in cursor:
+        mapper(row).transaction_date
+    rate = args.rows / (time.perf_counter() - start)
+    print(f"{'compact+dates':<15}{rate:>14,.0f}{'':>16}  (every timestamp read)")
+
+
+if __name__ == "__main__":
+    main()
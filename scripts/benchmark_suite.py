@@ -0,0 +1,343 @@
+"""
+Service benchmark suite: times the application's hot paths at several data
+scales, so performance regressions show up before users notice them.
+
+Covered:
+- InventoryService writes (purchase, donation, distribution, void),
+  search_items_by_prefix() and the in-memory autocomplete index
+- every ReportingService and AnalyticsService query (analytics with its
+  result cache disabled, so the queries themselves are timed)
+- CSV import / export (DataService)
+- PDF and Excel report generation
+
+Each scale is a synthetic database (database.synthetic_data) with a fixed
+seed and end date, generated once and kept in --data-dir; every run works
+on a fresh copy of it. Results are written as JSON; with --baseline the run
+is compared against an earlier results file and the exit status is 1 if
+any benchmark got slower than --threshold allows.
+
+Usage:
+    python scripts/benchmark_suite.py [--scales small,medium,large]
+        [--filter report] [--repeat 5] [--output results.json]
+        [--baseline baseline.json] [--threshold 0.25]
+    python scripts/benchmark_suite.py --compare OLD.json NEW.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.connection import get_db_manager, reset_db_manager
+from database.synthetic_data import SyntheticDataConfig, generate_database
+from services.analytics_service import AnalyticsService
+from services.autocomplete import get_autocomplete_index
+from services.data_service import DataService
+from services.excel_generator import ExcelReportGenerator
+from services.inventory_service import InventoryService
+from services.pdf_generator import PDFReportGenerator
+from services.reporting_service import ReportingService
+
+END_DATE = date(2026, 6, 30)
+
+SCALES = {
+    'small': SyntheticDataConfig(items=200, transactions=10_000, donors=50, suppliers=10,
+                                 end_date=END_DATE),
+    'medium': SyntheticDataConfig(items=2_000, transactions=200_000, donors=300, suppliers=30,
+                                  end_date=END_DATE),
+    'large': SyntheticDataConfig(items=20_000, transactions=2_000_000, donors=2_000,
+                                 suppliers=80, end_date=END_DATE),
+}
+
+# Writes are timed per operation over a batch of this many operations
+WRITE_BATCH = 50
+
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+class Benchmarks:
+    """The benchmarks for one scale, all sharing one database copy."""
+
+    def __init__(self, db_path: str, work_dir: str):
+        reset_db_manager()
+        self.db_manager = get_db_manager(db_path)
+        self.work_dir = work_dir
+        self.inventory = InventoryService()
+        self.reporting = ReportingService(db_manager=self.db_manager)
+        self.analytics = AnalyticsService(cache_size=0, db_manager=self.db_manager)
+        self.autocomplete = get_autocomplete_index(self.db_manager)
+        self.data = DataService(self.inventory)
+        self.pdf = PDFReportGenerator(work_dir)
+        self.excel = ExcelReportGenerator(work_dir)
+
+        self.start = END_DATE - timedelta(days=90)
+        conn = self.db_manager.get_connection()
+        # Best-stocked items, so distributions succeed without the purchases
+        self.item_ids = [row[0] for row in conn.execute(
+            "SELECT id FROM inventory_items ORDER BY quantity_on_hand DESC, id LIMIT ?",
+            (WRITE_BATCH,))]
+        self.distribution_ids = []
+        self._results = {}
+
+    def cases(self):
+        """(group, name, callable, operations per call) in run order."""
+        r, a = self.reporting, self.analytics
+        start, end = self.start, END_DATE
+        return [
+            # Writes run first so the report queries see the same data every
+            # repeat; distributions are voided again by the void benchmark
+            ('inventory', 'process_purchase', self._purchases, WRITE_BATCH),
+            ('inventory', 'process_donation', self._donations, WRITE_BATCH),
+            ('inventory', 'process_distribution', self._distributions, WRITE_BATCH),
+            ('inventory', 'void_transaction', self._voids, WRITE_BATCH),
+            ('inventory', 'search_items_by_prefix', self._searches, 4),
+            ('inventory', 'autocomplete_index_search', self._index_searches, 4),
+            ('inventory', 'get_all_items', self.inventory.get_all_items, 1),
+
+            ('reporting', 'get_dashboard_stats', r.get_dashboard_stats, 1),
+            ('reporting', 'get_financial_report_data',
+             lambda: r.get_financial_report_data(start, end), 1),
+            ('reporting', 'get_impact_report_data',
+             lambda: r.get_impact_report_data(start, end), 1),
+            ('reporting', 'get_stock_status_data', r.get_stock_status_data, 1),
+            ('reporting', 'get_transaction_history',
+             lambda: r.get_transaction_history(start_date=start, end_date=end, limit=None), 1),
+            ('reporting', 'get_category_rollup', lambda: r.get_category_rollup(start, end), 1),
+            ('reporting', 'get_purchases_report_data',
+             lambda: r.get_purchases_report_data(start, end), 1),
+            ('reporting', 'get_suppliers_report_data', r.get_suppliers_report_data, 1),
+
+            ('analytics', 'get_inventory_forecast', a.get_inventory_forecast, 1),
+            ('analytics', 'get_stockout_risk_items', a.get_stockout_risk_items, 1),
+            ('analytics', 'get_seasonal_trends', lambda: a.get_seasonal_trends(END_DATE.year), 1),
+            ('analytics', 'get_year_over_year_comparison', a.get_year_over_year_comparison, 1),
+            ('analytics', 'get_category_trends',
+             lambda: a.get_category_trends(END_DATE.year, rollup=True), 1),
+            ('analytics', 'get_donor_impact_summary',
+             lambda: a.get_donor_impact_summary(start, end), 1),
+            ('analytics', 'get_donor_retention', a.get_donor_retention, 1),
+
+            ('csv', 'export_items_to_csv',
+             lambda: self.data.export_items_to_csv(self._path("items.csv")), 1),
+            ('csv', 'import_items_from_csv',
+             lambda: self.data.import_items_from_csv(self._path("items.csv")), 1),
+            ('csv', 'export_transactions_to_csv',
+             lambda: self.data.export_transactions_to_csv(self._path("transactions.csv")), 1),
+
+            ('documents', 'pdf_financial_report',
+             lambda: self.pdf.generate_financial_report(self._data('financial')), 1),
+            ('documents', 'pdf_stock_status_report',
+             lambda: self.pdf.generate_stock_status_report(self._data('stock')), 1),
+            ('documents', 'excel_impact_report',
+             lambda: self.excel.generate_impact_report(self._data('impact')), 1),
+            ('documents', 'excel_purchases_report',
+             lambda: self.excel.generate_purchases_report(self._data('purchases')), 1),
+            ('documents', 'excel_inventory_forecast_report',
+             lambda: self.excel.generate_inventory_forecast_report(self._data('forecast')), 1),
+            ('documents', 'excel_seasonal_trends_report',
+             lambda: self.excel.generate_seasonal_trends_report(self._data('seasonal')), 1),
+            ('documents', 'excel_donor_impact_report',
+             lambda: self.excel.generate_donor_impact_report(self._data('donors')), 1),
+        ]
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.work_dir, name)
+
+    def _data(self, name: str):
+        # Document benchmarks time rendering only; the query is done once
+        if name not in self._results:
+            r, a = self.reporting, self.analytics
+            self._results[name] = {
+                'financial': lambda: r.get_financial_report_data(self.start, END_DATE),
+                'stock': r.get_stock_status_data,
+                'impact': lambda: r.get_impact_report_data(self.start, END_DATE),
+                'purchases': lambda: r.get_purchases_report_data(self.start, END_DATE),
+                'forecast': a.get_inventory_forecast,
+                'seasonal': lambda: a.get_seasonal_trends(END_DATE.year),
+                'donors': lambda: a.get_donor_impact_summary(self.start, END_DATE),
+            }[name]()
+        return self._results[name]
+
+    def _purchases(self):
+        for item_id in self.item_ids:
+            self.inventory.process_purchase(item_id, 20, 1.25, supplier="Benchmark Foods")
+
+    def _donations(self):
+        for item_id in self.item_ids:
+            self.inventory.process_donation(item_id, 10, 2.00, donor="Benchmark Donor")
+
+    def _distributions(self):
+        for item_id in self.item_ids:
+            _item, tx = self.inventory.process_distribution(item_id, 5, "CLIENT")
+            self.distribution_ids.append(tx.id)
+
+    def setup_void_transaction(self):
+        # Distributions to void, when the distribution benchmark was filtered out
+        while len(self.distribution_ids) < WRITE_BATCH:
+            self._distributions()
+
+    def _voids(self):
+        for _ in range(WRITE_BATCH):
+            self.inventory.void_transaction(self.distribution_ids.pop(), "Benchmark")
+
+    def _searches(self):
+        for prefix in ("b", "ca", "SKU-00", "zzz"):
+            self.inventory.search_items_by_prefix(prefix)
+
+    def _index_searches(self):
+        for prefix in ("b", "ca", "SKU-00", "zzz"):
+            self.autocomplete.search(prefix)
+
+    def close(self):
+        reset_db_manager()
+
+
+def time_case(func, operations: int, repeat: int, setup=None) -> dict:
+    """Milliseconds per operation over ``repeat`` calls (setup is not timed)."""
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000 / operations)
+    return {
+        'median_ms': statistics.median(samples),
+        'min_ms': min(samples),
+        'mean_ms': statistics.fmean(samples),
+        'repeat': repeat,
+    }
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def ensure_database(data_dir: str, scale: str) -> str:
+    """Path of the scale's database, generating it on first use."""
+    config = SCALES[scale]
+    path = os.path.join(data_dir, f"bench_{scale}_{config.items}_{config.transactions}"
+                                  f"_{config.seed}.db")
+    if not os.path.exists(path):
+        print(f"Generating {scale} database ({config.transactions:,} transactions)...")
+        os.makedirs(data_dir, exist_ok=True)
+        stats = generate_database(path, config, overwrite=True)
+        print(f"  done in {stats['seconds']:.1f}s")
+    return path
+
+
+def run_scale(scale: str, data_dir: str, repeat: int, name_filter: str) -> dict:
+    source = ensure_database(data_dir, scale)
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_path = os.path.join(work_dir, "bench.db")
+        # Checkpointed by generate_database(), so the main file is complete
+        shutil.copyfile(source, db_path)
+        benchmarks = Benchmarks(db_path, work_dir)
+        try:
+            for group, name, func, operations in benchmarks.cases():
+                key = f"{group}.{name}"
+                if name_filter and name_filter not in key:
+                    continue
+                setup = getattr(benchmarks, f"setup_{name}", None)
+                results[key] = time_case(func, operations, repeat, setup)
+                print(f"  {key:<48}{results[key]['median_ms']:>12.3f} ms")
+        finally:
+            benchmarks.close()
+    return results
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> int:
+    """Print current vs baseline medians; returns the number of regressions."""
+    regressions = 0
+    print(f"\n{'benchmark':<56}{'baseline':>12}{'current':>12}{'change':>9}")
+    for scale, results in current['results'].items():
+        base_results = baseline['results'].get(scale, {})
+        for key, result in results.items():
+            if key not in base_results:
+                continue
+            before = base_results[key]['median_ms']
+            after = result['median_ms']
+            change = after / before - 1 if before else 0.0
+            flag = ""
+            if change > threshold:
+                flag = "  SLOWER"
+                regressions += 1
+            elif change < -threshold:
+                flag = "  faster"
+            print(f"{scale + ' ' + key:<56}{before:>10.3f}ms{after:>10.3f}ms"
+                  f"{change:>+8.0%}{flag}")
+    print(f"\n{regressions} regression(s) beyond {threshold:.0%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service benchmark suite")
+    parser.add_argument("--scales", default="small,medium",
+                        help=f"Comma-separated: {', '.join(SCALES)}")
+    parser.add_argument("--filter", default="", help="Only benchmarks containing this text")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--data-dir",
+                        default=os.path.join(tempfile.gettempdir(), "aiopsstudio_benchmarks"),
+                        help="Where the generated databases are kept between runs")
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--baseline", help="Compare against this results file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Slowdown that counts as a regression (0.25 = 25%%)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "RESULTS"),
+                        help="Compare two results files without running")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        sys.exit(1 if compare(baseline, current, args.threshold) else 0)
+
+    scales = [s.strip() for s in args.scales.split(',') if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown or not scales:
+        parser.error(f"unknown scales: {', '.join(unknown) or args.scales}")
+
+    current = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+        },
+        'scales': {s: {'items': SCALES[s].items, 'transactions': SCALES[s].transactions}
+                   for s in scales},
+        'results': {},
+    }
+    for scale in scales:
+        print(f"\n{scale}")
+        current['results'][scale] = run_scale(scale, args.data_dir, args.repeat, args.filter)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        sys.exit(1 if compare(baseline, current, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
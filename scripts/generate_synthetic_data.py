@@ -0,0 +1,68 @@
+"""
+Generate a synthetic database for load and performance testing
+(database.synthetic_data).
+
+The output only depends on the options: the same seed and end date always
+produce the same database.
+
+Usage:
+    python scripts/generate_synthetic_data.py PATH [--items 100000]
+        [--transactions 10000000] [--years 3] [--seed 42] [--overwrite]
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.synthetic_data import SyntheticDataConfig, generate_database
+
+
+def main():
+    defaults = SyntheticDataConfig()
+    parser = argparse.ArgumentParser(description="Generate a synthetic load-test database")
+    parser.add_argument("database", help="Path of the database to create")
+    parser.add_argument("--items", type=int, default=defaults.items)
+    parser.add_argument("--transactions", type=int, default=defaults.transactions)
+    parser.add_argument("--years", type=int, default=defaults.years)
+    parser.add_argument("--donors", type=int, default=defaults.donors)
+    parser.add_argument("--suppliers", type=int, default=defaults.suppliers)
+    parser.add_argument("--void-rate", type=float, default=defaults.void_rate)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--end-date", type=date.fromisoformat,
+                        help="Last day of activity, YYYY-MM-DD (defaults to today)")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Replace the database if it exists")
+    args = parser.parse_args()
+
+    config = SyntheticDataConfig(
+        items=args.items,
+        transactions=args.transactions,
+        years=args.years,
+        donors=args.donors,
+        suppliers=args.suppliers,
+        void_rate=args.void_rate,
+        seed=args.seed,
+        end_date=args.end_date,
+    )
+
+    def report(written, total):
+        print(f"  {written:,} / {total:,} transactions written", end="\r")
+
+    print(f"Generating {args.database}...")
+    try:
+        stats = generate_database(args.database, config, args.overwrite, report)
+    except (FileExistsError, ValueError) as e:
+        print(f"\n{e}")
+        sys.exit(1)
+
+    print(f"\nDone: {stats['items']:,} items, {stats['transactions']:,} transactions "
+          f"({stats['voided']:,} voided), {stats['start_date']} to {stats['end_date']}")
+    print(f"{stats['size_bytes'] / 1024 ** 2:,.0f} MB in {stats['seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
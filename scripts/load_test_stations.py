@@ -0,0 +1,317 @@
+"""
+Concurrent-station load harness: several intake stations (worker processes)
+writing to and reporting from one shared database file.
+
+Each station runs a weighted mix of purchases, distributions, voids (of
+its own distributions) and report queries through the regular services,
+starting staggered over --ramp-up seconds. "database is locked" errors are
+retried with a short randomized backoff, as a station would; an operation
+that still fails after --retries attempts counts as a failure.
+
+Per configuration the harness reports:
+- throughput (operations/second, all stations together, after ramp-up)
+- latency percentiles per operation (including time spent retrying)
+- busy retries and failures per operation
+- lost updates: items whose quantity no longer matches their ledger
+
+--journal-mode and --begin take comma-separated lists; every combination
+runs on a fresh copy of the database, so DatabaseManager's locking and
+journaling settings can be compared side by side.
+
+Usage:
+    python scripts/load_test_stations.py [--db PATH] [--stations 8]
+        [--duration 20] [--ramp-up 5] [--mix purchase=30,distribution=40,void=5,report=25]
+        [--journal-mode WAL,DELETE] [--begin implicit,immediate]
+        [--busy-timeout-ms 5000] [--retries 5] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from itertools import product
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.connection import BEGIN_MODES, JOURNAL_MODES, DatabaseManager
+from database.synthetic_data import SyntheticDataConfig, generate_database
+from services.inventory_service import InventoryService
+from services.reporting_service import ReportingService
+
+OPERATIONS = ('purchase', 'distribution', 'void', 'report')
+DEFAULT_MIX = "purchase=30,distribution=40,void=5,report=25"
+
+# Seconds between launching the processes and the first station starting,
+# so process start-up is not part of the measurement
+START_DELAY = 1.0
+
+
+# ============================================================================
+# STATION (runs in a worker process)
+# ============================================================================
+
+def _is_busy(error: Exception) -> bool:
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+def run_station(
+    station: int,
+    db_path: str,
+    settings: dict,
+    mix: dict,
+    start_at: float,
+    stop_at: float,
+    retries: int,
+    seed: int
+) -> dict:
+    """
+    Run one station until ``stop_at`` (wall clock).
+
+    Returns:
+        dict: samples as (operation, completed_at, latency_ms, retries, ok)
+            tuples, plus rejected (business-rule errors) and error messages
+    """
+    rng = random.Random(seed * 1000 + station)
+    manager = DatabaseManager(db_path, **settings)
+    inventory = InventoryService(db_manager=manager)
+    reporting = ReportingService(db_manager=manager)
+    item_ids = [row[0] for row in manager.get_connection().execute(
+        "SELECT id FROM inventory_items WHERE is_active = 1")]
+    today = date.today()
+    reports = (
+        reporting.get_dashboard_stats,
+        reporting.get_stock_status_data,
+        lambda: reporting.get_financial_report_data(today - timedelta(days=30), today),
+    )
+    own_distributions = []
+    operations, weights = zip(*mix.items())
+
+    def perform(operation):
+        if operation == 'purchase':
+            inventory.process_purchase(rng.choice(item_ids), rng.randint(5, 50),
+                                       round(rng.uniform(0.5, 4.0), 2),
+                                       supplier=f"Station {station} Supplier")
+        elif operation == 'distribution':
+            _item, tx = inventory.process_distribution(rng.choice(item_ids),
+                                                       rng.randint(1, 5), "CLIENT")
+            own_distributions.append(tx.id)
+        elif operation == 'void':
+            if not own_distributions:
+                raise ValueError("Nothing to void yet")
+            tx_id = own_distributions.pop(rng.randrange(len(own_distributions)))
+            inventory.void_transaction(tx_id, "Load test")
+        else:
+            rng.choice(reports)()
+
+    samples, errors = [], []
+    rejected = 0
+    time.sleep(max(0.0, start_at - time.time()))
+    while time.time() < stop_at:
+        operation = rng.choices(operations, weights)[0]
+        started = time.perf_counter()
+        attempt = 0
+        ok = True
+        while True:
+            try:
+                perform(operation)
+                break
+            except sqlite3.OperationalError as e:
+                if not _is_busy(e) or attempt >= retries:
+                    ok = False
+                    errors.append(f"{operation}: {e}")
+                    break
+                attempt += 1
+                time.sleep(rng.uniform(0.001, 0.005) * 2 ** attempt)
+            except ValueError:
+                # Business rule (insufficient stock, nothing to void):
+                # not a concurrency problem, so not measured
+                rejected += 1
+                operation = None
+                break
+        if operation:
+            samples.append((operation, time.time(),
+                            (time.perf_counter() - started) * 1000, attempt, ok))
+    manager.close()
+    return {'samples': samples, 'rejected': rejected, 'errors': errors[:20]}
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def check_ledger(db_path: str) -> int:
+    """Number of items whose quantity differs from the sum of their ledger."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("""
+            SELECT COUNT(*) FROM inventory_items i
+            LEFT JOIN (SELECT item_id, SUM(quantity_change) AS qty
+                       FROM inventory_transactions GROUP BY item_id) t
+              ON t.item_id = i.id
+            WHERE ABS(i.quantity_on_hand - COALESCE(t.qty, 0)) > 1e-6
+        """).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def run_configuration(source_db: str, settings: dict, args, mix: dict) -> dict:
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_path = os.path.join(work_dir, "stations.db")
+        shutil.copyfile(source_db, db_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute(f"PRAGMA journal_mode = {settings['journal_mode']}")
+        conn.close()
+        baseline_mismatches = check_ledger(db_path)
+
+        t0 = time.time() + START_DELAY
+        ramp_end = t0 + args.ramp_up
+        stop_at = ramp_end + args.duration
+        with ProcessPoolExecutor(max_workers=args.stations) as pool:
+            futures = [
+                pool.submit(run_station, station, db_path, settings, mix,
+                            t0 + args.ramp_up * station / args.stations, stop_at,
+                            args.retries, args.seed)
+                for station in range(args.stations)
+            ]
+            stations = [future.result() for future in futures]
+        lost_updates = check_ledger(db_path) - baseline_mismatches
+
+    samples = [s for station in stations for s in station['samples']]
+    steady = [s for s in samples if s[1] >= ramp_end]
+    result = {
+        'settings': settings,
+        'throughput_ops': sum(1 for s in steady if s[4]) / args.duration,
+        'operations': {},
+        'rejected': sum(station['rejected'] for station in stations),
+        'lost_updates': lost_updates,
+        'errors': sorted({e for station in stations for e in station['errors']})[:10],
+    }
+    for operation in OPERATIONS:
+        op_samples = [s for s in samples if s[0] == operation]
+        latencies = sorted(s[2] for s in op_samples if s[4])
+        result['operations'][operation] = {
+            'count': len(latencies),
+            'p50_ms': percentile(latencies, 0.50),
+            'p90_ms': percentile(latencies, 0.90),
+            'p99_ms': percentile(latencies, 0.99),
+            'max_ms': latencies[-1] if latencies else 0.0,
+            'busy_retries': sum(s[3] for s in op_samples),
+            'failures': sum(1 for s in op_samples if not s[4]),
+        }
+    return result
+
+
+def print_result(result: dict):
+    settings = result['settings']
+    print(f"\njournal={settings['journal_mode']}  begin={settings['begin_mode'] or 'implicit'}"
+          f"  busy_timeout={settings['busy_timeout_ms']} ms")
+    print(f"  {'operation':<14}{'count':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}"
+          f"{'retries':>9}{'failed':>8}")
+    for operation, stats in result['operations'].items():
+        print(f"  {operation:<14}{stats['count']:>8}{stats['p50_ms']:>8.1f}ms"
+              f"{stats['p90_ms']:>8.1f}ms{stats['p99_ms']:>8.1f}ms{stats['max_ms']:>8.1f}ms"
+              f"{stats['busy_retries']:>9}{stats['failures']:>8}")
+    print(f"  throughput {result['throughput_ops']:.1f} ops/s, "
+          f"{result['rejected']} rejected by business rules, "
+          f"{result['lost_updates']} items with lost updates")
+    for error in result['errors']:
+        print(f"  ! {error}")
+
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(
+                f"unknown operation {name!r} (choose from {', '.join(OPERATIONS)})")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("the mix needs at least one weighted operation")
+    return mix
+
+
+def parse_choices(value: str, choices, implicit: bool = False) -> list:
+    names = [name.strip().upper() for name in value.split(',') if name.strip()]
+    allowed = set(choices) | ({'IMPLICIT'} if implicit else set())
+    unknown = [name for name in names if name not in allowed]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(
+            f"unknown value {', '.join(unknown) or value!r} "
+            f"(choose from {', '.join(sorted(allowed))})")
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-station load harness")
+    parser.add_argument("--db", help="Database to copy (default: a generated one)")
+    parser.add_argument("--stations", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20,
+                        help="Measured seconds after ramp-up")
+    parser.add_argument("--ramp-up", type=float, default=5,
+                        help="Seconds over which the stations start one by one")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Operation weights (default {DEFAULT_MIX})")
+    parser.add_argument("--journal-mode", type=lambda v: parse_choices(v, JOURNAL_MODES),
+                        default=['WAL'], help="Comma-separated journal modes to compare")
+    parser.add_argument("--begin", type=lambda v: parse_choices(v, BEGIN_MODES, True),
+                        default=['IMMEDIATE'],
+                        help="Comma-separated: immediate (the default), implicit, "
+                             "deferred, exclusive")
+    parser.add_argument("--busy-timeout-ms", type=int, default=5000)
+    parser.add_argument("--retries", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        source_db = args.db
+        if source_db is None:
+            source_db = os.path.join(data_dir, "source.db")
+            print("Generating a database (500 items, 50,000 transactions)...")
+            generate_database(source_db, SyntheticDataConfig(
+                items=500, transactions=50_000, donors=100, suppliers=10, seed=args.seed))
+        elif not os.path.exists(source_db):
+            print(f"Database not found: {source_db}")
+            sys.exit(1)
+
+        print(f"{args.stations} stations, {args.ramp_up:g}s ramp-up, "
+              f"{args.duration:g}s measured")
+        results = []
+        for journal_mode, begin in product(args.journal_mode, args.begin):
+            settings = {
+                'journal_mode': journal_mode,
+                'busy_timeout_ms': args.busy_timeout_ms,
+                'begin_mode': None if begin == 'IMPLICIT' else begin,
+            }
+            result = run_configuration(source_db, settings, args, args.mix)
+            print_result(result)
+            results.append(result)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'stations': args.stations, 'duration': args.duration,
+                       'ramp_up': args.ramp_up, 'mix': args.mix, 'results': results},
+                      f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Convert a database to the compact ledger layout (database.compact_ledger).
+
+Safe to run while the application is open: the ledger is copied in short
+batches and the view is swapped in at the end. An interrupted run resumes
+where it stopped. Take a backup first; there is no conversion back.
+
+Usage:
+    python scripts/migrate_compact_ledger.py [inventory.db|training.db|PATH]
+        [--batch-size 5000] [--pause 0.05]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.compact_ledger import (
+    DEFAULT_BATCH_SIZE, is_compact_ledger, migrate_to_compact_ledger
+)
+
+
+def get_app_data_db_path(filename: str) -> str:
+    """Resolve a bare database filename to the AppData location."""
+    if os.path.dirname(filename):
+        return filename
+    app_data = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+    return os.path.join(app_data, 'AIOpsStudio', filename)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert to the compact ledger layout")
+    parser.add_argument("database", nargs="?", default="inventory.db")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=0.05,
+                        help="Seconds between batches, to let the application write")
+    args = parser.parse_args()
+
+    db_path = get_app_data_db_path(args.database)
+    if not os.path.exists(db_path):
+        print(f"Database not found: {db_path}")
+        sys.exit(1)
+
+    conn = sqlite3.connect(db_path)
+    compact = is_compact_ledger(conn)
+    conn.close()
+    if compact:
+        print("Already using the compact ledger layout.")
+        return
+
+    print(f"Converting {db_path}...")
+
+    def report(copied, total):
+        print(f"  {copied:,} / {total:,} transactions copied", end="\r")
+
+    stats = migrate_to_compact_ledger(db_path, args.batch_size, args.pause, report)
+    print(f"\nDone: {stats['rows']:,} rows in {stats['batches']:,} batches "
+          f"({stats['cutover_rows']:,} at cutover).")
+
+
+if __name__ == "__main__":
+    main()
@@ -41,7 +41,13 @@ executables = [
         base="GUI",
         target_name="AIOpsStudio.exe",
         icon=os.path.join(script_dir, "resources", "icons", "icon.ico"),
-    )
+    ),
+    # Headless report generation for scheduled runs (console, no Qt)
+    Executable(
+        os.path.join(src_dir, "report_cli.py"),
+        base=None,
+        target_name="AIOpsStudio-Reports.exe",
+    ),
 ]
 
 setup(
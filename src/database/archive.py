@@ -0,0 +1,299 @@
+"""
+Hot/cold ledger partitioning for AIOps Studio - Inventory.
+
+Transactions from closed years are moved out of the main ("hot") database
+into an archive file next to it (``inventory.db`` -> ``inventory_archive.db``),
+so day-to-day operations, backups and maintenance only pay for recent rows.
+
+- ``archive_closed_years()`` moves rows in batches with its own connection
+- ``attach_archive()`` attaches the archive read-only (memory-mapped) to a
+  connection and creates the ``ledger_history`` TEMP view, the UNION ALL of
+  hot and archived transactions. Historical reports read ``ledger_history``;
+  writes keep going to ``inventory_transactions``
+
+The trigger-maintained aggregates (distributed quantities, supplier totals)
+keep the archived rows' contributions, so all-time figures do not change
+when a year is archived. Archived transactions can no longer be voided.
+Rebuilding the aggregates (database.migrations) only sees the hot rows.
+Moving rows to the archive is not logged as deletions for incremental
+exports (services.change_feed_service).
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+ARCHIVE_SCHEMA = "archive"
+DEFAULT_ARCHIVE_MMAP_SIZE = 256 * 1024 * 1024
+DEFAULT_BATCH_SIZE = 5000
+
+# inventory_transactions columns, in table order
+LEDGER_COLUMNS = (
+    'id', 'item_id', 'transaction_type', 'quantity_change', 'unit_cost_cents',
+    'fair_market_value_cents', 'total_financial_impact_cents', 'reason_code',
+    'supplier', 'supplier_id', 'donor', 'donor_id', 'notes', 'transaction_date',
+    'created_by', 'is_voided', 'ref_transaction_id',
+)
+_COLUMN_LIST = ", ".join(LEDGER_COLUMNS)
+
+ARCHIVE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS archive.archived_transactions (
+    id INTEGER PRIMARY KEY,  -- Same id as in the hot ledger
+    item_id INTEGER NOT NULL,
+    transaction_type TEXT NOT NULL,
+    quantity_change REAL NOT NULL,
+    unit_cost_cents INTEGER DEFAULT 0,
+    fair_market_value_cents INTEGER DEFAULT 0,
+    total_financial_impact_cents INTEGER DEFAULT 0,
+    reason_code TEXT,
+    supplier TEXT,
+    supplier_id INTEGER,
+    donor TEXT,
+    donor_id INTEGER,
+    notes TEXT,
+    transaction_date DATETIME,
+    created_by TEXT,
+    is_voided BOOLEAN DEFAULT 0,
+    ref_transaction_id INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS archive.idx_archived_date
+    ON archived_transactions(transaction_date);
+CREATE INDEX IF NOT EXISTS archive.idx_archived_item ON archived_transactions(item_id);
+CREATE INDEX IF NOT EXISTS archive.idx_archived_donor ON archived_transactions(donor_id);
+CREATE INDEX IF NOT EXISTS archive.idx_archived_supplier
+    ON archived_transactions(supplier_id, transaction_date);
+"""
+
+
+def get_archive_path(db_path: str) -> Optional[str]:
+    """
+    Get the archive file that belongs to a database.
+
+    Args:
+        db_path: Path to the main database
+
+    Returns:
+        str: Archive path, or None for in-memory databases
+    """
+    if not db_path or db_path == ":memory:" or db_path.startswith("file:"):
+        return None
+    root, ext = os.path.splitext(db_path)
+    return f"{root}_archive{ext or '.db'}"
+
+
+def _is_attached(conn: sqlite3.Connection) -> bool:
+    return any(row[1] == ARCHIVE_SCHEMA for row in conn.execute("PRAGMA database_list"))
+
+
+# ============================================================================
+# READING
+# ============================================================================
+
+def attach_archive(
+    conn: sqlite3.Connection,
+    db_path: str,
+    mmap_size: int = DEFAULT_ARCHIVE_MMAP_SIZE
+) -> bool:
+    """
+    Attach the archive read-only and (re)create the ledger_history view.
+
+    ledger_history is always created, so reports can use it whether or not
+    the database has an archive yet. Safe to call again after archiving to
+    pick up a newly created archive file.
+
+    Args:
+        conn: Connection to the main database
+        db_path: Path to the main database
+        mmap_size: Bytes of the archive to memory-map (0 disables mmap)
+
+    Returns:
+        bool: True if an archive is attached
+    """
+    archive_path = get_archive_path(db_path)
+    if not _is_attached(conn) and archive_path and os.path.exists(archive_path):
+        uri = Path(archive_path).resolve().as_uri() + "?mode=ro"
+        conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (uri,))
+        conn.execute(f"PRAGMA {ARCHIVE_SCHEMA}.mmap_size = {int(mmap_size)}")
+
+    attached = _is_attached(conn) and conn.execute(
+        f"SELECT 1 FROM {ARCHIVE_SCHEMA}.sqlite_master WHERE name = 'archived_transactions'"
+    ).fetchone() is not None
+
+    conn.execute("DROP VIEW IF EXISTS temp.ledger_history")
+    if attached:
+        conn.execute(f"""
+            CREATE TEMP VIEW ledger_history AS
+            SELECT {_COLUMN_LIST} FROM main.inventory_transactions
+            UNION ALL
+            SELECT {_COLUMN_LIST} FROM {ARCHIVE_SCHEMA}.archived_transactions
+        """)
+    else:
+        conn.execute(f"""
+            CREATE TEMP VIEW ledger_history AS
+            SELECT {_COLUMN_LIST} FROM main.inventory_transactions
+        """)
+    return attached
+
+
+# ============================================================================
+# ARCHIVING
+# ============================================================================
+
+def archive_closed_years(
+    db_path: str,
+    before_year: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Dict:
+    """
+    Move transactions dated before a year into the archive file.
+
+    Each batch is first copied into the archive and committed there, then
+    deleted from the hot ledger in a second transaction; a run interrupted
+    in between leaves rows in both files, and the next run finishes the
+    move. Rows still referenced (ref_transaction_id) by a transaction that
+    stays hot, such as a purchase voided this year, are kept hot.
+
+    Args:
+        db_path: Path to the main database
+        before_year: First year to keep hot (defaults to the current year,
+            i.e. every earlier year is archived)
+        batch_size: Rows moved per transaction
+
+    Returns:
+        Dict with moved (row count), archive_path and before_year
+    """
+    if before_year is None:
+        before_year = datetime.now().year
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1")
+    archive_path = get_archive_path(db_path)
+    if archive_path is None:
+        raise ValueError("In-memory databases cannot be archived")
+    cutoff = f"{before_year:04d}-01-01"
+
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=30)
+    moved = 0
+    try:
+        conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (archive_path,))
+        conn.executescript(ARCHIVE_TABLE_SQL)
+        conn.execute("CREATE TEMP TABLE archive_batch (id INTEGER PRIMARY KEY)")
+
+        while True:
+            conn.execute("DELETE FROM temp.archive_batch")
+            conn.execute("""
+                INSERT INTO temp.archive_batch (id)
+                SELECT t.id FROM main.inventory_transactions t
+                WHERE t.transaction_date < ?
+                  AND NOT EXISTS (
+                      SELECT 1 FROM main.inventory_transactions r
+                      WHERE r.ref_transaction_id = t.id AND r.transaction_date >= ?
+                  )
+                ORDER BY t.id
+                LIMIT ?
+            """, (cutoff, cutoff, batch_size))
+            count = conn.execute("SELECT COUNT(*) FROM temp.archive_batch").fetchone()[0]
+            if not count:
+                break
+
+            _run_in_transaction(conn, f"""
+                INSERT OR IGNORE INTO {ARCHIVE_SCHEMA}.archived_transactions ({_COLUMN_LIST})
+                SELECT {_COLUMN_LIST} FROM main.inventory_transactions
+                WHERE id IN (SELECT id FROM temp.archive_batch)
+            """)
+            _run_in_transaction(conn, *_REMOVE_HOT_SQL)
+            moved += count
+            logger.info(f"Archived {moved} transactions dated before {cutoff}")
+
+        # Release the freed pages (executescript steps the pragma to completion;
+        # a no-op unless auto_vacuum is INCREMENTAL)
+        conn.executescript("PRAGMA main.incremental_vacuum;")
+    finally:
+        conn.close()
+
+    return {'moved': moved, 'archive_path': archive_path, 'before_year': before_year}
+
+
+# Deletes the batch from the hot ledger. The delete triggers take the rows
+# out of the aggregates, so their contributions are put back: archived
+# history still counts towards all-time totals.
+_REMOVE_HOT_SQL = (
+    """
+    INSERT INTO main.kpi_item_distributed (item_id, quantity_distributed)
+    SELECT item_id, -SUM(quantity_change) FROM main.inventory_transactions
+    WHERE id IN (SELECT id FROM temp.archive_batch)
+      AND transaction_type = 'DISTRIBUTION' AND is_voided = 0
+    GROUP BY item_id
+    ON CONFLICT(item_id) DO UPDATE
+        SET quantity_distributed = quantity_distributed + excluded.quantity_distributed
+    """,
+    """
+    DELETE FROM main.inventory_transactions
+    WHERE id IN (SELECT id FROM temp.archive_batch)
+    """,
+    # Archived rows are moved, not deleted: keep them out of change exports
+    """
+    DELETE FROM main.change_log
+    WHERE table_name = 'inventory_transactions' AND op = 'D'
+      AND row_id IN (SELECT id FROM temp.archive_batch)
+    """,
+    f"""
+    INSERT INTO main.supplier_purchase_delta
+    SELECT supplier_id, 1, id, quantity_change, quantity_change * unit_cost_cents,
+           transaction_date, notes
+    FROM {ARCHIVE_SCHEMA}.archived_transactions
+    WHERE id IN (SELECT id FROM temp.archive_batch)
+      AND transaction_type = 'PURCHASE' AND is_voided = 0 AND supplier_id IS NOT NULL
+    ORDER BY id
+    """,
+)
+
+
+def _run_in_transaction(conn: sqlite3.Connection, *statements: str):
+    """Run statements in one write transaction."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for statement in statements:
+            conn.execute(statement)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def get_archive_info(db_path: str) -> Dict:
+    """
+    Summarize the archive file of a database.
+
+    Args:
+        db_path: Path to the main database
+
+    Returns:
+        Dict with archive_path, exists, size_bytes and years (list of
+        dicts with year and transaction count)
+    """
+    archive_path = get_archive_path(db_path)
+    info = {'archive_path': archive_path, 'exists': False, 'size_bytes': 0, 'years': []}
+    if not archive_path or not os.path.exists(archive_path):
+        return info
+
+    info['exists'] = True
+    info['size_bytes'] = os.path.getsize(archive_path)
+    conn = sqlite3.connect(Path(archive_path).resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        info['years'] = [
+            {'year': int(row[0]), 'transactions': row[1]}
+            for row in conn.execute("""
+                SELECT strftime('%Y', transaction_date), COUNT(*)
+                FROM archived_transactions GROUP BY 1 ORDER BY 1
+            """)
+        ]
+    finally:
+        conn.close()
+    return info
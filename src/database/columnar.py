@@ -0,0 +1,616 @@
+"""
+Columnar in-memory item and ledger store for bulk analytics.
+
+Loads inventory_items and inventory_transactions into typed NumPy arrays
+(one array per column) with chunked reads, so analytics can filter, group and
+join with vectorized operations instead of building a dict per row.
+
+- Strings that repeat (SKUs, donors, suppliers, reason codes) are interned
+  into StringDictionary objects and stored as int32 codes (-1 = NULL)
+- Transaction types are int8 codes (see TYPE_CODES)
+- Timestamps are datetime64[s] (SQLite text interpreted as naive UTC)
+- ledger.item_index joins each transaction to its row in the item columns
+
+A ColumnarFrame is shared per database via get_shared_frame(). It is
+refreshed incrementally when the data version changes: the ledger is
+append-only, so only new rows and the set of voided ids are re-read.
+Arrays are shared between callers and must be treated as read-only.
+"""
+
+import sqlite3
+import threading
+import weakref
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+DEFAULT_CHUNK_SIZE = 65536
+
+TYPE_CODES = {'PURCHASE': 0, 'DONATION': 1, 'DISTRIBUTION': 2, 'CORRECTION': 3}
+TYPE_NAMES = {code: name for name, code in TYPE_CODES.items()}
+
+DateLike = Union[date, datetime, str, None]
+
+
+class StringDictionary:
+    """Interns strings to dense integer codes (None maps to -1)."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[Optional[str], int] = {None: -1}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: Optional[str]) -> int:
+        """Get the code for a value, adding it if new."""
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def encode_many(self, values: Sequence[Optional[str]]) -> np.ndarray:
+        """Encode a sequence of values into an int32 code array."""
+        codes = self._codes
+        # Register new values in first-seen order, then look up at C speed
+        for value in dict.fromkeys(values):
+            if value not in codes:
+                self.encode(value)
+        return np.array([codes[v] for v in values], dtype=np.int32)
+
+    def code_of(self, value: str) -> int:
+        """Get the code for an existing value (-1 if unknown)."""
+        return self._codes.get(value, -1)
+
+    def decode(self, code: int) -> Optional[str]:
+        """Get the value for a code."""
+        return None if code < 0 else self.values[code]
+
+
+def _empty(dtype) -> np.ndarray:
+    return np.empty(0, dtype=dtype)
+
+
+@dataclass
+class ItemColumns:
+    """Item attributes, one array per column, ordered by id."""
+
+    id: np.ndarray = field(default_factory=lambda: _empty(np.int64))
+    sku: np.ndarray = field(default_factory=lambda: _empty(np.int32))
+    category_id: np.ndarray = field(default_factory=lambda: _empty(np.int64))  # -1 = none
+    quantity_on_hand: np.ndarray = field(default_factory=lambda: _empty(np.float64))
+    reorder_threshold: np.ndarray = field(default_factory=lambda: _empty(np.int64))
+    total_cost_basis_cents: np.ndarray = field(default_factory=lambda: _empty(np.int64))
+    is_active: np.ndarray = field(default_factory=lambda: _empty(np.bool_))
+    name: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+
+@dataclass
+class LedgerColumns:
+    """Transaction columns, one array per column, ordered by id."""
+
+    id: np.ndarray = field(default_factory=lambda: _empty(np.int64))
+    item_id: np.ndarray = field(default_factory=lambda: _empty(np.int64))
+    item_index: np.ndarray = field(default_factory=lambda: _empty(np.int64))  # -1 = unknown item
+    transaction_type: np.ndarray = field(default_factory=lambda: _empty(np.int8))
+    quantity_change: np.ndarray = field(default_factory=lambda: _empty(np.float64))
+    unit_cost_cents: np.ndarray = field(default_factory=lambda: _empty(np.int64))
+    fair_market_value_cents: np.ndarray = field(default_factory=lambda: _empty(np.int64))
+    total_financial_impact_cents: np.ndarray = field(default_factory=lambda: _empty(np.int64))
+    reason_code: np.ndarray = field(default_factory=lambda: _empty(np.int32))
+    donor: np.ndarray = field(default_factory=lambda: _empty(np.int32))
+    supplier: np.ndarray = field(default_factory=lambda: _empty(np.int32))
+    transaction_date: np.ndarray = field(default_factory=lambda: _empty('datetime64[s]'))
+    is_voided: np.ndarray = field(default_factory=lambda: _empty(np.bool_))
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the column arrays in bytes."""
+        return sum(
+            value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray)
+        )
+
+
+_ITEM_QUERY = """
+    SELECT id, sku, IFNULL(category_id, -1), quantity_on_hand, IFNULL(reorder_threshold, 0),
+           total_cost_basis_cents, is_active, name
+    FROM inventory_items
+    ORDER BY id
+"""
+
+# "+item_id" keeps the planner from walking idx_trans_item for the grouping
+# instead of searching idx_trans_date for the window
+_CONSUMPTION_QUERY = """
+    SELECT item_id, SUM(ABS(quantity_change))
+    FROM inventory_transactions
+    WHERE transaction_type = 'DISTRIBUTION'
+      AND IFNULL(is_voided, 0) = 0
+      AND transaction_date >= DATE(:start)
+      AND datetime(transaction_date) >= datetime(:start)
+    GROUP BY +item_id, DATE(transaction_date)
+    ORDER BY item_id, DATE(transaction_date)
+"""
+
+_LEDGER_QUERY = """
+    SELECT id, item_id,
+           CASE transaction_type
+               WHEN 'PURCHASE' THEN 0 WHEN 'DONATION' THEN 1
+               WHEN 'DISTRIBUTION' THEN 2 ELSE 3
+           END,
+           quantity_change,
+           IFNULL(unit_cost_cents, 0),
+           IFNULL(fair_market_value_cents, 0),
+           IFNULL(total_financial_impact_cents, 0),
+           reason_code, donor, supplier,
+           IFNULL(CAST(strftime('%s', transaction_date) AS INTEGER), 0),
+           IFNULL(is_voided, 0)
+    FROM inventory_transactions
+    WHERE id > ?
+    ORDER BY id
+"""
+
+
+def _to_datetime64(value: DateLike) -> np.datetime64:
+    """Convert a date/datetime/ISO string to datetime64[s]."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return np.datetime64(value.replace(tzinfo=None, microsecond=0), 's')
+
+
+def _weighted_rates(
+    group_items: np.ndarray,
+    daily: np.ndarray,
+    decay: float
+) -> Dict[int, Tuple[float, int]]:
+    """Exponentially weighted mean of daily totals sorted by item, then day."""
+    # Rank of each day from the most recent, within its item
+    starts = np.flatnonzero(np.r_[True, group_items[1:] != group_items[:-1]])
+    counts = np.diff(np.r_[starts, len(group_items)])
+    last = np.repeat(starts + counts - 1, counts)
+    weights = decay ** (last - np.arange(len(group_items)))
+
+    numerator = np.add.reduceat(daily * weights, starts)
+    denominator = np.add.reduceat(weights, starts)
+    rates = numerator / denominator
+    return {
+        int(item_id): (float(rate), int(n))
+        for item_id, rate, n in zip(group_items[starts], rates, counts)
+    }
+
+
+def read_consumption_rates(
+    conn: sqlite3.Connection,
+    start: DateLike,
+    decay: float = 0.7
+) -> Dict[int, Tuple[float, int]]:
+    """
+    Weighted daily distribution rate per item, read straight from SQLite.
+
+    Same result as ColumnarFrame.consumption_rates(), but only the
+    distributions since `start` are read (through idx_trans_date), grouped
+    per item per day in SQL. For short windows over a long ledger this is
+    far cheaper than loading the whole frame.
+
+    Args:
+        conn: Database connection
+        start: Only distributions on or after this time
+        decay: Weight multiplier per older active day
+
+    Returns:
+        Dict of item_id -> (daily_rate, number_of_active_days)
+    """
+    # Dates are stored with a 'T' or a space separator, which sort
+    # differently on the same day: the index narrows the read to the
+    # start day onwards, then datetime() compares the exact times
+    start_text = str(_to_datetime64(start))
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    rows = cursor.execute(_CONSUMPTION_QUERY, {'start': start_text}).fetchall()
+    if not rows:
+        return {}
+    columns = list(zip(*rows))
+    return _weighted_rates(
+        np.array(columns[0], dtype=np.int64), np.array(columns[1], dtype=np.float64), decay
+    )
+
+
+class ColumnarFrame:
+    """Typed column arrays for items and the transaction ledger."""
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Initialize an empty frame (call load() or refresh() to fill it).
+
+        Args:
+            chunk_size: Rows fetched per read
+        """
+        self.chunk_size = chunk_size
+        self.items = ItemColumns()
+        self.ledger = LedgerColumns()
+        self.skus = StringDictionary()
+        self.donors = StringDictionary()
+        self.suppliers = StringDictionary()
+        self.reasons = StringDictionary()
+        self.data_version: Optional[Tuple] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def load(self, conn: sqlite3.Connection):
+        """
+        Load all items and transactions, replacing any existing data.
+
+        Args:
+            conn: Database connection
+        """
+        with self._lock:
+            version = self._version(conn)
+            self.skus = StringDictionary()
+            self.donors = StringDictionary()
+            self.suppliers = StringDictionary()
+            self.reasons = StringDictionary()
+            self._load_items(conn)
+            self.ledger = self._read_ledger(conn, after_id=0)
+            self.ledger.item_index = self._item_index(self.ledger.item_id)
+            self.data_version = version
+
+    def refresh(self, conn: sqlite3.Connection) -> bool:
+        """
+        Bring the frame up to date with the database.
+
+        Items are reloaded (they are few); transactions are appended from the
+        last loaded id and void flags are re-read. Falls back to a full load
+        if rows were deleted.
+
+        Args:
+            conn: Database connection
+
+        Returns:
+            bool: True if the frame changed
+        """
+        version = self._version(conn)
+        if version == self.data_version:
+            return False
+        if self.data_version is None:
+            self.load(conn)
+            return True
+
+        with self._lock:
+            count, max_id = conn.execute(
+                "SELECT COUNT(*), IFNULL(MAX(id), 0) FROM inventory_transactions"
+            ).fetchone()
+            last_id = int(self.ledger.id[-1]) if len(self.ledger) else 0
+            appended = self._read_ledger(conn, after_id=last_id)
+
+            if max_id < last_id or len(self.ledger) + len(appended) != count:
+                full_reload = True
+            else:
+                full_reload = False
+                self._load_items(conn)
+                self.ledger = LedgerColumns(**{
+                    name: np.concatenate([getattr(self.ledger, name), getattr(appended, name)])
+                    for name in vars(self.ledger)
+                })
+                voided = np.fromiter(
+                    (row[0] for row in conn.execute(
+                        "SELECT id FROM inventory_transactions WHERE is_voided = 1"
+                    )),
+                    dtype=np.int64
+                )
+                self.ledger.is_voided = np.isin(self.ledger.id, voided)
+                self.ledger.item_index = self._item_index(self.ledger.item_id)
+                self.data_version = version
+
+        if full_reload:
+            self.load(conn)
+        return True
+
+    @staticmethod
+    def _version(conn: sqlite3.Connection) -> Tuple[int, int, int]:
+        # Same token as services.query_cache (without the date part), plus the
+        # connection identity since total_changes restarts on reconnect
+        return id(conn), conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes
+
+    def _load_items(self, conn: sqlite3.Connection):
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        rows = cursor.execute(_ITEM_QUERY).fetchall()
+        columns = list(zip(*rows)) if rows else [()] * 8
+        self.items = ItemColumns(
+            id=np.array(columns[0], dtype=np.int64),
+            sku=self.skus.encode_many(columns[1]),
+            category_id=np.array(columns[2], dtype=np.int64),
+            quantity_on_hand=np.array(columns[3], dtype=np.float64),
+            reorder_threshold=np.array(columns[4], dtype=np.int64),
+            total_cost_basis_cents=np.array(columns[5], dtype=np.int64),
+            is_active=np.array(columns[6], dtype=np.bool_),
+            name=list(columns[7])
+        )
+
+    def _read_ledger(self, conn: sqlite3.Connection, after_id: int) -> LedgerColumns:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(_LEDGER_QUERY, (after_id,))
+
+        chunks: Dict[str, List[np.ndarray]] = {name: [] for name in vars(LedgerColumns())}
+        while True:
+            rows = cursor.fetchmany(self.chunk_size)
+            if not rows:
+                break
+            c = list(zip(*rows))
+            chunks['id'].append(np.array(c[0], dtype=np.int64))
+            chunks['item_id'].append(np.array(c[1], dtype=np.int64))
+            chunks['transaction_type'].append(np.array(c[2], dtype=np.int8))
+            chunks['quantity_change'].append(np.array(c[3], dtype=np.float64))
+            chunks['unit_cost_cents'].append(np.array(c[4], dtype=np.int64))
+            chunks['fair_market_value_cents'].append(np.array(c[5], dtype=np.int64))
+            chunks['total_financial_impact_cents'].append(np.array(c[6], dtype=np.int64))
+            chunks['reason_code'].append(self.reasons.encode_many(c[7]))
+            chunks['donor'].append(self.donors.encode_many(c[8]))
+            chunks['supplier'].append(self.suppliers.encode_many(c[9]))
+            chunks['transaction_date'].append(
+                np.array(c[10], dtype=np.int64).astype('datetime64[s]')
+            )
+            chunks['is_voided'].append(np.array(c[11], dtype=np.bool_))
+
+        empty = LedgerColumns()
+        return LedgerColumns(**{
+            name: np.concatenate(parts) if parts else getattr(empty, name)
+            for name, parts in chunks.items()
+        })
+
+    def _item_index(self, item_ids: np.ndarray) -> np.ndarray:
+        """Map item ids to row positions in self.items (-1 if missing)."""
+        ids = self.items.id
+        if len(ids) == 0:
+            return np.full(len(item_ids), -1, dtype=np.int64)
+        pos = np.searchsorted(ids, item_ids)
+        pos_clipped = np.minimum(pos, len(ids) - 1)
+        return np.where(ids[pos_clipped] == item_ids, pos_clipped, -1)
+
+    # ------------------------------------------------------------------
+    # Vectorized queries
+    # ------------------------------------------------------------------
+
+    def mask(
+        self,
+        transaction_type: Optional[str] = None,
+        start: DateLike = None,
+        end: DateLike = None,
+        include_voided: bool = False
+    ) -> np.ndarray:
+        """
+        Build a boolean row filter over the ledger.
+
+        Args:
+            transaction_type: Only this type (e.g. 'DISTRIBUTION')
+            start: Inclusive lower bound on transaction_date
+            end: Exclusive upper bound on transaction_date
+            include_voided: Include voided rows
+
+        Returns:
+            Boolean array, one entry per ledger row
+        """
+        ledger = self.ledger
+        selected = np.ones(len(ledger), dtype=np.bool_)
+        if not include_voided:
+            selected &= ~ledger.is_voided
+        if transaction_type is not None:
+            selected &= ledger.transaction_type == TYPE_CODES[transaction_type]
+        if start is not None:
+            selected &= ledger.transaction_date >= _to_datetime64(start)
+        if end is not None:
+            selected &= ledger.transaction_date < _to_datetime64(end)
+        return selected
+
+    def consumption_rates(
+        self,
+        start: DateLike,
+        decay: float = 0.7
+    ) -> Dict[int, Tuple[float, int]]:
+        """
+        Weighted daily distribution rate per item.
+
+        Distributions since `start` are summed per item per day; the daily
+        totals are averaged with exponential weights (most recent day has
+        weight 1, the one before `decay`, and so on).
+
+        Args:
+            start: Only distributions on or after this time
+            decay: Weight multiplier per older active day
+
+        Returns:
+            Dict of item_id -> (daily_rate, number_of_active_days)
+        """
+        selected = self.mask('DISTRIBUTION', start=start)
+        item_ids = self.ledger.item_id[selected]
+        if len(item_ids) == 0:
+            return {}
+        days = self.ledger.transaction_date[selected].astype('datetime64[D]').astype(np.int64)
+        quantity = np.abs(self.ledger.quantity_change[selected])
+
+        # Group by (item, day) with one int64 key; sorted by item then day
+        first_day = days.min()
+        span = int(days.max() - first_day) + 1
+        keys, inverse = np.unique(item_ids * span + (days - first_day), return_inverse=True)
+        daily = np.bincount(inverse, weights=quantity)
+        return _weighted_rates(keys // span, daily, decay)
+
+    def monthly_totals(self, year: int, transaction_type: str, value_column: str) -> Dict:
+        """
+        Quantity and value totals per calendar month.
+
+        Args:
+            year: Calendar year
+            transaction_type: Transaction type to include
+            value_column: Ledger value column in cents to sum (absolute values)
+
+        Returns:
+            Dict with 'quantity' and 'value_cents' arrays of length 12 (Jan..Dec)
+        """
+        selected = self.mask(
+            transaction_type, start=date(year, 1, 1), end=date(year + 1, 1, 1)
+        )
+        months = (
+            self.ledger.transaction_date[selected].astype('datetime64[M]').astype(np.int64) % 12
+        )
+        quantity = np.abs(self.ledger.quantity_change[selected])
+        values = np.abs(getattr(self.ledger, value_column)[selected])
+        return {
+            'quantity': np.bincount(months, weights=quantity, minlength=12),
+            'value_cents': np.bincount(months, weights=values, minlength=12),
+        }
+
+    def donor_totals(self, start: DateLike = None, end: DateLike = None) -> List[Dict]:
+        """
+        Donation count, quantity and fair market value per donor.
+
+        Args:
+            start: Inclusive lower bound on transaction_date
+            end: Exclusive upper bound on transaction_date
+
+        Returns:
+            List of dicts sorted by total FMV (highest first)
+        """
+        selected = self.mask('DONATION', start=start, end=end) & (self.ledger.donor >= 0)
+        empty_code = self.donors.code_of('')
+        if empty_code >= 0:
+            selected &= self.ledger.donor != empty_code
+        codes = self.ledger.donor[selected]
+        size = len(self.donors)
+        counts = np.bincount(codes, minlength=size)
+        quantity = np.bincount(codes, weights=self.ledger.quantity_change[selected], minlength=size)
+        fmv = np.bincount(
+            codes, weights=self.ledger.fair_market_value_cents[selected], minlength=size
+        )
+        present = np.flatnonzero(counts)
+        order = present[np.argsort(-fmv[present], kind='stable')]
+        return [
+            {
+                'donor': self.donors.values[code],
+                'donation_count': int(counts[code]),
+                'total_quantity': float(quantity[code]),
+                'total_fmv_cents': int(fmv[code]),
+            }
+            for code in order
+        ]
+
+    def category_totals(
+        self,
+        transaction_type: str = 'DISTRIBUTION',
+        start: DateLike = None,
+        end: DateLike = None
+    ) -> Dict[int, Tuple[float, int]]:
+        """
+        Quantity and financial impact per item category (joined via item_index).
+
+        Args:
+            transaction_type: Transaction type to include
+            start: Inclusive lower bound on transaction_date
+            end: Exclusive upper bound on transaction_date
+
+        Returns:
+            Dict of category_id (-1 = uncategorized) -> (quantity, value_cents)
+        """
+        selected = self.mask(transaction_type, start=start, end=end)
+        selected &= self.ledger.item_index >= 0
+        categories = self.items.category_id[self.ledger.item_index[selected]]
+        uniq, inverse = np.unique(categories, return_inverse=True)
+        quantity = np.bincount(inverse, weights=np.abs(self.ledger.quantity_change[selected]))
+        values = np.bincount(
+            inverse, weights=np.abs(self.ledger.total_financial_impact_cents[selected])
+        )
+        return {
+            int(cat): (float(q), int(v)) for cat, q, v in zip(uniq, quantity, values)
+        }
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def to_arrow(self):
+        """
+        Export the ledger as a pyarrow Table.
+
+        SKU, donor, supplier and reason columns become dictionary arrays that
+        reuse the interned codes.
+
+        Returns:
+            pyarrow.Table
+        """
+        import pyarrow as pa
+
+        def dictionary(codes: np.ndarray, strings: StringDictionary):
+            return pa.DictionaryArray.from_arrays(
+                pa.array(codes, mask=codes < 0), pa.array(strings.values, type=pa.string())
+            )
+
+        ledger = self.ledger
+        if len(self.items):
+            sku_codes = np.where(
+                ledger.item_index >= 0, self.items.sku[np.maximum(ledger.item_index, 0)], -1
+            ).astype(np.int32)
+        else:
+            sku_codes = np.full(len(ledger), -1, dtype=np.int32)
+        return pa.table({
+            'id': ledger.id,
+            'item_id': ledger.item_id,
+            'sku': dictionary(sku_codes, self.skus),
+            'transaction_type': pa.DictionaryArray.from_arrays(
+                pa.array(ledger.transaction_type),
+                pa.array([TYPE_NAMES[c] for c in range(len(TYPE_NAMES))])
+            ),
+            'quantity_change': ledger.quantity_change,
+            'unit_cost_cents': ledger.unit_cost_cents,
+            'fair_market_value_cents': ledger.fair_market_value_cents,
+            'total_financial_impact_cents': ledger.total_financial_impact_cents,
+            'reason_code': dictionary(ledger.reason_code, self.reasons),
+            'donor': dictionary(ledger.donor, self.donors),
+            'supplier': dictionary(ledger.supplier, self.suppliers),
+            'transaction_date': ledger.transaction_date,
+            'is_voided': ledger.is_voided,
+        })
+
+
+# One shared frame per DatabaseManager
+_shared_frames: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_shared_lock = threading.Lock()
+
+
+def get_shared_frame(db_manager) -> ColumnarFrame:
+    """
+    Get the shared, up-to-date frame for a database.
+
+    The first call loads everything; later calls refresh incrementally, and
+    are free when nothing has been written since.
+
+    Args:
+        db_manager: DatabaseManager whose connection is read
+
+    Returns:
+        ColumnarFrame: Shared frame (treat arrays as read-only)
+    """
+    with _shared_lock:
+        frame = _shared_frames.get(db_manager)
+        if frame is None:
+            frame = ColumnarFrame()
+            _shared_frames[db_manager] = frame
+        frame.refresh(db_manager.get_connection())
+    return frame
@@ -0,0 +1,611 @@
+"""
+Compact ledger layout for large AIOps Studio - Inventory databases.
+
+The wide ``inventory_transactions`` table repeats the same strings on every
+row (transaction type, reason code, supplier and donor names, 'system') and
+indexes several of them. The compact layout stores each transaction as a
+narrow row of small integers and moves the rarely-read text aside:
+
+- ``ledger_entries``: one row per transaction. ``type_code`` and
+  ``reason_id`` point at the ``transaction_types`` / ``reason_codes`` lookup
+  tables, and ``supplier_id`` / ``donor_id`` at the dimension tables
+- ``ledger_details``: notes, the supplier/donor name as entered (only when
+  it differs from the dimension's name) and created_by (only when not
+  'system'). Most rows have no details row at all
+
+``inventory_transactions`` becomes a view with the old column shape, so
+existing queries keep working unchanged. INSTEAD OF triggers on the view
+write to the compact tables and keep the KPI and supplier aggregates
+current, taking over from the triggers on the wide table. Write through
+the view; rows written to ``ledger_entries`` directly bypass the
+aggregates.
+
+Two differences are visible through the view:
+- ``cursor.lastrowid`` and ``cursor.rowcount`` are not set by statements
+  on a view (read the new id back with ``SELECT MAX(id)`` in the same
+  transaction, count matching rows before an UPDATE)
+- A NULL created_by reads back as 'system'
+
+The layout is opt-in: ``migrate_to_compact_ledger()`` converts an existing
+database online, copying the ledger in short batches while the application
+keeps running and swapping the view in at the end.
+"""
+
+import sqlite3
+import time
+from typing import Callable, Dict, Optional
+
+from database.migrations import name_key_sql, split_sql_statements
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Same codes as database.columnar.TYPE_CODES
+TYPE_CODES = {'PURCHASE': 0, 'DONATION': 1, 'DISTRIBUTION': 2, 'CORRECTION': 3}
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+# ============================================================================
+# SCHEMA
+# ============================================================================
+
+LEDGER_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS transaction_types (
+    code INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+INSERT OR IGNORE INTO transaction_types (code, name) VALUES
+""" + ",\n".join(f"({code}, '{name}')" for name, code in TYPE_CODES.items()) + """;
+
+-- Reason codes are added on first use, like the donor and supplier dimensions
+CREATE TABLE IF NOT EXISTS reason_codes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS ledger_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    item_id INTEGER NOT NULL,
+    type_code INTEGER NOT NULL,
+    quantity_change REAL NOT NULL,
+    unit_cost_cents INTEGER DEFAULT 0,
+    fair_market_value_cents INTEGER DEFAULT 0,
+    total_financial_impact_cents INTEGER DEFAULT 0,
+    reason_id INTEGER,
+    supplier_id INTEGER,
+    donor_id INTEGER,
+    transaction_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+    is_voided BOOLEAN DEFAULT 0,
+    ref_transaction_id INTEGER,
+    FOREIGN KEY (item_id) REFERENCES inventory_items(id),
+    FOREIGN KEY (type_code) REFERENCES transaction_types(code),
+    FOREIGN KEY (reason_id) REFERENCES reason_codes(id),
+    FOREIGN KEY (supplier_id) REFERENCES suppliers(id),
+    FOREIGN KEY (donor_id) REFERENCES donors(id),
+    FOREIGN KEY (ref_transaction_id) REFERENCES ledger_entries(id),
+    CHECK (
+        (type_code = 2 AND quantity_change < 0) OR
+        (type_code IN (0, 1) AND quantity_change > 0) OR
+        (type_code = 3 AND quantity_change != 0)
+    )
+);
+
+CREATE TABLE IF NOT EXISTS ledger_details (
+    transaction_id INTEGER PRIMARY KEY,
+    notes TEXT,
+    supplier TEXT,  -- As entered, when it differs from suppliers.name
+    donor TEXT,  -- As entered, when it differs from donors.name
+    created_by TEXT,  -- NULL means 'system'
+    FOREIGN KEY (transaction_id) REFERENCES ledger_entries(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_ledger_item ON ledger_entries(item_id);
+CREATE INDEX IF NOT EXISTS idx_ledger_date ON ledger_entries(transaction_date);
+CREATE INDEX IF NOT EXISTS idx_ledger_donor ON ledger_entries(donor_id);
+CREATE INDEX IF NOT EXISTS idx_ledger_supplier ON ledger_entries(supplier_id, transaction_date);
+"""
+
+# Type names are decoded inline rather than joined, so scans filtering or
+# grouping on transaction_type stay single-table
+_TYPE_NAME = "CASE e.type_code " + " ".join(
+    f"WHEN {code} THEN '{name}'" for name, code in TYPE_CODES.items()) + " END"
+
+_DONOR_KEY = name_key_sql("NEW.donor")
+_SUPPLIER_KEY = name_key_sql("NEW.supplier")
+
+# A purchase or distribution row contributes to the aggregates; these are
+# the columns that decide how much (an UPDATE changing none of them leaves
+# the aggregates alone)
+_DISTRIBUTION_CHANGED = """(
+    NEW.item_id IS NOT OLD.item_id OR NEW.transaction_type IS NOT OLD.transaction_type
+    OR NEW.quantity_change IS NOT OLD.quantity_change OR NEW.is_voided IS NOT OLD.is_voided
+)"""
+_PURCHASE_CHANGED = """(
+    NEW.supplier_id IS NOT OLD.supplier_id OR NEW.transaction_type IS NOT OLD.transaction_type
+    OR NEW.quantity_change IS NOT OLD.quantity_change OR NEW.unit_cost_cents IS NOT OLD.unit_cost_cents
+    OR NEW.transaction_date IS NOT OLD.transaction_date OR NEW.notes IS NOT OLD.notes
+    OR NEW.is_voided IS NOT OLD.is_voided
+)"""
+
+LEDGER_VIEW_SQL = f"""
+-- Names are looked up by scalar subqueries, which only run for queries that
+-- read them; aggregates over the numeric columns never touch those tables
+CREATE VIEW IF NOT EXISTS inventory_transactions AS
+SELECT e.id, e.item_id, {_TYPE_NAME} AS transaction_type, e.quantity_change,
+       e.unit_cost_cents, e.fair_market_value_cents, e.total_financial_impact_cents,
+       (SELECT name FROM reason_codes WHERE id = e.reason_id) AS reason_code,
+       COALESCE(d.supplier, (SELECT name FROM suppliers WHERE id = e.supplier_id)) AS supplier,
+       e.supplier_id,
+       COALESCE(d.donor, (SELECT name FROM donors WHERE id = e.donor_id)) AS donor,
+       e.donor_id,
+       d.notes, e.transaction_date,
+       COALESCE(d.created_by, 'system') AS created_by,
+       e.is_voided, e.ref_transaction_id
+FROM ledger_entries e
+LEFT JOIN ledger_details d ON d.transaction_id = e.id;
+
+-- Views have no column defaults, so the wide table's defaults are applied
+-- here. Supplier and donor names are linked as by the wide-table triggers.
+CREATE TRIGGER IF NOT EXISTS ledger_insert
+INSTEAD OF INSERT ON inventory_transactions
+BEGIN
+    INSERT OR IGNORE INTO donors (name, normalized_key)
+    SELECT TRIM(NEW.donor), {_DONOR_KEY}
+    WHERE NEW.donor_id IS NULL AND NEW.donor IS NOT NULL AND TRIM(NEW.donor) != '';
+
+    INSERT OR IGNORE INTO suppliers (name, normalized_key)
+    SELECT TRIM(NEW.supplier), {_SUPPLIER_KEY}
+    WHERE NEW.supplier_id IS NULL AND NEW.supplier IS NOT NULL AND TRIM(NEW.supplier) != '';
+
+    INSERT OR IGNORE INTO reason_codes (name)
+    SELECT NEW.reason_code WHERE NEW.reason_code IS NOT NULL;
+
+    INSERT INTO ledger_entries (id, item_id, type_code, quantity_change, unit_cost_cents,
+                                fair_market_value_cents, total_financial_impact_cents,
+                                reason_id, supplier_id, donor_id, transaction_date,
+                                is_voided, ref_transaction_id)
+    VALUES (
+        NEW.id, NEW.item_id,
+        (SELECT code FROM transaction_types WHERE name = NEW.transaction_type),
+        NEW.quantity_change,
+        IFNULL(NEW.unit_cost_cents, 0),
+        IFNULL(NEW.fair_market_value_cents, 0),
+        IFNULL(NEW.total_financial_impact_cents, 0),
+        (SELECT id FROM reason_codes WHERE name = NEW.reason_code),
+        COALESCE(NEW.supplier_id,
+                 (SELECT id FROM suppliers WHERE normalized_key = {_SUPPLIER_KEY})),
+        COALESCE(NEW.donor_id,
+                 (SELECT COALESCE(merged_into_id, id) FROM donors
+                  WHERE normalized_key = {_DONOR_KEY})),
+        IFNULL(NEW.transaction_date, CURRENT_TIMESTAMP),
+        IFNULL(NEW.is_voided, 0),
+        NEW.ref_transaction_id
+    );
+
+    -- AUTOINCREMENT makes the new row the highest id unless one was given
+    INSERT INTO ledger_details (transaction_id, notes, supplier, donor, created_by)
+    SELECT * FROM (
+        SELECT e.id, NEW.notes, NULLIF(NEW.supplier, s.name) AS supplier,
+               NULLIF(NEW.donor, dn.name) AS donor,
+               NULLIF(NEW.created_by, 'system') AS created_by
+        FROM ledger_entries e
+        LEFT JOIN suppliers s ON s.id = e.supplier_id
+        LEFT JOIN donors dn ON dn.id = e.donor_id
+        WHERE e.id = IFNULL(NEW.id, (SELECT MAX(id) FROM ledger_entries))
+    )
+    WHERE COALESCE(notes, supplier, donor, created_by) IS NOT NULL;
+
+    INSERT INTO kpi_item_distributed (item_id, quantity_distributed)
+    SELECT NEW.item_id, -NEW.quantity_change
+    WHERE NEW.transaction_type = 'DISTRIBUTION' AND IFNULL(NEW.is_voided, 0) = 0
+    ON CONFLICT(item_id) DO UPDATE
+        SET quantity_distributed = quantity_distributed + excluded.quantity_distributed;
+
+    INSERT INTO supplier_purchase_delta
+    SELECT supplier_id, 1, id, quantity_change, quantity_change * unit_cost_cents,
+           transaction_date, NEW.notes
+    FROM ledger_entries
+    WHERE id = IFNULL(NEW.id, (SELECT MAX(id) FROM ledger_entries))
+      AND type_code = 0 AND is_voided = 0 AND supplier_id IS NOT NULL;
+END;
+
+-- Rewrites the entry, then takes OLD's contribution out of the aggregates
+-- and adds NEW's
+CREATE TRIGGER IF NOT EXISTS ledger_update
+INSTEAD OF UPDATE ON inventory_transactions
+BEGIN
+    SELECT RAISE(ABORT, 'Transaction ids cannot be changed')
+    WHERE NEW.id IS NOT OLD.id;
+
+    INSERT OR IGNORE INTO reason_codes (name)
+    SELECT NEW.reason_code WHERE NEW.reason_code IS NOT NULL;
+
+    UPDATE ledger_entries SET
+        item_id = NEW.item_id,
+        type_code = (SELECT code FROM transaction_types WHERE name = NEW.transaction_type),
+        quantity_change = NEW.quantity_change,
+        unit_cost_cents = NEW.unit_cost_cents,
+        fair_market_value_cents = NEW.fair_market_value_cents,
+        total_financial_impact_cents = NEW.total_financial_impact_cents,
+        reason_id = (SELECT id FROM reason_codes WHERE name = NEW.reason_code),
+        supplier_id = NEW.supplier_id,
+        donor_id = NEW.donor_id,
+        transaction_date = NEW.transaction_date,
+        is_voided = NEW.is_voided,
+        ref_transaction_id = NEW.ref_transaction_id
+    WHERE id = OLD.id;
+
+    REPLACE INTO ledger_details (transaction_id, notes, supplier, donor, created_by)
+    SELECT OLD.id, NEW.notes,
+           NULLIF(NEW.supplier, (SELECT name FROM suppliers WHERE id = NEW.supplier_id)),
+           NULLIF(NEW.donor, (SELECT name FROM donors WHERE id = NEW.donor_id)),
+           NULLIF(NEW.created_by, 'system')
+    WHERE NEW.notes IS NOT OLD.notes OR NEW.supplier IS NOT OLD.supplier
+       OR NEW.supplier_id IS NOT OLD.supplier_id OR NEW.donor IS NOT OLD.donor
+       OR NEW.donor_id IS NOT OLD.donor_id OR NEW.created_by IS NOT OLD.created_by;
+
+    DELETE FROM ledger_details
+    WHERE transaction_id = OLD.id
+      AND COALESCE(notes, supplier, donor, created_by) IS NULL;
+
+    INSERT INTO kpi_item_distributed (item_id, quantity_distributed)
+    SELECT OLD.item_id, OLD.quantity_change
+    WHERE OLD.transaction_type = 'DISTRIBUTION' AND OLD.is_voided = 0
+      AND {_DISTRIBUTION_CHANGED}
+    ON CONFLICT(item_id) DO UPDATE
+        SET quantity_distributed = quantity_distributed + excluded.quantity_distributed;
+
+    INSERT INTO kpi_item_distributed (item_id, quantity_distributed)
+    SELECT NEW.item_id, -NEW.quantity_change
+    WHERE NEW.transaction_type = 'DISTRIBUTION' AND NEW.is_voided = 0
+      AND {_DISTRIBUTION_CHANGED}
+    ON CONFLICT(item_id) DO UPDATE
+        SET quantity_distributed = quantity_distributed + excluded.quantity_distributed;
+
+    INSERT INTO supplier_purchase_delta
+    SELECT OLD.supplier_id, -1, OLD.id, OLD.quantity_change,
+           OLD.quantity_change * OLD.unit_cost_cents, OLD.transaction_date, OLD.notes
+    WHERE OLD.transaction_type = 'PURCHASE' AND OLD.is_voided = 0
+      AND OLD.supplier_id IS NOT NULL AND {_PURCHASE_CHANGED};
+
+    INSERT INTO supplier_purchase_delta
+    SELECT NEW.supplier_id, 1, NEW.id, NEW.quantity_change,
+           NEW.quantity_change * NEW.unit_cost_cents, NEW.transaction_date, NEW.notes
+    WHERE NEW.transaction_type = 'PURCHASE' AND NEW.is_voided = 0
+      AND NEW.supplier_id IS NOT NULL AND {_PURCHASE_CHANGED};
+END;
+
+CREATE TRIGGER IF NOT EXISTS ledger_delete
+INSTEAD OF DELETE ON inventory_transactions
+BEGIN
+    DELETE FROM ledger_details WHERE transaction_id = OLD.id;
+    DELETE FROM ledger_entries WHERE id = OLD.id;
+
+    UPDATE kpi_item_distributed
+    SET quantity_distributed = quantity_distributed + OLD.quantity_change
+    WHERE item_id = OLD.item_id
+      AND OLD.transaction_type = 'DISTRIBUTION' AND OLD.is_voided = 0;
+
+    INSERT INTO supplier_purchase_delta
+    SELECT OLD.supplier_id, -1, OLD.id, OLD.quantity_change,
+           OLD.quantity_change * OLD.unit_cost_cents, OLD.transaction_date, OLD.notes
+    WHERE OLD.transaction_type = 'PURCHASE' AND OLD.is_voided = 0
+      AND OLD.supplier_id IS NOT NULL;
+END;
+"""
+
+# Records wide-table rows changed while the online copy runs, so the
+# cutover can re-copy them
+_CAPTURE_SQL = """
+CREATE TABLE IF NOT EXISTS ledger_migration_dirty (id INTEGER PRIMARY KEY);
+
+CREATE TRIGGER IF NOT EXISTS ledger_migration_capture_update
+AFTER UPDATE ON inventory_transactions
+BEGIN
+    INSERT OR IGNORE INTO ledger_migration_dirty (id) VALUES (OLD.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS ledger_migration_capture_delete
+AFTER DELETE ON inventory_transactions
+BEGIN
+    INSERT OR IGNORE INTO ledger_migration_dirty (id) VALUES (OLD.id);
+END;
+"""
+
+# Change data capture (see change_log in schema.sql). Views cannot have
+# AFTER triggers, so writes through the view are logged from ledger_entries;
+# created at the cutover, after the copy, which is not a change
+LEDGER_CHANGE_LOG_SQL = "\n".join(f"""
+CREATE TRIGGER IF NOT EXISTS change_log_ledger_{event.lower()}
+AFTER {event} ON ledger_entries
+WHEN EXISTS (SELECT 1 FROM change_consumers)
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op)
+    VALUES ('inventory_transactions', {row}.id, '{event[0]}');
+END;
+""" for event, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')))
+
+# Closed-period locks (see closed_periods in schema.sql), on ledger_entries
+# for the same reason; also created at the cutover
+LEDGER_PERIOD_LOCK_SQL = """
+CREATE TRIGGER IF NOT EXISTS period_lock_ledger_insert
+BEFORE INSERT ON ledger_entries
+WHEN strftime('%Y-%m', NEW.transaction_date) IN (SELECT period FROM closed_periods)
+BEGIN
+    SELECT RAISE(ABORT, 'Transaction date is in a closed period');
+END;
+
+CREATE TRIGGER IF NOT EXISTS period_lock_ledger_update
+BEFORE UPDATE ON ledger_entries
+WHEN (strftime('%Y-%m', OLD.transaction_date) IN (SELECT period FROM closed_periods)
+      OR strftime('%Y-%m', NEW.transaction_date) IN (SELECT period FROM closed_periods))
+  AND (NEW.item_id IS NOT OLD.item_id
+       OR NEW.type_code IS NOT OLD.type_code
+       OR NEW.quantity_change IS NOT OLD.quantity_change
+       OR NEW.unit_cost_cents IS NOT OLD.unit_cost_cents
+       OR NEW.fair_market_value_cents IS NOT OLD.fair_market_value_cents
+       OR NEW.total_financial_impact_cents IS NOT OLD.total_financial_impact_cents
+       OR NEW.reason_id IS NOT OLD.reason_id
+       OR NEW.transaction_date IS NOT OLD.transaction_date
+       OR NEW.is_voided IS NOT OLD.is_voided)
+BEGIN
+    SELECT RAISE(ABORT, 'Transaction is in a closed period');
+END;
+"""
+
+
+# ============================================================================
+# LAYOUT DETECTION
+# ============================================================================
+
+def is_compact_ledger(conn: sqlite3.Connection) -> bool:
+    """
+    Check whether a database uses the compact ledger layout.
+
+    Args:
+        conn: Open database connection
+
+    Returns:
+        bool: True if inventory_transactions is the compatibility view
+    """
+    row = conn.execute(
+        "SELECT type FROM sqlite_master WHERE name = 'inventory_transactions'"
+    ).fetchone()
+    return row is not None and row[0] == 'view'
+
+
+# ============================================================================
+# ONLINE MIGRATION
+# ============================================================================
+
+def _copy_rows(conn: sqlite3.Connection, condition: str, params: tuple = ()):
+    """Copy wide-table rows matching a condition on w.id into the compact tables."""
+    conn.execute(f"""
+        INSERT OR IGNORE INTO reason_codes (name)
+        SELECT DISTINCT reason_code FROM inventory_transactions w
+        WHERE reason_code IS NOT NULL AND {condition}
+    """, params)
+    conn.execute(f"""
+        INSERT INTO ledger_entries (id, item_id, type_code, quantity_change, unit_cost_cents,
+                                    fair_market_value_cents, total_financial_impact_cents,
+                                    reason_id, supplier_id, donor_id, transaction_date,
+                                    is_voided, ref_transaction_id)
+        SELECT w.id, w.item_id, t.code, w.quantity_change, w.unit_cost_cents,
+               w.fair_market_value_cents, w.total_financial_impact_cents,
+               r.id, w.supplier_id, w.donor_id, w.transaction_date,
+               w.is_voided, w.ref_transaction_id
+        FROM inventory_transactions w
+        JOIN transaction_types t ON t.name = w.transaction_type
+        LEFT JOIN reason_codes r ON r.name = w.reason_code
+        WHERE {condition}
+        ORDER BY w.id
+    """, params)
+    conn.execute(f"""
+        INSERT INTO ledger_details (transaction_id, notes, supplier, donor, created_by)
+        SELECT * FROM (
+            SELECT w.id, w.notes, NULLIF(w.supplier, s.name) AS supplier,
+                   NULLIF(w.donor, dn.name) AS donor,
+                   NULLIF(w.created_by, 'system') AS created_by
+            FROM inventory_transactions w
+            LEFT JOIN suppliers s ON s.id = w.supplier_id
+            LEFT JOIN donors dn ON dn.id = w.donor_id
+            WHERE {condition}
+        )
+        WHERE COALESCE(notes, supplier, donor, created_by) IS NOT NULL
+    """, params)
+
+
+def _copy_batch(conn: sqlite3.Connection, batch_size: int) -> int:
+    """
+    Copy the next batch of wide-table rows in its own write transaction.
+
+    Progress is the highest id in ledger_entries, so an interrupted
+    migration resumes where it stopped.
+
+    Returns:
+        Number of rows copied (0 when caught up)
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        low = conn.execute("SELECT IFNULL(MAX(id), 0) FROM ledger_entries").fetchone()[0]
+        count, high = conn.execute("""
+            SELECT COUNT(*), MAX(id) FROM (
+                SELECT id FROM inventory_transactions WHERE id > ? ORDER BY id LIMIT ?
+            )
+        """, (low, batch_size)).fetchone()
+        if count:
+            _copy_rows(conn, "w.id > ? AND w.id <= ?", (low, high))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return count
+
+
+def _cut_over(conn: sqlite3.Connection) -> int:
+    """
+    Finish the copy and replace the wide table with the view, atomically.
+
+    Rows changed since they were copied are copied again, then the wide
+    table (and its indexes and triggers) is dropped.
+
+    Returns:
+        Number of rows copied during the cutover
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        low = conn.execute("SELECT IFNULL(MAX(id), 0) FROM ledger_entries").fetchone()[0]
+        copied = conn.execute(
+            "SELECT COUNT(*) FROM inventory_transactions WHERE id > ?", (low,)
+        ).fetchone()[0]
+        _copy_rows(conn, "w.id > ?", (low,))
+
+        dirty = "w.id IN (SELECT id FROM ledger_migration_dirty)"
+        copied += conn.execute("SELECT COUNT(*) FROM ledger_migration_dirty").fetchone()[0]
+        conn.execute("""
+            DELETE FROM ledger_details
+            WHERE transaction_id IN (SELECT id FROM ledger_migration_dirty)
+        """)
+        conn.execute("""
+            DELETE FROM ledger_entries WHERE id IN (SELECT id FROM ledger_migration_dirty)
+        """)
+        _copy_rows(conn, dirty)
+
+        # Keep AUTOINCREMENT from reusing ids deleted from the end of the ledger
+        conn.execute("""
+            UPDATE sqlite_sequence
+            SET seq = (SELECT MAX(seq) FROM sqlite_sequence
+                       WHERE name IN ('inventory_transactions', 'ledger_entries'))
+            WHERE name = 'ledger_entries'
+        """)
+        conn.execute("""
+            INSERT INTO sqlite_sequence (name, seq)
+            SELECT 'ledger_entries', seq FROM sqlite_sequence
+            WHERE name = 'inventory_transactions'
+              AND NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'ledger_entries')
+        """)
+
+        conn.execute("DROP TABLE inventory_transactions")
+        conn.execute("DROP TABLE ledger_migration_dirty")
+        for statement in split_sql_statements(
+                LEDGER_VIEW_SQL + LEDGER_CHANGE_LOG_SQL + LEDGER_PERIOD_LOCK_SQL):
+            conn.execute(statement)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return copied
+
+
+def migrate_to_compact_ledger(
+    db_path: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    pause: float = 0.0,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, int]:
+    """
+    Convert a database to the compact ledger layout while it stays in use.
+
+    The ledger is copied in batches of batch_size rows, each in its own
+    short write transaction, so other connections can keep reading and
+    writing in between. Rows updated or deleted after being copied are
+    recorded by temporary triggers and copied again in the final cutover,
+    which swaps the view in within a single transaction. Interrupted
+    migrations resume from the last copied batch.
+
+    Args:
+        db_path: Path to the database file
+        batch_size: Rows copied per write transaction
+        pause: Seconds to sleep between batches (yields to other writers)
+        progress: Called with (rows copied, rows in the ledger) after each batch
+
+    Returns:
+        Dict with rows (copied), batches and cutover_rows (copied or
+        re-copied during the cutover); all zero if already compact
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1")
+
+    # isolation_level=None: transactions are managed explicitly per batch
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=30)
+    stats = {'rows': 0, 'batches': 0, 'cutover_rows': 0}
+    try:
+        if is_compact_ledger(conn):
+            return stats
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Not executescript(), which would commit the open transaction
+            for statement in split_sql_statements(LEDGER_TABLES_SQL + _CAPTURE_SQL):
+                conn.execute(statement)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        total = conn.execute("SELECT COUNT(*) FROM inventory_transactions").fetchone()[0]
+        while True:
+            copied = _copy_batch(conn, batch_size)
+            if not copied:
+                break
+            stats['rows'] += copied
+            stats['batches'] += 1
+            if progress:
+                progress(stats['rows'], total)
+            if pause:
+                time.sleep(pause)
+
+        stats['cutover_rows'] = _cut_over(conn)
+        conn.execute("PRAGMA optimize")
+        logger.info(
+            f"Converted ledger to compact layout: {stats['rows']} rows in "
+            f"{stats['batches']} batches, {stats['cutover_rows']} at cutover"
+        )
+    finally:
+        conn.close()
+
+    return stats
+
+
+# ============================================================================
+# STORAGE METRICS
+# ============================================================================
+
+def ledger_storage_stats(conn: sqlite3.Connection) -> Dict[str, int]:
+    """
+    Count the pages used by the ledger's tables and indexes.
+
+    Uses the dbstat virtual table, so SQLite must be built with it
+    (the builds shipped with Python are).
+
+    Args:
+        conn: Open database connection
+
+    Returns:
+        Dict with page_size, table_pages, index_pages and total_pages for
+        whichever layout the database uses, plus the database page_count
+    """
+    if is_compact_ledger(conn):
+        tables = ('ledger_entries', 'ledger_details', 'transaction_types', 'reason_codes')
+    else:
+        tables = ('inventory_transactions',)
+
+    placeholders = ", ".join("?" for _ in tables)
+    table_pages = conn.execute(
+        f"SELECT COUNT(*) FROM dbstat WHERE name IN ({placeholders})", tables
+    ).fetchone()[0]
+    index_pages = conn.execute(f"""
+        SELECT COUNT(*) FROM dbstat
+        WHERE name IN (SELECT name FROM sqlite_master
+                       WHERE type = 'index' AND tbl_name IN ({placeholders}))
+    """, tables).fetchone()[0]
+
+    return {
+        'page_size': conn.execute("PRAGMA page_size").fetchone()[0],
+        'page_count': conn.execute("PRAGMA page_count").fetchone()[0],
+        'table_pages': table_pages,
+        'index_pages': index_pages,
+        'total_pages': table_pages + index_pages,
+    }
@@ -14,24 +14,60 @@ import os
 import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from contextlib import contextmanager
 
 from utils.app_paths import get_backups_dir
 
 
+JOURNAL_MODES = ('WAL', 'DELETE', 'TRUNCATE', 'PERSIST')
+BEGIN_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
 class DatabaseManager:
     """Manages SQLite database connections and operations."""
     
-    def __init__(self, db_path: str = "inventory.db"):
+    def __init__(
+        self,
+        db_path: str = "inventory.db",
+        journal_mode: str = "WAL",
+        busy_timeout_ms: int = 5000,
+        begin_mode: Optional[str] = "IMMEDIATE"
+    ):
         """
         Initialize database manager.
         
         Args:
             db_path: Path to the SQLite database file
+            journal_mode: Journal mode set on connect (see JOURNAL_MODES)
+            busy_timeout_ms: How long a statement waits for another
+                connection's lock before failing with "database is locked"
+            begin_mode: How ``transaction()`` starts its transaction (see
+                BEGIN_MODES). IMMEDIATE takes the write lock up front, so
+                what a transaction reads before writing (stock levels,
+                cost basis) cannot change under it. None leaves it to
+                Python's sqlite3, which begins a deferred transaction at the
+                first data change; reads before it are then not part of the
+                transaction and concurrent writers can lose updates.
+
+        Raises:
+            ValueError: If journal_mode or begin_mode is unknown
         """
+        journal_mode = journal_mode.upper()
+        if journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"Unknown journal mode: {journal_mode}")
+        if begin_mode is not None:
+            begin_mode = begin_mode.upper()
+            if begin_mode not in BEGIN_MODES:
+                raise ValueError(f"Unknown begin mode: {begin_mode}")
         self.db_path = db_path
+        self.journal_mode = journal_mode
+        self.busy_timeout_ms = busy_timeout_ms
+        self.begin_mode = begin_mode
         self._connection: Optional[sqlite3.Connection] = None
+        # Connection total_changes before and after the last committed
+        # transaction() (lets change-event subscribers see what it covered)
+        self.last_transaction_changes: Optional[Tuple[int, int]] = None
         
     def get_connection(self) -> sqlite3.Connection:
         """
@@ -41,14 +77,24 @@ class DatabaseManager:
             sqlite3.Connection: Active database connection
         """
         if self._connection is None:
-            self._connection = sqlite3.connect(self.db_path)
+            self._connection = sqlite3.connect(self.db_path,
+                                               timeout=self.busy_timeout_ms / 1000)
             self._connection.row_factory = sqlite3.Row  # Enable column access by name
             
             # Enable foreign key constraints (disabled by default in SQLite)
             self._connection.execute("PRAGMA foreign_keys = ON")
             
-            # Enable WAL mode for better concurrency
-            self._connection.execute("PRAGMA journal_mode = WAL")
+            # Incremental auto-vacuum for new databases. Only possible while
+            # the file is empty: setting journal_mode writes its header, so
+            # schema.sql's own PRAGMA would come too late. A no-op otherwise.
+            self._connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+            # WAL by default, for better concurrency
+            self._connection.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+
+            # Archived years (read-only) and the ledger_history view
+            from database.archive import attach_archive
+            attach_archive(self._connection, self.db_path)
             
         return self._connection
     
@@ -59,7 +105,7 @@ class DatabaseManager:
             self._connection = None
     
     @contextmanager
-    def transaction(self):
+    def transaction(self, begin_mode: Optional[str] = None):
         """
         Context manager for database transactions.
         
@@ -68,11 +114,28 @@ class DatabaseManager:
                 conn.execute("INSERT INTO ...")
                 conn.execute("UPDATE ...")
             # Automatically commits on success, rolls back on exception
+        
+        Args:
+            begin_mode: Overrides the manager's begin_mode for this
+                transaction, for read-then-write paths that must hold the
+                write lock from their first read whatever the setting
+
+        Raises:
+            ValueError: If begin_mode is unknown
         """
+        if begin_mode is not None:
+            begin_mode = begin_mode.upper()
+            if begin_mode not in BEGIN_MODES:
+                raise ValueError(f"Unknown begin mode: {begin_mode}")
+        begin_mode = begin_mode or self.begin_mode
         conn = self.get_connection()
+        if begin_mode and not conn.in_transaction:
+            conn.execute(f"BEGIN {begin_mode}")
+        changes_before = conn.total_changes
         try:
             yield conn
             conn.commit()
+            self.last_transaction_changes = (changes_before, conn.total_changes)
         except Exception as e:
             conn.rollback()
             raise e
@@ -145,12 +208,66 @@ class DatabaseManager:
     def vacuum(self):
         """
         Optimize database by reclaiming unused space.
-        Should be run periodically for maintenance.
+
+        This rewrites the whole file, so its cost grows with database size.
+        Prefer ``incremental_vacuum()`` for routine maintenance.
         """
         conn = self.get_connection()
         conn.execute("VACUUM")
         conn.commit()
-    
+
+    def incremental_vacuum(self, max_pages: int = 200) -> int:
+        """
+        Release at most ``max_pages`` free pages (bounded-time compaction).
+
+        Args:
+            max_pages: Upper bound on pages released
+
+        Returns:
+            int: Number of pages released (0 unless auto_vacuum is INCREMENTAL)
+        """
+        from database.maintenance import incremental_vacuum
+        return incremental_vacuum(self.get_connection(), max_pages)
+
+    def checkpoint(self, mode: str = "PASSIVE") -> dict:
+        """
+        Checkpoint the write-ahead log.
+
+        Args:
+            mode: PASSIVE, FULL, RESTART or TRUNCATE
+
+        Returns:
+            dict: Checkpoint result (busy flag and frame counts)
+        """
+        from database.maintenance import checkpoint
+        return checkpoint(self.get_connection(), mode)
+
+    def get_maintenance_metrics(self) -> dict:
+        """
+        Get freelist and WAL size metrics.
+
+        Returns:
+            dict: Page, freelist and WAL statistics
+        """
+        from database.maintenance import get_maintenance_metrics
+        return get_maintenance_metrics(self.get_connection(), self.db_path)
+
+    def archive_closed_years(self, before_year: Optional[int] = None) -> dict:
+        """
+        Move transactions from before a year into the archive file.
+
+        Args:
+            before_year: First year to keep (defaults to the current year)
+
+        Returns:
+            dict: Rows moved and the archive path
+        """
+        from database.archive import archive_closed_years, attach_archive
+        result = archive_closed_years(self.db_path, before_year)
+        # The archive file may be new; attach it to this connection too
+        attach_archive(self.get_connection(), self.db_path)
+        return result
+
     def get_database_info(self) -> dict:
         """
         Get information about the database.
@@ -176,12 +293,15 @@ class DatabaseManager:
             cursor.execute(f"SELECT COUNT(*) FROM {table}")
             table_counts[table] = cursor.fetchone()[0]
         
+        from database.archive import get_archive_info
+        
         return {
             "database_path": self.db_path,
             "size_bytes": db_size,
             "size_mb": round(db_size / (1024 * 1024), 2),
             "tables": tables,
-            "table_counts": table_counts
+            "table_counts": table_counts,
+            "archive": get_archive_info(self.db_path)
         }
 
 
@@ -240,6 +360,40 @@ def reset_db_manager() -> None:
         _db_manager = None
 
 
+# Multi-database mode: managers for other databases (e.g. the pantries of a
+# network being consolidated), one per path, independent of the singleton
+_path_managers: Dict[str, DatabaseManager] = {}
+
+
+def get_db_manager_for_path(db_path: str) -> DatabaseManager:
+    """
+    Get the DatabaseManager for a specific database file.
+
+    Unlike ``get_db_manager()``, every distinct path gets its own manager,
+    so one process can work with several databases. Pass the manager to
+    the services (``ReportingService(db_manager=...)``) to query it.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        DatabaseManager: Manager for that path (created on first use)
+    """
+    key = db_path if db_path == ":memory:" else os.path.abspath(db_path)
+    manager = _path_managers.get(key)
+    if manager is None:
+        manager = DatabaseManager(db_path)
+        _path_managers[key] = manager
+    return manager
+
+
+def close_db_managers() -> None:
+    """Close and forget every manager created by ``get_db_manager_for_path()``."""
+    for manager in _path_managers.values():
+        manager.close()
+    _path_managers.clear()
+
+
 def init_database(db_path: str = "inventory.db", schema_path: str = None):
     """
     Initialize the database with schema.
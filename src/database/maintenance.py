@@ -0,0 +1,375 @@
+"""
+Database maintenance for AIOps Studio - Inventory.
+
+Replaces the full ``VACUUM`` that used to run on exit with small, bounded
+steps that run in idle time:
+- ``auto_vacuum = INCREMENTAL`` so free pages can be released a few at a time
+  (older databases are converted once, by the scheduler, when idle)
+- ``PRAGMA incremental_vacuum(N)`` to trim at most N pages per step
+- ``PRAGMA wal_checkpoint(PASSIVE/TRUNCATE)`` to keep the -wal file small
+- Freelist / WAL size metrics for diagnostics
+
+The background worker uses its own SQLite connection because the
+application connection is bound to the UI thread.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# PRAGMA auto_vacuum values
+AUTO_VACUUM_NONE = 0
+AUTO_VACUUM_FULL = 1
+AUTO_VACUUM_INCREMENTAL = 2
+
+_AUTO_VACUUM_NAMES = {
+    AUTO_VACUUM_NONE: "NONE",
+    AUTO_VACUUM_FULL: "FULL",
+    AUTO_VACUUM_INCREMENTAL: "INCREMENTAL",
+}
+
+CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+# Defaults for one idle-time maintenance step
+DEFAULT_VACUUM_PAGES = 200
+DEFAULT_WAL_TRUNCATE_BYTES = 8 * 1024 * 1024  # Truncate the WAL above 8MB
+
+
+def get_auto_vacuum_mode(conn: sqlite3.Connection) -> int:
+    """
+    Get the auto_vacuum mode of a database.
+
+    Args:
+        conn: Open database connection
+
+    Returns:
+        int: 0 (NONE), 1 (FULL) or 2 (INCREMENTAL)
+    """
+    return conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+
+def migrate_to_incremental_vacuum(db_path: str) -> bool:
+    """
+    Switch an existing database to ``auto_vacuum = INCREMENTAL``.
+
+    Changing auto_vacuum on a database that already has tables only takes
+    effect after one full VACUUM, so this is a one-time cost, paid by
+    MaintenanceScheduler in idle time rather than at startup. Databases that
+    are already incremental are left untouched.
+
+    Args:
+        db_path: Path to the database file
+
+    Returns:
+        bool: True if the database was migrated, False if nothing to do
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        return convert_to_incremental_vacuum(conn, db_path)
+    finally:
+        conn.close()
+
+
+def convert_to_incremental_vacuum(conn: sqlite3.Connection, db_path: str) -> bool:
+    """
+    Switch the database of an open connection to ``auto_vacuum = INCREMENTAL``.
+
+    Args:
+        conn: Open database connection, with no transaction in progress
+        db_path: Path to the database file (for logging)
+
+    Returns:
+        bool: True if the database was migrated, False if nothing to do
+    """
+    if get_auto_vacuum_mode(conn) == AUTO_VACUUM_INCREMENTAL:
+        return False
+
+    logger.info(f"Migrating {db_path} to auto_vacuum=INCREMENTAL (one-time VACUUM)...")
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    migrated = get_auto_vacuum_mode(conn) == AUTO_VACUUM_INCREMENTAL
+    if migrated:
+        logger.info("auto_vacuum migration complete.")
+    else:
+        logger.warning("auto_vacuum migration did not take effect.")
+    return migrated
+
+
+def get_wal_size_bytes(db_path: str) -> int:
+    """
+    Get the size of the write-ahead log file.
+
+    Args:
+        db_path: Path to the database file
+
+    Returns:
+        int: Size of ``<db_path>-wal`` in bytes (0 if absent)
+    """
+    wal_path = f"{db_path}-wal"
+    try:
+        return os.path.getsize(wal_path)
+    except OSError:
+        return 0
+
+
+def get_maintenance_metrics(conn: sqlite3.Connection, db_path: str) -> Dict:
+    """
+    Collect freelist and WAL metrics.
+
+    Args:
+        conn: Open database connection
+        db_path: Path to the database file
+
+    Returns:
+        Dict with page, freelist and WAL statistics
+    """
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    auto_vacuum = get_auto_vacuum_mode(conn)
+    wal_size = get_wal_size_bytes(db_path)
+
+    return {
+        'auto_vacuum': _AUTO_VACUUM_NAMES.get(auto_vacuum, str(auto_vacuum)),
+        'page_size': page_size,
+        'page_count': page_count,
+        'freelist_count': freelist_count,
+        'freelist_bytes': freelist_count * page_size,
+        'freelist_ratio': round(freelist_count / page_count, 4) if page_count else 0.0,
+        'wal_size_bytes': wal_size,
+        'wal_size_mb': round(wal_size / (1024 * 1024), 2),
+    }
+
+
+def checkpoint(conn: sqlite3.Connection, mode: str = "PASSIVE") -> Dict:
+    """
+    Run a WAL checkpoint.
+
+    Args:
+        conn: Open database connection
+        mode: PASSIVE, FULL, RESTART or TRUNCATE
+
+    Returns:
+        Dict with busy flag, WAL frames and checkpointed frames
+
+    Raises:
+        ValueError: If mode is not a valid checkpoint mode
+    """
+    mode = mode.upper()
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f"Invalid checkpoint mode: {mode}")
+
+    busy, log_frames, checkpointed = conn.execute(
+        f"PRAGMA wal_checkpoint({mode})"
+    ).fetchone()
+    return {
+        'mode': mode,
+        'busy': bool(busy),
+        'log_frames': log_frames,
+        'checkpointed_frames': checkpointed,
+    }
+
+
+def incremental_vacuum(conn: sqlite3.Connection, max_pages: int = DEFAULT_VACUUM_PAGES) -> int:
+    """
+    Release at most ``max_pages`` free pages back to the filesystem.
+
+    Does nothing on databases that are not in INCREMENTAL mode.
+
+    Args:
+        conn: Open database connection
+        max_pages: Upper bound on pages released in this call
+
+    Returns:
+        int: Number of pages released
+    """
+    if max_pages <= 0 or get_auto_vacuum_mode(conn) != AUTO_VACUUM_INCREMENTAL:
+        return 0
+
+    before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    if before == 0:
+        return 0
+
+    # incremental_vacuum frees one page per VM step and returns no columns, so
+    # Connection.execute() would only step once; executescript() runs it to
+    # completion (and commits any open transaction first).
+    conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)});")
+    after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return before - after
+
+
+def run_maintenance_step(
+    conn: sqlite3.Connection,
+    db_path: str,
+    max_pages: int = DEFAULT_VACUUM_PAGES,
+    wal_truncate_bytes: int = DEFAULT_WAL_TRUNCATE_BYTES
+) -> Dict:
+    """
+    Run one bounded maintenance step.
+
+    Trims up to ``max_pages`` free pages, then checkpoints the WAL. A PASSIVE
+    checkpoint never waits on readers or writers; once the WAL grows past
+    ``wal_truncate_bytes`` a TRUNCATE checkpoint is attempted to shrink it.
+
+    Args:
+        conn: Open database connection (not used by other threads)
+        db_path: Path to the database file
+        max_pages: Upper bound on pages released
+        wal_truncate_bytes: WAL size that triggers a TRUNCATE checkpoint
+
+    Returns:
+        Dict with pages released and checkpoint result
+    """
+    pages_released = incremental_vacuum(conn, max_pages)
+
+    mode = "TRUNCATE" if get_wal_size_bytes(db_path) > wal_truncate_bytes else "PASSIVE"
+    result = checkpoint(conn, mode)
+
+    return {
+        'pages_released': pages_released,
+        'checkpoint': result,
+    }
+
+
+class MaintenanceScheduler:
+    """
+    Runs bounded maintenance steps on a background thread when the app is idle.
+
+    The first idle step on a database that is not yet INCREMENTAL converts it
+    instead (one full VACUUM); the bounded steps follow from the next round.
+
+    Usage:
+        scheduler = MaintenanceScheduler(db_path)
+        scheduler.start()
+        ...
+        scheduler.notify_activity()  # call on user writes to postpone work
+        ...
+        scheduler.stop()  # returns within ``timeout`` seconds
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        interval_seconds: float = 60.0,
+        idle_seconds: float = 30.0,
+        max_pages: int = DEFAULT_VACUUM_PAGES,
+        wal_truncate_bytes: int = DEFAULT_WAL_TRUNCATE_BYTES
+    ):
+        """
+        Initialize maintenance scheduler.
+
+        Args:
+            db_path: Path to the database file
+            interval_seconds: Time between maintenance checks
+            idle_seconds: Minimum time since last activity before a step runs
+            max_pages: Pages released per incremental_vacuum step
+            wal_truncate_bytes: WAL size that triggers a TRUNCATE checkpoint
+        """
+        self.db_path = db_path
+        self.interval_seconds = interval_seconds
+        self.idle_seconds = idle_seconds
+        self.max_pages = max_pages
+        self.wal_truncate_bytes = wal_truncate_bytes
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_activity = time.monotonic()
+        self._lock = threading.Lock()
+        self._last_metrics: Dict = {}
+        self._runs = 0
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the background maintenance thread."""
+        if self.is_running:
+            return
+        if self.db_path == ":memory:":
+            # An in-memory database cannot be opened from a second connection
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="db-maintenance", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """
+        Stop the background thread.
+
+        A step in progress is bounded by ``max_pages`` and a non-blocking
+        checkpoint, so this returns quickly regardless of database size.
+
+        Args:
+            timeout: Maximum seconds to wait for the thread to exit
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def notify_activity(self):
+        """Record user activity so maintenance waits for the next idle period."""
+        with self._lock:
+            self._last_activity = time.monotonic()
+
+    def get_metrics(self) -> Dict:
+        """
+        Get the metrics captured after the most recent maintenance step.
+
+        Returns:
+            Dict with freelist/WAL metrics and the number of steps run
+        """
+        with self._lock:
+            metrics = dict(self._last_metrics)
+            metrics['runs'] = self._runs
+        return metrics
+
+    def _is_idle(self) -> bool:
+        with self._lock:
+            return time.monotonic() - self._last_activity >= self.idle_seconds
+
+    def _run(self):
+        conn = None
+        try:
+            # Short busy timeout: if the UI is writing, skip this round
+            conn = sqlite3.connect(self.db_path, timeout=0.1)
+            while not self._stop_event.wait(self.interval_seconds):
+                if not self._is_idle():
+                    continue
+                try:
+                    if convert_to_incremental_vacuum(conn, self.db_path):
+                        continue
+                    step = run_maintenance_step(
+                        conn, self.db_path, self.max_pages, self.wal_truncate_bytes
+                    )
+                    metrics = get_maintenance_metrics(conn, self.db_path)
+                    metrics['last_step'] = step
+                    with self._lock:
+                        self._last_metrics = metrics
+                        self._runs += 1
+                    if step['pages_released']:
+                        logger.debug(
+                            f"Maintenance released {step['pages_released']} pages; "
+                            f"WAL {metrics['wal_size_mb']}MB"
+                        )
+                except sqlite3.OperationalError as e:
+                    # Database busy/locked - try again next interval
+                    logger.debug(f"Maintenance step skipped: {e}")
+        except Exception as e:
+            logger.error(f"Maintenance thread error: {e}", exc_info=True)
+        finally:
+            if conn is not None:
+                conn.close()
@@ -0,0 +1,400 @@
+"""
+Schema migrations for existing AIOps Studio - Inventory databases.
+
+``schema.sql`` is idempotent (CREATE ... IF NOT EXISTS, INSERT OR IGNORE),
+so bringing an older database up to date means adding any columns that
+were introduced since, re-applying it (triggers are dropped first, so
+changes to their bodies apply too), and then backfilling any derived
+tables that did not exist before. New databases get
+everything from ``schema.sql`` directly and never need a backfill.
+"""
+
+import os
+import re
+import sqlite3
+from typing import List, Optional
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def _get_tables(conn: sqlite3.Connection) -> set:
+    """Return the names of all user tables."""
+    rows = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+    ).fetchall()
+    return {row[0] for row in rows}
+
+
+def _get_columns(conn: sqlite3.Connection, table: str) -> set:
+    """Return the column names of a table, generated ones included."""
+    return {row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})")}
+
+
+def split_sql_statements(script: str) -> List[str]:
+    """
+    Split a SQL script into complete statements (trigger bodies stay whole).
+
+    Args:
+        script: SQL script text
+
+    Returns:
+        List of statements, comments included
+    """
+    statements = []
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            statements.append(statement.strip())
+            statement = ""
+    return statements
+
+
+# Indexes and triggers on the wide ledger table. A database converted to the
+# compact ledger layout (database.compact_ledger) has a view in its place,
+# which cannot carry them; the view's own triggers do the same work.
+_ON_WIDE_LEDGER = re.compile(
+    r"^\s*CREATE\s+(?:INDEX|TRIGGER)\b[^;]*?\bON\s+inventory_transactions\b",
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+# Trigger names in a script; existing databases get their triggers dropped
+# and re-created, since CREATE TRIGGER IF NOT EXISTS keeps an outdated body
+_TRIGGER_NAME = re.compile(
+    r"^\s*CREATE\s+TRIGGER\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.IGNORECASE | re.MULTILINE
+)
+
+
+def _is_view(conn: sqlite3.Connection, name: str) -> bool:
+    """Return True if name is a view."""
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+    return row is not None and row[0] == 'view'
+
+
+# Characters dropped from / turned into spaces in a normalized name key
+_NAME_KEY_DROP = ".'\u2019\""
+_NAME_KEY_SPACE = ",-/&()"
+
+
+def name_key_sql(expr: str) -> str:
+    """
+    Build the SQL expression that normalizes a donor or supplier name.
+
+    Case, surrounding whitespace and punctuation are ignored, so
+    "St. Mary's" and "st marys" share a key. The donor and supplier
+    triggers in schema.sql inline the output of this function; after
+    changing it, regenerate them (tests compare the trigger text).
+
+    Args:
+        expr: SQL expression yielding the raw name
+
+    Returns:
+        SQL expression yielding the normalized key
+    """
+    sql = f"LOWER(TRIM({expr}))"
+    for char in _NAME_KEY_DROP:
+        sql = f"REPLACE({sql}, '{char.replace(chr(39), chr(39) * 2)}', '')"
+    for char in _NAME_KEY_SPACE:
+        sql = f"REPLACE({sql}, '{char}', ' ')"
+    # Collapse runs of up to 8 spaces
+    for _ in range(3):
+        sql = f"REPLACE({sql}, '  ', ' ')"
+    return f"TRIM({sql})"
+
+
+def rebuild_dashboard_kpis(conn: sqlite3.Connection):
+    """
+    Recompute the dashboard KPI tables from inventory_items and the ledger.
+
+    The KPI triggers keep these tables current incrementally; this full
+    rebuild is only needed when backfilling an existing database (or to
+    repair the tables after manual edits with triggers disabled).
+
+    Args:
+        conn: Open database connection (caller commits)
+    """
+    # Same terms as the KPI triggers: no reorder threshold, not low on stock
+    conn.execute("""
+        UPDATE dashboard_kpi SET
+            total_items = (SELECT COUNT(*) FROM inventory_items WHERE is_active = 1),
+            low_stock_count = (
+                SELECT COALESCE(SUM(IFNULL(
+                    is_active != 0 AND quantity_on_hand < reorder_threshold, 0)), 0)
+                FROM inventory_items
+            ),
+            total_value_cents = (
+                SELECT COALESCE(SUM(total_cost_basis_cents), 0)
+                FROM inventory_items WHERE is_active = 1
+            )
+        WHERE id = 1
+    """)
+
+    conn.execute("DELETE FROM kpi_category_value")
+    conn.execute("""
+        INSERT INTO kpi_category_value (category_id, value_cents)
+        SELECT category_id, SUM(CASE WHEN is_active = 1 THEN total_cost_basis_cents ELSE 0 END)
+        FROM inventory_items
+        WHERE category_id IS NOT NULL
+        GROUP BY category_id
+    """)
+
+    conn.execute("DELETE FROM kpi_item_distributed")
+    conn.execute("""
+        INSERT INTO kpi_item_distributed (item_id, quantity_distributed)
+        SELECT item_id, -SUM(quantity_change)
+        FROM inventory_transactions
+        WHERE transaction_type = 'DISTRIBUTION' AND is_voided = 0
+        GROUP BY item_id
+    """)
+
+
+def rebuild_category_closure(conn: sqlite3.Connection):
+    """
+    Recompute category_closure from item_categories.parent_id.
+
+    The closure triggers keep the table current incrementally; this full
+    rebuild is only needed when backfilling an existing database.
+
+    Args:
+        conn: Open database connection (caller commits)
+    """
+    conn.execute("DELETE FROM category_closure")
+    # Depth guard stops runaway recursion if old data contains a cycle
+    conn.execute("""
+        INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM item_categories
+            UNION ALL
+            SELECT tree.ancestor_id, c.id, tree.depth + 1
+            FROM tree
+            JOIN item_categories c ON c.parent_id = tree.descendant_id
+            WHERE tree.depth < 64
+        )
+        SELECT ancestor_id, descendant_id, MIN(depth)
+        FROM tree
+        GROUP BY ancestor_id, descendant_id
+    """)
+
+
+def rebuild_donors(conn: sqlite3.Connection):
+    """
+    Populate the donors dimension from the donor names on transactions.
+
+    Each distinct normalized name becomes one donor, named after its first
+    spelling in the ledger, and every transaction is linked via donor_id.
+    New donations are linked by trigger; this is only needed when
+    backfilling an existing database.
+
+    Args:
+        conn: Open database connection (caller commits)
+    """
+    key = name_key_sql("donor")
+    conn.execute(f"""
+        INSERT OR IGNORE INTO donors (name, normalized_key)
+        SELECT TRIM(donor), {key}
+        FROM inventory_transactions
+        WHERE donor IS NOT NULL AND TRIM(donor) != ''
+        ORDER BY id
+    """)
+    conn.execute(f"""
+        UPDATE inventory_transactions
+        SET donor_id = (
+            SELECT COALESCE(merged_into_id, id) FROM donors
+            WHERE normalized_key = {key}
+        )
+        WHERE donor IS NOT NULL AND TRIM(donor) != ''
+    """)
+
+
+def rebuild_supplier_totals(conn: sqlite3.Connection):
+    """
+    Recompute the supplier aggregate tables from non-voided purchases.
+
+    The supplier triggers keep these tables current incrementally; this full
+    rebuild is only needed when backfilling an existing database (or to
+    repair the tables after manual edits with triggers disabled).
+
+    Args:
+        conn: Open database connection (caller commits)
+    """
+    conn.execute("DELETE FROM kpi_supplier_totals")
+    conn.execute("""
+        INSERT INTO kpi_supplier_totals (supplier_id, purchase_count, total_quantity,
+                                         total_cost_cents, first_purchase, last_purchase)
+        SELECT supplier_id, COUNT(*), SUM(quantity_change),
+               SUM(quantity_change * unit_cost_cents),
+               MIN(transaction_date), MAX(transaction_date)
+        FROM inventory_transactions
+        WHERE transaction_type = 'PURCHASE' AND is_voided = 0
+          AND supplier_id IS NOT NULL
+        GROUP BY supplier_id
+    """)
+
+    conn.execute("DELETE FROM kpi_supplier_notes")
+    conn.execute("""
+        INSERT INTO kpi_supplier_notes (supplier_id, note, purchase_count, first_transaction_id)
+        SELECT supplier_id, TRIM(notes), COUNT(*), MIN(id)
+        FROM inventory_transactions
+        WHERE transaction_type = 'PURCHASE' AND is_voided = 0
+          AND supplier_id IS NOT NULL
+          AND notes IS NOT NULL AND TRIM(notes) != '' AND LOWER(TRIM(notes)) != 'none'
+        GROUP BY supplier_id, TRIM(notes)
+    """)
+
+
+def rebuild_suppliers(conn: sqlite3.Connection):
+    """
+    Populate the suppliers dimension and its aggregates from transactions.
+
+    Each distinct normalized supplier name becomes one supplier, named
+    after its first spelling in the ledger, and every transaction is linked
+    via supplier_id. New purchases are linked by trigger; this is only
+    needed when backfilling an existing database.
+
+    Args:
+        conn: Open database connection (caller commits)
+    """
+    key = name_key_sql("supplier")
+    conn.execute(f"""
+        INSERT OR IGNORE INTO suppliers (name, normalized_key)
+        SELECT TRIM(supplier), {key}
+        FROM inventory_transactions
+        WHERE supplier IS NOT NULL AND TRIM(supplier) != ''
+        ORDER BY id
+    """)
+    conn.execute(f"""
+        UPDATE inventory_transactions
+        SET supplier_id = (SELECT id FROM suppliers WHERE normalized_key = {key})
+        WHERE supplier IS NOT NULL AND TRIM(supplier) != ''
+    """)
+    rebuild_supplier_totals(conn)
+
+
+def backfill_void_values(conn: sqlite3.Connection):
+    """
+    Store the cost-basis change on void corrections recorded before they
+    carried it.
+
+    Period close works item balances back through these values. Voids now
+    store the change they made; older ones reversed the voided transaction
+    in full: a purchase's cost (the correction keeps its unit cost), a
+    distribution's COGS, a donation's nothing.
+
+    Args:
+        conn: Open database connection (caller commits)
+    """
+    conn.execute("""
+        UPDATE inventory_transactions
+        SET total_financial_impact_cents = (
+            SELECT CASE r.transaction_type
+                       WHEN 'PURCHASE' THEN CAST(inventory_transactions.quantity_change
+                                                 * IFNULL(inventory_transactions.unit_cost_cents, 0)
+                                                 AS INTEGER)
+                       WHEN 'DISTRIBUTION' THEN IFNULL(r.total_financial_impact_cents, 0)
+                       ELSE 0 END
+            FROM inventory_transactions r WHERE r.id = inventory_transactions.ref_transaction_id)
+        WHERE transaction_type = 'CORRECTION' AND ref_transaction_id IS NOT NULL
+    """)
+
+
+# Weighted average unit cost, rounded half to even like InventoryItem
+_AVG = "(total_cost_basis_cents * 1.0 / quantity_on_hand)"
+_UNIT_COST_SQL = f"""
+    CASE WHEN quantity_on_hand > 0 THEN
+        CAST({_AVG} AS INTEGER)
+        + CASE SIGN({_AVG} - CAST({_AVG} AS INTEGER) - 0.5)
+            WHEN 1 THEN 1
+            WHEN 0 THEN CAST({_AVG} AS INTEGER) % 2
+            ELSE 0
+          END
+    ELSE 0 END
+"""
+
+# Columns added to existing tables since their first release, as
+# (table, column, declaration). CREATE TABLE IF NOT EXISTS cannot add them,
+# and schema.sql indexes them, so they are added before it is re-applied.
+# ALTER TABLE can only add VIRTUAL generated columns, which is also how
+# schema.sql declares them; their values are kept in the partial indexes.
+_COLUMNS = [
+    ('inventory_transactions', 'donor_id', 'INTEGER REFERENCES donors(id)'),
+    ('inventory_transactions', 'supplier_id', 'INTEGER REFERENCES suppliers(id)'),
+    ('inventory_items', 'is_low_stock', 'INTEGER GENERATED ALWAYS AS '
+     '(is_active != 0 AND quantity_on_hand < reorder_threshold) VIRTUAL'),
+    ('inventory_items', 'is_zero_stock', 'INTEGER GENERATED ALWAYS AS '
+     '(is_active != 0 AND quantity_on_hand <= 0) VIRTUAL'),
+    ('inventory_items', 'current_unit_cost_cents',
+     f'INTEGER GENERATED ALWAYS AS ({_UNIT_COST_SQL}) VIRTUAL'),
+]
+
+# Derived tables and the backfill that populates them for existing data.
+# Order matters when one backfill depends on another table.
+_BACKFILLS = [
+    ('kpi_item_distributed', rebuild_dashboard_kpis),
+    ('category_closure', rebuild_category_closure),
+    ('donors', rebuild_donors),
+    ('suppliers', rebuild_suppliers),
+    ('closed_periods', backfill_void_values),
+]
+
+
+def migrate_database(db_path: str, schema_path: Optional[str] = None) -> List[str]:
+    """
+    Bring an existing database up to the current schema.
+
+    Args:
+        db_path: Path to the database file
+        schema_path: Path to schema.sql (defaults to the bundled schema)
+
+    Returns:
+        List of backfills that were run (empty if already up to date)
+    """
+    if schema_path is None:
+        schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema.sql")
+
+    with open(schema_path, 'r') as f:
+        schema = f.read()
+
+    conn = sqlite3.connect(db_path)
+    applied = []
+    existing_tables = _get_tables(conn)
+    try:
+        for table, column, declaration in _COLUMNS:
+            if table in existing_tables and column not in _get_columns(conn, table):
+                logger.info(f"Adding column {table}.{column}...")
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+        if _is_view(conn, 'inventory_transactions'):
+            # Imported here: compact_ledger imports this module
+            from database.compact_ledger import (
+                LEDGER_CHANGE_LOG_SQL, LEDGER_PERIOD_LOCK_SQL
+            )
+            schema = "\n".join(
+                statement for statement in split_sql_statements(schema)
+                if not _ON_WIDE_LEDGER.search(statement.split("BEGIN", 1)[0])
+            ) + LEDGER_CHANGE_LOG_SQL + LEDGER_PERIOD_LOCK_SQL
+        conn.executescript("".join(
+            f"DROP TRIGGER IF EXISTS {name};\n" for name in _TRIGGER_NAME.findall(schema)
+        ) + schema)
+
+        for table, backfill in _BACKFILLS:
+            if table not in existing_tables:
+                logger.info(f"Backfilling {table} ({backfill.__name__})...")
+                backfill(conn)
+                applied.append(backfill.__name__)
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        # Drop derived tables created by this run so the backfill is retried
+        for table, _backfill in _BACKFILLS:
+            if table not in existing_tables:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.commit()
+        raise
+    finally:
+        conn.close()
+
+    return applied
@@ -5,6 +5,11 @@
 -- Enable Foreign Keys (must be set per connection)
 PRAGMA foreign_keys = ON;
 
+-- Incremental auto-vacuum lets idle-time maintenance release free pages in
+-- small batches instead of a full VACUUM (only effective before the first
+-- table is created; existing databases are migrated by database.maintenance)
+PRAGMA auto_vacuum = INCREMENTAL;
+
 -- Enable WAL mode for better concurrency
 PRAGMA journal_mode = WAL;
 
@@ -38,6 +43,27 @@ CREATE TABLE IF NOT EXISTS inventory_items (
     is_active BOOLEAN DEFAULT 1,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    -- Generated columns, recomputed whenever the row changes. The partial
+    -- indexes on them (below) make low-stock lists and counts index lookups.
+    -- Keep in sync with migrations._COLUMNS.
+    is_low_stock INTEGER GENERATED ALWAYS AS (
+        is_active != 0 AND quantity_on_hand < reorder_threshold
+    ) VIRTUAL,
+    is_zero_stock INTEGER GENERATED ALWAYS AS (
+        is_active != 0 AND quantity_on_hand <= 0
+    ) VIRTUAL,
+    -- Weighted average unit cost, rounded half to even like InventoryItem
+    current_unit_cost_cents INTEGER GENERATED ALWAYS AS (
+        CASE WHEN quantity_on_hand > 0 THEN
+            CAST(total_cost_basis_cents * 1.0 / quantity_on_hand AS INTEGER)
+            + CASE SIGN(total_cost_basis_cents * 1.0 / quantity_on_hand
+                        - CAST(total_cost_basis_cents * 1.0 / quantity_on_hand AS INTEGER) - 0.5)
+                WHEN 1 THEN 1
+                WHEN 0 THEN CAST(total_cost_basis_cents * 1.0 / quantity_on_hand AS INTEGER) % 2
+                ELSE 0
+              END
+        ELSE 0 END
+    ) VIRTUAL,
     FOREIGN KEY (category_id) REFERENCES item_categories(id),
     CHECK (quantity_on_hand >= 0),
     CHECK (total_cost_basis_cents >= 0)
@@ -61,7 +87,9 @@ CREATE TABLE IF NOT EXISTS inventory_transactions (
     total_financial_impact_cents INTEGER DEFAULT 0,  -- COGS impact (for distributions)
     reason_code TEXT,  -- For distributions: 'CLIENT', 'SPOILAGE', 'INTERNAL'
     supplier TEXT,  -- For purchases
+    supplier_id INTEGER,  -- suppliers.id, linked from supplier by trigger
     donor TEXT,  -- For donations
+    donor_id INTEGER,  -- donors.id, linked from donor by trigger
     notes TEXT,
     transaction_date DATETIME DEFAULT CURRENT_TIMESTAMP,
     created_by TEXT DEFAULT 'system',
@@ -69,6 +97,8 @@ CREATE TABLE IF NOT EXISTS inventory_transactions (
     ref_transaction_id INTEGER,
     FOREIGN KEY (item_id) REFERENCES inventory_items(id),
     FOREIGN KEY (ref_transaction_id) REFERENCES inventory_transactions(id),
+    FOREIGN KEY (donor_id) REFERENCES donors(id),
+    FOREIGN KEY (supplier_id) REFERENCES suppliers(id),
     CHECK (transaction_type IN ('PURCHASE', 'DONATION', 'DISTRIBUTION', 'CORRECTION')),
     CHECK (
         (transaction_type = 'DISTRIBUTION' AND quantity_change < 0) OR
@@ -83,6 +113,9 @@ CREATE TABLE IF NOT EXISTS inventory_transactions (
 CREATE INDEX IF NOT EXISTS idx_items_sku ON inventory_items(sku);
 CREATE INDEX IF NOT EXISTS idx_items_category ON inventory_items(category_id);
 CREATE INDEX IF NOT EXISTS idx_items_active ON inventory_items(is_active);
+-- Partial indexes: only low / zero stock items have entries, in name order
+CREATE INDEX IF NOT EXISTS idx_items_low_stock ON inventory_items(name) WHERE is_low_stock = 1;
+CREATE INDEX IF NOT EXISTS idx_items_zero_stock ON inventory_items(name) WHERE is_zero_stock = 1;
 CREATE INDEX IF NOT EXISTS idx_trans_item ON inventory_transactions(item_id);
 CREATE INDEX IF NOT EXISTS idx_trans_date ON inventory_transactions(transaction_date);
 CREATE INDEX IF NOT EXISTS idx_trans_type ON inventory_transactions(transaction_type);
@@ -97,6 +130,605 @@ BEGIN
     UPDATE inventory_items SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
 END;
 
+-- ============================================================================
+-- TABLES: Dashboard KPIs
+-- Purpose: Pre-aggregated dashboard statistics kept current by the triggers
+--          below, so showing the dashboard is a few point lookups instead of
+--          aggregate scans over items and the full transaction ledger.
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS dashboard_kpi (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total_items INTEGER NOT NULL DEFAULT 0,       -- Active items
+    low_stock_count INTEGER NOT NULL DEFAULT 0,   -- Active items below threshold
+    total_value_cents INTEGER NOT NULL DEFAULT 0  -- Cost basis of active items
+);
+
+INSERT OR IGNORE INTO dashboard_kpi (id) VALUES (1);
+
+-- Cost basis of active items per (leaf) category
+CREATE TABLE IF NOT EXISTS kpi_category_value (
+    category_id INTEGER PRIMARY KEY,
+    value_cents INTEGER NOT NULL DEFAULT 0
+);
+
+-- All-time non-voided distributed quantity per item
+CREATE TABLE IF NOT EXISTS kpi_item_distributed (
+    item_id INTEGER PRIMARY KEY,
+    quantity_distributed REAL NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_kpi_item_distributed_qty
+    ON kpi_item_distributed(quantity_distributed DESC);
+
+-- ============================================================================
+-- TRIGGERS for Dashboard KPI Maintenance
+-- Each item contributes (is_active * value) so activation, deactivation and
+-- value changes are handled by subtracting OLD and adding NEW. An item
+-- without a reorder threshold (NULL) is never low on stock.
+-- ============================================================================
+CREATE TRIGGER IF NOT EXISTS kpi_item_insert
+AFTER INSERT ON inventory_items
+BEGIN
+    UPDATE dashboard_kpi SET
+        total_items = total_items + (NEW.is_active != 0),
+        low_stock_count = low_stock_count
+            + IFNULL(NEW.is_active != 0 AND NEW.quantity_on_hand < NEW.reorder_threshold, 0),
+        total_value_cents = total_value_cents
+            + (NEW.is_active != 0) * COALESCE(NEW.total_cost_basis_cents, 0)
+    WHERE id = 1;
+
+    INSERT INTO kpi_category_value (category_id, value_cents)
+    SELECT NEW.category_id, (NEW.is_active != 0) * COALESCE(NEW.total_cost_basis_cents, 0)
+    WHERE NEW.category_id IS NOT NULL
+    ON CONFLICT(category_id) DO UPDATE SET value_cents = value_cents + excluded.value_cents;
+END;
+
+CREATE TRIGGER IF NOT EXISTS kpi_item_update
+AFTER UPDATE OF quantity_on_hand, reorder_threshold, total_cost_basis_cents,
+                is_active, category_id ON inventory_items
+BEGIN
+    UPDATE dashboard_kpi SET
+        total_items = total_items - (OLD.is_active != 0) + (NEW.is_active != 0),
+        low_stock_count = low_stock_count
+            - IFNULL(OLD.is_active != 0 AND OLD.quantity_on_hand < OLD.reorder_threshold, 0)
+            + IFNULL(NEW.is_active != 0 AND NEW.quantity_on_hand < NEW.reorder_threshold, 0),
+        total_value_cents = total_value_cents
+            - (OLD.is_active != 0) * COALESCE(OLD.total_cost_basis_cents, 0)
+            + (NEW.is_active != 0) * COALESCE(NEW.total_cost_basis_cents, 0)
+    WHERE id = 1;
+
+    UPDATE kpi_category_value
+    SET value_cents = value_cents - (OLD.is_active != 0) * COALESCE(OLD.total_cost_basis_cents, 0)
+    WHERE category_id = OLD.category_id;
+
+    INSERT INTO kpi_category_value (category_id, value_cents)
+    SELECT NEW.category_id, (NEW.is_active != 0) * COALESCE(NEW.total_cost_basis_cents, 0)
+    WHERE NEW.category_id IS NOT NULL
+    ON CONFLICT(category_id) DO UPDATE SET value_cents = value_cents + excluded.value_cents;
+END;
+
+CREATE TRIGGER IF NOT EXISTS kpi_item_delete
+AFTER DELETE ON inventory_items
+BEGIN
+    UPDATE dashboard_kpi SET
+        total_items = total_items - (OLD.is_active != 0),
+        low_stock_count = low_stock_count
+            - IFNULL(OLD.is_active != 0 AND OLD.quantity_on_hand < OLD.reorder_threshold, 0),
+        total_value_cents = total_value_cents
+            - (OLD.is_active != 0) * COALESCE(OLD.total_cost_basis_cents, 0)
+    WHERE id = 1;
+
+    UPDATE kpi_category_value
+    SET value_cents = value_cents - (OLD.is_active != 0) * COALESCE(OLD.total_cost_basis_cents, 0)
+    WHERE category_id = OLD.category_id;
+
+    DELETE FROM kpi_item_distributed WHERE item_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS kpi_distribution_insert
+AFTER INSERT ON inventory_transactions
+WHEN NEW.transaction_type = 'DISTRIBUTION' AND NEW.is_voided = 0
+BEGIN
+    INSERT INTO kpi_item_distributed (item_id, quantity_distributed)
+    VALUES (NEW.item_id, -NEW.quantity_change)
+    ON CONFLICT(item_id) DO UPDATE
+        SET quantity_distributed = quantity_distributed + excluded.quantity_distributed;
+END;
+
+-- Voiding (or un-voiding) a distribution removes (or restores) its quantity
+CREATE TRIGGER IF NOT EXISTS kpi_distribution_void
+AFTER UPDATE OF is_voided ON inventory_transactions
+WHEN NEW.transaction_type = 'DISTRIBUTION' AND OLD.is_voided != NEW.is_voided
+BEGIN
+    INSERT INTO kpi_item_distributed (item_id, quantity_distributed)
+    VALUES (NEW.item_id, CASE WHEN NEW.is_voided != 0 THEN NEW.quantity_change
+                              ELSE -NEW.quantity_change END)
+    ON CONFLICT(item_id) DO UPDATE
+        SET quantity_distributed = quantity_distributed + excluded.quantity_distributed;
+END;
+
+CREATE TRIGGER IF NOT EXISTS kpi_distribution_delete
+AFTER DELETE ON inventory_transactions
+WHEN OLD.transaction_type = 'DISTRIBUTION' AND OLD.is_voided = 0
+BEGIN
+    UPDATE kpi_item_distributed
+    SET quantity_distributed = quantity_distributed + OLD.quantity_change
+    WHERE item_id = OLD.item_id;
+END;
+
+-- ============================================================================
+-- TABLE: category_closure
+-- Purpose: Every (ancestor, descendant) pair in the category hierarchy,
+--          including each category paired with itself at depth 0.
+-- Note: Maintained by the triggers below, so subtree rollups are a single
+--       indexed join instead of a recursive walk.
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS category_closure (
+    ancestor_id INTEGER NOT NULL,
+    descendant_id INTEGER NOT NULL,
+    depth INTEGER NOT NULL,  -- 0 = self, 1 = child, 2 = grandchild, ...
+    PRIMARY KEY (ancestor_id, descendant_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_category_closure_descendant
+    ON category_closure(descendant_id, ancestor_id, depth);
+
+CREATE TRIGGER IF NOT EXISTS category_closure_insert
+AFTER INSERT ON item_categories
+BEGIN
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    VALUES (NEW.id, NEW.id, 0);
+
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    SELECT ancestor_id, NEW.id, depth + 1
+    FROM category_closure
+    WHERE descendant_id = NEW.parent_id;
+END;
+
+-- A category cannot be moved under itself or one of its descendants
+CREATE TRIGGER IF NOT EXISTS category_closure_no_cycles
+BEFORE UPDATE OF parent_id ON item_categories
+WHEN NEW.parent_id IS NOT NULL AND EXISTS (
+    SELECT 1 FROM category_closure
+    WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_id
+)
+BEGIN
+    SELECT RAISE(ABORT, 'Category cannot be moved under its own subcategory');
+END;
+
+-- Moving a category moves its whole subtree: drop the paths from the old
+-- ancestors into the subtree, then link the new ancestors to every node in it
+CREATE TRIGGER IF NOT EXISTS category_closure_move
+AFTER UPDATE OF parent_id ON item_categories
+WHEN OLD.parent_id IS NOT NEW.parent_id
+BEGIN
+    DELETE FROM category_closure
+    WHERE descendant_id IN (
+        SELECT descendant_id FROM category_closure WHERE ancestor_id = NEW.id
+    )
+    AND ancestor_id IN (
+        SELECT ancestor_id FROM category_closure
+        WHERE descendant_id = NEW.id AND ancestor_id != NEW.id
+    );
+
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    SELECT above.ancestor_id, below.descendant_id, above.depth + below.depth + 1
+    FROM category_closure above, category_closure below
+    WHERE above.descendant_id = NEW.parent_id
+      AND below.ancestor_id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS category_closure_delete
+AFTER DELETE ON item_categories
+BEGIN
+    DELETE FROM category_closure
+    WHERE descendant_id = OLD.id OR ancestor_id = OLD.id;
+END;
+
+-- ============================================================================
+-- TABLE: donors
+-- Purpose: Donor dimension. One row per distinct normalized donor name;
+--          transactions keep the name as entered and point here via donor_id.
+-- Note: normalized_key ignores case, whitespace and punctuation. Rows merged
+--       as duplicates keep their key and point at the surviving donor.
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS donors (
+    id INTEGER PRIMARY KEY,  -- No AUTOINCREMENT: ignored inserts must not use up IDs
+    name TEXT NOT NULL,  -- Display name (first spelling seen)
+    normalized_key TEXT NOT NULL UNIQUE,
+    merged_into_id INTEGER,  -- Surviving donor after a merge
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (merged_into_id) REFERENCES donors(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_trans_donor ON inventory_transactions(donor_id);
+
+-- Link new donations to their donor, creating it on first sight.
+-- The key expression is generated by migrations.name_key_sql().
+CREATE TRIGGER IF NOT EXISTS donors_link_transaction
+AFTER INSERT ON inventory_transactions
+WHEN NEW.donor_id IS NULL AND NEW.donor IS NOT NULL AND TRIM(NEW.donor) != ''
+BEGIN
+    INSERT OR IGNORE INTO donors (name, normalized_key)
+    VALUES (TRIM(NEW.donor), TRIM(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(LOWER(TRIM(NEW.donor)), '.', ''), '''', ''), '’', ''), '"', ''), ',', ' '), '-', ' '), '/', ' '), '&', ' '), '(', ' '), ')', ' '), '  ', ' '), '  ', ' '), '  ', ' ')));
+
+    UPDATE inventory_transactions
+    SET donor_id = (
+        SELECT COALESCE(merged_into_id, id) FROM donors
+        WHERE normalized_key = TRIM(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(LOWER(TRIM(NEW.donor)), '.', ''), '''', ''), '’', ''), '"', ''), ',', ' '), '-', ' '), '/', ' '), '&', ' '), '(', ' '), ')', ' '), '  ', ' '), '  ', ' '), '  ', ' '))
+    )
+    WHERE id = NEW.id;
+END;
+
+-- ============================================================================
+-- TABLES: Suppliers
+-- Purpose: Supplier dimension plus per-supplier purchase aggregates for the
+--          suppliers report, kept current by triggers so the report reads a
+--          small table instead of scanning every purchase.
+-- Note: Voided purchases are excluded. Notes are stored once per distinct
+--       text with a count of the purchases carrying them.
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS suppliers (
+    id INTEGER PRIMARY KEY,  -- No AUTOINCREMENT: ignored inserts must not use up IDs
+    name TEXT NOT NULL,  -- Display name (first spelling seen)
+    normalized_key TEXT NOT NULL UNIQUE,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS kpi_supplier_totals (
+    supplier_id INTEGER PRIMARY KEY,
+    purchase_count INTEGER NOT NULL DEFAULT 0,
+    total_quantity REAL NOT NULL DEFAULT 0,
+    total_cost_cents REAL NOT NULL DEFAULT 0,
+    first_purchase DATETIME,
+    last_purchase DATETIME,
+    FOREIGN KEY (supplier_id) REFERENCES suppliers(id)
+);
+
+CREATE TABLE IF NOT EXISTS kpi_supplier_notes (
+    supplier_id INTEGER NOT NULL,
+    note TEXT NOT NULL,
+    purchase_count INTEGER NOT NULL DEFAULT 0,
+    first_transaction_id INTEGER NOT NULL,  -- Keeps notes in entry order
+    PRIMARY KEY (supplier_id, note),
+    FOREIGN KEY (supplier_id) REFERENCES suppliers(id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_trans_supplier
+    ON inventory_transactions(supplier_id, transaction_date);
+
+-- Link new transactions to their supplier, creating it on first sight.
+-- The key expression is generated by migrations.name_key_sql().
+CREATE TRIGGER IF NOT EXISTS suppliers_link_transaction
+AFTER INSERT ON inventory_transactions
+WHEN NEW.supplier_id IS NULL AND NEW.supplier IS NOT NULL AND TRIM(NEW.supplier) != ''
+BEGIN
+    INSERT OR IGNORE INTO suppliers (name, normalized_key)
+    VALUES (TRIM(NEW.supplier), TRIM(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(LOWER(TRIM(NEW.supplier)), '.', ''), '''', ''), '’', ''), '"', ''), ',', ' '), '-', ' '), '/', ' '), '&', ' '), '(', ' '), ')', ' '), '  ', ' '), '  ', ' '), '  ', ' ')));
+
+    UPDATE inventory_transactions
+    SET supplier_id = (
+        SELECT id FROM suppliers
+        WHERE normalized_key = TRIM(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(LOWER(TRIM(NEW.supplier)), '.', ''), '''', ''), '’', ''), '"', ''), ',', ' '), '-', ' '), '/', ' '), '&', ' '), '(', ' '), ')', ' '), '  ', ' '), '  ', ' '), '  ', ' '))
+    )
+    WHERE id = NEW.id;
+END;
+
+-- Inserting into this view adds (sign = 1) or removes (sign = -1) one
+-- purchase from its supplier's aggregates; the triggers below share it
+CREATE VIEW IF NOT EXISTS supplier_purchase_delta AS
+SELECT NULL AS supplier_id, NULL AS sign, NULL AS transaction_id,
+       NULL AS quantity, NULL AS cost_cents, NULL AS transaction_date, NULL AS note
+WHERE 0;
+
+CREATE TRIGGER IF NOT EXISTS supplier_purchase_delta_apply
+INSTEAD OF INSERT ON supplier_purchase_delta
+BEGIN
+    INSERT INTO kpi_supplier_totals (supplier_id, purchase_count, total_quantity,
+                                     total_cost_cents, first_purchase, last_purchase)
+    VALUES (NEW.supplier_id, NEW.sign, NEW.sign * NEW.quantity, NEW.sign * NEW.cost_cents,
+            NEW.transaction_date, NEW.transaction_date)
+    ON CONFLICT(supplier_id) DO UPDATE SET
+        purchase_count = purchase_count + excluded.purchase_count,
+        total_quantity = total_quantity + excluded.total_quantity,
+        total_cost_cents = total_cost_cents + excluded.total_cost_cents,
+        first_purchase = MIN(IFNULL(first_purchase, excluded.first_purchase),
+                             IFNULL(excluded.first_purchase, first_purchase)),
+        last_purchase = MAX(IFNULL(last_purchase, excluded.last_purchase),
+                            IFNULL(excluded.last_purchase, last_purchase));
+
+    -- A removed purchase may have been the first or last one
+    UPDATE kpi_supplier_totals SET
+        first_purchase = (
+            SELECT MIN(transaction_date) FROM inventory_transactions
+            WHERE supplier_id = NEW.supplier_id
+              AND transaction_type = 'PURCHASE' AND is_voided = 0
+        ),
+        last_purchase = (
+            SELECT MAX(transaction_date) FROM inventory_transactions
+            WHERE supplier_id = NEW.supplier_id
+              AND transaction_type = 'PURCHASE' AND is_voided = 0
+        )
+    WHERE supplier_id = NEW.supplier_id AND NEW.sign < 0;
+
+    DELETE FROM kpi_supplier_totals
+    WHERE supplier_id = NEW.supplier_id AND purchase_count <= 0;
+
+    INSERT INTO kpi_supplier_notes (supplier_id, note, purchase_count, first_transaction_id)
+    SELECT NEW.supplier_id, TRIM(NEW.note), NEW.sign, NEW.transaction_id
+    WHERE NEW.note IS NOT NULL AND TRIM(NEW.note) != '' AND LOWER(TRIM(NEW.note)) != 'none'
+    ON CONFLICT(supplier_id, note) DO UPDATE SET
+        purchase_count = purchase_count + excluded.purchase_count,
+        first_transaction_id = MIN(first_transaction_id, excluded.first_transaction_id);
+
+    DELETE FROM kpi_supplier_notes
+    WHERE supplier_id = NEW.supplier_id AND purchase_count <= 0;
+END;
+
+-- Purchases inserted with a supplier_id already set
+CREATE TRIGGER IF NOT EXISTS kpi_supplier_purchase_insert
+AFTER INSERT ON inventory_transactions
+WHEN NEW.transaction_type = 'PURCHASE' AND NEW.is_voided = 0 AND NEW.supplier_id IS NOT NULL
+BEGIN
+    INSERT INTO supplier_purchase_delta
+    VALUES (NEW.supplier_id, 1, NEW.id, NEW.quantity_change,
+            NEW.quantity_change * NEW.unit_cost_cents, NEW.transaction_date, NEW.notes);
+END;
+
+-- Linking (or re-linking) a purchase moves it between suppliers
+CREATE TRIGGER IF NOT EXISTS kpi_supplier_purchase_relink
+AFTER UPDATE OF supplier_id ON inventory_transactions
+WHEN NEW.transaction_type = 'PURCHASE' AND NEW.is_voided = 0
+     AND OLD.supplier_id IS NOT NEW.supplier_id
+BEGIN
+    INSERT INTO supplier_purchase_delta
+    SELECT OLD.supplier_id, -1, OLD.id, OLD.quantity_change,
+           OLD.quantity_change * OLD.unit_cost_cents, OLD.transaction_date, OLD.notes
+    WHERE OLD.supplier_id IS NOT NULL;
+
+    INSERT INTO supplier_purchase_delta
+    SELECT NEW.supplier_id, 1, NEW.id, NEW.quantity_change,
+           NEW.quantity_change * NEW.unit_cost_cents, NEW.transaction_date, NEW.notes
+    WHERE NEW.supplier_id IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS kpi_supplier_purchase_void
+AFTER UPDATE OF is_voided ON inventory_transactions
+WHEN NEW.transaction_type = 'PURCHASE' AND NEW.supplier_id IS NOT NULL
+     AND OLD.is_voided != NEW.is_voided
+BEGIN
+    INSERT INTO supplier_purchase_delta
+    VALUES (NEW.supplier_id, CASE WHEN NEW.is_voided THEN -1 ELSE 1 END, NEW.id,
+            NEW.quantity_change, NEW.quantity_change * NEW.unit_cost_cents,
+            NEW.transaction_date, NEW.notes);
+END;
+
+CREATE TRIGGER IF NOT EXISTS kpi_supplier_purchase_delete
+AFTER DELETE ON inventory_transactions
+WHEN OLD.transaction_type = 'PURCHASE' AND OLD.is_voided = 0 AND OLD.supplier_id IS NOT NULL
+BEGIN
+    INSERT INTO supplier_purchase_delta
+    VALUES (OLD.supplier_id, -1, OLD.id, OLD.quantity_change,
+            OLD.quantity_change * OLD.unit_cost_cents, OLD.transaction_date, OLD.notes);
+END;
+
+-- ============================================================================
+-- TABLE: intake_sessions
+-- Purpose: Rapid-scan intake sessions (services.intake_session). Every group
+--          commit stores the last journal sequence number it contains in
+--          the same transaction, so after a crash exactly the scans that did
+--          not reach the database are replayed from the session's journal.
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS intake_sessions (
+    id TEXT PRIMARY KEY,  -- Also the journal file name
+    transaction_type TEXT NOT NULL CHECK(transaction_type IN ('PURCHASE', 'DONATION')),
+    source TEXT,  -- Donor or supplier of the whole session
+    committed_seq INTEGER NOT NULL DEFAULT 0,
+    started_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    closed_at DATETIME
+);
+
+-- ============================================================================
+-- TABLES: client_visits, client_visit_lines
+-- Purpose: Distributions handed out together in one client visit
+--          (InventoryService.process_distribution_basket). The lines are a
+--          side table rather than a ledger column, so the ledger layouts
+--          (compact view, archive) are unaffected; transaction_id has no
+--          foreign key because inventory_transactions may be a view.
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS client_visits (
+    id TEXT PRIMARY KEY,
+    reason_code TEXT,
+    notes TEXT,
+    visit_date DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS client_visit_lines (
+    transaction_id INTEGER PRIMARY KEY,  -- inventory_transactions.id
+    visit_id TEXT NOT NULL REFERENCES client_visits(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_visit_lines_visit ON client_visit_lines(visit_id);
+
+-- ============================================================================
+-- TABLES: stock_takes, stock_take_counts
+-- Purpose: Physical counts (services.stock_take_service). Counts are loaded
+--          per item, compared with quantity_on_hand and posted as one batch of
+--          CORRECTION transactions; the system quantity at posting time and
+--          the correction's id are kept with each count for the audit trail.
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS stock_takes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    notes TEXT,
+    started_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    posted_at DATETIME
+);
+
+CREATE TABLE IF NOT EXISTS stock_take_counts (
+    stock_take_id INTEGER NOT NULL REFERENCES stock_takes(id),
+    item_id INTEGER NOT NULL REFERENCES inventory_items(id),
+    counted_quantity REAL NOT NULL CHECK(counted_quantity >= 0),
+    system_quantity REAL,  -- quantity_on_hand when posted
+    transaction_id INTEGER,  -- CORRECTION posted for the variance (NULL: none)
+    PRIMARY KEY (stock_take_id, item_id)
+) WITHOUT ROWID;
+
+-- ============================================================================
+-- TABLES: change_log, change_consumers
+-- Purpose: Change data capture for incremental exports
+--          (services.change_feed_service). While at least one consumer is
+--          registered, the triggers below append the id of every inserted,
+--          updated or deleted item and transaction to change_log. A
+--          consumer's watermark is the last seq it has exported; entries all
+--          consumers have passed are pruned. On the compact ledger layout the
+--          transaction triggers are on ledger_entries instead
+--          (compact_ledger.LEDGER_CHANGE_LOG_SQL).
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS change_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,  -- 'inventory_items' or 'inventory_transactions'
+    row_id INTEGER NOT NULL,
+    op TEXT NOT NULL CHECK(op IN ('I', 'U', 'D')),
+    changed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS change_consumers (
+    name TEXT PRIMARY KEY,
+    watermark INTEGER,  -- Last seq exported; NULL until the first snapshot is acknowledged
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TRIGGER IF NOT EXISTS change_log_item_insert
+AFTER INSERT ON inventory_items
+WHEN EXISTS (SELECT 1 FROM change_consumers)
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op) VALUES ('inventory_items', NEW.id, 'I');
+END;
+
+-- updated_at is left out so update_item_timestamp does not log every update twice
+CREATE TRIGGER IF NOT EXISTS change_log_item_update
+AFTER UPDATE OF sku, name, category_id, quantity_on_hand, reorder_threshold,
+                total_cost_basis_cents, is_active ON inventory_items
+WHEN EXISTS (SELECT 1 FROM change_consumers)
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op) VALUES ('inventory_items', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS change_log_item_delete
+AFTER DELETE ON inventory_items
+WHEN EXISTS (SELECT 1 FROM change_consumers)
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op) VALUES ('inventory_items', OLD.id, 'D');
+END;
+
+CREATE TRIGGER IF NOT EXISTS change_log_transaction_insert
+AFTER INSERT ON inventory_transactions
+WHEN EXISTS (SELECT 1 FROM change_consumers)
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op)
+    VALUES ('inventory_transactions', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS change_log_transaction_update
+AFTER UPDATE ON inventory_transactions
+WHEN EXISTS (SELECT 1 FROM change_consumers)
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op)
+    VALUES ('inventory_transactions', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS change_log_transaction_delete
+AFTER DELETE ON inventory_transactions
+WHEN EXISTS (SELECT 1 FROM change_consumers)
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op)
+    VALUES ('inventory_transactions', OLD.id, 'D');
+END;
+
+-- ============================================================================
+-- TABLES: closed_periods, period_cogs, period_donations, period_purchases,
+--         period_balances
+-- Purpose: Month-end close (services.period_close_service). Closing a month
+--          stores its totals, which reports on closed months read instead of
+--          summing the ledger, and the triggers below reject transactions
+--          dated in a closed month and changes to their amounts, dates or
+--          void status until it is reopened. Notes and supplier/donor links
+--          (donor merges) stay editable. On the compact ledger layout the
+--          triggers are on ledger_entries (compact_ledger.LEDGER_PERIOD_LOCK_SQL).
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS closed_periods (
+    period TEXT PRIMARY KEY,  -- 'YYYY-MM'
+    notes TEXT,
+    closed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Non-voided distributions by reason code ('' when none)
+CREATE TABLE IF NOT EXISTS period_cogs (
+    period TEXT NOT NULL REFERENCES closed_periods(period),
+    reason_code TEXT NOT NULL,
+    distribution_count INTEGER NOT NULL,
+    quantity REAL NOT NULL,
+    cogs_cents INTEGER NOT NULL,
+    PRIMARY KEY (period, reason_code)
+) WITHOUT ROWID;
+
+-- Non-voided donations by donor name ('' for anonymous)
+CREATE TABLE IF NOT EXISTS period_donations (
+    period TEXT NOT NULL REFERENCES closed_periods(period),
+    donor TEXT NOT NULL,
+    donor_id INTEGER,
+    donation_count INTEGER NOT NULL,
+    quantity REAL NOT NULL,
+    fmv_cents INTEGER NOT NULL,
+    PRIMARY KEY (period, donor)
+) WITHOUT ROWID;
+
+-- Non-voided purchases by supplier name ('' when none)
+CREATE TABLE IF NOT EXISTS period_purchases (
+    period TEXT NOT NULL REFERENCES closed_periods(period),
+    supplier TEXT NOT NULL,
+    supplier_id INTEGER,
+    purchase_count INTEGER NOT NULL,
+    quantity REAL NOT NULL,
+    cost_cents INTEGER NOT NULL,
+    PRIMARY KEY (period, supplier)
+) WITHOUT ROWID;
+
+-- Quantity and cost basis of each item at the end of the month (items with
+-- neither are left out)
+CREATE TABLE IF NOT EXISTS period_balances (
+    period TEXT NOT NULL REFERENCES closed_periods(period),
+    item_id INTEGER NOT NULL,
+    quantity_on_hand REAL NOT NULL,
+    total_cost_basis_cents INTEGER NOT NULL,
+    PRIMARY KEY (period, item_id)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS period_lock_insert
+BEFORE INSERT ON inventory_transactions
+WHEN strftime('%Y-%m', NEW.transaction_date) IN (SELECT period FROM closed_periods)
+BEGIN
+    SELECT RAISE(ABORT, 'Transaction date is in a closed period');
+END;
+
+CREATE TRIGGER IF NOT EXISTS period_lock_update
+BEFORE UPDATE ON inventory_transactions
+WHEN (strftime('%Y-%m', OLD.transaction_date) IN (SELECT period FROM closed_periods)
+      OR strftime('%Y-%m', NEW.transaction_date) IN (SELECT period FROM closed_periods))
+  AND (NEW.item_id IS NOT OLD.item_id
+       OR NEW.transaction_type IS NOT OLD.transaction_type
+       OR NEW.quantity_change IS NOT OLD.quantity_change
+       OR NEW.unit_cost_cents IS NOT OLD.unit_cost_cents
+       OR NEW.fair_market_value_cents IS NOT OLD.fair_market_value_cents
+       OR NEW.total_financial_impact_cents IS NOT OLD.total_financial_impact_cents
+       OR NEW.reason_code IS NOT OLD.reason_code
+       OR NEW.transaction_date IS NOT OLD.transaction_date
+       OR NEW.is_voided IS NOT OLD.is_voided)
+BEGIN
+    SELECT RAISE(ABORT, 'Transaction is in a closed period');
+END;
+
 -- ============================================================================
 -- SEED DATA: Default Categories
 -- ============================================================================
@@ -49,13 +49,14 @@ def seed_training_data(target_db_path):
         
         # 2. Copy Items
         logger.info("Copying items...")
-        cursor_source.execute("SELECT * FROM inventory_items")
+        # Explicit columns: the generated ones (is_low_stock, ...) cannot be inserted
+        cursor_source.execute("""
+            SELECT id, sku, name, category_id, quantity_on_hand, reorder_threshold,
+                   total_cost_basis_cents, is_active, created_at, updated_at
+            FROM inventory_items
+        """)
         items = cursor_source.fetchall()
         
-        # Get column names to map correctly if needed, but assuming schema match
-        # schema for items: id, sku, name, category_id, quantity_on_hand, reorder_threshold, 
-        # total_cost_basis_cents, is_active, created_at, updated_at
-        
         if not items:
             logger.info("No items found in production database.")
         
@@ -73,7 +74,7 @@ def seed_training_data(target_db_path):
         now = datetime.now()
         
         for item in items:
-            # item structure matches SELECT * order. 
+            # item structure matches the SELECT order above
             # id=0, sku=1, name=2... quantity_on_hand=4, total_cost_basis=6
             item_id = item[0]
             qty = item[4]
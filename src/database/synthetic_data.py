@@ -0,0 +1,420 @@
+"""
+Synthetic data generator for AIOps Studio - Inventory.
+
+Builds production-scale databases for load and performance testing
+(100k items / 10M transactions and beyond). The ledger is what the
+application itself would have written:
+
+- Activity spans several years with seasonal patterns (holiday peaks for
+  donations and distributions, quiet weekends) and year-over-year growth
+- Item popularity, donors and suppliers follow skewed (Zipf-like) weights
+- Distributions never exceed stock; items that run out are restocked
+- A share of transactions is voided with a CORRECTION row, as
+  InventoryService.void_transaction() does
+- Item quantities and cost bases follow the service's weighted-average
+  arithmetic exactly, so item state matches a replay of the ledger
+
+The output only depends on the configuration (including its seed and end
+date). Rows are written with executemany in large transactions with the
+ledger's indexes and triggers dropped; they are recreated afterwards and
+the trigger-maintained aggregates rebuilt (database.migrations).
+"""
+
+import os
+import random
+import sqlite3
+import time
+from bisect import bisect
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Callable, Dict, List, Optional
+
+from database.migrations import (
+    name_key_sql, rebuild_dashboard_kpis, rebuild_supplier_totals
+)
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema.sql")
+
+# Relative activity per month (Jan..Dec) and weekday (Mon..Sun)
+DISTRIBUTION_SEASON = (1.00, 0.92, 0.97, 0.98, 1.00, 1.10, 1.18, 1.12, 1.02, 1.05, 1.25, 1.38)
+DONATION_SEASON = (0.75, 0.65, 0.75, 0.85, 0.90, 0.80, 0.80, 0.90, 1.00, 1.15, 1.70, 2.00)
+WEEKDAY_ACTIVITY = (1.00, 1.05, 1.15, 1.05, 1.20, 0.55, 0.08)
+
+# Base transaction mix before seasonal weighting
+DISTRIBUTION_SHARE = 0.62
+DONATION_SHARE = 0.24
+PURCHASE_SHARE = 0.14
+
+REASON_WEIGHTS = (('CLIENT', 0.90), ('SPOILAGE', 0.07), ('INTERNAL', 0.03))
+PURCHASE_NOTES = (None, None, None, None, None, None, 'Net 30', 'Bulk order', 'Pallet delivery')
+VOID_REASONS = ('Entered twice', 'Wrong item', 'Wrong quantity', 'Returned')
+
+# Leaf categories seeded by schema.sql, with an item-name vocabulary each
+CATEGORY_WORDS = {
+    3: ('Canned', ('Corn', 'Green Beans', 'Tomatoes', 'Tuna', 'Chicken Soup', 'Peaches',
+                   'Chili', 'Carrots', 'Pears', 'Salmon')),
+    4: ('Dry', ('Rice', 'Pasta', 'Oatmeal', 'Cereal', 'Black Beans', 'Lentils', 'Flour',
+                'Peanut Butter', 'Crackers', 'Sugar')),
+    5: ('Fresh', ('Apples', 'Potatoes', 'Onions', 'Bananas', 'Carrots', 'Cabbage',
+                  'Oranges', 'Squash', 'Lettuce', 'Tomatoes')),
+    6: ('Frozen', ('Chicken', 'Vegetables', 'Ground Beef', 'Fish Fillets', 'Berries',
+                   'Pizza', 'Turkey', 'Waffles', 'Peas', 'Corn')),
+    7: ('Hygiene', ('Toothpaste', 'Soap', 'Shampoo', 'Deodorant', 'Razors', 'Diapers',
+                    'Wipes', 'Toothbrushes', 'Lotion', 'Feminine Care')),
+    8: ('Cleaning', ('Dish Soap', 'Laundry Detergent', 'Bleach', 'Sponges',
+                     'All-Purpose Cleaner', 'Trash Bags', 'Gloves', 'Mops',
+                     'Disinfectant', 'Scrubbers')),
+    9: ('Paper', ('Toilet Paper', 'Paper Towels', 'Napkins', 'Tissues', 'Plates',
+                  'Cups', 'Bags', 'Foil', 'Wrap', 'Filters')),
+}
+SIZES = ('8oz', '12oz', '16oz', '1lb', '2lb', '5lb', 'Family Size', 'Case of 12', 'Single', 'Bulk')
+
+DONOR_FIRST = ('St. Mary', 'Grace', 'First Baptist', 'Riverside', 'Oak Street', 'Lincoln',
+               'Hillside', 'Valley', 'Maple', 'Union', 'Harbor', 'Cedar')
+DONOR_KIND = ('Church', 'Elementary School', 'Rotary Club', 'Community Garden', 'Grocery',
+              'Credit Union', 'Scout Troop', 'Family Foundation', 'Farmers Market', 'Lions Club')
+SUPPLIER_FIRST = ('Acme', 'Valley', 'Northern', 'Summit', 'Prairie', 'Coastal', 'Heartland',
+                  'Metro', 'Golden', 'Evergreen')
+SUPPLIER_KIND = ('Foods', 'Wholesale', 'Distributors', 'Farms', 'Provisions', 'Supply Co.',
+                 'Produce', 'Grocers')
+
+_TRANSACTION_SQL = """
+    INSERT INTO inventory_transactions
+        (id, item_id, transaction_type, quantity_change, unit_cost_cents,
+         fair_market_value_cents, total_financial_impact_cents, reason_code,
+         supplier, supplier_id, donor, donor_id, notes, transaction_date,
+         created_by, is_voided, ref_transaction_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+@dataclass
+class SyntheticDataConfig:
+    """Size and shape of a generated database."""
+
+    items: int = 1000
+    transactions: int = 100_000  # Approximate; void corrections come on top
+    years: int = 3
+    donors: int = 500
+    suppliers: int = 40
+    void_rate: float = 0.004
+    annual_growth: float = 0.08
+    seed: int = 42
+    end_date: Optional[date] = None  # Defaults to today
+    batch_size: int = 200_000
+
+    def validate(self):
+        """Raise ValueError if the configuration cannot be generated."""
+        if self.items < 1 or self.transactions < 0:
+            raise ValueError("Need at least one item and a non-negative transaction count")
+        if self.years < 1 or self.donors < 1 or self.suppliers < 1:
+            raise ValueError("Years, donors and suppliers must be at least 1")
+        if not 0 <= self.void_rate < 1:
+            raise ValueError("Void rate must be between 0 and 1")
+        if self.batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+
+
+def _zipf_cum_weights(rng: random.Random, count: int, exponent: float) -> List[float]:
+    """Cumulative Zipf-like weights over count entries, in shuffled rank order."""
+    ranks = list(range(1, count + 1))
+    rng.shuffle(ranks)
+    return list(accumulate(1.0 / rank ** exponent for rank in ranks))
+
+
+def _daily_counts(config: SyntheticDataConfig, days: List[date]) -> List[int]:
+    """Split the transaction count over days by season, weekday and growth."""
+    weights = []
+    for n, day in enumerate(days):
+        season = (DISTRIBUTION_SHARE * DISTRIBUTION_SEASON[day.month - 1]
+                  + DONATION_SHARE * DONATION_SEASON[day.month - 1]
+                  + PURCHASE_SHARE)
+        growth = (1 + config.annual_growth) ** (n / 365.0)
+        weights.append(season * WEEKDAY_ACTIVITY[day.weekday()] * growth)
+
+    # Largest-remainder rounding keeps the total exact
+    total = sum(weights)
+    exact = [config.transactions * w / total for w in weights]
+    counts = [int(x) for x in exact]
+    short = config.transactions - sum(counts)
+    for index in sorted(range(len(days)), key=lambda i: counts[i] - exact[i])[:short]:
+        counts[index] += 1
+    return counts
+
+
+class _LedgerWriter:
+    """Simulates the pantry day by day and streams ledger rows to SQLite."""
+
+    def __init__(self, conn, config: SyntheticDataConfig, rng: random.Random,
+                 progress: Optional[Callable[[int, int], None]]):
+        self.conn = conn
+        self.config = config
+        self.rng = rng
+        self.progress = progress
+        self.rows: List[tuple] = []
+        self.next_id = 1
+        self.written = 0
+        self.voided = 0
+
+    def add(self, row: tuple):
+        self.rows.append(row)
+        self.next_id += 1
+        if len(self.rows) >= self.config.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        with self.conn:
+            self.conn.executemany(_TRANSACTION_SQL, self.rows)
+        self.written += len(self.rows)
+        self.rows = []
+        if self.progress:
+            self.progress(self.written, self.config.transactions)
+
+
+def generate_database(
+    db_path: str,
+    config: Optional[SyntheticDataConfig] = None,
+    overwrite: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Dict:
+    """
+    Create a database filled with synthetic, internally consistent data.
+
+    Args:
+        db_path: Path of the database file to create
+        config: Size and shape (defaults to SyntheticDataConfig())
+        overwrite: Replace an existing file instead of raising
+        progress: Called with (rows written, target transactions) per batch
+
+    Returns:
+        Dict with items, transactions (rows incl. corrections), voided,
+        donors, suppliers, start_date, end_date, seconds and size_bytes
+
+    Raises:
+        FileExistsError: If db_path exists and overwrite is False
+        ValueError: If the configuration is invalid
+    """
+    config = config or SyntheticDataConfig()
+    config.validate()
+    if os.path.exists(db_path):
+        if not overwrite:
+            raise FileExistsError(f"Database already exists: {db_path}")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+    started = time.perf_counter()
+    rng = random.Random(config.seed)
+    end_date = config.end_date or date.today()
+    days = [end_date - timedelta(days=n) for n in range(config.years * 365 - 1, -1, -1)]
+
+    conn = sqlite3.connect(db_path)
+    try:
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        # Bulk-load settings: the file is new, so a crash only loses test data
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA cache_size = -262144")
+        conn.execute("PRAGMA temp_store = MEMORY")
+
+        # Indexes are cheaper to build once after loading, and the
+        # trigger-maintained aggregates are rebuilt in one pass at the end
+        deferred = conn.execute("""
+            SELECT type, name, sql FROM sqlite_master
+            WHERE type IN ('index', 'trigger') AND sql IS NOT NULL
+              AND tbl_name IN ('inventory_items', 'inventory_transactions')
+        """).fetchall()
+        for kind, name, _sql in deferred:
+            conn.execute(f"DROP {kind.upper()} {name}")
+
+        items = _insert_items(conn, config, rng)
+        donors = _insert_dimension(conn, 'donors', _names(rng, config.donors, DONOR_FIRST,
+                                                          DONOR_KIND))
+        suppliers = _insert_dimension(conn, 'suppliers', _names(rng, config.suppliers,
+                                                                SUPPLIER_FIRST, SUPPLIER_KIND))
+
+        writer = _LedgerWriter(conn, config, rng, progress)
+        state = _simulate(writer, config, rng, days, items, donors, suppliers)
+        writer.flush()
+
+        with conn:
+            conn.executemany(
+                "UPDATE inventory_items SET quantity_on_hand = ?, total_cost_basis_cents = ? "
+                "WHERE id = ?",
+                ((qty, basis, item_id) for item_id, (qty, basis) in state.items()))
+        for _kind, _name, sql in deferred:
+            conn.execute(sql)
+        rebuild_dashboard_kpis(conn)
+        rebuild_supplier_totals(conn)
+        conn.commit()
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA journal_mode = WAL")
+    finally:
+        conn.close()
+
+    stats = {
+        'items': config.items,
+        'transactions': writer.written,
+        'voided': writer.voided,
+        'donors': config.donors,
+        'suppliers': config.suppliers,
+        'start_date': days[0],
+        'end_date': end_date,
+        'seconds': time.perf_counter() - started,
+        'size_bytes': os.path.getsize(db_path),
+    }
+    logger.info(f"Generated {stats['transactions']:,} transactions for {config.items:,} items "
+                f"in {stats['seconds']:.1f}s ({db_path})")
+    return stats
+
+
+def _names(rng: random.Random, count: int, first: tuple, kind: tuple) -> List[str]:
+    names = []
+    for n in range(count):
+        name = f"{first[n % len(first)]} {kind[(n // len(first)) % len(kind)]}"
+        cycle = n // (len(first) * len(kind))
+        names.append(f"{name} {cycle + 1}" if cycle else name)
+    rng.shuffle(names)
+    return names
+
+
+def _insert_dimension(conn, table: str, names: List[str]) -> List[tuple]:
+    """Insert donors or suppliers; returns (id, name) in insertion order."""
+    with conn:
+        conn.executemany(
+            f"INSERT INTO {table} (id, name, normalized_key) VALUES (?, ?, {name_key_sql('?')})",
+            ((n + 1, name, name) for n, name in enumerate(names)))
+    return [(n + 1, name) for n, name in enumerate(names)]
+
+
+def _insert_items(conn, config: SyntheticDataConfig, rng: random.Random) -> List[tuple]:
+    """Insert items; returns (id, base cost cents, reorder threshold)."""
+    categories = sorted(CATEGORY_WORDS)
+    rows, items = [], []
+    for n in range(config.items):
+        category = categories[n % len(categories)]
+        prefix, words = CATEGORY_WORDS[category]
+        word = words[(n // len(categories)) % len(words)]
+        size = SIZES[(n // (len(categories) * len(words))) % len(SIZES)]
+        threshold = rng.choice((5, 10, 10, 20, 25, 50))
+        base_cost = rng.randint(40, 1200)
+        rows.append((n + 1, f"SYN-{n + 1:06d}", f"{prefix} {word} {size} #{n + 1}",
+                     category, threshold))
+        items.append((n + 1, base_cost, threshold))
+    with conn:
+        conn.executemany("""
+            INSERT INTO inventory_items (id, sku, name, category_id, reorder_threshold)
+            VALUES (?, ?, ?, ?, ?)
+        """, rows)
+    return items
+
+
+def _simulate(writer: _LedgerWriter, config: SyntheticDataConfig, rng: random.Random,
+              days: List[date], items: List[tuple], donors: List[tuple],
+              suppliers: List[tuple]) -> Dict[int, List[int]]:
+    """
+    Generate the ledger day by day.
+
+    Returns item id -> [quantity_on_hand, total_cost_basis_cents]. The
+    arithmetic mirrors InventoryService / InventoryItem exactly.
+    """
+    item_ids = [item[0] for item in items]
+    base_cost = {item[0]: item[1] for item in items}
+    state = {item_id: [0, 0] for item_id in item_ids}
+    item_weights = _zipf_cum_weights(rng, len(item_ids), 0.9)
+    donor_weights = _zipf_cum_weights(rng, len(donors), 1.1)
+    supplier_weights = _zipf_cum_weights(rng, len(suppliers), 1.2)
+    reasons = [reason for reason, _ in REASON_WEIGHTS]
+    reason_weights = list(accumulate(weight for _, weight in REASON_WEIGHTS))
+    void_rate = config.void_rate
+    add = writer.add
+    random_ = rng.random
+
+    def purchase(item_id, when, qty):
+        supplier_id, supplier = suppliers[bisect(supplier_weights,
+                                                 random_() * supplier_weights[-1])]
+        unit_cost = max(1, round(base_cost[item_id] * rng.uniform(0.85, 1.15)))
+        item = state[item_id]
+        item[0] += qty
+        item[1] += int(qty * unit_cost)
+        return (writer.next_id, item_id, 'PURCHASE', qty, unit_cost, 0, 0, None,
+                supplier, supplier_id, None, None, rng.choice(PURCHASE_NOTES), when,
+                'system')
+
+    for day, count in zip(days, _daily_counts(config, days)):
+        if not count:
+            continue
+        month = day.month - 1
+        type_weights = list(accumulate((
+            DISTRIBUTION_SHARE * DISTRIBUTION_SEASON[month],
+            DONATION_SHARE * DONATION_SEASON[month],
+            PURCHASE_SHARE,
+        )))
+        holiday = month >= 10
+        opening = datetime(day.year, day.month, day.day, 9)
+        seconds = sorted(int(random_() * 28800) for _ in range(count))  # 9:00-17:00
+        picks = rng.choices(item_ids, cum_weights=item_weights, k=count)
+
+        for offset, item_id in zip(seconds, picks):
+            when = (opening + timedelta(seconds=offset)).isoformat()
+            kind = bisect(type_weights, random_() * type_weights[-1])
+            item = state[item_id]
+
+            if kind == 0 and item[0] >= 1:
+                qty = min(rng.randint(1, 12), item[0])
+                reason = reasons[bisect(reason_weights, random_() * reason_weights[-1])]
+                unit_cost = round(item[1] / item[0]) if item[0] > 0 else 0
+                cogs = round(qty * unit_cost)
+                item[0] -= qty
+                item[1] = max(0, item[1] - cogs)
+                row = (writer.next_id, item_id, 'DISTRIBUTION', -qty, unit_cost, 0, cogs,
+                       reason, None, None, None, None, None, when, 'system')
+            elif kind == 1:
+                qty = rng.randint(1, 60)
+                donor_id, donor = donors[bisect(donor_weights,
+                                                random_() * donor_weights[-1])]
+                fmv_cents = int(qty * base_cost[item_id] * 1.2)
+                item[0] += qty
+                notes = 'Holiday drive' if holiday and random_() < 0.3 else None
+                row = (writer.next_id, item_id, 'DONATION', qty, 0, fmv_cents, 0, None,
+                       None, None, donor, donor_id, notes, when, 'system')
+            else:
+                # Planned purchase, or a restock of an item that ran out
+                row = purchase(item_id, when, rng.randint(12, 240))
+
+            if void_rate and random_() < void_rate:
+                add(row + (1, None))
+                _void(writer, state, row, when, rng.choice(VOID_REASONS))
+            else:
+                add(row + (0, None))
+
+    return state
+
+
+def _void(writer: _LedgerWriter, state: Dict[int, List[int]], row: tuple,
+          when: str, reason: str):
+    """Append the CORRECTION row for a voided transaction, as the service does."""
+    tx_id, item_id, tx_type, qty, unit_cost = row[:5]
+    item = state[item_id]
+    if tx_type == 'PURCHASE':
+        item[0] -= qty
+        item[1] = max(0, item[1] - int(qty * unit_cost))
+        correction = -qty
+    elif tx_type == 'DONATION':
+        item[0] -= qty
+        correction = -qty
+    else:
+        item[0] += -qty
+        item[1] += row[6]
+        correction = -qty
+    writer.voided += 1
+    writer.add((writer.next_id, item_id, 'CORRECTION', correction, unit_cost, 0, 0, 'VOID',
+                None, None, None, None, f"Void of Tx #{tx_id}: {reason}", when, 'system',
+                0, tx_id))
@@ -194,7 +194,16 @@ def setup_database(appdata_dir: str, db_name: str) -> str:
         except Exception as e:
             logger.error(f"Error initializing database: {e}", exc_info=True)
             sys.exit(1)
-    
+    else:
+        # Bring databases created by older versions up to the current schema
+        try:
+            from database.migrations import migrate_database
+            applied = migrate_database(db_path, get_schema_path())
+            if applied:
+                logger.info(f"Applied database migrations: {', '.join(applied)}")
+        except Exception as e:
+            logger.error(f"Error migrating database schema: {e}", exc_info=True)
+
     return db_path
 
 
@@ -3,12 +3,26 @@
 from .category import Category
 from .item import InventoryItem
 from .transaction import Transaction, TransactionType, ReasonCode
+from .compact import (
+    CompactCategory,
+    CompactItem,
+    CompactTransaction,
+    compile_row_mapper,
+    iter_rows,
+    map_rows
+)
 
 __all__ = [
     'Category',
     'InventoryItem',
     'Transaction',
     'TransactionType',
-    'ReasonCode'
+    'ReasonCode',
+    'CompactCategory',
+    'CompactItem',
+    'CompactTransaction',
+    'compile_row_mapper',
+    'iter_rows',
+    'map_rows'
 ]
 
@@ -0,0 +1,371 @@
+"""
+Compact read-only model variants for AIOps Studio - Inventory.
+
+InventoryItem, Transaction and Category are full dataclasses: every instance
+carries a __dict__, and from_db_row() parses each timestamp up front. That is
+fine for a single record, but loading every item or a long transaction
+history allocates heavily.
+
+The classes here are slotted equivalents for bulk reads:
+- No per-instance __dict__ (__slots__ only)
+- Timestamps are kept as the raw SQLite text and parsed on first access
+- Rows are mapped by a function compiled once per cursor description,
+  instead of looking up each column by name on every row
+
+Compact models skip the dataclass validation (rows come from the database,
+which enforces the same rules with CHECK constraints). Use to_model() when a
+full, mutable model is needed.
+"""
+
+import functools
+from datetime import datetime
+from operator import itemgetter
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+from .category import Category
+from .item import InventoryItem
+from .transaction import Transaction, TransactionType
+
+
+class LazyDatetime:
+    """
+    Descriptor for a timestamp stored as text and parsed on first access.
+
+    The backing slot holds the raw string until it is read, then the parsed
+    datetime, so each value is parsed at most once.
+    """
+
+    __slots__ = ('slot',)
+
+    def __init__(self, slot: str):
+        self.slot = slot
+
+    def __get__(self, obj, objtype=None) -> Optional[datetime]:
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+            setattr(obj, self.slot, value)
+        return value
+
+    def __set__(self, obj, value):
+        setattr(obj, self.slot, value)
+
+
+class CompactModel:
+    """
+    Base class for slotted models.
+
+    Subclasses list their columns in FIELDS (constructor order), the columns a
+    query must select in REQUIRED, and defaults for the rest in DEFAULTS.
+    Slots named with a leading underscore back a LazyDatetime or property of
+    the same name without it.
+    """
+
+    __slots__ = ()
+
+    FIELDS: Tuple[str, ...] = ()
+    REQUIRED: Tuple[str, ...] = ()
+    DEFAULTS: Dict[str, object] = {}
+
+    @classmethod
+    def from_db_row(cls, row):
+        """
+        Create an instance from a single row (sqlite3.Row or mapping).
+
+        For many rows prefer map_rows(), which resolves columns only once.
+        """
+        keys = row.keys()
+        for required in cls.REQUIRED:
+            if required not in keys:
+                raise ValueError(f"Row is missing required column '{required}'")
+        return cls(*[
+            row[name] if name in keys else cls.DEFAULTS.get(name)
+            for name in cls.FIELDS
+        ])
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{f}={getattr(self, f)!r}" for f in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+
+class CompactItem(CompactModel):
+    """Slotted, read-only view of an inventory_items row."""
+
+    __slots__ = (
+        'id', 'sku', 'name', 'category_id', 'quantity_on_hand',
+        'reorder_threshold', 'total_cost_basis_cents', '_is_active',
+        '_created_at', '_updated_at',
+    )
+
+    FIELDS = (
+        'id', 'sku', 'name', 'category_id', 'quantity_on_hand',
+        'reorder_threshold', 'total_cost_basis_cents', 'is_active',
+        'created_at', 'updated_at',
+    )
+    REQUIRED = ('id', 'sku', 'name')
+    DEFAULTS = {'quantity_on_hand': 0.0, 'reorder_threshold': 10,
+                'total_cost_basis_cents': 0, 'is_active': 1}
+
+    created_at = LazyDatetime('_created_at')
+    updated_at = LazyDatetime('_updated_at')
+
+    def __init__(self, id, sku, name, category_id=None, quantity_on_hand=0.0,
+                 reorder_threshold=10, total_cost_basis_cents=0, is_active=1,
+                 created_at=None, updated_at=None):
+        self.id = id
+        self.sku = sku
+        self.name = name
+        self.category_id = category_id
+        self.quantity_on_hand = quantity_on_hand
+        self.reorder_threshold = reorder_threshold
+        self.total_cost_basis_cents = total_cost_basis_cents
+        self._is_active = is_active
+        self._created_at = created_at
+        self._updated_at = updated_at
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self._is_active)
+
+    # Same derived values as InventoryItem
+    current_unit_cost_cents = InventoryItem.current_unit_cost_cents
+    current_unit_cost_dollars = InventoryItem.current_unit_cost_dollars
+    total_cost_basis_dollars = InventoryItem.total_cost_basis_dollars
+    total_inventory_value_cents = InventoryItem.total_inventory_value_cents
+    total_inventory_value_dollars = InventoryItem.total_inventory_value_dollars
+    is_below_threshold = InventoryItem.is_below_threshold
+    can_distribute = InventoryItem.can_distribute
+    to_dict = InventoryItem.to_dict
+    __str__ = InventoryItem.__str__
+
+    def to_model(self) -> InventoryItem:
+        """Convert to a full InventoryItem."""
+        return InventoryItem(
+            id=self.id,
+            sku=self.sku,
+            name=self.name,
+            category_id=self.category_id,
+            quantity_on_hand=self.quantity_on_hand,
+            reorder_threshold=self.reorder_threshold,
+            total_cost_basis_cents=self.total_cost_basis_cents,
+            is_active=self.is_active,
+            created_at=self.created_at,
+            updated_at=self.updated_at
+        )
+
+
+_TRANSACTION_TYPES = {t.value: t for t in TransactionType}
+
+# Low-cardinality text (reason codes, user, supplier and donor names) repeats
+# on most rows; share one string object per distinct value. Bounded, so a
+# long-running session with many distinct names does not keep them all.
+_SHARED_TEXT_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=_SHARED_TEXT_SIZE)
+def _share(value: Optional[str]) -> Optional[str]:
+    return value
+
+
+class CompactTransaction(CompactModel):
+    """Slotted, read-only view of an inventory_transactions row."""
+
+    __slots__ = (
+        'id', 'item_id', 'transaction_type', 'quantity_change',
+        'unit_cost_cents', 'fair_market_value_cents',
+        'total_financial_impact_cents', 'reason_code', 'supplier', 'donor',
+        'notes', '_transaction_date', 'created_by', '_is_voided',
+        'ref_transaction_id',
+    )
+
+    FIELDS = (
+        'id', 'item_id', 'transaction_type', 'quantity_change',
+        'unit_cost_cents', 'fair_market_value_cents',
+        'total_financial_impact_cents', 'reason_code', 'supplier', 'donor',
+        'notes', 'transaction_date', 'created_by', 'is_voided',
+        'ref_transaction_id',
+    )
+    REQUIRED = ('id', 'item_id', 'transaction_type', 'quantity_change')
+    DEFAULTS = {'unit_cost_cents': 0, 'fair_market_value_cents': 0,
+                'total_financial_impact_cents': 0, 'created_by': 'system',
+                'is_voided': 0}
+
+    transaction_date = LazyDatetime('_transaction_date')
+
+    def __init__(self, id, item_id, transaction_type, quantity_change,
+                 unit_cost_cents=0, fair_market_value_cents=0,
+                 total_financial_impact_cents=0, reason_code=None,
+                 supplier=None, donor=None, notes=None, transaction_date=None,
+                 created_by='system', is_voided=0, ref_transaction_id=None):
+        self.id = id
+        self.item_id = item_id
+        self.transaction_type = (
+            _TRANSACTION_TYPES.get(transaction_type) or TransactionType(transaction_type)
+        )
+        self.quantity_change = quantity_change
+        self.unit_cost_cents = unit_cost_cents
+        self.fair_market_value_cents = fair_market_value_cents
+        self.total_financial_impact_cents = total_financial_impact_cents
+        self.reason_code = _share(reason_code)
+        self.supplier = _share(supplier)
+        self.donor = _share(donor)
+        self.notes = notes
+        self._transaction_date = transaction_date
+        self.created_by = _share(created_by)
+        self._is_voided = is_voided
+        self.ref_transaction_id = ref_transaction_id
+
+    @property
+    def is_voided(self) -> bool:
+        return bool(self._is_voided)
+
+    unit_cost_dollars = Transaction.unit_cost_dollars
+    fair_market_value_dollars = Transaction.fair_market_value_dollars
+    total_financial_impact_dollars = Transaction.total_financial_impact_dollars
+    to_dict = Transaction.to_dict
+
+    def to_model(self) -> Transaction:
+        """Convert to a full Transaction."""
+        return Transaction(
+            id=self.id,
+            item_id=self.item_id,
+            transaction_type=self.transaction_type,
+            quantity_change=self.quantity_change,
+            unit_cost_cents=self.unit_cost_cents,
+            fair_market_value_cents=self.fair_market_value_cents,
+            total_financial_impact_cents=self.total_financial_impact_cents,
+            reason_code=self.reason_code,
+            supplier=self.supplier,
+            donor=self.donor,
+            notes=self.notes,
+            transaction_date=self.transaction_date,
+            created_by=self.created_by,
+            is_voided=self.is_voided,
+            ref_transaction_id=self.ref_transaction_id
+        )
+
+
+class CompactCategory(CompactModel):
+    """Slotted, read-only view of an item_categories row."""
+
+    __slots__ = ('id', 'name', 'parent_id', 'description', '_created_at')
+
+    FIELDS = ('id', 'name', 'parent_id', 'description', 'created_at')
+    REQUIRED = ('id', 'name')
+    DEFAULTS = {}
+
+    created_at = LazyDatetime('_created_at')
+
+    def __init__(self, id, name, parent_id=None, description=None, created_at=None):
+        self.id = id
+        self.name = name
+        self.parent_id = parent_id
+        self.description = description
+        self._created_at = created_at
+
+    to_dict = Category.to_dict
+    __str__ = Category.__str__
+
+    def to_model(self) -> Category:
+        """Convert to a full Category."""
+        return Category(
+            id=self.id,
+            name=self.name,
+            parent_id=self.parent_id,
+            description=self.description,
+            created_at=self.created_at
+        )
+
+
+# ============================================================================
+# ROW MAPPING
+# ============================================================================
+
+_MAPPER_CACHE: Dict[Tuple[type, Tuple[str, ...]], Callable] = {}
+
+
+def compile_row_mapper(
+    description: Sequence[Sequence],
+    model: Type[CompactModel]
+) -> Callable:
+    """
+    Build a function that maps rows with the given columns to model instances.
+
+    Column positions are resolved once; each row is then converted with a
+    single itemgetter call. Works with plain tuples and sqlite3.Row.
+
+    Args:
+        description: cursor.description of the query
+        model: Compact model class to build
+
+    Returns:
+        Callable taking a row and returning a model instance
+    """
+    columns = tuple(d[0] for d in description)
+    key = (model, columns)
+    mapper = _MAPPER_CACHE.get(key)
+    if mapper is not None:
+        return mapper
+
+    position = {name: i for i, name in enumerate(columns)}
+    missing = [f for f in model.FIELDS if f not in position]
+    for required in model.REQUIRED:
+        if required not in position:
+            raise ValueError(f"Query does not select required column '{required}'")
+
+    if not missing:
+        getter = itemgetter(*[position[f] for f in model.FIELDS])
+
+        def mapper(row, _new=model, _get=getter):
+            return _new(*_get(row))
+    else:
+        # Older schema: fill absent columns with defaults
+        present = [f for f in model.FIELDS if f in position]
+        getter = itemgetter(*[position[f] for f in present])
+        defaults = {f: model.DEFAULTS.get(f) for f in missing}
+
+        def mapper(row, _new=model, _get=getter, _names=present, _defaults=defaults):
+            return _new(**dict(zip(_names, _get(row))), **_defaults)
+
+    _MAPPER_CACHE[key] = mapper
+    return mapper
+
+
+def iter_rows(cursor, model: Type[CompactModel]) -> Iterator[CompactModel]:
+    """
+    Stream an executed cursor's rows as compact model instances.
+
+    Args:
+        cursor: Cursor after execute()
+        model: Compact model class to build
+
+    Yields:
+        Model instances, one per row
+    """
+    mapper = compile_row_mapper(cursor.description, model)
+    for row in cursor:
+        yield mapper(row)
+
+
+def map_rows(cursor, model: Type[CompactModel]) -> List[CompactModel]:
+    """
+    Fetch all of an executed cursor's rows as compact model instances.
+
+    Args:
+        cursor: Cursor after execute()
+        model: Compact model class to build
+
+    Returns:
+        List of model instances
+    """
+    mapper = compile_row_mapper(cursor.description, model)
+    return list(map(mapper, cursor.fetchall()))
@@ -161,7 +161,45 @@ class InventoryItem:
             new_cost_basis = 0
             
         return new_quantity, new_cost_basis, cogs_cents
-    
+
+    def calculate_count_adjustment_state(
+        self,
+        counted_quantity: float,
+        found_unit_cost_cents: Optional[int] = None
+    ) -> tuple[float, int, int]:
+        """
+        Calculate new state after setting the quantity to a physical count.
+
+        Missing units are written off like a distribution (at weighted
+        average cost); found units are added at the weighted average cost,
+        which therefore does not change. An item with no stock has no
+        average cost, so its found units need found_unit_cost_cents.
+
+        Args:
+            counted_quantity: Quantity counted on the shelf
+            found_unit_cost_cents: Unit cost of found units (default: the
+                weighted average cost)
+
+        Returns:
+            tuple[float, int, int]: (new_quantity, new_total_cost_basis_cents,
+            value_change_cents); the value change is negative for shrinkage
+
+        Raises:
+            ValueError: If the count is negative
+        """
+        if counted_quantity < 0:
+            raise ValueError("Counted quantity cannot be negative")
+
+        variance = counted_quantity - self.quantity_on_hand
+        if variance < 0:
+            _quantity, new_cost_basis, cogs_cents = self.calculate_distribution_state(-variance)
+            return counted_quantity, new_cost_basis, -cogs_cents
+
+        if found_unit_cost_cents is None:
+            found_unit_cost_cents = self.current_unit_cost_cents
+        value_cents = round(variance * found_unit_cost_cents)
+        return counted_quantity, self.total_cost_basis_cents + value_cents, value_cents
+
     @classmethod
     def from_db_row(cls, row) -> 'InventoryItem':
         """
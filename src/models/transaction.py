@@ -24,6 +24,7 @@ class ReasonCode(Enum):
     SPOILAGE = "SPOILAGE"
     INTERNAL = "INTERNAL"
     VOID = "VOID"  # Transaction was voided
+    COUNT = "COUNT"  # Stock-take (physical count) adjustment
 
 
 @dataclass
@@ -85,8 +86,9 @@ class Transaction:
         """Create Transaction instance from database row."""
         # Handle new columns safely (for backwards compatibility if row assumes old schema, 
         # though migration should handle it)
-        is_voided = bool(row['is_voided']) if 'is_voided' in row.keys() else False
-        ref_id = row['ref_transaction_id'] if 'ref_transaction_id' in row.keys() else None
+        keys = row.keys()
+        is_voided = bool(row['is_voided']) if 'is_voided' in keys else False
+        ref_id = row['ref_transaction_id'] if 'ref_transaction_id' in keys else None
         
         return cls(
             id=row['id'],
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Headless report generation for AIOps Studio - Inventory.
+
+Runs without PyQt6 (only the database and services layers are imported),
+so reports can be generated by a scheduled job on a server:
+
+    python src/report_cli.py --db inventory.db --reports financial,impact,stock-status \\
+        --start 2026-09-01 --end 2026-09-30 --output-dir /srv/reports/2026-09
+
+    python src/report_cli.py --db /data/pantry.db --reports all --format native,json
+
+    python src/report_cli.py --db inventory.db --reports financial,impact,purchases \\
+        --start 2026-09-01 --end 2026-09-30 --summary-only
+
+A bare file name (inventory.db, training.db) refers to the application's
+data directory; anything else is used as a path. Stage timings are printed
+at the end.
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add src directory to path
+src_dir = Path(__file__).parent
+sys.path.insert(0, str(src_dir))
+
+from database.connection import get_db_manager
+from database.migrations import migrate_database
+from services.batch_report_service import (
+    OUTPUT_FORMATS, REPORTS, BatchReportService
+)
+from utils.app_paths import get_app_data_dir, get_reports_dir
+
+
+def resolve_db_path(database: str) -> str:
+    """Resolve a bare database file name to the application data directory."""
+    if os.path.dirname(database):
+        return database
+    return str(get_app_data_dir() / database)
+
+
+def _split(value: str, choices, label: str) -> list:
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    if names == ['all']:
+        return list(choices)
+    unknown = [name for name in names if name not in choices]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(
+            f"unknown {label}: {', '.join(unknown) or value!r} "
+            f"(choose from {', '.join(choices)}, or all)")
+    return names
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generate reports without the UI")
+    parser.add_argument("--db", required=True,
+                        help="Database path, or inventory.db / training.db in the app data directory")
+    parser.add_argument("--reports", required=True,
+                        type=lambda v: _split(v, tuple(REPORTS), "report"),
+                        help=f"Comma-separated: {', '.join(REPORTS)}, or all")
+    parser.add_argument("--format", default=["native"], dest="formats",
+                        type=lambda v: _split(v, OUTPUT_FORMATS, "format"),
+                        help="native (PDF/Excel as in the app), json, or native,json")
+    parser.add_argument("--start", type=date.fromisoformat, help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="End date (YYYY-MM-DD)")
+    parser.add_argument("--year", type=int, help="Year for the trends report")
+    parser.add_argument("--forecast-days", type=int, default=30)
+    parser.add_argument("--lookback-days", type=int, default=90)
+    parser.add_argument("--summary-only", action="store_true",
+                        help="Leave out transaction lists (closed months are then read "
+                             "from their stored totals)")
+    parser.add_argument("--output-dir", type=Path,
+                        help="Where to write the files (defaults to the app's reports folder)")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    db_path = resolve_db_path(args.db)
+    if not os.path.exists(db_path):
+        print(f"Database not found: {db_path}", file=sys.stderr)
+        return 1
+
+    # Bring databases created by older versions up to the current schema,
+    # as the application does on startup
+    migrate_database(db_path)
+
+    service = BatchReportService(
+        get_db_manager(db_path),
+        args.output_dir or get_reports_dir(),
+        start_date=args.start,
+        end_date=args.end,
+        year=args.year,
+        forecast_days=args.forecast_days,
+        lookback_days=args.lookback_days,
+        include_details=not args.summary_only,
+    )
+    outputs = service.run(args.reports, args.formats)
+
+    for report, files in outputs.items():
+        for path in files:
+            print(f"{report}: {path}")
+    print("\nTimings:")
+    print(service.format_timings())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,31 +2,103 @@
 Analytics service for AIOps Studio - Inventory.
 
 Provides predictive forecasting, seasonal trend analysis, and donor impact tracking.
+
+Ledger queries read ledger_history, so trends include archived years
+(see database.archive).
 """
 
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional
 from datetime import datetime, date, timedelta
 from collections import defaultdict
 
-from database.connection import get_db_manager
+from database.connection import DatabaseManager, get_db_manager
+from database.columnar import ColumnarFrame, get_shared_frame, read_consumption_rates
+from services.events import (
+    ChangeEvent, DonorsMerged, ItemCreated, ItemUpdated, StockTakePosted,
+    TransactionAdded, TransactionsAdded, TransactionVoided, get_event_bus
+)
+from services.query_cache import QueryCache, cached_query
+
+# What cached results depend on (cached_query depends_on): 'items' (the
+# inventory_items rows), 'donors' (the donors table) and transaction types
+ALL_TRANSACTION_TYPES = ('PURCHASE', 'DONATION', 'DISTRIBUTION', 'CORRECTION')
+
+
+def changed_by(event: ChangeEvent) -> frozenset:
+    """What a change event changed, in cached_query depends_on terms."""
+    if isinstance(event, (ItemCreated, ItemUpdated)):
+        return frozenset({'items'})
+    if isinstance(event, (TransactionAdded, TransactionsAdded)):
+        return frozenset({'items', event.transaction_type})
+    if isinstance(event, TransactionVoided):
+        return frozenset({'items', event.transaction_type, 'CORRECTION'})
+    if isinstance(event, StockTakePosted):
+        return frozenset({'items', 'CORRECTION'})
+    if isinstance(event, DonorsMerged):
+        return frozenset({'donors'})
+    return frozenset({'items', 'donors', *ALL_TRANSACTION_TYPES})
 
 
 class AnalyticsService:
     """Service layer for advanced analytics and forecasting."""
     
-    def __init__(self, db_path: str = "inventory.db"):
+    def __init__(
+        self,
+        db_path: str = "inventory.db",
+        cache_size: int = 64,
+        db_manager: Optional[DatabaseManager] = None
+    ):
         """
         Initialize analytics service.
         
+        Results of the public analytics methods are cached until the next
+        database write (see services.query_cache). Writes made through the
+        services on the same manager announce what they changed
+        (services.events), and only the results depending on it are
+        dropped. Cached results are shared between callers and must be
+        treated as read-only.
+        
         Args:
             db_path: Path to the database file
+            cache_size: Maximum number of cached results (0 disables caching)
+            db_manager: Manager to query instead of the application's
+                (e.g. from get_db_manager_for_path)
         """
-        self.db_manager = get_db_manager(db_path)
+        self.db_manager = db_manager or get_db_manager(db_path)
+        self.cache = QueryCache(cache_size) if cache_size > 0 else None
+        if self.cache is not None:
+            get_event_bus(self.db_manager).subscribe(self._on_change, weak=True)
+    
+    def _on_change(self, event: ChangeEvent):
+        """Drop the cached results an announced write made stale."""
+        changes = self.db_manager.last_transaction_changes
+        if changes is None:
+            self.cache.clear()
+            return
+        self.cache.evict_changed(changed_by(event), *changes)
+    
+    def get_cache_stats(self) -> Dict:
+        """
+        Get result cache statistics.
+        
+        Returns:
+            Dict with hits, misses, hit_rate, evictions, invalidations and size
+        """
+        if self.cache is None:
+            return {'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'evictions': 0,
+                    'invalidations': 0, 'size': 0, 'max_entries': 0}
+        return self.cache.get_stats()
+    
+    def clear_cache(self):
+        """Discard all cached results."""
+        if self.cache is not None:
+            self.cache.clear()
     
     # =========================================================================
     # PREDICTIVE INVENTORY FORECASTING
     # =========================================================================
     
+    @cached_query(depends_on=('items', 'DISTRIBUTION'))
     def get_inventory_forecast(
         self,
         days_ahead: int = 30,
@@ -64,46 +136,20 @@ class AnalyticsService:
         """)
         items = cursor.fetchall()
         
-        # Get distribution history for the lookback period
-        cursor.execute("""
-            SELECT 
-                item_id,
-                DATE(transaction_date) as dist_date,
-                SUM(ABS(quantity_change)) as total_quantity
-            FROM inventory_transactions
-            WHERE transaction_type = 'DISTRIBUTION'
-              AND is_voided = 0
-              AND transaction_date >= ?
-            GROUP BY item_id, DATE(transaction_date)
-        """, (start_date.isoformat(),))
-        
-        # Organize distribution data by item_id
-        dist_data = defaultdict(list)
-        for row in cursor.fetchall():
-            dist_data[row['item_id']].append({
-                'date': datetime.strptime(row['dist_date'], '%Y-%m-%d').date(),
-                'quantity': row['total_quantity']
-            })
+        # Weighted daily consumption per item; only the lookback window is
+        # read, so this does not load the whole ledger into the shared frame
+        consumption = read_consumption_rates(conn, start_date)
         
         forecasts = []
         
         for item in items:
             item_id = item['id']
             current_qty = item['quantity_on_hand']
-            threshold = item['reorder_threshold']
-            
-            # Calculate consumption rate
-            item_dist = dist_data.get(item_id, [])
+            threshold = item['reorder_threshold'] or 0
             
-            if not item_dist:
-                # No distribution history - assume stable
-                daily_rate = 0.0
-                confidence = "low"
-            else:
-                # Calculate daily consumption using weighted moving average
-                daily_rate, confidence = self._calculate_consumption_rate(
-                    item_dist, lookback_days
-                )
+            # Calculate consumption rate (no history - assume stable)
+            daily_rate, active_days = consumption.get(item_id, (0.0, 0))
+            confidence = self._confidence_level(active_days)
             
             # Project future inventory
             projected_qty = current_qty - (daily_rate * days_ahead)
@@ -142,48 +188,33 @@ class AnalyticsService:
         
         return forecasts
     
-    def _calculate_consumption_rate(
-        self,
-        dist_data: List[Dict],
-        total_days: int
-    ) -> Tuple[float, str]:
+    def get_ledger_frame(self) -> ColumnarFrame:
         """
-        Calculate weighted daily consumption rate.
+        Get the shared columnar item/ledger frame for vectorized analysis.
         
-        Uses exponential weighting - more recent data has higher weight.
+        Returns:
+            ColumnarFrame: Up-to-date frame (arrays are shared, read-only)
+        """
+        return get_shared_frame(self.db_manager)
+    
+    @staticmethod
+    def _confidence_level(active_days: int) -> str:
+        """
+        Determine forecast confidence from data density.
         
         Args:
-            dist_data: List of distribution dicts with 'date' and 'quantity'
-            total_days: Total period in days
+            active_days: Number of days with distributions in the lookback
             
         Returns:
-            Tuple of (daily_rate, confidence_level)
+            "high", "medium" or "low"
         """
-        if not dist_data:
-            return 0.0, "low"
-        
-        # Sort by date
-        dist_data.sort(key=lambda x: x['date'])
-        
-        # Calculate weights (exponential decay)
-        n = len(dist_data)
-        weights = [0.7 ** (n - 1 - i) for i in range(n)]
-        total_weight = sum(weights)
-        
-        # Weighted average daily consumption
-        total_distributed = sum(d['quantity'] * w for d, w in zip(dist_data, weights))
-        daily_rate = total_distributed / total_weight if total_weight > 0 else 0
-        
-        # Determine confidence based on data density
-        if n >= 30:
-            confidence = "high"
-        elif n >= 10:
-            confidence = "medium"
-        else:
-            confidence = "low"
-        
-        return daily_rate, confidence
+        if active_days >= 30:
+            return "high"
+        elif active_days >= 10:
+            return "medium"
+        return "low"
     
+    @cached_query(depends_on=('items', 'DISTRIBUTION'))
     def get_stockout_risk_items(
         self,
         days_ahead: int = 30,
@@ -213,6 +244,7 @@ class AnalyticsService:
     # SEASONAL TREND ANALYSIS
     # =========================================================================
     
+    @cached_query(depends_on=('PURCHASE', 'DONATION', 'DISTRIBUTION'))
     def get_seasonal_trends(
         self,
         year: Optional[int] = None,
@@ -257,7 +289,7 @@ class AnalyticsService:
                     strftime('%m', transaction_date) as month,
                     SUM(ABS(quantity_change)) as quantity,
                     SUM(ABS(total_financial_impact_cents)) as value
-                FROM inventory_transactions
+                FROM ledger_history
                 WHERE transaction_type = 'DISTRIBUTION'
                   AND is_voided = 0
                   AND transaction_date >= ? 
@@ -277,7 +309,7 @@ class AnalyticsService:
                     strftime('%m', transaction_date) as month,
                     SUM(quantity_change) as quantity,
                     SUM(fair_market_value_cents) as value
-                FROM inventory_transactions
+                FROM ledger_history
                 WHERE transaction_type = 'DONATION'
                   AND is_voided = 0
                   AND transaction_date >= ? 
@@ -297,7 +329,7 @@ class AnalyticsService:
                     strftime('%m', transaction_date) as month,
                     SUM(quantity_change) as quantity,
                     SUM(quantity_change * unit_cost_cents) as value
-                FROM inventory_transactions
+                FROM ledger_history
                 WHERE transaction_type = 'PURCHASE'
                   AND is_voided = 0
                   AND transaction_date >= ? 
@@ -351,6 +383,7 @@ class AnalyticsService:
             'peak_distribution_qty': peak_month['distributions_qty']
         }
     
+    @cached_query(depends_on=ALL_TRANSACTION_TYPES)
     def get_year_over_year_comparison(
         self,
         years: Optional[List[int]] = None
@@ -383,7 +416,7 @@ class AnalyticsService:
                     transaction_type,
                     SUM(ABS(quantity_change)) as total_quantity,
                     SUM(ABS(total_financial_impact_cents)) as total_value
-                FROM inventory_transactions
+                FROM ledger_history
                 WHERE is_voided = 0
                   AND transaction_date >= ?
                   AND transaction_date <= ?
@@ -447,15 +480,20 @@ class AnalyticsService:
     # CATEGORY TRENDS
     # =========================================================================
     
+    @cached_query(depends_on=('items', 'DISTRIBUTION'))
     def get_category_trends(
         self,
-        year: Optional[int] = None
+        year: Optional[int] = None,
+        rollup: bool = False
     ) -> Dict:
         """
         Get distribution trends by category.
         
         Args:
             year: Year to analyze
+            rollup: If True, return every category with the totals of its
+                whole subtree (e.g. "Food" includes Canned Goods); totals and
+                percentages are then based on the top-level categories
             
         Returns:
             Dict with category-level trends
@@ -469,15 +507,28 @@ class AnalyticsService:
         start_date = f"{year}-01-01"
         end_date = f"{year}-12-31"
         
-        cursor.execute("""
+        if rollup:
+            # One join on the closure table attributes each distribution to
+            # its category and every ancestor
+            category_join = """
+            LEFT JOIN category_closure cc ON cc.descendant_id = ii.category_id
+            LEFT JOIN item_categories ic ON ic.id = cc.ancestor_id
+            """
+        else:
+            category_join = """
+            LEFT JOIN item_categories ic ON ii.category_id = ic.id
+            """
+        
+        cursor.execute(f"""
             SELECT 
                 ic.name as category_name,
                 ic.id as category_id,
+                ic.parent_id as parent_id,
                 SUM(ABS(it.quantity_change)) as total_distributed,
                 SUM(ABS(it.total_financial_impact_cents)) as total_value
-            FROM inventory_transactions it
+            FROM ledger_history it
             JOIN inventory_items ii ON it.item_id = ii.id
-            LEFT JOIN item_categories ic ON ii.category_id = ic.id
+            {category_join}
             WHERE it.transaction_type = 'DISTRIBUTION'
               AND it.is_voided = 0
               AND it.transaction_date >= ?
@@ -494,16 +545,21 @@ class AnalyticsService:
             qty = row['total_distributed'] or 0
             val = (row['total_value'] or 0) / 100.0
             
-            total_qty += qty
-            total_value += val
+            # In rollup mode subtotals repeat in their ancestors
+            if not rollup or row['parent_id'] is None:
+                total_qty += qty
+                total_value += val
             
-            categories.append({
+            category = {
                 'category_id': row['category_id'],
                 'category_name': row['category_name'] or 'Uncategorized',
                 'quantity': qty,
                 'value': round(val, 2),
                 'percentage': 0  # Will calculate after
-            })
+            }
+            if rollup:
+                category['parent_id'] = row['parent_id']
+            categories.append(category)
         
         # Calculate percentages
         for cat in categories:
@@ -523,6 +579,7 @@ class AnalyticsService:
     # DONOR IMPACT TRACKING
     # =========================================================================
     
+    @cached_query(depends_on=('DONATION', 'donors'))
     def get_donor_impact_summary(
         self,
         start_date: Optional[date] = None,
@@ -541,30 +598,39 @@ class AnalyticsService:
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
         
+        # Aggregate on the integer donor_id, then attach names; spelling
+        # variants of one donor share a donor_id. Archived rows keep the id
+        # of a donor merged away later, so ids are resolved through
+        # merged_into_id here rather than rewritten in the archive
         query = """
             SELECT 
-                donor,
+                COALESCE(m.merged_into_id, m.id) AS donor_id,
                 COUNT(*) as donation_count,
-                SUM(quantity_change) as total_quantity,
-                SUM(fair_market_value_cents) as total_fmv_cents
-            FROM inventory_transactions
-            WHERE transaction_type = 'DONATION'
-              AND is_voided = 0
-              AND donor IS NOT NULL
-              AND donor != ''
+                SUM(l.quantity_change) as total_quantity,
+                SUM(l.fair_market_value_cents) as total_fmv_cents
+            FROM ledger_history l
+            JOIN donors m ON m.id = l.donor_id
+            WHERE l.transaction_type = 'DONATION'
+              AND l.is_voided = 0
         """
         
         params = []
         
         if start_date:
-            query += " AND DATE(transaction_date) >= ?"
+            query += " AND DATE(l.transaction_date) >= ?"
             params.append(start_date.isoformat())
         
         if end_date:
-            query += " AND DATE(transaction_date) <= ?"
+            query += " AND DATE(l.transaction_date) <= ?"
             params.append(end_date.isoformat())
         
-        query += " GROUP BY donor ORDER BY total_fmv_cents DESC"
+        query += " GROUP BY COALESCE(m.merged_into_id, m.id)"
+        query = f"""
+            SELECT d.name AS donor, t.*
+            FROM ({query}) t
+            JOIN donors d ON d.id = t.donor_id
+            ORDER BY t.total_fmv_cents DESC
+        """
         
         cursor.execute(query, params)
         rows = cursor.fetchall()
@@ -581,6 +647,7 @@ class AnalyticsService:
             total_quantity += qty
             
             donors.append({
+                'donor_id': row['donor_id'],
                 'donor': row['donor'],
                 'donation_count': row['donation_count'],
                 'total_quantity': qty,
@@ -599,6 +666,7 @@ class AnalyticsService:
             'donors': donors
         }
     
+    @cached_query(depends_on=('DONATION', 'donors'))
     def get_top_donors(
         self,
         limit: int = 10,
@@ -619,6 +687,7 @@ class AnalyticsService:
         summary = self.get_donor_impact_summary(start_date, end_date)
         return summary['donors'][:limit]
     
+    @cached_query(depends_on=('DONATION', 'donors'))
     def get_donor_retention(
         self,
         years: int = 2
@@ -638,22 +707,23 @@ class AnalyticsService:
         current_year = datetime.now().year
         start_year = current_year - years + 1
         
-        # Get unique donors per year
-        yearly_donors = {}
+        # Get unique donor IDs per year (merged donors resolved, as in
+        # get_donor_impact_summary)
+        yearly_donors = defaultdict(set)
         
-        for year in range(start_year, current_year + 1):
-            cursor.execute("""
-                SELECT DISTINCT donor
-                FROM inventory_transactions
-                WHERE transaction_type = 'DONATION'
-                  AND is_voided = 0
-                  AND donor IS NOT NULL
-                  AND donor != ''
-                  AND strftime('%Y', transaction_date) = ?
-            """, (str(year),))
-            
-            donors = {row['donor'] for row in cursor.fetchall()}
-            yearly_donors[year] = donors
+        cursor.execute("""
+            SELECT DISTINCT
+                CAST(strftime('%Y', l.transaction_date) AS INTEGER) AS year,
+                COALESCE(m.merged_into_id, m.id) AS donor_id
+            FROM ledger_history l
+            JOIN donors m ON m.id = l.donor_id
+            WHERE l.transaction_type = 'DONATION'
+              AND l.is_voided = 0
+              AND strftime('%Y', l.transaction_date) BETWEEN ? AND ?
+        """, (str(start_year), str(current_year)))
+        
+        for row in cursor.fetchall():
+            yearly_donors[row['year']].add(row['donor_id'])
         
         # Calculate retention
         retention_data = []
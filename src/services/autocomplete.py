@@ -0,0 +1,253 @@
+"""
+In-memory autocomplete index for AIOps Studio - Inventory.
+
+Item type-ahead used to run a LIKE query per keystroke; a barcode scanner
+typing 13 digits fired twelve of them. The index keeps the active items'
+lowercased SKUs, names and name words in one sorted array, so a prefix
+lookup is a binary search, and a longer prefix typed after a shorter one
+only narrows the previous matches. Prefixes matching a large share of the
+items ("a") instead walk the items in SKU order until enough suggestions
+are found, which for such prefixes takes only a few steps. It is built once per database and kept
+current from the item change events (services.events), so lookups never
+touch the database.
+
+Matching follows InventoryService.search_items_by_prefix() (SKU or name
+prefix, case-insensitive, ordered by SKU) and additionally matches the
+start of any word in the name ("bea" finds "Black Beans").
+
+Usage:
+    index = get_autocomplete_index(service.db_manager)
+    match = index.search("bla")
+    match = index.search("blac", previous=match)   # narrows, no search
+    for suggestion in match.suggestions:
+        ...
+"""
+
+import heapq
+import threading
+import weakref
+from bisect import bisect_left, insort
+from math import isqrt
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from services.events import ChangeEvent, ItemCreated, ItemUpdated, get_event_bus
+
+# Separates the key from the item id in the sorted array; sorts before any
+# printable character, so all entries for a key are contiguous
+_SEP = "\x00"
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    """An item offered by autocomplete."""
+
+    item_id: int
+    sku: str
+    name: str
+
+
+@dataclass(frozen=True)
+class PrefixMatch:
+    """Result of an index lookup."""
+
+    prefix: str
+    item_ids: Optional[Tuple[int, ...]]  # All matching items, unordered
+                                         # (None: too many to collect)
+    suggestions: Tuple[Suggestion, ...]  # The first ``limit`` by SKU
+    version: int                      # Index version the lookup saw
+
+
+def _keys(sku: str, name: str) -> set:
+    """Lowercased strings an item can be found by."""
+    name = name.lower()
+    keys = {sku.lower(), name}
+    keys.update(word for word in name.split() if word)
+    return keys
+
+
+class AutocompleteIndex:
+    """Sorted-array prefix index over the active items' SKUs and names."""
+
+    def __init__(self, db_manager):
+        """
+        Build the index from the active items and follow item changes.
+
+        Args:
+            db_manager: DatabaseManager of the database to index
+        """
+        # Weak, so the index (kept per manager) does not keep it alive
+        self._db_manager = weakref.ref(db_manager)
+        self.version = 0
+        self._lock = threading.Lock()
+        self._entries: List[str] = []                  # "key\0item_id", sorted
+        self._items: Dict[int, Suggestion] = {}
+        self._item_keys: Dict[int, set] = {}
+        self._by_sku: List[Tuple[str, int]] = []       # (sku, item_id), sorted
+
+        conn = db_manager.get_connection()
+        rows = conn.execute(
+            "SELECT id, sku, name FROM inventory_items WHERE is_active = 1"
+        ).fetchall()
+        entries = []
+        for item_id, sku, name in rows:
+            self._items[item_id] = Suggestion(item_id, sku, name)
+            keys = _keys(sku, name)
+            self._item_keys[item_id] = keys
+            entries.extend(f"{key}{_SEP}{item_id}" for key in keys)
+        entries.sort()
+        self._entries = entries
+        self._by_sku = sorted((s.sku, item_id) for item_id, s in self._items.items())
+
+        get_event_bus(db_manager).subscribe(self.on_change, ItemCreated, ItemUpdated, weak=True)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # =========================================================================
+    # LOOKUP
+    # =========================================================================
+
+    def search(
+        self,
+        prefix: str,
+        limit: int = 15,
+        previous: Optional[PrefixMatch] = None
+    ) -> PrefixMatch:
+        """
+        Find the items whose SKU, name or a name word starts with ``prefix``.
+
+        Args:
+            prefix: Text typed so far (case-insensitive)
+            limit: Maximum number of suggestions
+            previous: The lookup for a shorter prefix of this one; its
+                matches are narrowed instead of searching the index again
+
+        Returns:
+            PrefixMatch: All matching item ids and the first ``limit``
+                suggestions ordered by SKU
+        """
+        key = prefix.strip().lower()
+        with self._lock:
+            if (previous is not None and previous.item_ids is not None
+                    and previous.version == self.version
+                    and key.startswith(previous.prefix)):
+                item_ids = tuple(
+                    item_id for item_id in previous.item_ids
+                    if self._matches(item_id, key)
+                )
+            else:
+                start = bisect_left(self._entries, key)
+                end = bisect_left(self._entries, key + "\U0010ffff", start)
+                # Collecting every match costs about (end - start) steps;
+                # walking in SKU order about limit * items / (end - start)
+                if key and (end - start) > isqrt(limit * len(self._items)):
+                    return PrefixMatch(key, None, self._first_by_sku(key, limit),
+                                       self.version)
+                item_ids = tuple(dict.fromkeys(
+                    int(entry.rpartition(_SEP)[2]) for entry in self._entries[start:end]))
+            suggestions = heapq.nsmallest(
+                limit, (self._items[item_id] for item_id in item_ids),
+                key=lambda s: s.sku)
+            return PrefixMatch(key, item_ids, tuple(suggestions), self.version)
+
+    def _matches(self, item_id: int, key: str) -> bool:
+        return any(k.startswith(key) for k in self._item_keys[item_id])
+
+    def _first_by_sku(self, key: str, limit: int) -> Tuple[Suggestion, ...]:
+        suggestions = []
+        for _sku, item_id in self._by_sku:
+            if self._matches(item_id, key):
+                suggestions.append(self._items[item_id])
+                if len(suggestions) == limit:
+                    break
+        return tuple(suggestions)
+
+    # =========================================================================
+    # MAINTENANCE
+    # =========================================================================
+
+    def on_change(self, event: ChangeEvent):
+        """Re-index the items an item event is about."""
+        db_manager = self._db_manager()
+        if db_manager is None:
+            return
+        conn = db_manager.get_connection()
+        for item_id in event.item_ids:
+            row = conn.execute(
+                "SELECT sku, name, is_active FROM inventory_items WHERE id = ?", (item_id,)
+            ).fetchone()
+            if row is not None and row[2]:
+                self.update(item_id, row[0], row[1])
+            else:
+                self.remove(item_id)
+
+    def update(self, item_id: int, sku: str, name: str):
+        """
+        Add an item or re-index its SKU and name.
+
+        Args:
+            item_id: Item ID
+            sku: Current SKU
+            name: Current name
+        """
+        with self._lock:
+            self._remove(item_id)
+            self._items[item_id] = Suggestion(item_id, sku, name)
+            keys = _keys(sku, name)
+            self._item_keys[item_id] = keys
+            for key in keys:
+                insort(self._entries, f"{key}{_SEP}{item_id}")
+            insort(self._by_sku, (sku, item_id))
+            self.version += 1
+
+    def remove(self, item_id: int):
+        """
+        Drop an item (e.g. soft-deleted).
+
+        Args:
+            item_id: Item ID
+        """
+        with self._lock:
+            if self._remove(item_id):
+                self.version += 1
+
+    def _remove(self, item_id: int) -> bool:
+        keys = self._item_keys.pop(item_id, None)
+        if keys is None:
+            return False
+        sku = self._items.pop(item_id).sku
+        position = bisect_left(self._by_sku, (sku, item_id))
+        if position < len(self._by_sku) and self._by_sku[position] == (sku, item_id):
+            del self._by_sku[position]
+        for key in keys:
+            entry = f"{key}{_SEP}{item_id}"
+            position = bisect_left(self._entries, entry)
+            if position < len(self._entries) and self._entries[position] == entry:
+                del self._entries[position]
+        return True
+
+
+# One index per DatabaseManager, dropped with the manager
+_indexes: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def get_autocomplete_index(db_manager) -> AutocompleteIndex:
+    """
+    Get the shared autocomplete index for a database.
+
+    Built on first use; all dialogs on the same database share it.
+
+    Args:
+        db_manager: DatabaseManager of the database
+
+    Returns:
+        AutocompleteIndex: The database's index
+    """
+    with _indexes_lock:
+        index = _indexes.get(db_manager)
+        if index is None:
+            index = AutocompleteIndex(db_manager)
+            _indexes[db_manager] = index
+    return index
@@ -0,0 +1,202 @@
+"""
+Batch report service for AIOps Studio - Inventory.
+
+Generates several reports in one run without any UI, for scheduled
+(cron / Task Scheduler) month-end runs; see report_cli.py.
+
+Each report is built from one or more named datasets (service query
+results). A dataset is queried once per run and reused by every report
+and output format that needs it. Every stage - opening the database, each
+query and each rendered file - is timed.
+"""
+
+import json
+import time
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from database.connection import DatabaseManager
+from services.analytics_service import AnalyticsService
+from services.reporting_service import ReportingService
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+OUTPUT_FORMATS = ('native', 'json')
+
+# Report -> (datasets it is built from, generator, generator method).
+# Native output uses the same PDF / Excel generators as the Reports and
+# Analytics pages; the first dataset is the one passed to the generator.
+REPORTS = {
+    'financial': (('financial',), 'pdf', 'generate_financial_report'),
+    'impact': (('impact',), 'excel', 'generate_impact_report'),
+    'stock-status': (('stock',), 'pdf', 'generate_stock_status_report'),
+    'purchases': (('purchases',), 'excel', 'generate_purchases_report'),
+    'suppliers': (('suppliers',), 'excel', 'generate_suppliers_report'),
+    'forecast': (('forecast', 'stockout_risk'), 'excel', 'generate_inventory_forecast_report'),
+    'trends': (('seasonal', 'year_over_year'), 'excel', 'generate_seasonal_trends_report'),
+}
+
+
+class BatchReportService:
+    """Generates any combination of reports headlessly, with stage timings."""
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        output_dir: Path,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        year: Optional[int] = None,
+        forecast_days: int = 30,
+        lookback_days: int = 90,
+        include_details: bool = True
+    ):
+        """
+        Initialize batch report service.
+
+        Args:
+            db_manager: Manager of the database to report on
+            output_dir: Directory the report files are written to
+            start_date: Start date for date-ranged reports (optional)
+            end_date: End date for date-ranged reports (optional)
+            year: Year for the trends report (defaults to the current year)
+            forecast_days: Forecast horizon in days
+            lookback_days: History used by the forecast, in days
+            include_details: List individual transactions in the financial,
+                impact and purchases reports (summaries of closed months
+                are read from their stored totals)
+        """
+        self.db_manager = db_manager
+        self.output_dir = Path(output_dir)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.year = year
+        self.forecast_days = forecast_days
+        self.lookback_days = lookback_days
+        self.include_details = include_details
+
+        self.timings: List[Dict] = []
+        self._datasets: Dict[str, object] = {}
+        self._generators: Dict[str, object] = {}
+        self._timed("open database", db_manager.get_connection)
+
+        self.reporting = ReportingService(db_manager=db_manager)
+        self.analytics = AnalyticsService(db_manager=db_manager)
+        self._queries: Dict[str, Callable[[], object]] = {
+            'financial': lambda: self.reporting.get_financial_report_data(
+                self.start_date, self.end_date, self.include_details),
+            'impact': lambda: self.reporting.get_impact_report_data(
+                self.start_date, self.end_date, self.include_details),
+            'stock': self.reporting.get_stock_status_data,
+            'purchases': lambda: self.reporting.get_purchases_report_data(
+                self.start_date, self.end_date, self.include_details),
+            'suppliers': self.reporting.get_suppliers_report_data,
+            'forecast': lambda: self.analytics.get_inventory_forecast(
+                self.forecast_days, self.lookback_days),
+            # Built from the (already loaded) forecast
+            'stockout_risk': lambda: self.analytics.get_stockout_risk_items(
+                self.forecast_days, self.lookback_days),
+            'seasonal': lambda: self.analytics.get_seasonal_trends(self.year),
+            'year_over_year': self.analytics.get_year_over_year_comparison,
+        }
+
+    def _timed(self, stage: str, func: Callable, **details):
+        started = time.perf_counter()
+        result = func()
+        self.timings.append(dict(stage=stage, seconds=time.perf_counter() - started, **details))
+        return result
+
+    def get_dataset(self, name: str):
+        """
+        Get a dataset, querying it on first use.
+
+        Args:
+            name: Dataset name (see the report definitions in REPORTS)
+
+        Returns:
+            The service query result (shared, treat as read-only)
+        """
+        if name not in self._datasets:
+            self._datasets[name] = self._timed(f"query {name}", self._queries[name])
+        else:
+            self.timings.append({'stage': f"query {name}", 'seconds': 0.0, 'reused': True})
+        return self._datasets[name]
+
+    def _generator(self, kind: str):
+        # Imported on first use: the generators pull in reportlab / pandas
+        if kind not in self._generators:
+            if kind == 'pdf':
+                from services.pdf_generator import PDFReportGenerator
+                self._generators[kind] = PDFReportGenerator(self.output_dir)
+            else:
+                from services.excel_generator import ExcelReportGenerator
+                self._generators[kind] = ExcelReportGenerator(self.output_dir)
+        return self._generators[kind]
+
+    def _write_json(self, report: str, datasets: Dict) -> str:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"{report.replace('-', '_')}_{date.today().isoformat()}.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(datasets, f, indent=2, default=str)
+        return str(path)
+
+    def run(
+        self,
+        reports: Sequence[str],
+        formats: Sequence[str] = ('native',)
+    ) -> Dict[str, List[str]]:
+        """
+        Generate reports.
+
+        Args:
+            reports: Report names (keys of REPORTS)
+            formats: 'native' (the PDF / Excel file the UI produces) and/or
+                'json' (every dataset of the report)
+
+        Returns:
+            Dict of report name -> generated file paths
+
+        Raises:
+            ValueError: If a report or format is unknown
+        """
+        unknown = [r for r in reports if r not in REPORTS]
+        unknown += [f for f in formats if f not in OUTPUT_FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown reports or formats: {', '.join(unknown)}")
+
+        outputs: Dict[str, List[str]] = {}
+        for report in reports:
+            dataset_names, kind, method = REPORTS[report]
+            datasets = {name: self.get_dataset(name) for name in dataset_names}
+            files = outputs.setdefault(report, [])
+            if 'native' in formats:
+                render = getattr(self._generator(kind), method)
+                data = datasets[dataset_names[0]]
+                files.append(self._timed(f"render {report}", lambda: render(data),
+                                         format=kind))
+            if 'json' in formats:
+                files.append(self._timed(f"render {report}",
+                                         lambda: self._write_json(report, datasets),
+                                         format='json'))
+            logger.info(f"Generated {report}: {', '.join(files)}")
+        return outputs
+
+    def format_timings(self) -> str:
+        """
+        Format the stage timings as a table.
+
+        Returns:
+            str: One line per stage, then the total
+        """
+        lines = []
+        for timing in self.timings:
+            label = timing['stage']
+            if 'format' in timing:
+                label += f" ({timing['format']})"
+            note = "  reused" if timing.get('reused') else ""
+            lines.append(f"  {label:<36}{timing['seconds'] * 1000:>10.1f} ms{note}")
+        total = sum(t['seconds'] for t in self.timings)
+        lines.append(f"  {'total':<36}{total * 1000:>10.1f} ms")
+        return "\n".join(lines)
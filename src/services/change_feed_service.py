@@ -0,0 +1,301 @@
+"""
+Change Feed Service for AIOps Studio - Inventory.
+
+Incremental exports for consumers that keep a copy of the data (accounting
+sync, a central database): instead of exporting every item and transaction
+each time, a consumer exports only what changed since its last export.
+
+- Triggers append the id of every changed item and transaction to
+  ``change_log`` under a monotonically increasing ``seq`` (schema.sql;
+  compact_ledger.LEDGER_CHANGE_LOG_SQL on the compact layout)
+- Each consumer stores a watermark, the last seq it has exported
+- A delta is the current state of the rows changed after the watermark,
+  one row per id however often it changed, plus the ids deleted
+- The first export of a consumer is a full snapshot
+
+Nothing is logged while no consumer is registered, and log entries every
+consumer has passed are pruned when a watermark moves, so the log stays the
+size of the activity between exports.
+
+Usage:
+    feed = ChangeFeedService()
+    result = feed.export_changes("accounting", "/srv/sync")  # writes CSV files
+    # or, to push the rows elsewhere:
+    changes = feed.get_changes(feed.get_watermark("accounting"))
+    ...
+    feed.acknowledge("accounting", changes.to_seq)
+"""
+
+import csv
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from database.archive import LEDGER_COLUMNS
+from database.connection import DatabaseManager, get_db_manager
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# inventory_items columns exported
+ITEM_COLUMNS = (
+    'id', 'sku', 'name', 'category_id', 'quantity_on_hand', 'reorder_threshold',
+    'total_cost_basis_cents', 'is_active', 'created_at', 'updated_at',
+)
+
+# Latest change of each row in a seq range; SQLite takes op from the row
+# holding MAX(seq)
+_LATEST_SQL = """
+    SELECT row_id, op, MAX(seq) FROM change_log
+    WHERE table_name = ? AND seq > ? AND seq <= ?
+    GROUP BY row_id
+"""
+
+
+@dataclass(frozen=True)
+class ChangeSet:
+    """Rows changed between two change log positions."""
+
+    from_seq: Optional[int]  # Exclusive; None for a full snapshot
+    to_seq: int  # Inclusive; the consumer's watermark once exported
+    items: List[Dict] = field(default_factory=list)
+    transactions: List[Dict] = field(default_factory=list)
+    deleted_item_ids: List[int] = field(default_factory=list)
+    deleted_transaction_ids: List[int] = field(default_factory=list)
+
+    @property
+    def is_snapshot(self) -> bool:
+        return self.from_seq is None
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.items or self.transactions
+                    or self.deleted_item_ids or self.deleted_transaction_ids)
+
+
+class ChangeFeedService:
+    """Service layer for change data capture and incremental exports."""
+
+    def __init__(
+        self,
+        db_path: str = "inventory.db",
+        db_manager: Optional[DatabaseManager] = None
+    ):
+        """
+        Initialize change feed service.
+
+        Args:
+            db_path: Path to the database file
+            db_manager: Manager to use instead of the application's
+        """
+        self.db_manager = db_manager or get_db_manager(db_path)
+
+    # ========================================================================
+    # CONSUMERS
+    # ========================================================================
+
+    def get_watermark(self, consumer: str) -> Optional[int]:
+        """
+        Get the last change log seq a consumer has exported.
+
+        Returns:
+            int or None: None if the consumer has not acknowledged a snapshot yet
+        """
+        row = self.db_manager.get_connection().execute(
+            "SELECT watermark FROM change_consumers WHERE name = ?", (consumer,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def acknowledge(self, consumer: str, seq: int):
+        """
+        Record that a consumer has exported everything up to seq.
+
+        Args:
+            consumer: Consumer name
+            seq: to_seq of the exported ChangeSet
+
+        Raises:
+            ValueError: If the consumer is unknown or the watermark would move back
+        """
+        with self.db_manager.transaction() as conn:
+            row = conn.execute(
+                "SELECT watermark FROM change_consumers WHERE name = ?", (consumer,)
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Unknown consumer: {consumer}")
+            if row[0] is not None and seq < row[0]:
+                raise ValueError(
+                    f"Watermark of {consumer} cannot move back (from {row[0]} to {seq})")
+            conn.execute("""
+                UPDATE change_consumers SET watermark = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE name = ?
+            """, (seq, consumer))
+            self._prune(conn)
+
+    def remove_consumer(self, consumer: str):
+        """Stop tracking changes for a consumer (logging stops with the last one)."""
+        with self.db_manager.transaction() as conn:
+            conn.execute("DELETE FROM change_consumers WHERE name = ?", (consumer,))
+            self._prune(conn)
+
+    @staticmethod
+    def _prune(conn):
+        """Delete log entries every consumer has exported."""
+        conn.execute("""
+            DELETE FROM change_log
+            WHERE NOT EXISTS (SELECT 1 FROM change_consumers)
+               OR seq <= (SELECT MIN(watermark) FROM change_consumers)
+        """)
+
+    # ========================================================================
+    # CHANGES
+    # ========================================================================
+
+    def get_changes(self, since_seq: Optional[int],
+                    max_changes: Optional[int] = None) -> ChangeSet:
+        """
+        Get the rows changed after a change log position.
+
+        Rows are read in their current state, so a row changed several times
+        appears once. Rows changed and then deleted are reported as deleted;
+        rows moved to the archive are not.
+
+        Args:
+            since_seq: Watermark to start after; None for a full snapshot
+            max_changes: Limit on log entries covered, to export a large
+                backlog in several parts (the next part starts at to_seq)
+
+        Returns:
+            ChangeSet: Changed rows and the position to acknowledge
+        """
+        if max_changes is not None and max_changes < 1:
+            raise ValueError("max_changes must be at least 1")
+
+        # One transaction, so the rows and to_seq are a consistent snapshot
+        with self.db_manager.transaction() as conn:
+            return self._get_changes(conn, since_seq, max_changes)
+
+    def _get_changes(self, conn, since_seq: Optional[int],
+                     max_changes: Optional[int]) -> ChangeSet:
+        if since_seq is None:
+            return self._snapshot(conn)
+
+        to_seq = None
+        if max_changes is not None:
+            row = conn.execute(
+                "SELECT seq FROM change_log WHERE seq > ? ORDER BY seq LIMIT 1 OFFSET ?",
+                (since_seq, max_changes - 1)
+            ).fetchone()
+            to_seq = row[0] if row else None
+        if to_seq is None:
+            to_seq = max(since_seq, conn.execute(
+                "SELECT IFNULL(MAX(seq), 0) FROM change_log").fetchone()[0])
+
+        items, deleted_items = self._read_changes(
+            conn, 'inventory_items', ITEM_COLUMNS, since_seq, to_seq)
+        transactions, deleted_transactions = self._read_changes(
+            conn, 'inventory_transactions', LEDGER_COLUMNS, since_seq, to_seq)
+        return ChangeSet(since_seq, to_seq, items, transactions,
+                         deleted_items, deleted_transactions)
+
+    @staticmethod
+    def _read_changes(conn, table: str, columns, since_seq: int, to_seq: int):
+        """Return (current rows, deleted ids) of one table's changes in a seq range."""
+        params = (table, since_seq, to_seq)
+        # CROSS JOIN keeps the (small) set of changed ids as the outer loop
+        rows = conn.execute(f"""
+            WITH latest AS ({_LATEST_SQL})
+            SELECT {", ".join(f"t.{column}" for column in columns)}
+            FROM latest CROSS JOIN {table} t ON t.id = latest.row_id
+            WHERE latest.op != 'D'
+            ORDER BY t.id
+        """, params).fetchall()
+        deleted = [row[0] for row in conn.execute(f"""
+            WITH latest AS ({_LATEST_SQL})
+            SELECT row_id FROM latest WHERE op = 'D' ORDER BY row_id
+        """, params)]
+        return [dict(row) for row in rows], deleted
+
+    @staticmethod
+    def _snapshot(conn) -> ChangeSet:
+        """All items and transactions (archived years included)."""
+        to_seq = conn.execute("SELECT IFNULL(MAX(seq), 0) FROM change_log").fetchone()[0]
+        items = conn.execute(
+            f"SELECT {', '.join(ITEM_COLUMNS)} FROM inventory_items ORDER BY id").fetchall()
+        transactions = conn.execute(
+            f"SELECT {', '.join(LEDGER_COLUMNS)} FROM ledger_history ORDER BY id").fetchall()
+        return ChangeSet(None, to_seq, [dict(row) for row in items],
+                         [dict(row) for row in transactions])
+
+    # ========================================================================
+    # EXPORT
+    # ========================================================================
+
+    def export_changes(self, consumer: str, output_dir: str,
+                       max_changes: Optional[int] = None) -> Dict:
+        """
+        Write a consumer's changes since its last export to CSV files.
+
+        Writes items_<range>.csv and transactions_<range>.csv, whose first
+        column is 'upsert' or 'delete' (a delete row has only the id), and
+        moves the watermark once both files are written. A consumer's first
+        export is a full snapshot (items_snapshot_<seq>.csv); logging starts
+        for it in the same transaction, so no change falls in between.
+        Nothing is written when nothing changed.
+
+        Args:
+            consumer: Consumer name (registered on first use)
+            output_dir: Directory for the CSV files
+            max_changes: Limit on log entries covered (see get_changes)
+
+        Returns:
+            Dict with snapshot, from_seq, to_seq, items, transactions,
+            deleted and files (paths written)
+        """
+        consumer = (consumer or "").strip()
+        if not consumer:
+            raise ValueError("Consumer name is required")
+
+        if max_changes is not None and max_changes < 1:
+            raise ValueError("max_changes must be at least 1")
+
+        with self.db_manager.transaction() as conn:
+            conn.execute("INSERT OR IGNORE INTO change_consumers (name) VALUES (?)", (consumer,))
+            changes = self._get_changes(conn, self.get_watermark(consumer), max_changes)
+
+        files = []
+        if changes.is_snapshot or not changes.is_empty:
+            os.makedirs(output_dir, exist_ok=True)
+            suffix = (f"snapshot_{changes.to_seq}" if changes.is_snapshot
+                      else f"changes_{changes.from_seq}-{changes.to_seq}")
+            for name, columns, rows, deleted in (
+                ('items', ITEM_COLUMNS, changes.items, changes.deleted_item_ids),
+                ('transactions', LEDGER_COLUMNS, changes.transactions,
+                 changes.deleted_transaction_ids),
+            ):
+                path = os.path.join(output_dir, f"{name}_{suffix}.csv")
+                _write_csv(path, columns, rows, deleted)
+                files.append(path)
+
+        self.acknowledge(consumer, changes.to_seq)
+        result = {
+            'snapshot': changes.is_snapshot,
+            'from_seq': changes.from_seq,
+            'to_seq': changes.to_seq,
+            'items': len(changes.items),
+            'transactions': len(changes.transactions),
+            'deleted': len(changes.deleted_item_ids) + len(changes.deleted_transaction_ids),
+            'files': files,
+        }
+        logger.info(f"Exported changes for {consumer}: {result}")
+        return result
+
+
+def _write_csv(path: str, columns, rows: List[Dict], deleted_ids: List[int]):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(('op',) + tuple(columns))
+        for row in rows:
+            writer.writerow(['upsert'] + [row[column] for column in columns])
+        for row_id in deleted_ids:
+            writer.writerow(['delete', row_id] + [''] * (len(columns) - 1))
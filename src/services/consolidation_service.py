@@ -0,0 +1,307 @@
+"""
+Consolidation service for AIOps Studio - Inventory.
+
+Builds network-wide reports for a group of pantries, each with its own
+database file. Every pantry is queried in a separate worker process with
+the regular ReportingService / AnalyticsService, so a consolidated run
+takes about as long as the slowest pantry; the results are then merged:
+
+- financial: COGS totals summed, distributions listed with their pantry
+- impact: donation FMV and distributed value summed
+- stock: items matched by SKU, quantities and values summed per pantry
+- donors: donors matched by normalized name across pantries
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+from database.connection import get_db_manager_for_path
+from services.analytics_service import AnalyticsService
+from services.reporting_service import ReportingService
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+CONSOLIDATED_REPORTS = ('financial', 'impact', 'stock', 'donors')
+
+
+# ============================================================================
+# PER-PANTRY WORKER
+# ============================================================================
+
+def _pantry_reports(
+    db_path: str,
+    reports: Sequence[str],
+    start_date: Optional[date],
+    end_date: Optional[date]
+) -> Dict:
+    """
+    Run the requested reports against one pantry database.
+
+    Runs in a worker process, so it only takes and returns picklable values.
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Database not found: {db_path}")
+    started = time.perf_counter()
+    manager = get_db_manager_for_path(db_path)
+    try:
+        reporting = ReportingService(db_manager=manager)
+        analytics = AnalyticsService(cache_size=0, db_manager=manager)
+        results = {}
+        if 'financial' in reports:
+            results['financial'] = reporting.get_financial_report_data(start_date, end_date)
+        if 'impact' in reports:
+            results['impact'] = reporting.get_impact_report_data(start_date, end_date)
+        if 'stock' in reports:
+            results['stock'] = reporting.get_stock_status_data()
+        if 'donors' in reports:
+            summary = analytics.get_donor_impact_summary(start_date, end_date)
+            keys = dict(manager.get_connection().execute(
+                "SELECT id, normalized_key FROM donors"))
+            for donor in summary['donors']:
+                donor['normalized_key'] = keys.get(donor['donor_id'], donor['donor'].lower())
+            results['donors'] = summary
+    finally:
+        manager.close()
+    results['elapsed_seconds'] = time.perf_counter() - started
+    return results
+
+
+# ============================================================================
+# MERGING
+# ============================================================================
+
+def _merge_financial(per_pantry: Dict[str, Dict]) -> Dict:
+    merged = {'pantries': {}, 'distributions': []}
+    for key in ('total_cogs_cents', 'client_cogs_cents', 'spoilage_cogs_cents',
+                'internal_cogs_cents'):
+        merged[key] = sum(report[key] for report in per_pantry.values())
+        merged[key.replace('_cents', '_dollars')] = merged[key] / 100.0
+
+    for pantry, report in per_pantry.items():
+        merged['pantries'][pantry] = {
+            'total_cogs_cents': report['total_cogs_cents'],
+            'distribution_count': report['distribution_count'],
+        }
+        merged['distributions'].extend(
+            dict(row, pantry=pantry) for row in report['distributions'])
+
+    merged['distributions'].sort(key=lambda row: row['date'] or '', reverse=True)
+    merged['distribution_count'] = len(merged['distributions'])
+    return merged
+
+
+def _merge_impact(per_pantry: Dict[str, Dict]) -> Dict:
+    merged = {'pantries': {}, 'donations': []}
+    for key in ('total_donations_fmv_cents', 'total_distributed_value_cents'):
+        merged[key] = sum(report[key] for report in per_pantry.values())
+        merged[key.replace('_cents', '_dollars')] = merged[key] / 100.0
+
+    for pantry, report in per_pantry.items():
+        merged['pantries'][pantry] = {
+            'total_donations_fmv_cents': report['total_donations_fmv_cents'],
+            'total_distributed_value_cents': report['total_distributed_value_cents'],
+            'donation_count': report['donation_count'],
+        }
+        merged['donations'].extend(dict(row, pantry=pantry) for row in report['donations'])
+
+    merged['donations'].sort(key=lambda row: row['date'] or '', reverse=True)
+    merged['donation_count'] = len(merged['donations'])
+    merged['distributions_count'] = sum(
+        report['distributions_count'] for report in per_pantry.values())
+    return merged
+
+
+def _merge_stock(per_pantry: Dict[str, Dict]) -> Dict:
+    items: Dict[str, Dict] = {}
+    pantries = {}
+    for pantry, report in per_pantry.items():
+        pantries[pantry] = {
+            'total_items': report['total_items'],
+            'total_value_cents': report['total_value_cents'],
+            'below_threshold_count': report['below_threshold_count'],
+            'zero_stock_count': report['zero_stock_count'],
+        }
+        for category_items in report['items_by_category'].values():
+            for item in category_items:
+                merged = items.setdefault(item['sku'], {
+                    'sku': item['sku'],
+                    'name': item['name'],
+                    'category': item['category'],
+                    'quantity': 0,
+                    'value_cents': 0,
+                    'by_pantry': {},
+                    'low_stock_pantries': [],
+                })
+                merged['quantity'] += item['quantity']
+                merged['value_cents'] += item['value_cents']
+                merged['by_pantry'][pantry] = item['quantity']
+                if item['quantity'] < item['threshold']:
+                    merged['low_stock_pantries'].append(pantry)
+
+    total_value_cents = sum(p['total_value_cents'] for p in pantries.values())
+    return {
+        'pantries': pantries,
+        'items': sorted(items.values(), key=lambda item: (item['name'], item['sku'])),
+        'total_items': len(items),
+        'total_value_cents': total_value_cents,
+        'total_value_dollars': total_value_cents / 100.0,
+        'below_threshold_count': sum(p['below_threshold_count'] for p in pantries.values()),
+        'zero_stock_count': sum(p['zero_stock_count'] for p in pantries.values()),
+    }
+
+
+def _merge_donors(per_pantry: Dict[str, Dict]) -> Dict:
+    donors: Dict[str, Dict] = {}
+    for pantry, summary in per_pantry.items():
+        for row in summary['donors']:
+            merged = donors.setdefault(row['normalized_key'], {
+                'donor': row['donor'],
+                'donation_count': 0,
+                'total_quantity': 0,
+                'total_fmv_cents': 0,
+                'pantries': [],
+            })
+            merged['donation_count'] += row['donation_count']
+            merged['total_quantity'] += row['total_quantity']
+            merged['total_fmv_cents'] += row['total_fmv_cents']
+            merged['pantries'].append(pantry)
+
+    ranked = sorted(donors.values(), key=lambda d: (-d['total_fmv_cents'], d['donor']))
+    for donor in ranked:
+        donor['total_fmv_dollars'] = round(donor['total_fmv_cents'] / 100.0, 2)
+    total_fmv_cents = sum(d['total_fmv_cents'] for d in ranked)
+    return {
+        'total_donors': len(ranked),
+        'total_donations': sum(d['donation_count'] for d in ranked),
+        'total_quantity': sum(d['total_quantity'] for d in ranked),
+        'total_fmv_cents': total_fmv_cents,
+        'total_fmv_dollars': round(total_fmv_cents / 100.0, 2),
+        'donors': ranked,
+    }
+
+
+_MERGERS = {
+    'financial': _merge_financial,
+    'impact': _merge_impact,
+    'stock': _merge_stock,
+    'donors': _merge_donors,
+}
+
+
+# ============================================================================
+# SERVICE
+# ============================================================================
+
+class ConsolidationService:
+    """Network-wide reports over several pantry databases."""
+
+    def __init__(
+        self,
+        pantries: Union[Mapping[str, str], Iterable[str]],
+        max_workers: Optional[int] = None
+    ):
+        """
+        Initialize consolidation service.
+
+        Args:
+            pantries: Pantry name -> database path, or just paths (the file
+                name without extension is used as the pantry name)
+            max_workers: Worker processes (defaults to one per pantry, up to
+                the CPU count); 1 runs everything in this process
+
+        Raises:
+            ValueError: If no pantries are given or names collide
+        """
+        if isinstance(pantries, Mapping):
+            self.pantries = dict(pantries)
+        else:
+            paths = list(pantries)
+            self.pantries = {Path(path).stem: path for path in paths}
+            if len(self.pantries) != len(paths):
+                raise ValueError("Pantry database file names must be unique")
+        if not self.pantries:
+            raise ValueError("At least one pantry database is required")
+        if max_workers is None:
+            max_workers = min(len(self.pantries), os.cpu_count() or 1)
+        self.max_workers = max(1, max_workers)
+
+    def get_consolidated_reports(
+        self,
+        reports: Sequence[str] = CONSOLIDATED_REPORTS,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict:
+        """
+        Run reports against every pantry and merge them.
+
+        A pantry whose database cannot be read is listed under ``errors``
+        and left out of the totals instead of failing the whole run.
+
+        Args:
+            reports: Any of 'financial', 'impact', 'stock', 'donors'
+            start_date: Start date for financial/impact/donors (optional)
+            end_date: End date for financial/impact/donors (optional)
+
+        Returns:
+            Dict with one merged report per requested name, plus pantries
+            (names included), errors (pantry -> message), timings (pantry ->
+            seconds) and elapsed_seconds (wall time of the whole run)
+
+        Raises:
+            ValueError: If an unknown report is requested
+        """
+        unknown = set(reports) - set(CONSOLIDATED_REPORTS)
+        if unknown:
+            raise ValueError(f"Unknown reports: {', '.join(sorted(unknown))}")
+
+        started = time.perf_counter()
+        results, errors = self._run_pantries(list(reports), start_date, end_date)
+
+        consolidated = {
+            'pantries': sorted(results),
+            'errors': errors,
+            'timings': {name: result['elapsed_seconds'] for name, result in results.items()},
+        }
+        for report in reports:
+            consolidated[report] = _MERGERS[report](
+                {name: result[report] for name, result in sorted(results.items())})
+        consolidated['elapsed_seconds'] = time.perf_counter() - started
+
+        logger.info(
+            f"Consolidated {len(results)} of {len(self.pantries)} pantries "
+            f"in {consolidated['elapsed_seconds']:.2f}s")
+        return consolidated
+
+    def _run_pantries(
+        self,
+        reports: List[str],
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ):
+        results, errors = {}, {}
+        if self.max_workers == 1:
+            for name, path in self.pantries.items():
+                try:
+                    results[name] = _pantry_reports(path, reports, start_date, end_date)
+                except Exception as e:
+                    logger.error(f"Pantry {name} ({path}) failed: {e}")
+                    errors[name] = str(e)
+            return results, errors
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                name: pool.submit(_pantry_reports, path, reports, start_date, end_date)
+                for name, path in self.pantries.items()
+            }
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.error(f"Pantry {name} ({self.pantries[name]}) failed: {e}")
+                    errors[name] = str(e)
+        return results, errors
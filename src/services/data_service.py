@@ -220,7 +220,7 @@ class DataService:
                     i.sku, i.name as item_name,
                     t.quantity_change, t.unit_cost_cents, t.total_financial_impact_cents,
                     t.reason_code, t.supplier, t.donor, t.notes
-                FROM inventory_transactions t
+                FROM ledger_history t
                 JOIN inventory_items i ON t.item_id = i.id
                 ORDER BY t.transaction_date DESC
             """)
@@ -0,0 +1,285 @@
+"""
+Donor Service for AIOps Studio - Inventory.
+
+Manages the donors dimension:
+- Donor lookup by name (case/punctuation-insensitive)
+- Duplicate detection (fuzzy matching with n-gram blocking)
+- Merging duplicate donors
+"""
+
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+from database.connection import get_db_manager
+from database.migrations import name_key_sql
+from services.events import DonorsMerged, get_event_bus
+
+
+# Tokens rewritten / ignored when comparing donor names
+_ABBREVIATIONS = {
+    'st': 'saint',
+    'mt': 'mount',
+    'ft': 'fort',
+    'assn': 'association',
+    'assoc': 'association',
+    'ctr': 'center',
+    'centre': 'center',
+    'dept': 'department',
+    'intl': 'international',
+    'bros': 'brothers',
+}
+_STOPWORDS = frozenset({'the', 'of', 'and', 'inc', 'llc', 'ltd', 'co', 'corp'})
+
+
+def donor_tokens(normalized_key: str) -> List[str]:
+    """
+    Split a normalized donor key into comparable tokens.
+
+    Abbreviations are expanded, filler words dropped and the result sorted,
+    so word order does not matter.
+
+    Args:
+        normalized_key: Key from donors.normalized_key
+
+    Returns:
+        Sorted list of distinct tokens
+    """
+    tokens = {_ABBREVIATIONS.get(token, token) for token in normalized_key.split()}
+    return sorted(tokens - _STOPWORDS)
+
+
+def donor_ngrams(tokens: List[str], n: int = 3) -> set:
+    """
+    Character n-grams of each token, padded so short tokens still match.
+
+    Args:
+        tokens: Tokens from donor_tokens()
+        n: Gram length
+
+    Returns:
+        Set of n-gram strings
+    """
+    grams = set()
+    for token in tokens:
+        padded = f" {token} "
+        grams.update(padded[i:i + n] for i in range(max(len(padded) - n + 1, 1)))
+    return grams
+
+
+class DonorService:
+    """Service layer for the donors dimension."""
+
+    def __init__(self, db_path: str = "inventory.db"):
+        """
+        Initialize donor service.
+
+        Args:
+            db_path: Path to the database file
+        """
+        self.db_manager = get_db_manager(db_path)
+
+    # ========================================================================
+    # LOOKUPS
+    # ========================================================================
+
+    def get_donors(self, include_merged: bool = False) -> List[Dict]:
+        """
+        Get donors with their donation totals.
+
+        Donations of donors merged away are counted for the donor they were
+        merged into (merged donors themselves show none).
+
+        Args:
+            include_merged: Include donors that were merged into another
+
+        Returns:
+            List of donor dicts sorted by name
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        query = """
+            SELECT d.id, d.name, d.normalized_key, d.merged_into_id,
+                   COALESCE(t.donation_count, 0) AS donation_count,
+                   COALESCE(t.total_fmv_cents, 0) AS total_fmv_cents
+            FROM donors d
+            LEFT JOIN (
+                SELECT COALESCE(m.merged_into_id, m.id) AS donor_id,
+                       COUNT(*) AS donation_count,
+                       SUM(l.fair_market_value_cents) AS total_fmv_cents
+                FROM ledger_history l
+                JOIN donors m ON m.id = l.donor_id
+                WHERE l.transaction_type = 'DONATION' AND l.is_voided = 0
+                GROUP BY COALESCE(m.merged_into_id, m.id)
+            ) t ON t.donor_id = d.id
+        """
+        if not include_merged:
+            query += " WHERE d.merged_into_id IS NULL"
+        query += " ORDER BY d.name COLLATE NOCASE"
+
+        cursor.execute(query)
+        return [dict(row) for row in cursor.fetchall()]
+
+    def find_donor(self, name: str) -> Optional[Dict]:
+        """
+        Find a donor by name, ignoring case, whitespace and punctuation.
+
+        Merged donors resolve to the donor they were merged into.
+
+        Args:
+            name: Donor name as entered
+
+        Returns:
+            Dict with id and name, or None if no donor matches
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(f"""
+            SELECT d.id, d.name
+            FROM donors alias
+            JOIN donors d ON d.id = COALESCE(alias.merged_into_id, alias.id)
+            WHERE alias.normalized_key = {name_key_sql('?')}
+        """, (name,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
+    # ========================================================================
+    # DUPLICATE DETECTION
+    # ========================================================================
+
+    def suggest_merges(
+        self,
+        threshold: float = 0.75,
+        max_block_size: int = 200
+    ) -> List[Dict]:
+        """
+        Suggest donors that are probably the same organization.
+
+        Names are compared on character trigrams of their tokens. Each
+        donor is only indexed under its rarest trigrams (a prefix long enough
+        that any pair reaching the threshold must share one), and only donors
+        sharing an index entry (a "block") are scored. Blocks larger than
+        max_block_size are skipped, so the work grows roughly linearly with
+        the number of donors.
+
+        Args:
+            threshold: Minimum Dice similarity (0-1) to suggest a merge
+            max_block_size: Largest block of donors compared pairwise
+
+        Returns:
+            List of suggestion dicts (best match first), each with the donor
+            to keep (more donations) and the duplicate to merge into it
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("Threshold must be between 0 and 1")
+
+        donors = self.get_donors()
+        grams = [donor_ngrams(donor_tokens(d['normalized_key'])) for d in donors]
+
+        # Prefix filtering: Dice >= t implies Jaccard >= t / (2 - t), and two
+        # sets that similar must share one of their first n - ceil(j * n) + 1
+        # grams when grams are ordered rarest first
+        frequency = Counter(gram for donor_grams in grams for gram in donor_grams)
+        jaccard = threshold / (2 - threshold)
+        prefixes = []
+        blocks = defaultdict(list)
+        for index, donor_grams in enumerate(grams):
+            ordered = sorted(donor_grams, key=lambda gram: (frequency[gram], gram))
+            prefix = ordered[:len(ordered) - math.ceil(jaccard * len(ordered) - 1e-9) + 1]
+            prefixes.append(prefix)
+            for gram in prefix:
+                blocks[gram].append(index)
+
+        suggestions = []
+        for a, donor_grams in enumerate(grams):
+            # Later donors sharing at least one usable block
+            shared = set()
+            for gram in prefixes[a]:
+                members = blocks[gram]
+                if len(members) <= max_block_size:
+                    for b in members:
+                        if b > a:
+                            shared.add(b)
+
+            for b in shared:
+                # Names of very different lengths cannot reach the threshold
+                size = len(donor_grams) + len(grams[b])
+                if 2 * min(len(donor_grams), len(grams[b])) < threshold * size:
+                    continue
+                score = 2 * len(donor_grams & grams[b]) / size
+                if score < threshold:
+                    continue
+
+                keep, duplicate = donors[a], donors[b]
+                if (duplicate['donation_count'], -duplicate['id']) > \
+                        (keep['donation_count'], -keep['id']):
+                    keep, duplicate = duplicate, keep
+                suggestions.append({
+                    'donor_id': keep['id'],
+                    'donor': keep['name'],
+                    'duplicate_id': duplicate['id'],
+                    'duplicate': duplicate['name'],
+                    'duplicate_donations': duplicate['donation_count'],
+                    'score': round(score, 3)
+                })
+
+        suggestions.sort(key=lambda s: (-s['score'], s['donor'].lower(), s['duplicate'].lower()))
+        return suggestions
+
+    def merge_donors(self, duplicate_id: int, target_id: int) -> int:
+        """
+        Merge a duplicate donor into another donor.
+
+        The duplicate's donations are re-pointed at the target (the donor
+        names on the transactions are left as entered), and future donations
+        under the duplicate's spelling are linked to the target.
+
+        Archived transactions are read-only and keep the duplicate's id;
+        donor rollups resolve them through donors.merged_into_id when read.
+
+        Args:
+            duplicate_id: Donor to merge away
+            target_id: Donor to keep
+
+        Returns:
+            Number of transactions moved
+        """
+        with self.db_manager.transaction() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(
+                "SELECT id, merged_into_id FROM donors WHERE id IN (?, ?)",
+                (duplicate_id, target_id)
+            )
+            rows = {row['id']: row for row in cursor.fetchall()}
+            for donor_id in (duplicate_id, target_id):
+                if donor_id not in rows:
+                    raise ValueError(f"Donor with ID {donor_id} not found")
+            if rows[duplicate_id]['merged_into_id'] is not None:
+                raise ValueError(f"Donor with ID {duplicate_id} is already merged")
+
+            target_id = rows[target_id]['merged_into_id'] or target_id
+            if target_id == duplicate_id:
+                raise ValueError("Cannot merge a donor into itself")
+
+            # Counted up front: rowcount is not set when the ledger is a view
+            cursor.execute(
+                "SELECT COUNT(*) FROM inventory_transactions WHERE donor_id = ?",
+                (duplicate_id,)
+            )
+            moved = cursor.fetchone()[0]
+            cursor.execute(
+                "UPDATE inventory_transactions SET donor_id = ? WHERE donor_id = ?",
+                (target_id, duplicate_id)
+            )
+
+            # Earlier merges into the duplicate follow it to the target
+            cursor.execute("""
+                UPDATE donors SET merged_into_id = ?
+                WHERE id = ? OR merged_into_id = ?
+            """, (target_id, duplicate_id, duplicate_id))
+
+        get_event_bus(self.db_manager).publish(DonorsMerged(duplicate_id, target_id))
+        return moved
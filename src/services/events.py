@@ -0,0 +1,228 @@
+"""
+Change events for AIOps Studio - Inventory.
+
+InventoryService publishes a typed event after every committed write, with
+the ids it affected (one event per commit, so a multi-line write such as an
+intake batch is announced once). Subscribers (the items table, the dashboard, the
+analytics result cache) update only what the event touches instead of
+reloading everything.
+
+There is one bus per database (DatabaseManager), so services working on
+another database (e.g. a pantry being consolidated) never see the
+application's events. Handlers run synchronously, in the thread that made
+the write, after the transaction has committed. A failing handler is
+logged and does not affect the write or the other handlers.
+
+Usage:
+    bus = get_event_bus(db_manager)
+    unsubscribe = bus.subscribe(on_change, TransactionAdded, TransactionVoided)
+    ...
+    unsubscribe()
+"""
+
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Callable, List, Tuple, Type
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+# ============================================================================
+# EVENTS
+# ============================================================================
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """Base class of all change events; subscribe to it to receive all."""
+
+    @property
+    def item_ids(self) -> Tuple[int, ...]:
+        """Ids of the inventory items whose row changed."""
+        return ()
+
+
+@dataclass(frozen=True)
+class ItemCreated(ChangeEvent):
+    """A new inventory item was created."""
+
+    item_id: int
+
+    @property
+    def item_ids(self) -> Tuple[int, ...]:
+        return (self.item_id,)
+
+
+@dataclass(frozen=True)
+class ItemUpdated(ChangeEvent):
+    """An item's details changed (including soft delete: is_active False)."""
+
+    item_id: int
+    is_active: bool = True
+
+    @property
+    def item_ids(self) -> Tuple[int, ...]:
+        return (self.item_id,)
+
+
+@dataclass(frozen=True)
+class TransactionAdded(ChangeEvent):
+    """A purchase, donation or distribution was recorded."""
+
+    transaction_id: int
+    item_id: int
+    transaction_type: str
+
+    @property
+    def item_ids(self) -> Tuple[int, ...]:
+        return (self.item_id,)
+
+
+@dataclass(frozen=True)
+class TransactionsAdded(ChangeEvent):
+    """Several transactions of one type were recorded in one commit
+    (an intake batch, a client visit's basket)."""
+
+    transaction_ids: Tuple[int, ...]
+    affected_item_ids: Tuple[int, ...]  # Distinct, in first-line order
+    transaction_type: str
+
+    @property
+    def item_ids(self) -> Tuple[int, ...]:
+        return self.affected_item_ids
+
+
+@dataclass(frozen=True)
+class TransactionVoided(ChangeEvent):
+    """A transaction was voided by a correction transaction."""
+
+    transaction_id: int
+    correction_id: int
+    item_id: int
+    transaction_type: str  # Type of the voided transaction
+
+    @property
+    def item_ids(self) -> Tuple[int, ...]:
+        return (self.item_id,)
+
+
+@dataclass(frozen=True)
+class StockTakePosted(ChangeEvent):
+    """A stock take's count adjustments were posted as corrections."""
+
+    stock_take_id: int
+    adjusted_item_ids: Tuple[int, ...]
+
+    @property
+    def item_ids(self) -> Tuple[int, ...]:
+        return self.adjusted_item_ids
+
+
+@dataclass(frozen=True)
+class DonorsMerged(ChangeEvent):
+    """A duplicate donor's donations were moved to another donor."""
+
+    source_id: int
+    target_id: int
+
+
+# ============================================================================
+# BUS
+# ============================================================================
+
+Handler = Callable[[ChangeEvent], None]
+
+
+class EventBus:
+    """Synchronous publish/subscribe for change events."""
+
+    def __init__(self):
+        """Initialize an event bus with no subscribers."""
+        self._subscribers: List[Tuple[Tuple[Type[ChangeEvent], ...], Callable, bool]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(
+        self,
+        handler: Handler,
+        *event_types: Type[ChangeEvent],
+        weak: bool = False
+    ) -> Callable[[], None]:
+        """
+        Call ``handler`` for every published event of the given types.
+
+        Args:
+            handler: Called with the event
+            *event_types: Event classes to receive (default: all events)
+            weak: Hold a bound method weakly, so the subscription does not
+                keep its object alive (it ends when the object is collected)
+
+        Returns:
+            Callable that removes the subscription
+        """
+        if weak:
+            handler = weakref.WeakMethod(handler)
+        entry = (event_types or (ChangeEvent,), handler, weak)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def unsubscribe():
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+
+        return unsubscribe
+
+    def publish(self, event: ChangeEvent):
+        """
+        Deliver an event to its subscribers, in subscription order.
+
+        Args:
+            event: The event
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for entry in subscribers:
+            event_types, handler, weak = entry
+            if not isinstance(event, event_types):
+                continue
+            if weak:
+                handler = handler()
+                if handler is None:
+                    with self._lock:
+                        if entry in self._subscribers:
+                            self._subscribers.remove(entry)
+                    continue
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"Event handler {handler!r} failed for {event}: {e}")
+
+    def subscriber_count(self) -> int:
+        """Number of active subscriptions."""
+        with self._lock:
+            return len(self._subscribers)
+
+
+# One bus per DatabaseManager, dropped with the manager
+_buses: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_buses_lock = threading.Lock()
+
+
+def get_event_bus(db_manager) -> EventBus:
+    """
+    Get the event bus for a database.
+
+    Args:
+        db_manager: DatabaseManager the events are about
+
+    Returns:
+        EventBus: The database's bus (created on first use)
+    """
+    with _buses_lock:
+        bus = _buses.get(db_manager)
+        if bus is None:
+            bus = EventBus()
+            _buses[db_manager] = bus
+    return bus
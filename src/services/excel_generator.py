@@ -284,6 +284,70 @@ class ExcelReportGenerator:
         
         return str(filepath)
 
+    def generate_category_rollup_report(self, data: Dict) -> str:
+        """
+        Generate category rollup report Excel file.
+        
+        Args:
+            data: Category rollup data from ReportingService.get_category_rollup()
+            
+        Returns:
+            str: Path to generated Excel file
+        """
+        # Generate filename
+        today = date.today().isoformat()
+        filename = f"category_rollup_report_{today}.xlsx"
+        filepath = self.output_dir / filename
+        
+        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+            # Summary sheet
+            summary_data = {
+                'Metric': [
+                    'Total Inventory Value',
+                    'Total Distributed Quantity',
+                    'Uncategorized Value',
+                    'Date Range'
+                ],
+                'Value': [
+                    f"${data['total_value_dollars']:,.2f}",
+                    data['total_distributed_qty'],
+                    f"${data['uncategorized']['value_dollars']:,.2f}",
+                    f"{data['start_date'] or 'All'} to {data['end_date'] or 'All'}"
+                ]
+            }
+            pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
+            
+            # Category tree sheet; subcategories are indented under parents
+            categories_data = []
+            for category in data['categories']:
+                categories_data.append({
+                    'Category': '    ' * category['depth'] + category['name'],
+                    'Level': category['depth'],
+                    'Items': category['item_count'],
+                    'Quantity on Hand': category['quantity_on_hand'],
+                    'Value': category['value_dollars'],
+                    'Distributed Qty': category['distributed_qty'],
+                    'Distributed Value': category['distributed_value_dollars']
+                })
+            
+            categories_df = pd.DataFrame(categories_data, columns=[
+                'Category', 'Level', 'Items', 'Quantity on Hand', 'Value',
+                'Distributed Qty', 'Distributed Value'
+            ])
+            categories_df.to_excel(writer, sheet_name='Categories', index=False)
+            
+            # Format columns
+            worksheet = writer.sheets['Categories']
+            worksheet.column_dimensions['A'].width = 35
+            for column in 'BCDEFG':
+                worksheet.column_dimensions[column].width = 16
+            
+            ws_summary = writer.sheets['Summary']
+            ws_summary.column_dimensions['A'].width = 28
+            ws_summary.column_dimensions['B'].width = 25
+        
+        return str(filepath)
+
     def generate_inventory_forecast_report(self, data: list) -> str:
         """
         Generate inventory forecast report Excel file.
@@ -0,0 +1,394 @@
+"""
+Rapid-scan intake sessions for AIOps Studio - Inventory.
+
+At a food drive every scanned barcode used to be its own modal dialog and
+its own commit. An IntakeSession takes scans into an in-memory buffer that
+merges repeated SKUs and writes it with one group commit
+(InventoryService.process_intake_batch) every ``flush_every`` scans or
+``flush_interval_ms`` milliseconds, so scanning speed is set by the scanner
+rather than by disk syncs.
+
+Crash safety: each scan is appended to the session's journal file (JSON
+lines, synced to disk) before it is buffered, and each group commit stores
+the last journal sequence number it contains in intake_sessions in the
+same database transaction. After a crash, recover_session() replays
+exactly the journaled scans that never reached the database.
+
+Usage:
+    session = IntakeSession(service, TransactionType.DONATION, source="Food Drive")
+    session.scan("012345678905")        # returns the item's tally line
+    session.flush_if_due()              # from a timer
+    session.close()                     # flushes and removes the journal
+
+    for path in find_unfinished_journals(db_path):
+        recover_session(service, path)
+"""
+
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from models.transaction import TransactionType
+from services.inventory_service import InventoryService
+from services.period_close_service import is_period_closed, period_of
+from utils.app_paths import get_intake_journal_dir
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class TallyLine:
+    """Running total of one item in a session."""
+
+    item_id: int
+    sku: str
+    name: str
+    quantity: float = 0.0            # Scanned so far (committed + pending)
+    committed_quantity: float = 0.0  # Already in the database
+    scans: int = 0
+
+    @property
+    def pending_quantity(self) -> float:
+        return self.quantity - self.committed_quantity
+
+
+def _abspath(db_path: str) -> str:
+    return db_path if db_path == ":memory:" else os.path.abspath(db_path)
+
+
+class IntakeSession:
+    """Buffered, journaled purchase or donation intake for barcode scanning."""
+
+    def __init__(
+        self,
+        service: InventoryService,
+        transaction_type: TransactionType = TransactionType.DONATION,
+        source: Optional[str] = None,
+        notes: Optional[str] = None,
+        unit_value_dollars: Optional[float] = None,
+        flush_every: int = 50,
+        flush_interval_ms: int = 2000,
+        journal_dir: Optional[Path] = None,
+        sync_journal: bool = True
+    ):
+        """
+        Start a session.
+
+        Args:
+            service: InventoryService to write through
+            transaction_type: PURCHASE or DONATION for every scan
+            source: Supplier or donor of the whole session
+            notes: Notes stored on every transaction
+            unit_value_dollars: Default unit cost (purchases) or fair market
+                value per unit (donations); None uses the item's current
+                unit cost for purchases and 0 for donations
+            flush_every: Group-commit after this many buffered scans
+            flush_interval_ms: ...or once the oldest buffered scan is this old
+                (checked by scan() and flush_if_due())
+            journal_dir: Where the journal is kept (default: app data)
+            sync_journal: fsync the journal after every scan (turn off only
+                where losing the last scans on power loss is acceptable)
+
+        Raises:
+            ValueError: If the type is not PURCHASE/DONATION or flush_every < 1
+        """
+        if transaction_type not in (TransactionType.PURCHASE, TransactionType.DONATION):
+            raise ValueError("Intake sessions record purchases or donations")
+        if flush_every < 1:
+            raise ValueError("flush_every must be at least 1")
+
+        self.service = service
+        self.transaction_type = transaction_type
+        self.source = source
+        self.notes = notes
+        self.unit_value_dollars = unit_value_dollars
+        self.flush_every = flush_every
+        self.flush_interval_ms = flush_interval_ms
+        self.sync_journal = sync_journal
+
+        self.id = uuid.uuid4().hex
+        self.tally: Dict[int, TallyLine] = {}
+        self.scan_count = 0
+        self.committed_scans = 0
+        self.batches = 0
+        self._seq = 0
+        self._pending: Dict[Tuple[int, float], List] = {}  # (item, value) -> [qty, date]
+        self._pending_scans = 0
+        self._oldest_pending: Optional[float] = None
+        self._items: Dict[str, Tuple[int, str, float]] = {}  # sku -> (id, name, unit cost)
+
+        with service.db_manager.transaction() as conn:
+            conn.execute(
+                "INSERT INTO intake_sessions (id, transaction_type, source) VALUES (?, ?, ?)",
+                (self.id, transaction_type.value, source))
+
+        self.journal_path = Path(journal_dir or get_intake_journal_dir()) / f"{self.id}.jsonl"
+        self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        self._write_journal({
+            'session': self.id,
+            'db': _abspath(service.db_manager.db_path),
+            'type': transaction_type.value,
+            'source': source,
+            'notes': notes,
+        })
+
+    # =========================================================================
+    # SCANNING
+    # =========================================================================
+
+    @property
+    def pending_scans(self) -> int:
+        """Scans buffered but not yet committed."""
+        return self._pending_scans
+
+    def scan(
+        self,
+        sku: str,
+        quantity: float = 1.0,
+        unit_value_dollars: Optional[float] = None
+    ) -> TallyLine:
+        """
+        Record a scan.
+
+        The scan is journaled, buffered (merged with earlier scans of the
+        same item and value) and committed with the next group commit.
+
+        Args:
+            sku: Scanned SKU
+            quantity: Units scanned
+            unit_value_dollars: Overrides the session's unit value
+
+        Returns:
+            TallyLine: The item's running total
+
+        Raises:
+            ValueError: If the SKU is unknown or the quantity/value invalid
+                (nothing is recorded). An error from a group commit this scan
+                triggered is raised too; the scan itself stays recorded.
+        """
+        if quantity <= 0:
+            raise ValueError("Intake quantity must be positive")
+        item_id, name, unit_cost = self._resolve(sku.strip())
+        value = unit_value_dollars
+        if value is None:
+            value = self.unit_value_dollars
+        if value is None:
+            value = unit_cost if self.transaction_type == TransactionType.PURCHASE else 0.0
+        if value < 0:
+            raise ValueError("Unit value cannot be negative")
+
+        at = datetime.now().isoformat()
+        self._seq += 1
+        self._write_journal({'seq': self._seq, 'item_id': item_id, 'quantity': quantity,
+                             'value': value, 'at': at})
+
+        line = self._pending.setdefault((item_id, value), [0.0, at])
+        line[0] += quantity
+        line[1] = at
+        self._pending_scans += 1
+        if self._oldest_pending is None:
+            self._oldest_pending = time.monotonic()
+        self.scan_count += 1
+
+        tally = self.tally.get(item_id)
+        if tally is None:
+            tally = self.tally[item_id] = TallyLine(item_id, sku.strip(), name)
+        tally.quantity += quantity
+        tally.scans += 1
+
+        if self._pending_scans >= self.flush_every:
+            self.flush()
+        else:
+            self.flush_if_due()
+        return tally
+
+    def _resolve(self, sku: str) -> Tuple[int, str, float]:
+        """Item for a SKU, from the database only the first time it is scanned."""
+        cached = self._items.get(sku)
+        if cached is None:
+            item = self.service.get_item_by_sku(sku)
+            if item is None or not item.is_active:
+                raise ValueError(f"Unknown SKU: {sku}")
+            cached = self._items[sku] = (item.id, item.name, item.current_unit_cost_dollars)
+        return cached
+
+    # =========================================================================
+    # GROUP COMMIT
+    # =========================================================================
+
+    def flush_if_due(self) -> int:
+        """
+        Flush if the oldest buffered scan has waited flush_interval_ms.
+
+        Returns:
+            int: Number of scans committed (0 if not due)
+        """
+        if (self._oldest_pending is not None and
+                (time.monotonic() - self._oldest_pending) * 1000 >= self.flush_interval_ms):
+            return self.flush()
+        return 0
+
+    def flush(self) -> int:
+        """
+        Commit the buffered scans in one transaction.
+
+        If the write fails the buffer is kept (and still journaled), so the
+        next flush retries it.
+
+        Returns:
+            int: Number of scans committed
+        """
+        if not self._pending:
+            return 0
+        lines = [(item_id, quantity, value, at)
+                 for (item_id, value), (quantity, at) in self._pending.items()]
+        self.service.process_intake_batch(
+            self.transaction_type, lines, source=self.source, notes=self.notes,
+            intake_session=(self.id, self._seq))
+
+        for item_id, quantity, _value, _at in lines:
+            self.tally[item_id].committed_quantity += quantity
+        flushed = self._pending_scans
+        self.committed_scans += flushed
+        self.batches += 1
+        self._pending.clear()
+        self._pending_scans = 0
+        self._oldest_pending = None
+        return flushed
+
+    def close(self) -> int:
+        """
+        Flush, mark the session closed and remove its journal.
+
+        Returns:
+            int: Number of scans committed by the final flush
+        """
+        flushed = self.flush()
+        with self.service.db_manager.transaction() as conn:
+            conn.execute(
+                "UPDATE intake_sessions SET closed_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (self.id,))
+        self._journal.close()
+        self.journal_path.unlink(missing_ok=True)
+        return flushed
+
+    def _write_journal(self, record: dict):
+        self._journal.write(json.dumps(record) + "\n")
+        self._journal.flush()
+        if self.sync_journal:
+            os.fsync(self._journal.fileno())
+
+
+# ============================================================================
+# RECOVERY
+# ============================================================================
+
+def _read_journal(path: Path) -> Tuple[dict, List[dict]]:
+    """Header and scans of a journal; a torn last line (crash mid-write) is skipped."""
+    header, scans = None, []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping incomplete journal line in {path.name}")
+                continue
+            if header is None:
+                header = record
+            else:
+                scans.append(record)
+    if header is None or 'session' not in header:
+        raise ValueError(f"Not an intake journal: {path}")
+    return header, scans
+
+
+def find_unfinished_journals(db_path: str, journal_dir: Optional[Path] = None) -> List[Path]:
+    """
+    Journals of sessions on a database that were never closed.
+
+    Args:
+        db_path: Database the sessions wrote to
+        journal_dir: Journal directory (default: app data)
+
+    Returns:
+        List of journal paths, oldest first
+    """
+    journal_dir = Path(journal_dir or get_intake_journal_dir())
+    found = []
+    for path in sorted(journal_dir.glob("*.jsonl"), key=lambda p: p.stat().st_mtime):
+        try:
+            header, _scans = _read_journal(path)
+        except (OSError, ValueError):
+            continue
+        if header.get('db') == _abspath(db_path):
+            found.append(path)
+    return found
+
+
+def recover_session(service: InventoryService, journal_path: Path) -> int:
+    """
+    Commit the scans of an interrupted session that never reached the
+    database, then close the session and remove its journal.
+
+    Scans keep their scan time, except those in a month closed since the
+    crash (the period lock rejects them): they are booked now, and the
+    batch notes say which months were moved.
+
+    Args:
+        service: InventoryService on the session's database
+        journal_path: The session's journal
+
+    Returns:
+        int: Number of scans recovered
+
+    Raises:
+        ValueError: If the journal belongs to another database or session
+            is unknown
+    """
+    header, scans = _read_journal(Path(journal_path))
+    if header['db'] != _abspath(service.db_manager.db_path):
+        raise ValueError(f"Journal {Path(journal_path).name} belongs to {header['db']}")
+    conn = service.db_manager.get_connection()
+    row = conn.execute(
+        "SELECT committed_seq FROM intake_sessions WHERE id = ?", (header['session'],)
+    ).fetchone()
+    if row is None:
+        raise ValueError(f"Unknown intake session: {header['session']}")
+
+    missing = [scan for scan in scans if scan['seq'] > row[0]]
+    if missing:
+        now = datetime.now().isoformat()
+        closed = sorted({period_of(scan['at']) for scan in missing
+                         if is_period_closed(conn, scan['at'])})
+        merged: Dict[Tuple[int, float], List] = {}
+        for scan in missing:
+            at = now if period_of(scan['at']) in closed else scan['at']
+            line = merged.setdefault((scan['item_id'], scan['value']), [0.0, at])
+            line[0] += scan['quantity']
+            line[1] = at
+        notes = header.get('notes')
+        if closed:
+            moved = (f"Recovered intake: scans from closed period(s) "
+                     f"{', '.join(closed)} booked on {now[:10]}")
+            notes = f"{notes} ({moved})" if notes else moved
+            logger.warning(f"Intake session {header['session']}: {moved}")
+        service.process_intake_batch(
+            TransactionType(header['type']),
+            [(item_id, quantity, value, at)
+             for (item_id, value), (quantity, at) in merged.items()],
+            source=header.get('source'), notes=notes,
+            intake_session=(header['session'], missing[-1]['seq']))
+        logger.info(f"Recovered {len(missing)} scans of intake session {header['session']}")
+
+    with service.db_manager.transaction() as conn:
+        conn.execute(
+            "UPDATE intake_sessions SET closed_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (header['session'],))
+    Path(journal_path).unlink(missing_ok=True)
+    return len(missing)
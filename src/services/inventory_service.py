@@ -8,26 +8,40 @@ Business logic layer for inventory operations including:
 - Item CRUD operations
 """
 
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from datetime import datetime
 
 from models.item import InventoryItem
 from models.transaction import Transaction, TransactionType, ReasonCode
 from models.category import Category
-from database.connection import get_db_manager
+from models.compact import CompactItem, CompactTransaction, map_rows
+from database.connection import DatabaseManager, get_db_manager
+from services.events import (
+    ItemCreated, ItemUpdated, TransactionAdded, TransactionsAdded, TransactionVoided,
+    get_event_bus
+)
+from services.period_close_service import is_period_closed, period_of
 
 
 class InventoryService:
     """Service layer for inventory operations."""
     
-    def __init__(self, db_path: str = "inventory.db"):
+    def __init__(
+        self,
+        db_path: str = "inventory.db",
+        db_manager: Optional[DatabaseManager] = None
+    ):
         """
         Initialize inventory service.
         
         Args:
             db_path: Path to the database file
+            db_manager: Manager to use instead of the application's
+                (e.g. one with different locking settings)
         """
-        self.db_manager = get_db_manager(db_path)
+        self.db_manager = db_manager or get_db_manager(db_path)
+        # Change events are published after each committed write
+        self.events = get_event_bus(self.db_manager)
     
     # ========================================================================
     # ITEM CRUD OPERATIONS
@@ -76,6 +90,7 @@ class InventoryService:
             cursor.execute("SELECT * FROM inventory_items WHERE id = ?", (item_id,))
             row = cursor.fetchone()
             
+        self.events.publish(ItemCreated(item_id))
         return InventoryItem.from_db_row(row)
     
     def get_item(self, item_id: int) -> Optional[InventoryItem]:
@@ -98,6 +113,32 @@ class InventoryService:
             return InventoryItem.from_db_row(row)
         return None
     
+    def get_items(self, item_ids: Iterable[int]) -> Dict[int, InventoryItem]:
+        """
+        Get several items by ID with one query.
+        
+        Args:
+            item_ids: Item IDs
+            
+        Returns:
+            Dict of item ID -> InventoryItem (IDs not found are left out)
+        """
+        item_ids = list(item_ids)
+        if not item_ids:
+            return {}
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        items = {}
+        # Chunked to stay under SQLite's bound-parameter limit
+        for start in range(0, len(item_ids), 500):
+            chunk = item_ids[start:start + 500]
+            cursor.execute(
+                f"SELECT * FROM inventory_items WHERE id IN ({', '.join('?' * len(chunk))})",
+                chunk)
+            items.update((row['id'], InventoryItem.from_db_row(row)) for row in cursor.fetchall())
+        return items
+    
     def get_item_by_sku(self, sku: str) -> Optional[InventoryItem]:
         """
         Get item by SKU.
@@ -118,15 +159,21 @@ class InventoryService:
             return InventoryItem.from_db_row(row)
         return None
     
-    def get_all_items(self, active_only: bool = True) -> List[InventoryItem]:
+    def get_all_items(
+        self,
+        active_only: bool = True,
+        compact: bool = False
+    ) -> Union[List[InventoryItem], List[CompactItem]]:
         """
         Get all inventory items.
         
         Args:
             active_only: If True, only return active items
+            compact: If True, return read-only CompactItem objects
+                (slotted, timestamps parsed on access) for bulk reads
             
         Returns:
-            List of InventoryItem
+            List of InventoryItem (or CompactItem)
         """
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
@@ -136,17 +183,28 @@ class InventoryService:
         else:
             cursor.execute("SELECT * FROM inventory_items ORDER BY name")
         
+        if compact:
+            return map_rows(cursor, CompactItem)
         return [InventoryItem.from_db_row(row) for row in cursor.fetchall()]
     
-    def search_items_by_prefix(self, prefix: str, limit: int = 15) -> List[InventoryItem]:
+    def search_items_by_prefix(
+        self,
+        prefix: str,
+        limit: int = 15,
+        after_sku: Optional[str] = None
+    ) -> List[InventoryItem]:
         """
         Search active items by SKU or name prefix for autocomplete.
         
         Uses LIKE query which leverages the idx_items_sku index for SKU matches.
+        Passing the last SKU of a page as ``after_sku`` returns the next page
+        (keyset pagination), so a list can be fetched as it is scrolled.
         
         Args:
-            prefix: The prefix to search for (minimum 2 chars recommended)
+            prefix: The prefix to search for (minimum 2 chars recommended;
+                empty matches every active item)
             limit: Maximum results to return
+            after_sku: Only return items whose SKU sorts after this one
             
         Returns:
             List of matching InventoryItem, ordered by SKU
@@ -155,13 +213,17 @@ class InventoryService:
         cursor = conn.cursor()
         
         pattern = f"{prefix}%"
+        # The range on sku (and +is_active, which keeps idx_items_active
+        # out of the plan) makes SQLite walk idx_items_sku in order and stop
+        # after ``limit`` rows instead of sorting every active item
         cursor.execute("""
             SELECT * FROM inventory_items 
-            WHERE is_active = 1 
+            WHERE +is_active = 1 
               AND (sku LIKE ? OR name LIKE ?)
+              AND sku > ?
             ORDER BY sku
             LIMIT ?
-        """, (pattern, pattern, limit))
+        """, (pattern, pattern, after_sku or "", limit))
         
         return [InventoryItem.from_db_row(row) for row in cursor.fetchall()]
     
@@ -216,7 +278,9 @@ class InventoryService:
             cursor.execute("SELECT * FROM inventory_items WHERE id = ?", (item_id,))
             row = cursor.fetchone()
             
-        return InventoryItem.from_db_row(row)
+        item = InventoryItem.from_db_row(row)
+        self.events.publish(ItemUpdated(item_id, item.is_active))
+        return item
     
     def soft_delete_item(self, item_id: int) -> InventoryItem:
         """
@@ -240,22 +304,23 @@ class InventoryService:
             cursor.execute("SELECT * FROM inventory_items WHERE id = ?", (item_id,))
             row = cursor.fetchone()
             
+        self.events.publish(ItemUpdated(item_id, is_active=False))
         return InventoryItem.from_db_row(row)
     
     def get_items_below_threshold(self) -> List[InventoryItem]:
         """
-        Get all items below their reorder threshold.
+        Get all active items below their reorder threshold.
         
         Returns:
-            List of InventoryItem below threshold
+            List of InventoryItem below threshold, by name
         """
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
         
+        # Walks the idx_items_low_stock partial index (low stock items only)
         cursor.execute("""
-            SELECT * FROM inventory_items 
-            WHERE is_active = 1 
-            AND quantity_on_hand < reorder_threshold
+            SELECT * FROM inventory_items
+            WHERE is_low_stock = 1
             ORDER BY name
         """)
         
@@ -265,6 +330,29 @@ class InventoryService:
     # TRANSACTION PROCESSING - THE CORE BUSINESS LOGIC
     # ========================================================================
     
+    def _publish_transaction(self, transaction: Transaction):
+        self.events.publish(TransactionAdded(
+            transaction.id, transaction.item_id, transaction.transaction_type.value))
+
+    @staticmethod
+    def _inserted_transaction_id(cursor) -> int:
+        """
+        Get the ID of the transaction the cursor just inserted.
+
+        cursor.lastrowid is not set when inventory_transactions is the
+        compact ledger's view (see database.compact_ledger). Inside the
+        write transaction no other connection can insert, so the newest
+        row is ours.
+
+        Args:
+            cursor: Cursor that ran the INSERT
+
+        Returns:
+            int: The new transaction ID
+        """
+        cursor.execute("SELECT MAX(id) FROM inventory_transactions")
+        return cursor.fetchone()[0]
+
     def process_purchase(
         self,
         item_id: int,
@@ -336,7 +424,7 @@ class InventoryService:
             """, (item_id, TransactionType.PURCHASE.value, quantity, 
                   unit_cost_cents, supplier, notes, transaction_date))
             
-            transaction_id = cursor.lastrowid
+            transaction_id = self._inserted_transaction_id(cursor)
             
             # Fetch updated item and transaction
             cursor.execute("SELECT * FROM inventory_items WHERE id = ?", (item_id,))
@@ -346,6 +434,7 @@ class InventoryService:
                          (transaction_id,))
             transaction = Transaction.from_db_row(cursor.fetchone())
         
+        self._publish_transaction(transaction)
         return updated_item, transaction
     
     def process_donation(
@@ -412,7 +501,7 @@ class InventoryService:
             """, (item_id, TransactionType.DONATION.value, quantity, 
                   0, total_fmv_cents, donor, notes, transaction_date))
             
-            transaction_id = cursor.lastrowid
+            transaction_id = self._inserted_transaction_id(cursor)
             
             # Fetch updated item and transaction
             cursor.execute("SELECT * FROM inventory_items WHERE id = ?", (item_id,))
@@ -422,8 +511,109 @@ class InventoryService:
                          (transaction_id,))
             transaction = Transaction.from_db_row(cursor.fetchone())
         
+        self._publish_transaction(transaction)
         return updated_item, transaction
     
+    def process_intake_batch(
+        self,
+        transaction_type: TransactionType,
+        lines: List[Tuple[int, float, float, str]],
+        source: Optional[str] = None,
+        notes: Optional[str] = None,
+        intake_session: Optional[Tuple[str, int]] = None
+    ) -> List[int]:
+        """
+        Record many purchases or donations in one transaction (group commit).
+        
+        Each line is booked exactly as process_purchase() or
+        process_donation() would book it, but the whole batch shares one
+        commit, so a scanning session pays for one disk sync per batch
+        instead of one per item. Either every line is recorded or none is.
+        
+        Args:
+            transaction_type: PURCHASE or DONATION
+            lines: (item_id, quantity, unit value in dollars, transaction
+                date as ISO string) tuples; the unit value is the unit cost
+                for purchases and the fair market value per unit for donations
+            source: Supplier (purchases) or donor (donations)
+            notes: Notes stored on every transaction
+            intake_session: (session id, journal sequence number) recorded
+                as committed in intake_sessions within the same transaction
+                (see services.intake_session)
+            
+        Returns:
+            List of the new transaction IDs, in line order
+            
+        Raises:
+            ValueError: If the type is not an intake type, an item is not
+                found, or a quantity/value is invalid
+        """
+        if transaction_type not in (TransactionType.PURCHASE, TransactionType.DONATION):
+            raise ValueError("Intake batches must be purchases or donations")
+        for _item_id, quantity, unit_value, _date in lines:
+            if quantity <= 0:
+                raise ValueError("Intake quantity must be positive")
+            if unit_value < 0:
+                raise ValueError("Unit value cannot be negative")
+        
+        is_purchase = transaction_type == TransactionType.PURCHASE
+        transaction_ids = []
+        
+        with self.db_manager.transaction() as conn:
+            cursor = conn.cursor()
+            items = {}
+            
+            for item_id, quantity, unit_value, transaction_date in lines:
+                item = items.get(item_id)
+                if item is None:
+                    cursor.execute("SELECT * FROM inventory_items WHERE id = ?", (item_id,))
+                    row = cursor.fetchone()
+                    if not row:
+                        raise ValueError(f"Item with ID {item_id} not found")
+                    item = items[item_id] = InventoryItem.from_db_row(row)
+                
+                # Same conversions as the single-transaction methods
+                unit_value_cents = int(unit_value * 100)
+                if is_purchase:
+                    item.quantity_on_hand, item.total_cost_basis_cents = \
+                        item.calculate_purchase_state(quantity, int(quantity * unit_value_cents))
+                    cursor.execute("""
+                        INSERT INTO inventory_transactions
+                        (item_id, transaction_type, quantity_change, unit_cost_cents, 
+                         supplier, notes, transaction_date)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """, (item_id, transaction_type.value, quantity,
+                          unit_value_cents, source, notes, transaction_date))
+                else:
+                    item.quantity_on_hand += quantity
+                    cursor.execute("""
+                        INSERT INTO inventory_transactions
+                        (item_id, transaction_type, quantity_change, unit_cost_cents,
+                         fair_market_value_cents, donor, notes, transaction_date)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (item_id, transaction_type.value, quantity,
+                          0, int(quantity * unit_value_cents), source, notes, transaction_date))
+                transaction_ids.append(self._inserted_transaction_id(cursor))
+            
+            # One update per item, however many lines it had
+            cursor.executemany("""
+                UPDATE inventory_items
+                SET quantity_on_hand = ?,
+                    total_cost_basis_cents = ?
+                WHERE id = ?
+            """, [(item.quantity_on_hand, item.total_cost_basis_cents, item.id)
+                  for item in items.values()])
+            
+            if intake_session is not None:
+                session_id, sequence = intake_session
+                cursor.execute("""
+                    UPDATE intake_sessions SET committed_seq = ? WHERE id = ?
+                """, (sequence, session_id))
+        
+        self.events.publish(TransactionsAdded(
+            tuple(transaction_ids), tuple(items), transaction_type.value))
+        return transaction_ids
+    
     def process_distribution(
         self,
         item_id: int,
@@ -496,7 +686,7 @@ class InventoryService:
                   unit_cost_cents, total_financial_impact_cents, reason_str, notes,
                   transaction_date))
             
-            transaction_id = cursor.lastrowid
+            transaction_id = self._inserted_transaction_id(cursor)
             
             # Fetch updated item and transaction
             cursor.execute("SELECT * FROM inventory_items WHERE id = ?", (item_id,))
@@ -506,8 +696,128 @@ class InventoryService:
                          (transaction_id,))
             transaction = Transaction.from_db_row(cursor.fetchone())
         
+        self._publish_transaction(transaction)
         return updated_item, transaction
-    
+
+    def process_distribution_basket(
+        self,
+        lines: List[Tuple[int, float]],
+        reason_code: str = ReasonCode.CLIENT.value,
+        notes: Optional[str] = None,
+        visit_id: Optional[str] = None
+    ) -> Tuple[List[InventoryItem], List[Transaction]]:
+        """
+        Process a client visit: several distributions committed together.
+
+        Stock for every line is checked with one query before anything is
+        written, COGS is calculated per line exactly as process_distribution()
+        would calculate it, and all transactions and item updates share one
+        commit. Either the whole basket is recorded or none of it is.
+
+        Args:
+            lines: (item_id, quantity) tuples; an item may appear more than once
+            reason_code: Reason for every line (CLIENT, SPOILAGE, INTERNAL)
+            notes: Notes stored on every transaction (optional)
+            visit_id: Records the lines as one visit in client_visits (optional)
+
+        Returns:
+            Tuple of (updated InventoryItems in first-line order,
+            Transactions in line order)
+
+        Raises:
+            ValueError: If the basket is empty, a quantity is invalid, an item
+                is not found, any item has too little stock for its lines
+                (all short items are listed), or the visit ID is taken
+        """
+        if not lines:
+            raise ValueError("The basket is empty")
+        requested = {}
+        for item_id, quantity in lines:
+            if quantity <= 0:
+                raise ValueError("Distribution quantity must be positive")
+            requested[item_id] = requested.get(item_id, 0) + quantity
+
+        reason_str = reason_code.value if hasattr(reason_code, 'value') else reason_code
+        transaction_date = datetime.now().isoformat()
+        placeholders = ", ".join("?" * len(requested))
+
+        # IMMEDIATE whatever the manager's setting: the stock checked here
+        # must not change before the basket is written
+        with self.db_manager.transaction("IMMEDIATE") as conn:
+            cursor = conn.cursor()
+
+            # One query for every item in the basket
+            cursor.execute(
+                f"SELECT * FROM inventory_items WHERE id IN ({placeholders})",
+                tuple(requested))
+            items = {item.id: item for item in map(InventoryItem.from_db_row, cursor.fetchall())}
+
+            for item_id in requested:
+                if item_id not in items:
+                    raise ValueError(f"Item with ID {item_id} not found")
+            short = [
+                f"{items[item_id].name} (available: {items[item_id].quantity_on_hand}, "
+                f"requested: {quantity})"
+                for item_id, quantity in requested.items()
+                if not items[item_id].can_distribute(quantity)
+            ]
+            if short:
+                raise ValueError("Insufficient inventory: " + "; ".join(short))
+
+            if visit_id is not None:
+                cursor.execute("SELECT 1 FROM client_visits WHERE id = ?", (visit_id,))
+                if cursor.fetchone():
+                    raise ValueError(f"Visit {visit_id} is already recorded")
+
+            transaction_ids = []
+            for item_id, quantity in lines:
+                item = items[item_id]
+                # Unit cost before the update, as in process_distribution()
+                unit_cost_cents = item.current_unit_cost_cents
+                item.quantity_on_hand, item.total_cost_basis_cents, cogs_cents = \
+                    item.calculate_distribution_state(quantity)
+                cursor.execute("""
+                    INSERT INTO inventory_transactions
+                    (item_id, transaction_type, quantity_change, unit_cost_cents,
+                     total_financial_impact_cents, reason_code, notes, transaction_date)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (item_id, TransactionType.DISTRIBUTION.value, -quantity,
+                      unit_cost_cents, cogs_cents, reason_str, notes, transaction_date))
+                transaction_ids.append(self._inserted_transaction_id(cursor))
+
+            cursor.executemany("""
+                UPDATE inventory_items
+                SET quantity_on_hand = ?,
+                    total_cost_basis_cents = ?
+                WHERE id = ?
+            """, [(item.quantity_on_hand, item.total_cost_basis_cents, item.id)
+                  for item in items.values()])
+
+            cursor.execute(
+                f"SELECT * FROM inventory_transactions WHERE id IN "
+                f"({', '.join('?' * len(transaction_ids))}) ORDER BY id",
+                transaction_ids)
+            transactions = [Transaction.from_db_row(row) for row in cursor.fetchall()]
+
+            if visit_id is not None:
+                cursor.execute("""
+                    INSERT INTO client_visits (id, reason_code, notes, visit_date)
+                    VALUES (?, ?, ?, ?)
+                """, (visit_id, reason_str, notes, transaction_date))
+                cursor.executemany("""
+                    INSERT INTO client_visit_lines (transaction_id, visit_id) VALUES (?, ?)
+                """, [(transaction.id, visit_id) for transaction in transactions])
+
+            cursor.execute(
+                f"SELECT * FROM inventory_items WHERE id IN ({placeholders})",
+                tuple(requested))
+            updated = {item.id: item for item in map(InventoryItem.from_db_row, cursor.fetchall())}
+
+        self.events.publish(TransactionsAdded(
+            tuple(t.id for t in transactions), tuple(requested),
+            TransactionType.DISTRIBUTION.value))
+        return [updated[item_id] for item_id in requested], transactions
+
     # ========================================================================
     # TRANSACTION HISTORY
     # ========================================================================
@@ -515,17 +825,20 @@ class InventoryService:
     def get_item_transactions(
         self,
         item_id: int,
-        limit: Optional[int] = None
-    ) -> List[Transaction]:
+        limit: Optional[int] = None,
+        compact: bool = False
+    ) -> Union[List[Transaction], List[CompactTransaction]]:
         """
         Get transaction history for an item.
         
         Args:
             item_id: Item ID
             limit: Maximum number of transactions to return (optional)
+            compact: If True, return read-only CompactTransaction objects
+                (slotted, timestamps parsed on access) for long histories
             
         Returns:
-            List of Transaction, most recent first
+            List of Transaction (or CompactTransaction), most recent first
         """
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
@@ -544,8 +857,30 @@ class InventoryService:
 
         cursor.execute(query, params)
         
+        if compact:
+            return map_rows(cursor, CompactTransaction)
         return [Transaction.from_db_row(row) for row in cursor.fetchall()]
-    
+
+    def get_visit_transactions(self, visit_id: str) -> List[Transaction]:
+        """
+        Get the distributions recorded for a client visit.
+
+        Args:
+            visit_id: Visit ID passed to process_distribution_basket()
+
+        Returns:
+            List of Transaction in line order (empty if the visit is unknown)
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT t.* FROM client_visit_lines v
+            JOIN inventory_transactions t ON t.id = v.transaction_id
+            WHERE v.visit_id = ?
+            ORDER BY t.id
+        """, (visit_id,))
+        return [Transaction.from_db_row(row) for row in cursor.fetchall()]
+
     # ========================================================================
     # CATEGORY OPERATIONS
     # ========================================================================
@@ -600,6 +935,10 @@ class InventoryService:
             
             if original_tx.is_voided:
                 raise ValueError(f"Transaction {transaction_id} is already voided")
+            if is_period_closed(cursor, original_tx.transaction_date):
+                raise ValueError(
+                    f"Transaction {transaction_id} is in closed period "
+                    f"{period_of(original_tx.transaction_date)}; reopen the period to void it")
             
             # 2. Fetch current item state
             cursor.execute("SELECT * FROM inventory_items WHERE id = ?", (original_tx.item_id,))
@@ -673,6 +1012,8 @@ class InventoryService:
             # 4. Update Item
             if new_cost_basis < 0:
                 new_cost_basis = 0 # Safety floor
+            # Stored on the correction: the change actually made, after the floor
+            correction_value_cents = new_cost_basis - item.total_cost_basis_cents
                 
             cursor.execute("""
                 UPDATE inventory_items
@@ -685,20 +1026,22 @@ class InventoryService:
             cursor.execute("""
                 INSERT INTO inventory_transactions
                 (item_id, transaction_type, quantity_change, unit_cost_cents,
-                 reason_code, notes, ref_transaction_id, created_by, transaction_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 total_financial_impact_cents, reason_code, notes, ref_transaction_id,
+                 created_by, transaction_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 item.id,
                 TransactionType.CORRECTION.value,
                 correction_qty,
                 original_tx.unit_cost_cents, # Keep original unit cost for reference
+                correction_value_cents,
                 ReasonCode.VOID.value,
                 f"Void of Tx #{transaction_id}: {reason}",
                 transaction_id,
                 "system", # TODO: Pass actual user
                 datetime.now().isoformat()
             ))
-            correction_id = cursor.lastrowid
+            correction_id = self._inserted_transaction_id(cursor)
             
             # 6. Mark Original as Voided
             cursor.execute("""
@@ -718,7 +1061,9 @@ class InventoryService:
             cursor.execute("SELECT * FROM inventory_transactions WHERE id = ?", (transaction_id,))
             original_tx_updated = Transaction.from_db_row(cursor.fetchone())
             
-            return updated_item, original_tx_updated, correction_tx
+        self.events.publish(TransactionVoided(
+            transaction_id, correction_id, item.id, original_tx.transaction_type.value))
+        return updated_item, original_tx_updated, correction_tx
 
     def get_transactions_by_item(self, item_id: int) -> List[Transaction]:
         """
@@ -241,6 +241,42 @@ class PDFReportGenerator:
         story.append(summary)
         story.append(Spacer(1, 0.3 * inch))
         
+        # Category tree with subtree totals
+        if data.get('category_rollup'):
+            story.append(Paragraph("Value by Category (incl. subcategories)", self.heading_style))
+            story.append(Spacer(1, 0.1 * inch))
+            
+            rollup_rows = [['Category', 'Items', 'Qty on Hand', 'Value']]
+            for category in data['category_rollup']:
+                rollup_rows.append([
+                    '\u00a0' * 4 * category['depth'] + category['name'],
+                    f"{category['item_count']}",
+                    f"{category['quantity_on_hand']:,.1f}",
+                    f"${category['value_dollars']:,.2f}",
+                ])
+            
+            rollup_table = Table(rollup_rows, colWidths=[3.3*inch, 1.0*inch, 1.4*inch, 1.8*inch])
+            rollup_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('ALIGN', (1, 0), (3, -1), 'RIGHT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('FONTSIZE', (0, 1), (-1, -1), 9),
+                # Top-level categories in bold
+                *[
+                    ('FONTNAME', (0, i + 1), (-1, i + 1), 'Helvetica-Bold')
+                    for i, category in enumerate(data['category_rollup'])
+                    if category['depth'] == 0
+                ],
+            ]))
+            story.append(rollup_table)
+            story.append(Spacer(1, 0.3 * inch))
+        
         # Inventory items grouped by category
         if data.get('items_by_category'):
             section_heading = Paragraph("Inventory by Category", self.heading_style)
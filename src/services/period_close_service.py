@@ -0,0 +1,299 @@
+"""
+Period Close Service for AIOps Studio - Inventory.
+
+Month-end close: closing a month freezes its totals and locks its ledger.
+
+- COGS by reason code, FMV by donor and purchases by supplier are summed
+  once and stored (period_cogs, period_donations, period_purchases)
+- Each item's quantity and cost basis at the end of the month are stored
+  (period_balances), worked back from the current state through the
+  activity dated after the month
+- Triggers reject transactions dated in a closed month and changes to the
+  amounts, dates or void status of its transactions (schema.sql), so the
+  stored totals stay true until the month is reopened
+
+Reports covering whole closed months (ReportingService) read the stored
+totals instead of summing the ledger.
+
+Usage:
+    periods = PeriodCloseService()
+    periods.close_period(2026, 9, notes="Reconciled with bank statement")
+    totals = periods.get_period_totals(2026, 9)
+    periods.reopen_period(2026, 9)  # to correct it, then close it again
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Union
+
+from database.connection import DatabaseManager, get_db_manager
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Change in an item's cost basis made by a transaction (as applied by
+# InventoryService / StockTakeService). Corrections (voids and stock takes)
+# store the change they made, after the cost-basis floor.
+_VALUE_CHANGE_SQL = """
+    CASE t.transaction_type
+        WHEN 'PURCHASE' THEN CAST(t.quantity_change * IFNULL(t.unit_cost_cents, 0) AS INTEGER)
+        WHEN 'DISTRIBUTION' THEN -IFNULL(t.total_financial_impact_cents, 0)
+        WHEN 'CORRECTION' THEN IFNULL(t.total_financial_impact_cents, 0)
+        ELSE 0
+    END
+"""
+
+
+def period_key(year: int, month: int) -> str:
+    """
+    Get the key of a month ('YYYY-MM').
+
+    Raises:
+        ValueError: If the month is not 1-12
+    """
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid month: {month}")
+    return f"{year:04d}-{month:02d}"
+
+
+def period_of(value: Union[date, datetime, str]) -> str:
+    """Get the period key of a date, datetime or ISO date string."""
+    if isinstance(value, (date, datetime)):
+        return f"{value:%Y-%m}"
+    return str(value)[:7]
+
+
+def _next_month(first_day: date) -> date:
+    return (first_day + timedelta(days=32)).replace(day=1)
+
+
+def is_period_closed(conn, value: Union[date, datetime, str]) -> bool:
+    """Check whether the month of a date is closed."""
+    return conn.execute(
+        "SELECT 1 FROM closed_periods WHERE period = ?", (period_of(value),)
+    ).fetchone() is not None
+
+
+def closed_periods_covering(conn, start_date: Optional[date],
+                            end_date: Optional[date]) -> Optional[List[str]]:
+    """
+    Get the months of a date range made up of whole, closed months.
+
+    Args:
+        conn: Open database connection (or cursor)
+        start_date: First day of the range
+        end_date: Last day of the range
+
+    Returns:
+        List of period keys, or None if the range is open-ended, does not
+        start and end on month boundaries or includes an open month
+    """
+    if start_date is None or end_date is None or end_date < start_date:
+        return None
+    if start_date.day != 1 or (end_date + timedelta(days=1)).day != 1:
+        return None
+
+    periods = []
+    month = start_date
+    while month <= end_date:
+        periods.append(period_of(month))
+        month = _next_month(month)
+    closed = conn.execute(
+        "SELECT COUNT(*) FROM closed_periods WHERE period BETWEEN ? AND ?",
+        (periods[0], periods[-1])
+    ).fetchone()[0]
+    return periods if closed == len(periods) else None
+
+
+class PeriodCloseService:
+    """Service layer for closing and reopening accounting months."""
+
+    def __init__(
+        self,
+        db_path: str = "inventory.db",
+        db_manager: Optional[DatabaseManager] = None
+    ):
+        """
+        Initialize period close service.
+
+        Args:
+            db_path: Path to the database file
+            db_manager: Manager to use instead of the application's
+        """
+        self.db_manager = db_manager or get_db_manager(db_path)
+
+    # ========================================================================
+    # PERIODS
+    # ========================================================================
+
+    def get_closed_periods(self) -> List[Dict]:
+        """Get the closed months, latest first."""
+        rows = self.db_manager.get_connection().execute("""
+            SELECT period, notes, closed_at FROM closed_periods ORDER BY period DESC
+        """).fetchall()
+        return [dict(row) for row in rows]
+
+    def is_closed(self, year: int, month: int) -> bool:
+        return is_period_closed(self.db_manager.get_connection(), period_key(year, month))
+
+    def close_period(self, year: int, month: int, notes: Optional[str] = None) -> Dict:
+        """
+        Close a month: store its totals and lock its transactions.
+
+        Args:
+            year: Year
+            month: Month (1-12)
+            notes: Optional notes (e.g. who reconciled it)
+
+        Returns:
+            Dict: The stored totals (see get_period_totals)
+
+        Raises:
+            ValueError: If the month has not ended or is already closed
+        """
+        period = period_key(year, month)
+        start = date(year, month, 1)
+        end = _next_month(start)
+        if end > date.today():
+            raise ValueError(f"Period {period} has not ended yet")
+
+        params = (period, start.isoformat(), end.isoformat())
+        with self.db_manager.transaction() as conn:
+            if is_period_closed(conn, period):
+                raise ValueError(f"Period {period} is already closed")
+            conn.execute("INSERT INTO closed_periods (period, notes) VALUES (?, ?)",
+                         (period, notes))
+
+            conn.execute("""
+                INSERT INTO period_cogs
+                    (period, reason_code, distribution_count, quantity, cogs_cents)
+                SELECT ?, IFNULL(reason_code, ''), COUNT(*), -SUM(quantity_change),
+                       SUM(IFNULL(total_financial_impact_cents, 0))
+                FROM ledger_history
+                WHERE transaction_type = 'DISTRIBUTION' AND is_voided = 0
+                  AND transaction_date >= ? AND transaction_date < ?
+                GROUP BY IFNULL(reason_code, '')
+            """, params)
+
+            conn.execute("""
+                INSERT INTO period_donations
+                    (period, donor, donor_id, donation_count, quantity, fmv_cents)
+                SELECT ?, COALESCE(d.name, NULLIF(TRIM(t.donor), ''), ''), MAX(d.id),
+                       COUNT(*), SUM(t.quantity_change),
+                       SUM(IFNULL(t.fair_market_value_cents, 0))
+                FROM ledger_history t
+                LEFT JOIN donors m ON m.id = t.donor_id
+                LEFT JOIN donors d ON d.id = COALESCE(m.merged_into_id, m.id)
+                WHERE t.transaction_type = 'DONATION' AND t.is_voided = 0
+                  AND t.transaction_date >= ? AND t.transaction_date < ?
+                GROUP BY 2
+            """, params)
+
+            conn.execute("""
+                INSERT INTO period_purchases
+                    (period, supplier, supplier_id, purchase_count, quantity, cost_cents)
+                SELECT ?, COALESCE(s.name, NULLIF(TRIM(t.supplier), ''), ''),
+                       MAX(t.supplier_id), COUNT(*), SUM(t.quantity_change),
+                       SUM(CAST(t.quantity_change * IFNULL(t.unit_cost_cents, 0) AS INTEGER))
+                FROM ledger_history t
+                LEFT JOIN suppliers s ON s.id = t.supplier_id
+                WHERE t.transaction_type = 'PURCHASE' AND t.is_voided = 0
+                  AND t.transaction_date >= ? AND t.transaction_date < ?
+                GROUP BY 2
+            """, params)
+
+            # Current state minus everything dated after the month (voided
+            # rows included: their corrections undo them)
+            conn.execute(f"""
+                INSERT INTO period_balances
+                    (period, item_id, quantity_on_hand, total_cost_basis_cents)
+                SELECT ?, id, quantity, cost_basis_cents FROM (
+                    SELECT i.id,
+                           i.quantity_on_hand - IFNULL(later.quantity, 0) AS quantity,
+                           i.total_cost_basis_cents - IFNULL(later.value_cents, 0)
+                               AS cost_basis_cents
+                    FROM inventory_items i
+                    LEFT JOIN (
+                        SELECT t.item_id, SUM(t.quantity_change) AS quantity,
+                               SUM({_VALUE_CHANGE_SQL}) AS value_cents
+                        FROM ledger_history t
+                        WHERE t.transaction_date >= ?
+                        GROUP BY t.item_id
+                    ) later ON later.item_id = i.id
+                )
+                WHERE quantity != 0 OR cost_basis_cents != 0
+            """, (period, end.isoformat()))
+
+        logger.info(f"Closed period {period}")
+        return self.get_period_totals(year, month)
+
+    def reopen_period(self, year: int, month: int):
+        """
+        Reopen a closed month: drop its stored totals and unlock it.
+
+        Raises:
+            ValueError: If the month is not closed
+        """
+        period = period_key(year, month)
+        with self.db_manager.transaction() as conn:
+            if not is_period_closed(conn, period):
+                raise ValueError(f"Period {period} is not closed")
+            for table in ('period_cogs', 'period_donations', 'period_purchases',
+                          'period_balances', 'closed_periods'):
+                conn.execute(f"DELETE FROM {table} WHERE period = ?", (period,))
+        logger.info(f"Reopened period {period}")
+
+    # ========================================================================
+    # FROZEN TOTALS
+    # ========================================================================
+
+    def get_period_totals(self, year: int, month: int) -> Dict:
+        """
+        Get the totals stored when a month was closed.
+
+        Returns:
+            Dict with period, notes, closed_at, cogs_by_reason, fmv_by_donor,
+            purchases_by_supplier, balances (per item, with sku and name) and
+            the totals of each
+
+        Raises:
+            ValueError: If the month is not closed
+        """
+        period = period_key(year, month)
+        conn = self.db_manager.get_connection()
+        header = conn.execute(
+            "SELECT period, notes, closed_at FROM closed_periods WHERE period = ?", (period,)
+        ).fetchone()
+        if header is None:
+            raise ValueError(f"Period {period} is not closed")
+
+        cogs = [dict(row) for row in conn.execute("""
+            SELECT reason_code, distribution_count, quantity, cogs_cents
+            FROM period_cogs WHERE period = ? ORDER BY cogs_cents DESC
+        """, (period,))]
+        donations = [dict(row) for row in conn.execute("""
+            SELECT donor, donor_id, donation_count, quantity, fmv_cents
+            FROM period_donations WHERE period = ? ORDER BY fmv_cents DESC
+        """, (period,))]
+        purchases = [dict(row) for row in conn.execute("""
+            SELECT supplier, supplier_id, purchase_count, quantity, cost_cents
+            FROM period_purchases WHERE period = ? ORDER BY cost_cents DESC
+        """, (period,))]
+        balances = [dict(row) for row in conn.execute("""
+            SELECT b.item_id, i.sku, i.name, b.quantity_on_hand, b.total_cost_basis_cents
+            FROM period_balances b
+            LEFT JOIN inventory_items i ON i.id = b.item_id
+            WHERE b.period = ?
+            ORDER BY i.name
+        """, (period,))]
+
+        return {
+            **dict(header),
+            'cogs_by_reason': cogs,
+            'fmv_by_donor': donations,
+            'purchases_by_supplier': purchases,
+            'balances': balances,
+            'total_cogs_cents': sum(row['cogs_cents'] for row in cogs),
+            'total_fmv_cents': sum(row['fmv_cents'] for row in donations),
+            'total_purchases_cents': sum(row['cost_cents'] for row in purchases),
+            'closing_value_cents': sum(row['total_cost_basis_cents'] for row in balances),
+        }
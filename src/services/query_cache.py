@@ -0,0 +1,227 @@
+"""
+Result cache for read-only service queries.
+
+Results are keyed by method name and bound arguments, and are only valid for
+the database version they were computed against. The version combines:
+- ``PRAGMA data_version`` - changes when another connection commits
+- ``Connection.total_changes`` - changes when this connection writes
+- today's date - forecasts and "current year" defaults move with the calendar
+
+Any write therefore invalidates the whole cache on the next lookup, while
+repeated calls with nothing changed are served from memory. Writes that are
+announced by a change event (services.events) are handled more finely: the
+owning service evicts only the results computed from what changed
+(``cached_query(depends_on=...)``) and the rest stay valid.
+"""
+
+import functools
+import inspect
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Optional, Tuple
+
+
+def get_data_version(conn: sqlite3.Connection) -> Tuple[int, int, date]:
+    """
+    Get a token that changes whenever the database contents may have changed.
+
+    Args:
+        conn: The connection used for queries
+
+    Returns:
+        Tuple of (data_version, total_changes, today)
+    """
+    data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+    return data_version, conn.total_changes, date.today()
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert lists/dicts/sets in arguments to hashable equivalents."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, set):
+        return frozenset(_freeze(v) for v in value)
+    return value
+
+
+class QueryCache:
+    """LRU cache of query results, invalidated when the data version changes."""
+
+    def __init__(self, max_entries: int = 64):
+        """
+        Initialize query cache.
+
+        Args:
+            max_entries: Maximum number of cached results (LRU eviction)
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._depends_on: Dict[Hashable, Optional[FrozenSet[str]]] = {}
+        self._version: Optional[Hashable] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def validate(self, version: Hashable):
+        """
+        Drop all entries if the data version has changed.
+
+        Args:
+            version: Current data version token
+        """
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._depends_on.clear()
+                self._version = version
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (found, value)
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value: Any, depends_on: Optional[FrozenSet[str]] = None):
+        """
+        Store a result, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Result to cache
+            depends_on: What the result was computed from (None: everything)
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._depends_on[key] = depends_on
+            while len(self._entries) > self.max_entries:
+                evicted, _value = self._entries.popitem(last=False)
+                self._depends_on.pop(evicted, None)
+                self.evictions += 1
+
+    def evict_changed(self, changed: Iterable[str], changes_before: int, changes_after: int) -> int:
+        """
+        Handle a write announced by a change event.
+
+        Drops the entries computed from anything in ``changed``. If the
+        cache was current up to the start of the write (no unannounced
+        writes since), the cached version moves past it so the other
+        entries survive the next validate(); otherwise that validate()
+        clears everything as usual.
+
+        Args:
+            changed: What the write changed (see cached_query depends_on)
+            changes_before: Connection total_changes when the write began
+            changes_after: Connection total_changes after it committed
+
+        Returns:
+            int: Number of entries dropped
+        """
+        changed = frozenset(changed)
+        with self._lock:
+            stale = [key for key, depends_on in self._depends_on.items()
+                     if depends_on is None or depends_on & changed]
+            for key in stale:
+                del self._entries[key]
+                del self._depends_on[key]
+            if stale:
+                self.invalidations += 1
+            if self._version is not None and self._version[1] == changes_before:
+                data_version, _total_changes, today = self._version
+                self._version = (data_version, changes_after, today)
+            return len(stale)
+
+    def clear(self):
+        """Remove all entries (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._depends_on.clear()
+            self._version = None
+
+    def get_stats(self) -> Dict:
+        """
+        Get hit/miss statistics.
+
+        Returns:
+            Dict with hits, misses, hit_rate, evictions, invalidations and size
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+            }
+
+
+def cached_query(
+    method: Optional[Callable] = None,
+    *,
+    depends_on: Optional[Iterable[str]] = None
+) -> Callable:
+    """
+    Memoize a service method on ``self.cache`` keyed by data version.
+
+    The owning service must provide ``self.db_manager`` and ``self.cache``
+    (a QueryCache). Cached results are shared between callers, so treat
+    them as read-only.
+
+    Use bare (``@cached_query``) or with ``depends_on``: the names of what
+    the result is computed from ('items', transaction types, 'donors'),
+    so QueryCache.evict_changed() can keep it across unrelated writes.
+    Without it the result is dropped on every write.
+    """
+    if method is None:
+        return lambda m: cached_query(m, depends_on=depends_on)
+    signature = inspect.signature(method)
+    tags = frozenset(depends_on) if depends_on is not None else None
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache: Optional[QueryCache] = getattr(self, 'cache', None)
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__,) + tuple(
+            (name, _freeze(value))
+            for name, value in bound.arguments.items() if name != 'self'
+        )
+
+        cache.validate(get_data_version(self.db_manager.get_connection()))
+        found, value = cache.get(key)
+        if found:
+            return value
+
+        value = method(self, *args, **kwargs)
+        cache.put(key, value, tags)
+        return value
+
+    return wrapper
@@ -2,28 +2,41 @@
 Reporting service for AIOps Studio - Inventory.
 
 Generates financial, impact, and stock status reports.
+
+Ledger queries read ledger_history, so reports covering archived years
+include them (see database.archive). The totals of financial, impact and
+purchases reports covering whole closed months come from the totals stored
+when the months were closed (see services.period_close_service).
 """
 
 from typing import List, Dict, Optional, Tuple
+from collections import defaultdict
 from datetime import datetime, date
 from pathlib import Path
 
 from models.item import InventoryItem
 from models.transaction import Transaction, TransactionType
-from database.connection import get_db_manager
+from database.connection import DatabaseManager, get_db_manager
+from services.period_close_service import closed_periods_covering
 
 
 class ReportingService:
     """Service layer for generating reports."""
     
-    def __init__(self, db_path: str = "inventory.db"):
+    def __init__(
+        self,
+        db_path: str = "inventory.db",
+        db_manager: Optional[DatabaseManager] = None
+    ):
         """
         Initialize reporting service.
         
         Args:
             db_path: Path to the database file
+            db_manager: Manager to query instead of the application's
+                (e.g. from get_db_manager_for_path)
         """
-        self.db_manager = get_db_manager(db_path)
+        self.db_manager = db_manager or get_db_manager(db_path)
     
     # ========================================================================
     # FINANCIAL REPORT - COST OF GOODS DISTRIBUTED (COGS)
@@ -32,7 +45,8 @@ class ReportingService:
     def get_financial_report_data(
         self,
         start_date: Optional[date] = None,
-        end_date: Optional[date] = None
+        end_date: Optional[date] = None,
+        include_details: bool = True
     ) -> Dict:
         """
         Get financial report data (COGS).
@@ -43,12 +57,15 @@ class ReportingService:
         Args:
             start_date: Start date (optional, defaults to beginning of time)
             end_date: End date (optional, defaults to now)
+            include_details: Include the list of distributions; without it a
+                range of closed months does not read the ledger at all
             
         Returns:
             Dict with financial data
         """
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
+        closed_periods = closed_periods_covering(cursor, start_date, end_date)
         
         # Build query with date filters — P1-1: exclude voided transactions
         query = """
@@ -60,7 +77,7 @@ class ReportingService:
                 it.unit_cost_cents,
                 it.total_financial_impact_cents,
                 it.reason_code
-            FROM inventory_transactions it
+            FROM ledger_history it
             JOIN inventory_items ii ON it.item_id = ii.id
             WHERE it.transaction_type = 'DISTRIBUTION'
               AND it.is_voided = 0
@@ -78,8 +95,10 @@ class ReportingService:
         
         query += " ORDER BY it.transaction_date DESC"
         
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        rows = []
+        if include_details or not closed_periods:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
         
         # Calculate totals
         total_cogs_cents = 0
@@ -102,15 +121,30 @@ class ReportingService:
             elif reason == 'INTERNAL':
                 internal_cogs_cents += cogs_cents
             
-            distributions.append({
-                'item_name': row['name'],
-                'sku': row['sku'],
-                'date': row['transaction_date'],
-                'quantity': abs(row['quantity_change']),
-                'unit_cost_cents': row['unit_cost_cents'],
-                'total_cogs_cents': cogs_cents,
-                'reason': reason
-            })
+            if include_details:
+                distributions.append({
+                    'item_name': row['name'],
+                    'sku': row['sku'],
+                    'date': row['transaction_date'],
+                    'quantity': abs(row['quantity_change']),
+                    'unit_cost_cents': row['unit_cost_cents'],
+                    'total_cogs_cents': cogs_cents,
+                    'reason': reason
+                })
+        distribution_count = len(rows)
+        
+        if closed_periods:
+            cursor.execute("""
+                SELECT reason_code, SUM(distribution_count) AS count, SUM(cogs_cents) AS cogs
+                FROM period_cogs WHERE period BETWEEN ? AND ?
+                GROUP BY reason_code
+            """, (closed_periods[0], closed_periods[-1]))
+            by_reason = {row['reason_code']: row for row in cursor.fetchall()}
+            total_cogs_cents = sum(row['cogs'] for row in by_reason.values())
+            distribution_count = sum(row['count'] for row in by_reason.values())
+            client_cogs_cents, spoilage_cogs_cents, internal_cogs_cents = (
+                by_reason[reason]['cogs'] if reason in by_reason else 0
+                for reason in ('CLIENT', 'SPOILAGE', 'INTERNAL'))
         
         return {
             'start_date': start_date,
@@ -124,7 +158,8 @@ class ReportingService:
             'internal_cogs_cents': internal_cogs_cents,
             'internal_cogs_dollars': internal_cogs_cents / 100.0,
             'distributions': distributions,
-            'distribution_count': len(distributions)
+            'distribution_count': distribution_count,
+            'closed_periods': closed_periods or []
         }
     
     # ========================================================================
@@ -134,7 +169,8 @@ class ReportingService:
     def get_impact_report_data(
         self,
         start_date: Optional[date] = None,
-        end_date: Optional[date] = None
+        end_date: Optional[date] = None,
+        include_details: bool = True
     ) -> Dict:
         """
         Get impact report data (donations and FMV).
@@ -144,12 +180,15 @@ class ReportingService:
         Args:
             start_date: Start date (optional)
             end_date: End date (optional)
+            include_details: Include the list of donations; without it a
+                range of closed months does not read the ledger at all
             
         Returns:
             Dict with impact data
         """
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
+        closed_periods = closed_periods_covering(cursor, start_date, end_date)
         
         # Get donations — P1-1: exclude voided transactions
         query = """
@@ -160,7 +199,7 @@ class ReportingService:
                 it.quantity_change,
                 it.fair_market_value_cents,
                 it.donor
-            FROM inventory_transactions it
+            FROM ledger_history it
             JOIN inventory_items ii ON it.item_id = ii.id
             WHERE it.transaction_type = 'DONATION'
               AND it.is_voided = 0
@@ -178,8 +217,10 @@ class ReportingService:
         
         query += " ORDER BY it.transaction_date DESC"
         
-        cursor.execute(query, params)
-        donation_rows = cursor.fetchall()
+        donation_rows, dist_rows = [], []
+        if include_details or not closed_periods:
+            cursor.execute(query, params)
+            donation_rows = cursor.fetchall()
         
         # Get distributions for total value distributed — P1-1: exclude voided
         dist_query = """
@@ -190,7 +231,7 @@ class ReportingService:
                 it.quantity_change,
                 it.total_financial_impact_cents,
                 it.reason_code
-            FROM inventory_transactions it
+            FROM ledger_history it
             JOIN inventory_items ii ON it.item_id = ii.id
             WHERE it.transaction_type = 'DISTRIBUTION'
               AND it.reason_code = 'CLIENT'
@@ -207,23 +248,38 @@ class ReportingService:
             dist_query += " AND DATE(it.transaction_date) <= ?"
             dist_params.append(end_date.isoformat())
         
-        cursor.execute(dist_query, dist_params)
-        dist_rows = cursor.fetchall()
+        if not closed_periods:
+            cursor.execute(dist_query, dist_params)
+            dist_rows = cursor.fetchall()
         
         # Calculate totals
         total_fmv_cents = sum(row['fair_market_value_cents'] for row in donation_rows)
         total_distributed_value_cents = sum(row['total_financial_impact_cents'] for row in dist_rows)
+        donation_count = len(donation_rows)
+        distributions_count = len(dist_rows)
         
         donations = []
-        for row in donation_rows:
-            donations.append({
-                'item_name': row['name'],
-                'sku': row['sku'],
-                'date': row['transaction_date'],
-                'quantity': row['quantity_change'],
-                'fmv_cents': row['fair_market_value_cents'],
-                'donor': row['donor']
-            })
+        if include_details:
+            for row in donation_rows:
+                donations.append({
+                    'item_name': row['name'],
+                    'sku': row['sku'],
+                    'date': row['transaction_date'],
+                    'quantity': row['quantity_change'],
+                    'fmv_cents': row['fair_market_value_cents'],
+                    'donor': row['donor']
+                })
+        
+        if closed_periods:
+            frozen_range = (closed_periods[0], closed_periods[-1])
+            total_fmv_cents, donation_count = cursor.execute("""
+                SELECT IFNULL(SUM(fmv_cents), 0), IFNULL(SUM(donation_count), 0)
+                FROM period_donations WHERE period BETWEEN ? AND ?
+            """, frozen_range).fetchone()
+            total_distributed_value_cents, distributions_count = cursor.execute("""
+                SELECT IFNULL(SUM(cogs_cents), 0), IFNULL(SUM(distribution_count), 0)
+                FROM period_cogs WHERE period BETWEEN ? AND ? AND reason_code = 'CLIENT'
+            """, frozen_range).fetchone()
         
         return {
             'start_date': start_date,
@@ -233,8 +289,9 @@ class ReportingService:
             'total_distributed_value_cents': total_distributed_value_cents,
             'total_distributed_value_dollars': total_distributed_value_cents / 100.0,
             'donations': donations,
-            'donation_count': len(donations),
-            'distributions_count': len(dist_rows)
+            'donation_count': donation_count,
+            'distributions_count': distributions_count,
+            'closed_periods': closed_periods or []
         }
     
     # ========================================================================
@@ -247,7 +304,7 @@ class ReportingService:
 
         Returns:
             Dict with stock status data including items_by_category for
-            grouped PDF rendering.
+            grouped PDF rendering and category_rollup (subtree totals).
         """
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
@@ -262,6 +319,9 @@ class ReportingService:
                 ii.quantity_on_hand,
                 ii.reorder_threshold,
                 ii.total_cost_basis_cents,
+                ii.current_unit_cost_cents,
+                ii.is_low_stock,
+                ii.is_zero_stock,
                 ic.name AS category_name
             FROM inventory_items ii
             LEFT JOIN item_categories ic ON ii.category_id = ic.id
@@ -293,14 +353,16 @@ class ReportingService:
                 'quantity': qty,
                 'threshold': threshold,
                 'value_cents': cost_basis,
-                'unit_cost_cents': int(cost_basis / qty) if qty > 0 else 0,
+                # Rounded like InventoryItem.current_unit_cost_cents (the
+                # report used to truncate, so it could differ by a cent)
+                'unit_cost_cents': row['current_unit_cost_cents'],
                 'category': category_name,
             }
 
             # Status buckets (for "Items Requiring Attention" section)
-            if qty == 0:
+            if row['is_zero_stock']:
                 items_zero_stock.append(item_data)
-            elif qty < threshold:
+            elif row['is_low_stock']:
                 items_below_threshold.append(item_data)
             else:
                 items_ok.append(item_data)
@@ -315,10 +377,16 @@ class ReportingService:
             uncategorized = items_by_category.pop('Uncategorized')
             items_by_category['Uncategorized'] = uncategorized
 
+        # Subtree totals (e.g. "Food" includes Canned Goods, Dry Goods, ...)
+        category_rollup = [
+            c for c in self.get_category_rollup()['categories'] if c['item_count'] > 0
+        ]
+
         return {
             'total_items': total_items,
             'total_value_cents': total_value_cents,
             'total_value_dollars': total_value_cents / 100.0,
+            'category_rollup': category_rollup,
             'items_ok': items_ok,
             'items_below_threshold': items_below_threshold,
             'items_zero_stock': items_zero_stock,
@@ -359,7 +427,7 @@ class ReportingService:
                 it.*,
                 ii.name as item_name,
                 ii.sku
-            FROM inventory_transactions it
+            FROM ledger_history it
             JOIN inventory_items ii ON it.item_id = ii.id
             WHERE 1=1
         """
@@ -415,6 +483,10 @@ class ReportingService:
     def get_dashboard_stats(self) -> Dict:
         """
         Get aggregated statistics for the dashboard.
+
+        Reads the trigger-maintained KPI tables (dashboard_kpi,
+        kpi_category_value, kpi_item_distributed), so the cost is a few
+        indexed lookups regardless of how many items or transactions exist.
         
         Returns:
             Dict containing:
@@ -422,57 +494,71 @@ class ReportingService:
             - low_stock_count
             - total_items_count
             - top_distributed_items (list)
-            - value_by_category (list)
+            - value_by_category (list, leaf categories)
+            - category_rollup (list, every category with its subtree value,
+              in tree order with depth)
         """
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
         
         stats = {}
         
-        # 1. Total Inventory Value & Item Counts
+        # 1. Total Inventory Value & Item Counts (single-row KPI table)
         cursor.execute("""
-            SELECT 
-                COUNT(*) as total_items,
-                SUM(CASE WHEN quantity_on_hand < reorder_threshold THEN 1 ELSE 0 END) as low_stock,
-                SUM(total_cost_basis_cents) as total_value_cents
-            FROM inventory_items
-            WHERE is_active = 1
+            SELECT total_items, low_stock_count, total_value_cents
+            FROM dashboard_kpi
+            WHERE id = 1
         """)
         row = cursor.fetchone()
         
-        # Handle None results which occur when table is empty
-        stats['total_items_count'] = row['total_items'] or 0
-        stats['low_stock_count'] = row['low_stock'] or 0
-        stats['total_inventory_value_dollars'] = (row['total_value_cents'] or 0) / 100.0
+        stats['total_items_count'] = row['total_items'] if row else 0
+        stats['low_stock_count'] = row['low_stock_count'] if row else 0
+        stats['total_inventory_value_dollars'] = (row['total_value_cents'] if row else 0) / 100.0
         
-        # 2. Value by Category
+        # 2. Value by Category (one row per category)
         cursor.execute("""
             SELECT 
                 c.name,
-                SUM(i.total_cost_basis_cents) as value_cents
-            FROM inventory_items i
-            JOIN item_categories c ON i.category_id = c.id
-            WHERE i.is_active = 1
-            GROUP BY c.name
-            HAVING value_cents > 0
-            ORDER BY value_cents DESC
+                k.value_cents
+            FROM kpi_category_value k
+            JOIN item_categories c ON k.category_id = c.id
+            WHERE k.value_cents > 0
+            ORDER BY k.value_cents DESC
         """)
         stats['value_by_category'] = [
             {'category': row['name'], 'value_dollars': (row['value_cents'] or 0) / 100.0}
             for row in cursor.fetchall()
         ]
         
-        # 3. Top Distributed Items (All Time) — P1-1: exclude voided transactions
+        # 2b. Value rolled up the category tree (one join on the closure table)
+        cursor.execute("""
+            SELECT cc.ancestor_id AS category_id, SUM(k.value_cents) AS value_cents
+            FROM kpi_category_value k
+            JOIN category_closure cc ON cc.descendant_id = k.category_id
+            GROUP BY cc.ancestor_id
+        """)
+        rollup_values = {row['category_id']: row['value_cents'] or 0 for row in cursor.fetchall()}
+        stats['category_rollup'] = [
+            {
+                'category_id': node['category_id'],
+                'category': node['name'],
+                'parent_id': node['parent_id'],
+                'depth': node['depth'],
+                'value_dollars': rollup_values[node['category_id']] / 100.0
+            }
+            for node in self._get_category_tree(cursor)
+            if rollup_values.get(node['category_id'], 0) > 0
+        ]
+        
+        # 3. Top Distributed Items (All Time, voids excluded by the KPI triggers)
         cursor.execute("""
             SELECT 
                 i.name,
-                ABS(SUM(t.quantity_change)) as total_distributed
-            FROM inventory_transactions t
-            JOIN inventory_items i ON t.item_id = i.id
-            WHERE t.transaction_type = 'DISTRIBUTION'
-              AND t.is_voided = 0
-            GROUP BY i.name
-            ORDER BY total_distributed DESC
+                k.quantity_distributed as total_distributed
+            FROM kpi_item_distributed k
+            JOIN inventory_items i ON k.item_id = i.id
+            WHERE k.quantity_distributed > 0
+            ORDER BY k.quantity_distributed DESC
             LIMIT 5
         """)
         stats['top_distributed_items'] = [
@@ -482,6 +568,153 @@ class ReportingService:
         
         return stats
     
+    # ========================================================================
+    # CATEGORY ROLLUPS
+    # ========================================================================
+    
+    def _get_category_tree(self, cursor) -> List[Dict]:
+        """
+        Get all categories in depth-first display order.
+        
+        Args:
+            cursor: Database cursor
+            
+        Returns:
+            List of dicts with category_id, name, parent_id and depth
+            (0 for top-level categories)
+        """
+        cursor.execute("""
+            SELECT c.id, c.name, c.parent_id, MAX(cc.depth) AS depth
+            FROM item_categories c
+            JOIN category_closure cc ON cc.descendant_id = c.id
+            GROUP BY c.id
+        """)
+        rows = cursor.fetchall()
+        ids = {row['id'] for row in rows}
+        
+        children = defaultdict(list)
+        for row in rows:
+            parent = row['parent_id'] if row['parent_id'] in ids else None
+            children[parent].append(row)
+        
+        ordered = []
+        stack = sorted(children[None], key=lambda r: r['name'], reverse=True)
+        while stack:
+            row = stack.pop()
+            ordered.append({
+                'category_id': row['id'],
+                'name': row['name'],
+                'parent_id': row['parent_id'],
+                'depth': row['depth']
+            })
+            stack.extend(sorted(children[row['id']], key=lambda r: r['name'], reverse=True))
+        return ordered
+    
+    def get_category_rollup(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict:
+        """
+        Get stock and distribution totals for every category subtree.
+        
+        Each category's figures include all of its descendants (e.g. "Food"
+        covers Canned Goods, Dry Goods, ...). Totals come from one grouped
+        join on the category_closure table per metric.
+        
+        Args:
+            start_date: Start of the distribution period (optional)
+            end_date: End of the distribution period (optional)
+            
+        Returns:
+            Dict with categories (tree order), uncategorized totals and
+            grand totals
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        # Current stock per subtree (active items)
+        cursor.execute("""
+            SELECT
+                cc.ancestor_id AS category_id,
+                COUNT(ii.id) AS item_count,
+                COALESCE(SUM(ii.quantity_on_hand), 0) AS quantity,
+                COALESCE(SUM(ii.total_cost_basis_cents), 0) AS value_cents
+            FROM category_closure cc
+            JOIN inventory_items ii ON ii.category_id = cc.descendant_id
+            WHERE ii.is_active = 1
+            GROUP BY cc.ancestor_id
+        """)
+        stock = {row['category_id']: row for row in cursor.fetchall()}
+        
+        # Distributions per subtree in the period (voids excluded)
+        query = """
+            SELECT
+                cc.ancestor_id AS category_id,
+                SUM(ABS(it.quantity_change)) AS quantity,
+                SUM(ABS(it.total_financial_impact_cents)) AS value_cents
+            FROM ledger_history it
+            JOIN inventory_items ii ON it.item_id = ii.id
+            JOIN category_closure cc ON cc.descendant_id = ii.category_id
+            WHERE it.transaction_type = 'DISTRIBUTION'
+              AND it.is_voided = 0
+        """
+        params = []
+        if start_date:
+            query += " AND DATE(it.transaction_date) >= ?"
+            params.append(start_date.isoformat())
+        if end_date:
+            query += " AND DATE(it.transaction_date) <= ?"
+            params.append(end_date.isoformat())
+        query += " GROUP BY cc.ancestor_id"
+        cursor.execute(query, params)
+        distributed = {row['category_id']: row for row in cursor.fetchall()}
+        
+        categories = []
+        for node in self._get_category_tree(cursor):
+            stock_row = stock.get(node['category_id'])
+            dist_row = distributed.get(node['category_id'])
+            value_cents = stock_row['value_cents'] if stock_row else 0
+            distributed_cents = (dist_row['value_cents'] or 0) if dist_row else 0
+            categories.append({
+                **node,
+                'item_count': stock_row['item_count'] if stock_row else 0,
+                'quantity_on_hand': stock_row['quantity'] if stock_row else 0,
+                'value_cents': value_cents,
+                'value_dollars': value_cents / 100.0,
+                'distributed_qty': (dist_row['quantity'] or 0) if dist_row else 0,
+                'distributed_value_cents': distributed_cents,
+                'distributed_value_dollars': distributed_cents / 100.0,
+            })
+        
+        # Items without a category are outside the tree
+        cursor.execute("""
+            SELECT COUNT(*) AS item_count,
+                   COALESCE(SUM(quantity_on_hand), 0) AS quantity,
+                   COALESCE(SUM(total_cost_basis_cents), 0) AS value_cents
+            FROM inventory_items
+            WHERE is_active = 1 AND category_id IS NULL
+        """)
+        uncategorized = cursor.fetchone()
+        
+        roots = [c for c in categories if c['depth'] == 0]
+        total_value_cents = sum(c['value_cents'] for c in roots) + uncategorized['value_cents']
+        
+        return {
+            'start_date': start_date,
+            'end_date': end_date,
+            'categories': categories,
+            'uncategorized': {
+                'item_count': uncategorized['item_count'],
+                'quantity_on_hand': uncategorized['quantity'],
+                'value_cents': uncategorized['value_cents'],
+                'value_dollars': uncategorized['value_cents'] / 100.0,
+            },
+            'total_value_cents': total_value_cents,
+            'total_value_dollars': total_value_cents / 100.0,
+            'total_distributed_qty': sum(c['distributed_qty'] for c in roots),
+        }
+    
     # ========================================================================
     # PURCHASES REPORT
     # ========================================================================
@@ -489,22 +722,27 @@ class ReportingService:
     def get_purchases_report_data(
         self,
         start_date: Optional[date] = None,
-        end_date: Optional[date] = None
+        end_date: Optional[date] = None,
+        include_details: bool = True
     ) -> Dict:
         """
         Get purchases report data.
 
-        Only includes non-voided PURCHASE transactions.
+        Only includes non-voided PURCHASE transactions. For closed months
+        unique_suppliers counts suppliers, not spellings of their names.
 
         Args:
             start_date: Start date (optional)
             end_date: End date (optional)
+            include_details: Include the list of purchases; without it a
+                range of closed months does not read the ledger at all
             
         Returns:
             Dict with purchases data
         """
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
+        closed_periods = closed_periods_covering(cursor, start_date, end_date)
         
         # Get purchases — P1-1: exclude voided transactions
         query = """
@@ -517,7 +755,7 @@ class ReportingService:
                 it.unit_cost_cents,
                 it.supplier,
                 it.notes
-            FROM inventory_transactions it
+            FROM ledger_history it
             JOIN inventory_items ii ON it.item_id = ii.id
             LEFT JOIN item_categories ic ON ii.category_id = ic.id
             WHERE it.transaction_type = 'PURCHASE'
@@ -536,8 +774,10 @@ class ReportingService:
         
         query += " ORDER BY it.transaction_date DESC"
         
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        rows = []
+        if include_details or not closed_periods:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
         
         # Calculate totals
         total_purchases = len(rows)
@@ -558,17 +798,27 @@ class ReportingService:
             if row['supplier']:
                 suppliers_set.add(row['supplier'])
             
-            purchases.append({
-                'item_name': row['name'],
-                'sku': row['sku'],
-                'category': row['category_name'] or 'Uncategorized',
-                'date': row['transaction_date'],
-                'quantity': qty,
-                'unit_cost_cents': unit_cost,
-                'total_cost_cents': total_item_cost,
-                'supplier': row['supplier'],
-                'notes': row['notes']
-            })
+            if include_details:
+                purchases.append({
+                    'item_name': row['name'],
+                    'sku': row['sku'],
+                    'category': row['category_name'] or 'Uncategorized',
+                    'date': row['transaction_date'],
+                    'quantity': qty,
+                    'unit_cost_cents': unit_cost,
+                    'total_cost_cents': total_item_cost,
+                    'supplier': row['supplier'],
+                    'notes': row['notes']
+                })
+        unique_suppliers = len(suppliers_set)
+        
+        if closed_periods:
+            total_purchases, total_quantity, total_cost_cents, unique_suppliers = cursor.execute("""
+                SELECT IFNULL(SUM(purchase_count), 0), IFNULL(SUM(quantity), 0),
+                       IFNULL(SUM(cost_cents), 0),
+                       COUNT(DISTINCT NULLIF(supplier, ''))
+                FROM period_purchases WHERE period BETWEEN ? AND ?
+            """, (closed_periods[0], closed_periods[-1])).fetchone()
         
         return {
             'start_date': start_date,
@@ -577,8 +827,9 @@ class ReportingService:
             'total_quantity': total_quantity,
             'total_cost_cents': total_cost_cents,
             'total_cost_dollars': total_cost_cents / 100.0,
-            'unique_suppliers': len(suppliers_set),
-            'purchases': purchases
+            'unique_suppliers': unique_suppliers,
+            'purchases': purchases,
+            'closed_periods': closed_periods or []
         }
     
     # ========================================================================
@@ -589,6 +840,10 @@ class ReportingService:
         """
         Get suppliers report data.
         
+        Reads the trigger-maintained supplier aggregate tables, so the cost
+        does not grow with the number of purchases. Voided purchases are
+        excluded.
+        
         Returns:
             Dict with suppliers data including aggregated purchases and notes
         """
@@ -598,23 +853,30 @@ class ReportingService:
         # Get all suppliers with aggregated data
         cursor.execute("""
             SELECT 
-                it.supplier,
-                COUNT(*) as purchase_count,
-                SUM(it.quantity_change) as total_quantity,
-                SUM(it.quantity_change * it.unit_cost_cents) as total_cost_cents,
-                MIN(it.transaction_date) as first_purchase,
-                MAX(it.transaction_date) as last_purchase,
-                GROUP_CONCAT(it.notes, ' | ') as all_notes
-            FROM inventory_transactions it
-            WHERE it.transaction_type = 'PURCHASE'
-            AND it.supplier IS NOT NULL
-            AND it.supplier != ''
-            GROUP BY it.supplier
-            ORDER BY total_cost_cents DESC
+                s.id as supplier_id,
+                s.name as supplier,
+                t.purchase_count,
+                t.total_quantity,
+                t.total_cost_cents,
+                t.first_purchase,
+                t.last_purchase
+            FROM kpi_supplier_totals t
+            JOIN suppliers s ON s.id = t.supplier_id
+            ORDER BY t.total_cost_cents DESC
         """)
         
         rows = cursor.fetchall()
         
+        # Distinct notes per supplier, in the order they were first entered
+        cursor.execute("""
+            SELECT supplier_id, note
+            FROM kpi_supplier_notes
+            ORDER BY supplier_id, first_transaction_id
+        """)
+        notes_by_supplier = defaultdict(list)
+        for note_row in cursor.fetchall():
+            notes_by_supplier[note_row['supplier_id']].append(note_row['note'])
+        
         suppliers = []
         total_suppliers = len(rows)
         grand_total_purchases = 0
@@ -625,17 +887,8 @@ class ReportingService:
             grand_total_purchases += row['purchase_count']
             grand_total_cost_cents += total_cost
             
-            # Clean up notes - remove None values and duplicates
-            notes_str = row['all_notes'] or ''
-            if notes_str:
-                # Split by separator, remove empty/None, and keep unique
-                notes_list = [n.strip() for n in notes_str.split('|') if n and n.strip() and n.strip().lower() != 'none']
-                unique_notes = list(dict.fromkeys(notes_list))  # Preserve order while removing duplicates
-                cleaned_notes = ' | '.join(unique_notes) if unique_notes else ''
-            else:
-                cleaned_notes = ''
-            
             suppliers.append({
+                'supplier_id': row['supplier_id'],
                 'supplier': row['supplier'],
                 'purchase_count': row['purchase_count'],
                 'total_quantity': row['total_quantity'] or 0,
@@ -643,7 +896,7 @@ class ReportingService:
                 'total_cost_dollars': total_cost / 100.0,
                 'first_purchase': row['first_purchase'],
                 'last_purchase': row['last_purchase'],
-                'notes': cleaned_notes
+                'notes': ' | '.join(notes_by_supplier[row['supplier_id']])
             })
         
         return {
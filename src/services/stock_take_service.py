@@ -0,0 +1,441 @@
+"""
+Stock Take Service for AIOps Studio - Inventory.
+
+Physical counts (cycle counts) reconciled against the system quantities:
+- Count loading from a count sheet (CSV) or scanned entries
+- Variances from one join of the counts with inventory_items
+- Cost impact preview at weighted average cost (found units of items with
+  no stock, which have no average cost, at their last purchase cost)
+- Posting all adjustments as CORRECTION transactions in one transaction
+
+Only the items counted are adjusted, so a count can cover one aisle or the
+whole pantry. The preview and the posting use the same calculation
+(InventoryItem.calculate_count_adjustment_state), so what is previewed is
+what gets posted.
+
+Usage:
+    stock_takes = StockTakeService()
+    stock_take_id = stock_takes.start("Aisle 3 - March")
+    stock_takes.import_count_sheet(stock_take_id, "counts.csv")
+    stock_takes.record_counts(stock_take_id, [("012345678905", 1)])  # a scan
+    preview = stock_takes.preview(stock_take_id)
+    stock_takes.post(stock_take_id)
+"""
+
+import csv
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from database.connection import DatabaseManager, get_db_manager
+from models.item import InventoryItem
+from models.transaction import ReasonCode, TransactionType
+from services.events import StockTakePosted, get_event_bus
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Count sheet columns accepted for the counted quantity, in order of preference
+COUNT_COLUMNS = ('count', 'counted', 'counted quantity', 'counted_quantity', 'quantity', 'qty')
+
+
+@dataclass(frozen=True)
+class CountVariance:
+    """Difference between a counted and the system quantity of one item."""
+
+    item_id: int
+    sku: str
+    name: str
+    system_quantity: float
+    counted_quantity: float
+    unit_cost_cents: int
+    value_change_cents: int  # Negative for shrinkage
+    # Where unit_cost_cents comes from: 'average' (weighted average cost),
+    # 'last_purchase' (no stock to average: last purchase in the ledger) or
+    # 'unknown' (no stock and never purchased: found units valued at 0)
+    unit_cost_source: str = 'average'
+
+    @property
+    def variance(self) -> float:
+        return self.counted_quantity - self.system_quantity
+
+
+class StockTakeService:
+    """Service layer for physical counts and their reconciliation."""
+
+    def __init__(
+        self,
+        db_path: str = "inventory.db",
+        db_manager: Optional[DatabaseManager] = None
+    ):
+        """
+        Initialize stock take service.
+
+        Args:
+            db_path: Path to the database file
+            db_manager: Manager to use instead of the application's
+        """
+        self.db_manager = db_manager or get_db_manager(db_path)
+
+    # ========================================================================
+    # STOCK TAKES
+    # ========================================================================
+
+    def start(self, name: str, notes: Optional[str] = None) -> int:
+        """
+        Start a stock take.
+
+        Args:
+            name: Name shown in lists (e.g. "Aisle 3 - March")
+            notes: Notes stored on every correction it posts
+
+        Returns:
+            int: The new stock take's ID
+
+        Raises:
+            ValueError: If the name is empty
+        """
+        if not name or not name.strip():
+            raise ValueError("Stock take name is required")
+        with self.db_manager.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO stock_takes (name, notes) VALUES (?, ?)", (name.strip(), notes))
+            return cursor.lastrowid
+
+    def get_stock_takes(self, open_only: bool = False) -> List[Dict]:
+        """
+        Get stock takes with the number of items counted.
+
+        Args:
+            open_only: Only those not posted yet
+
+        Returns:
+            List of stock take dicts, newest first
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        query = """
+            SELECT s.id, s.name, s.notes, s.started_at, s.posted_at,
+                   (SELECT COUNT(*) FROM stock_take_counts c
+                    WHERE c.stock_take_id = s.id) AS counted_items
+            FROM stock_takes s
+        """
+        if open_only:
+            query += " WHERE s.posted_at IS NULL"
+        cursor.execute(query + " ORDER BY s.id DESC")
+        return [dict(row) for row in cursor.fetchall()]
+
+    def _require_open(self, cursor, stock_take_id: int):
+        cursor.execute("SELECT posted_at FROM stock_takes WHERE id = ?", (stock_take_id,))
+        row = cursor.fetchone()
+        if row is None:
+            raise ValueError(f"Stock take {stock_take_id} not found")
+        if row[0] is not None:
+            raise ValueError(f"Stock take {stock_take_id} was already posted")
+
+    # ========================================================================
+    # COUNTS
+    # ========================================================================
+
+    def record_counts(
+        self,
+        stock_take_id: int,
+        counts: Iterable[Tuple[str, float]],
+        replace: bool = False
+    ) -> List[str]:
+        """
+        Record counted quantities by SKU.
+
+        The counts are loaded into a temporary table and matched to the
+        items with one join, however many there are.
+
+        Args:
+            stock_take_id: Stock take ID
+            counts: (sku, quantity) pairs; repeated SKUs are added up (an
+                item counted in several places, or scanned once per unit)
+            replace: Replace an item's earlier count instead of adding to it
+
+        Returns:
+            List of SKUs that match no active item (not recorded)
+
+        Raises:
+            ValueError: If the stock take is unknown or posted, or a
+                quantity is negative
+        """
+        totals: Dict[str, float] = {}
+        for sku, quantity in counts:
+            if quantity < 0:
+                raise ValueError(f"Counted quantity cannot be negative (SKU {sku})")
+            sku = sku.strip()
+            totals[sku] = totals.get(sku, 0) + quantity
+
+        with self.db_manager.transaction() as conn:
+            cursor = conn.cursor()
+            self._require_open(cursor, stock_take_id)
+
+            cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS stock_take_load (
+                    sku TEXT PRIMARY KEY,
+                    quantity REAL NOT NULL
+                )
+            """)
+            cursor.execute("DELETE FROM temp.stock_take_load")
+            cursor.executemany(
+                "INSERT INTO temp.stock_take_load (sku, quantity) VALUES (?, ?)",
+                totals.items())
+
+            update = "excluded.counted_quantity" if replace else \
+                "counted_quantity + excluded.counted_quantity"
+            # WHERE 1 resolves the parsing ambiguity of INSERT ... SELECT ... ON CONFLICT
+            cursor.execute(f"""
+                INSERT INTO stock_take_counts (stock_take_id, item_id, counted_quantity)
+                SELECT ?, i.id, l.quantity
+                FROM temp.stock_take_load l
+                JOIN inventory_items i ON i.sku = l.sku AND i.is_active = 1
+                WHERE 1
+                ON CONFLICT (stock_take_id, item_id) DO UPDATE
+                    SET counted_quantity = {update}
+            """, (stock_take_id,))
+
+            cursor.execute("""
+                SELECT l.sku FROM temp.stock_take_load l
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM inventory_items i WHERE i.sku = l.sku AND i.is_active = 1
+                )
+                ORDER BY l.sku
+            """)
+            unknown = [row[0] for row in cursor.fetchall()]
+            cursor.execute("DELETE FROM temp.stock_take_load")
+        return unknown
+
+    def import_count_sheet(self, stock_take_id: int, file_path: str) -> Tuple[int, List[str]]:
+        """
+        Record the counts of a count sheet (CSV).
+
+        Expected columns: SKU and the counted quantity (Count, Counted,
+        Quantity or Qty). A sheet replaces earlier counts of the items it
+        lists; rows repeating a SKU are added up.
+
+        Args:
+            stock_take_id: Stock take ID
+            file_path: Count sheet path
+
+        Returns:
+            Tuple[int, List[str]]: (Rows recorded, Error Messages)
+
+        Raises:
+            ValueError: If the stock take is unknown or posted
+        """
+        counts = []
+        rows_by_sku: Dict[str, List[int]] = {}
+        errors: List[Tuple[int, str]] = []
+        try:
+            with open(file_path, 'r', newline='', encoding='utf-8-sig') as f:
+                reader = csv.DictReader(f)
+                # Normalize headers (strip whitespace, lowercase)
+                reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+                count_column = next((c for c in COUNT_COLUMNS if c in reader.fieldnames), None)
+                if 'sku' not in reader.fieldnames:
+                    return 0, ["Missing required column: sku"]
+                if count_column is None:
+                    return 0, ["Missing required column: count"]
+
+                for row_num, row in enumerate(reader, start=1):
+                    sku = (row.get('sku') or '').strip()
+                    quantity_str = (row.get(count_column) or '').replace(',', '').strip()
+                    if not sku and not quantity_str:
+                        continue  # Blank line
+                    if not sku:
+                        errors.append((row_num, "SKU is required"))
+                        continue
+                    try:
+                        quantity = float(quantity_str)
+                    except ValueError:
+                        quantity = math.nan
+                    if not math.isfinite(quantity) or quantity < 0:
+                        errors.append((row_num, f"Invalid count '{quantity_str}'"))
+                        continue
+                    counts.append((sku, quantity))
+                    rows_by_sku.setdefault(sku, []).append(row_num)
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            return 0, [f"File error: {e}"]
+
+        unknown = self.record_counts(stock_take_id, counts, replace=True)
+        recorded = len(counts)
+        for sku in unknown:
+            errors.extend((row_num, f"Unknown SKU {sku}") for row_num in rows_by_sku[sku])
+            recorded -= len(rows_by_sku[sku])
+        return recorded, [f"Row {row_num}: {message}" for row_num, message in sorted(errors)]
+
+    # ========================================================================
+    # RECONCILIATION
+    # ========================================================================
+
+    def _variances(
+        self,
+        cursor,
+        stock_take_id: int
+    ) -> List[Tuple[InventoryItem, float, int, str]]:
+        """
+        Counted items whose count differs from quantity_on_hand (one join),
+        with the unit cost their adjustment is valued at and its source.
+        """
+        cursor.execute("""
+            SELECT i.*, c.counted_quantity,
+                   CASE WHEN i.quantity_on_hand <= 0 THEN (
+                       SELECT t.unit_cost_cents FROM ledger_history t
+                       WHERE t.item_id = i.id AND t.transaction_type = 'PURCHASE'
+                         AND t.is_voided = 0
+                       ORDER BY t.id DESC LIMIT 1
+                   ) END AS last_purchase_cost_cents
+            FROM stock_take_counts c
+            JOIN inventory_items i ON i.id = c.item_id
+            WHERE c.stock_take_id = ? AND c.counted_quantity != i.quantity_on_hand
+            ORDER BY i.sku
+        """, (stock_take_id,))
+        variances = []
+        for row in cursor.fetchall():
+            item = InventoryItem.from_db_row(row)
+            if item.quantity_on_hand > 0:
+                unit_cost_cents, source = item.current_unit_cost_cents, 'average'
+            elif row['last_purchase_cost_cents']:
+                unit_cost_cents, source = row['last_purchase_cost_cents'], 'last_purchase'
+            else:
+                unit_cost_cents, source = 0, 'unknown'
+            variances.append((item, row['counted_quantity'], unit_cost_cents, source))
+        return variances
+
+    def get_variances(self, stock_take_id: int) -> List[CountVariance]:
+        """
+        Get the items whose count differs from the system quantity.
+
+        Args:
+            stock_take_id: Stock take ID
+
+        Returns:
+            List of CountVariance ordered by SKU, valued as post() would post them
+        """
+        cursor = self.db_manager.get_connection().cursor()
+        variances = []
+        for item, counted, unit_cost_cents, source in self._variances(cursor, stock_take_id):
+            _quantity, _basis, value_cents = \
+                item.calculate_count_adjustment_state(counted, unit_cost_cents)
+            variances.append(CountVariance(
+                item.id, item.sku, item.name, item.quantity_on_hand, counted,
+                unit_cost_cents, value_cents, source))
+        return variances
+
+    def preview(self, stock_take_id: int) -> Dict:
+        """
+        Summarize what posting a stock take would change.
+
+        Args:
+            stock_take_id: Stock take ID
+
+        Returns:
+            Dict with counted_items, the variances (list of CountVariance),
+            shrink/overage quantities and values in cents, the net value
+            change in cents, and estimated_cost: the variances not valued at
+            weighted average cost (see CountVariance.unit_cost_source), to
+            be checked before posting
+        """
+        cursor = self.db_manager.get_connection().cursor()
+        cursor.execute(
+            "SELECT COUNT(*) FROM stock_take_counts WHERE stock_take_id = ?", (stock_take_id,))
+        counted_items = cursor.fetchone()[0]
+        variances = self.get_variances(stock_take_id)
+        shrink = [v for v in variances if v.variance < 0]
+        overage = [v for v in variances if v.variance > 0]
+        return {
+            'counted_items': counted_items,
+            'variances': variances,
+            'shrink_quantity': -sum(v.variance for v in shrink),
+            'shrink_value_cents': -sum(v.value_change_cents for v in shrink),
+            'overage_quantity': sum(v.variance for v in overage),
+            'overage_value_cents': sum(v.value_change_cents for v in overage),
+            'net_value_cents': sum(v.value_change_cents for v in variances),
+            'estimated_cost': [v for v in variances if v.unit_cost_source != 'average'],
+        }
+
+    def post(self, stock_take_id: int) -> int:
+        """
+        Post every variance as a CORRECTION transaction, in one transaction.
+
+        Each counted item's quantity becomes its count; missing units leave
+        the cost basis at weighted average cost and found units enter at it
+        (at the last purchase cost for items that had no stock).
+        Variances are recomputed inside the write transaction, so writes made
+        since the preview are taken into account.
+
+        Args:
+            stock_take_id: Stock take ID
+
+        Returns:
+            int: Number of corrections posted
+
+        Raises:
+            ValueError: If the stock take is unknown or already posted
+        """
+        transaction_date = datetime.now().isoformat()
+
+        # IMMEDIATE whatever the manager's setting: variances and new IDs
+        # below rely on no other connection writing until the commit
+        with self.db_manager.transaction("IMMEDIATE") as conn:
+            cursor = conn.cursor()
+            self._require_open(cursor, stock_take_id)
+            cursor.execute("SELECT name, notes FROM stock_takes WHERE id = ?", (stock_take_id,))
+            name, notes = cursor.fetchone()
+            notes = f"Stock take #{stock_take_id} ({name})" + (f": {notes}" if notes else "")
+
+            # Audit trail: what the system showed for every counted item
+            cursor.execute("""
+                UPDATE stock_take_counts
+                SET system_quantity = (SELECT quantity_on_hand FROM inventory_items
+                                       WHERE id = stock_take_counts.item_id)
+                WHERE stock_take_id = ?
+            """, (stock_take_id,))
+
+            rows, updates = [], []
+            for item, counted, unit_cost_cents, _source in self._variances(cursor, stock_take_id):
+                new_quantity, new_cost_basis, value_cents = \
+                    item.calculate_count_adjustment_state(counted, unit_cost_cents)
+                rows.append((item.id, TransactionType.CORRECTION.value,
+                             new_quantity - item.quantity_on_hand, unit_cost_cents,
+                             value_cents, ReasonCode.COUNT.value, notes, transaction_date))
+                updates.append((new_quantity, new_cost_basis, item.id))
+
+            # New IDs are the ones above the current maximum: the write lock
+            # has been held since BEGIN IMMEDIATE, so no other connection
+            # can have inserted in between
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM inventory_transactions")
+            last_id = cursor.fetchone()[0]
+            cursor.executemany("""
+                INSERT INTO inventory_transactions
+                (item_id, transaction_type, quantity_change, unit_cost_cents,
+                 total_financial_impact_cents, reason_code, notes, transaction_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            cursor.executemany("""
+                UPDATE inventory_items
+                SET quantity_on_hand = ?,
+                    total_cost_basis_cents = ?
+                WHERE id = ?
+            """, updates)
+
+            cursor.execute(
+                "SELECT id, item_id FROM inventory_transactions WHERE id > ?", (last_id,))
+            cursor.executemany("""
+                UPDATE stock_take_counts SET transaction_id = ?
+                WHERE stock_take_id = ? AND item_id = ?
+            """, [(transaction_id, stock_take_id, item_id)
+                  for transaction_id, item_id in cursor.fetchall()])
+            cursor.execute(
+                "UPDATE stock_takes SET posted_at = ? WHERE id = ?",
+                (transaction_date, stock_take_id))
+
+        logger.info(f"Stock take {stock_take_id} posted: {len(rows)} corrections")
+        get_event_bus(self.db_manager).publish(
+            StockTakePosted(stock_take_id, tuple(item_id for *_values, item_id in updates)))
+        return len(rows)
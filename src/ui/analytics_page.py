@@ -32,6 +32,8 @@ class AnalyticsPage(QWidget):
         self.analytics_service = AnalyticsService(db_path)
         self.current_forecast_days = 30
         self.current_lookback_days = 90
+        # Results each generated tab shows (tab index -> tuple of results)
+        self._shown_results = {}
         
         self.excel_generator = ExcelReportGenerator()
         
@@ -186,6 +188,33 @@ class AnalyticsPage(QWidget):
                         opacity: 1;
                     }}
                 """)
+        
+        # Refresh previously generated reports. Unchanged data comes back
+        # from the analytics cache as the same objects, which the tab
+        # already shows, so only a change rebuilds its widgets.
+        if index in self._shown_results:
+            generators = [self.generate_forecast, self.generate_trends, self.generate_donor_report]
+            generators[index]()
+    
+    def _is_shown(self, index: int, results: tuple) -> bool:
+        """
+        Check whether a tab already shows these results; record them if not.
+        
+        Args:
+            index: Tab index
+            results: The (cached) results the tab is built from
+            
+        Returns:
+            bool: True if the tab shows these results (the same objects
+                when nothing changed, or equal ones recomputed after an
+                unrelated write)
+        """
+        shown = self._shown_results.get(index)
+        if shown is not None and len(shown) == len(results) and \
+                all(old is new or old == new for old, new in zip(shown, results)):
+            return True
+        self._shown_results[index] = results
+        return False
     
     def create_forecast_page(self):
         """Create inventory forecast page."""
@@ -590,6 +619,8 @@ class AnalyticsPage(QWidget):
                 days_ahead=days_ahead,
                 lookback_days=lookback_days
             )
+            if self._is_shown(0, (forecasts,)):
+                return
             
             # Update table
             self.forecast_table.setRowCount(len(forecasts))
@@ -657,6 +688,7 @@ class AnalyticsPage(QWidget):
             self.update_summary_card(self.low_risk_card, f"{low_count} items")
             
         except Exception as e:
+            self._shown_results.pop(0, None)
             QMessageBox.critical(self, "Error", f"Failed to generate forecast: {e}")
     
     def generate_trends(self):
@@ -664,8 +696,11 @@ class AnalyticsPage(QWidget):
         try:
             year = int(self.trend_year.currentText())
             
-            # Get seasonal trends
+            # Get seasonal trends and YoY comparison
             trends = self.analytics_service.get_seasonal_trends(year=year)
+            yoy = self.analytics_service.get_year_over_year_comparison()
+            if self._is_shown(1, (trends, yoy)):
+                return
             
             # Update summary
             totals = trends['totals']
@@ -697,9 +732,7 @@ class AnalyticsPage(QWidget):
                     cell = QTableWidgetItem(item)
                     self.trends_table.setItem(row, col, cell)
             
-            # Get YoY comparison
-            yoy = self.analytics_service.get_year_over_year_comparison()
-            
+            # YoY comparison
             self.yoy_table.setRowCount(len(yoy['years']))
             for row, year in enumerate(yoy['years']):
                 data = yoy['data'][year]
@@ -722,12 +755,15 @@ class AnalyticsPage(QWidget):
                     self.yoy_table.setItem(row, col, cell)
             
         except Exception as e:
+            self._shown_results.pop(1, None)
             QMessageBox.critical(self, "Error", f"Failed to generate trends: {e}")
     
     def generate_donor_report(self):
         """Generate donor impact report."""
         try:
             summary = self.analytics_service.get_donor_impact_summary()
+            if self._is_shown(2, (summary,)):
+                return
             
             # Update summary cards
             self.update_summary_card(self.total_donors_card, str(summary['total_donors']))
@@ -760,6 +796,7 @@ class AnalyticsPage(QWidget):
                     self.donor_table.setItem(row, col, cell)
             
         except Exception as e:
+            self._shown_results.pop(2, None)
             QMessageBox.critical(self, "Error", f"Failed to generate donor report: {e}")
             
     def export_forecast(self):
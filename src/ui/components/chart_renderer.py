@@ -0,0 +1,293 @@
+"""
+Offscreen chart renderers for the dashboard.
+
+Each renderer owns a matplotlib Figure attached to an Agg canvas (no Qt), so
+it can be drawn on a worker thread and the resulting RGBA buffer blitted by
+the UI. Figures and artists are created once and reused: when new data has
+the same shape only wedge angles, bar heights and label text are updated;
+when the data is unchanged nothing is redrawn at all.
+
+Renderers are not thread-safe - use each instance from one thread at a time.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+@dataclass
+class RenderedFrame:
+    """An RGBA8888 image produced by a chart renderer."""
+
+    width: int
+    height: int
+    data: bytes
+
+
+def _truncate(name: str, max_len: int = 20) -> str:
+    """Truncate long labels for display."""
+    return name[:max_len - 3] + "..." if len(name) > max_len else name
+
+
+class ChartRenderer:
+    """Base class: a persistent Figure rendered offscreen with Agg."""
+
+    def __init__(self, width_px: int = 500, height_px: int = 400, dpi: int = 100):
+        self.dpi = dpi
+        self.figure = Figure(figsize=(width_px / dpi, height_px / dpi), dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot(111)
+        self._data: Optional[Tuple] = None
+        self._dirty = True
+        self._empty_text = None
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Current output size in pixels (width, height)."""
+        width, height = self.figure.get_size_inches() * self.dpi
+        return int(round(width)), int(round(height))
+
+    def set_size(self, width_px: int, height_px: int, dpi: Optional[int] = None) -> bool:
+        """
+        Resize the output image.
+
+        Args:
+            width_px: Width in device pixels
+            height_px: Height in device pixels
+            dpi: Optional new resolution (for high-DPI screens)
+
+        Returns:
+            bool: True if the size changed (a redraw is needed)
+        """
+        width_px, height_px = max(int(width_px), 1), max(int(height_px), 1)
+        if dpi is not None and dpi != self.dpi:
+            self.dpi = dpi
+            self.figure.set_dpi(dpi)
+            self._dirty = True
+        if (width_px, height_px) != self.size:
+            self.figure.set_size_inches(width_px / self.dpi, height_px / self.dpi)
+            self._dirty = True
+        return self._dirty
+
+    def update(self, data: List[Dict]) -> bool:
+        """
+        Update the chart with new data.
+
+        Args:
+            data: Rows from ReportingService.get_dashboard_stats()
+
+        Returns:
+            bool: False if the data is unchanged (no redraw needed)
+        """
+        key = self._normalize(data)
+        if key == self._data:
+            return False
+
+        self._data = key
+        if self._can_update(key):
+            self._update_artists(key)
+        else:
+            self._rebuild(key)
+        self._dirty = True
+        return True
+
+    @property
+    def needs_render(self) -> bool:
+        """Whether the last rendered frame is stale."""
+        return self._dirty
+
+    def render(self) -> RenderedFrame:
+        """
+        Rasterize the figure into an RGBA buffer.
+
+        Returns:
+            RenderedFrame: The rendered image
+        """
+        self.canvas.draw()
+        buffer = self.canvas.buffer_rgba()
+        height, width = buffer.shape[0], buffer.shape[1]
+        self._dirty = False
+        return RenderedFrame(width=width, height=height, data=bytes(buffer))
+
+    # ------------------------------------------------------------------
+    # Subclass hooks
+    # ------------------------------------------------------------------
+
+    def _normalize(self, data: List[Dict]) -> Tuple:
+        """Convert input rows into a hashable (labels, values) tuple."""
+        raise NotImplementedError
+
+    def _can_update(self, key: Tuple) -> bool:
+        """Whether existing artists match the shape of the new data."""
+        raise NotImplementedError
+
+    def _rebuild(self, key: Tuple):
+        """Recreate all artists (first draw or shape change)."""
+        raise NotImplementedError
+
+    def _update_artists(self, key: Tuple):
+        """Update existing artists in place (same shape as before)."""
+        raise NotImplementedError
+
+    def _show_empty(self):
+        self.ax.clear()
+        self.ax.set_axis_off()
+        self._empty_text = self.ax.text(0.5, 0.5, "No Data", ha='center', va='center')
+
+
+class CategoryPieChart(ChartRenderer):
+    """Inventory value by category (pie + legend)."""
+
+    START_ANGLE = 90
+    EXPLODE = 0.05
+    PCT_DISTANCE = 0.85
+    MIN_LABEL_PCT = 5
+
+    def __init__(self, width_px: int = 500, height_px: int = 400, dpi: int = 100):
+        super().__init__(width_px, height_px, dpi)
+        self.wedges = []
+        self.autotexts = []
+        self.legend = None
+
+    def _normalize(self, data: List[Dict]) -> Tuple:
+        labels = tuple(c['category'] for c in data)
+        values = tuple(float(c['value_dollars']) for c in data)
+        return labels, values
+
+    def _can_update(self, key: Tuple) -> bool:
+        return bool(self.wedges) and len(self.wedges) == len(key[1])
+
+    @classmethod
+    def _autopct(cls, pct: float) -> str:
+        return ('%1.1f%%' % pct) if pct >= cls.MIN_LABEL_PCT else ''
+
+    def _rebuild(self, key: Tuple):
+        labels, values = key
+        self.ax.clear()
+        self.wedges, self.autotexts, self.legend = [], [], None
+
+        if not values or sum(values) <= 0:
+            self._show_empty()
+            return
+
+        self.ax.set_axis_on()
+        colors = self._colors()
+        self.wedges, _texts, self.autotexts = self.ax.pie(
+            values,
+            labels=None,
+            autopct=self._autopct,
+            startangle=self.START_ANGLE,
+            colors=colors,
+            explode=[self.EXPLODE] * len(values),
+            pctdistance=self.PCT_DISTANCE,
+            textprops={'fontsize': 9}
+        )
+        for autotext in self.autotexts:
+            autotext.set_color('white')
+            autotext.set_weight('bold')
+
+        self._build_legend(labels)
+        self.ax.set_title("Inventory Value by Category", fontsize=10, weight='bold')
+        self.figure.subplots_adjust(left=0.05, right=0.7, top=0.9, bottom=0.1)
+
+    def _update_artists(self, key: Tuple):
+        labels, values = key
+        total = sum(values)
+        if total <= 0:
+            self._rebuild(key)
+            return
+
+        # Same geometry as Axes.pie(): counter-clockwise from START_ANGLE
+        theta1 = self.START_ANGLE / 360.0
+        for wedge, autotext, value in zip(self.wedges, self.autotexts, values):
+            frac = value / total
+            theta2 = theta1 + frac
+            thetam = math.pi * (theta1 + theta2)
+            x = self.EXPLODE * math.cos(thetam)
+            y = self.EXPLODE * math.sin(thetam)
+
+            wedge.set_center((x, y))
+            wedge.set_theta1(360.0 * theta1)
+            wedge.set_theta2(360.0 * theta2)
+            autotext.set_position((
+                x + self.PCT_DISTANCE * math.cos(thetam),
+                y + self.PCT_DISTANCE * math.sin(thetam)
+            ))
+            autotext.set_text(self._autopct(100.0 * frac))
+            theta1 = theta2
+
+        if self.legend is None or [t.get_text() for t in self.legend.get_texts()] != list(labels):
+            self._build_legend(labels)
+
+    def _build_legend(self, labels: Sequence[str]):
+        if self.legend is not None:
+            self.legend.remove()
+        self.legend = self.ax.legend(
+            self.wedges, labels,
+            title="Categories",
+            loc="center left",
+            bbox_to_anchor=(0.9, 0, 0.5, 1),
+            fontsize='small'
+        )
+
+    @staticmethod
+    def _colors():
+        from matplotlib import colormaps
+        return colormaps['Set3'].colors
+
+
+class TopItemsBarChart(ChartRenderer):
+    """Top distributed items (vertical bars with value labels)."""
+
+    def __init__(self, width_px: int = 500, height_px: int = 400, dpi: int = 100):
+        super().__init__(width_px, height_px, dpi)
+        self.bars = None
+        self.bar_labels = []
+
+    def _normalize(self, data: List[Dict]) -> Tuple:
+        names = tuple(_truncate(i['name']) for i in data)
+        quantities = tuple(float(i['quantity']) for i in data)
+        return names, quantities
+
+    def _can_update(self, key: Tuple) -> bool:
+        return self.bars is not None and len(self.bars) == len(key[1])
+
+    def _rebuild(self, key: Tuple):
+        names, quantities = key
+        self.ax.clear()
+        self.bars, self.bar_labels = None, []
+
+        if not quantities:
+            self._show_empty()
+            return
+
+        self.ax.set_axis_on()
+        positions = range(len(quantities))
+        self.bars = self.ax.bar(positions, quantities, color='#3498db')
+        self.bar_labels = self.ax.bar_label(self.bars, padding=3)
+
+        self.ax.set_title("Top 5 Distributed Items", pad=20)
+        self.ax.set_ylabel("Units")
+        self._set_names(names)
+        self._set_ylim(quantities)
+        # Bottom margin for rotated labels
+        self.figure.subplots_adjust(bottom=0.35, top=0.85)
+
+    def _update_artists(self, key: Tuple):
+        names, quantities = key
+        for rect, label, qty in zip(self.bars, self.bar_labels, quantities):
+            rect.set_height(qty)
+            label.xy = (rect.get_x() + rect.get_width() / 2, qty)
+            label.set_text(f"{qty:g}")
+        self._set_names(names)
+        self._set_ylim(quantities)
+
+    def _set_names(self, names: Sequence[str]):
+        self.ax.set_xticks(range(len(names)), names, rotation=45, ha='right')
+
+    def _set_ylim(self, quantities: Sequence[float]):
+        top = max(quantities) * 1.2 if quantities and max(quantities) > 0 else 1
+        self.ax.set_ylim(0, top)
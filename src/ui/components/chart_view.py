@@ -0,0 +1,162 @@
+"""
+Chart view widget that displays offscreen-rendered charts.
+
+Rendering (matplotlib Agg) runs on a single worker thread per view; the UI
+thread only blits the finished RGBA image. New data that arrives while a
+frame is rendering is coalesced so only the latest request is drawn.
+"""
+
+from typing import Dict, List, Optional
+
+from PyQt6.QtWidgets import QWidget, QSizePolicy
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtGui import QImage, QPainter
+
+from ui.components.chart_renderer import ChartRenderer, RenderedFrame
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class _RenderSignals(QObject):
+    """Signals emitted by a render task (delivered on the UI thread)."""
+    finished = pyqtSignal(object)  # RenderedFrame or None
+
+
+class _RenderTask(QRunnable):
+    """Applies data/size to a renderer and rasterizes it off the UI thread."""
+
+    def __init__(self, renderer: ChartRenderer, data, size, signals: _RenderSignals):
+        super().__init__()
+        self.renderer = renderer
+        self.data = data
+        self.size = size
+        self.signals = signals
+
+    def run(self):
+        frame = None
+        try:
+            if self.size is not None:
+                self.renderer.set_size(*self.size)
+            if self.data is not None:
+                self.renderer.update(self.data)
+            if self.renderer.needs_render:
+                frame = self.renderer.render()
+        except Exception as e:
+            logger.error(f"Chart render failed: {e}", exc_info=True)
+        self.signals.finished.emit(frame)
+
+
+class ChartView(QWidget):
+    """
+    Widget that shows a ChartRenderer's output.
+
+    Usage:
+        view = ChartView(CategoryPieChart())
+        view.set_data(stats['value_by_category'])
+    """
+
+    RESIZE_DEBOUNCE_MS = 150
+
+    def __init__(self, renderer: ChartRenderer, parent=None):
+        super().__init__(parent)
+        self.renderer = renderer
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.setMinimumSize(250, 200)
+
+        self._image: Optional[QImage] = None
+        self._last_data: Optional[List[Dict]] = None
+        self._busy = False
+        self._pending_data = None
+        self._pending_size = None
+
+        # One worker per view: the renderer is never touched by two threads
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._signals = _RenderSignals()
+        self._signals.finished.connect(self._on_frame)
+
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(self.RESIZE_DEBOUNCE_MS)
+        self._resize_timer.timeout.connect(self._request_resize)
+
+    def set_data(self, data: List[Dict]) -> bool:
+        """
+        Show new chart data.
+
+        Args:
+            data: Chart rows (as returned by get_dashboard_stats)
+
+        Returns:
+            bool: False if the data is unchanged and no redraw was scheduled
+        """
+        if data == self._last_data and self._image is not None:
+            return False
+        self._last_data = list(data)
+        self._pending_data = self._last_data
+        self._schedule()
+        return True
+
+    def wait_for_render(self, msecs: int = -1) -> bool:
+        """Block until queued renders finish (tests and benchmarks)."""
+        return self._pool.waitForDone(msecs)
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def _device_size(self):
+        ratio = self.devicePixelRatioF()
+        return (
+            int(self.width() * ratio),
+            int(self.height() * ratio),
+            int(round(100 * ratio)),
+        )
+
+    def _request_resize(self):
+        self._pending_size = self._device_size()
+        self._schedule()
+
+    def _schedule(self):
+        if self._busy:
+            return  # Picked up by _on_frame when the current render finishes
+        if self._pending_data is None and self._pending_size is None:
+            return
+
+        data, size = self._pending_data, self._pending_size
+        self._pending_data = self._pending_size = None
+        if size is None and self._image is None:
+            size = self._device_size()
+
+        self._busy = True
+        self._pool.start(_RenderTask(self.renderer, data, size, self._signals))
+
+    def _on_frame(self, frame: Optional[RenderedFrame]):
+        self._busy = False
+        if frame is not None:
+            image = QImage(
+                frame.data, frame.width, frame.height,
+                frame.width * 4, QImage.Format.Format_RGBA8888
+            ).copy()  # Own the pixels; frame.data is released after this call
+            image.setDevicePixelRatio(self.devicePixelRatioF())
+            self._image = image
+            self.update()
+        self._schedule()
+
+    # ------------------------------------------------------------------
+    # Qt events
+    # ------------------------------------------------------------------
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._resize_timer.start()
+
+    def paintEvent(self, event):
+        if self._image is None:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        # Stretch the last frame until the debounced resize render arrives
+        painter.drawImage(self.rect(), self._image)
+        painter.end()
@@ -0,0 +1,176 @@
+"""
+Lazy, searchable item picker.
+
+Replaces combo boxes filled with every active item: the list model fetches
+items a page at a time (keyset pagination on SKU, see
+InventoryService.search_items_by_prefix) only as the list is scrolled, and
+the view only paints the rows in view, so opening a dialog costs one page
+whatever the size of the catalog. Typing in the search field restarts the
+list from the first page of matching items.
+"""
+
+from typing import List, Optional
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer, pyqtSignal
+from PyQt6.QtWidgets import (
+    QDialog, QDialogButtonBox, QLineEdit, QListView, QVBoxLayout, QWidget
+)
+
+from models.item import InventoryItem
+from services.inventory_service import InventoryService
+
+# Items fetched per page (a few screens of rows)
+PAGE_SIZE = 100
+
+# Pause in typing before the list is filtered
+FILTER_DEBOUNCE_MS = 150
+
+
+class ItemListModel(QAbstractListModel):
+    """Active items matching a prefix, fetched page by page in SKU order."""
+
+    def __init__(self, service: InventoryService, parent=None):
+        super().__init__(parent)
+        self.service = service
+        self._prefix = ""
+        self._items: List[InventoryItem] = []
+        self._exhausted = False
+
+    def set_prefix(self, prefix: str):
+        """Restart the list with the items whose SKU or name starts with ``prefix``."""
+        self.beginResetModel()
+        self._prefix = prefix.strip()
+        self._items = []
+        self._exhausted = False
+        self.endResetModel()
+
+    def item_at(self, row: int) -> Optional[InventoryItem]:
+        """The item shown in a row (as fetched; re-read it before using stock figures)."""
+        return self._items[row] if 0 <= row < len(self._items) else None
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        item = self.item_at(index.row())
+        if item is None:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{item.name} ({item.sku})"
+        if role == Qt.ItemDataRole.UserRole:
+            return item.id
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        after_sku = self._items[-1].sku if self._items else None
+        page = self.service.search_items_by_prefix(self._prefix, PAGE_SIZE, after_sku=after_sku)
+        self._exhausted = len(page) < PAGE_SIZE
+        if page:
+            first = len(self._items)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self._items.extend(page)
+            self.endInsertRows()
+
+
+class ItemPicker(QWidget):
+    """
+    Search field over a lazily filled item list.
+
+    Signals:
+        item_selected(object): Item ID of the selected row, or None
+    """
+
+    item_selected = pyqtSignal(object)
+
+    def __init__(self, service: InventoryService, parent=None):
+        super().__init__(parent)
+        self.model = ItemListModel(service, self)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search by SKU or name...")
+        self.search_input.setClearButtonEnabled(True)
+        layout.addWidget(self.search_input)
+
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)  # Lets the view skip measuring rows
+        self.list_view.setModel(self.model)
+        self.list_view.setMinimumHeight(150)
+        layout.addWidget(self.list_view)
+
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self._apply_filter)
+        self.search_input.textChanged.connect(lambda _text: self._filter_timer.start())
+        self.search_input.returnPressed.connect(self._select_first)
+
+        self.list_view.selectionModel().currentChanged.connect(self._on_current_changed)
+        self.model.modelReset.connect(lambda: self.item_selected.emit(None))
+
+    def current_item_id(self) -> Optional[int]:
+        """ID of the selected item, or None."""
+        index = self.list_view.currentIndex()
+        return index.data(Qt.ItemDataRole.UserRole) if index.isValid() else None
+
+    def set_search_text(self, text: str):
+        """Fill the search field and filter right away (no typing pause)."""
+        self.search_input.setText(text)
+        self._filter_timer.stop()
+        self._apply_filter()
+
+    def _apply_filter(self):
+        self.model.set_prefix(self.search_input.text())
+
+    def _select_first(self):
+        """Enter in the search field picks the first match (e.g. after a scan)."""
+        if self._filter_timer.isActive():
+            self._filter_timer.stop()
+            self._apply_filter()
+        if self.model.rowCount() == 0 and self.model.canFetchMore():
+            self.model.fetchMore()
+        if self.model.rowCount() > 0:
+            self.list_view.setCurrentIndex(self.model.index(0))
+
+    def _on_current_changed(self, current: QModelIndex, _previous: QModelIndex):
+        self.item_selected.emit(current.data(Qt.ItemDataRole.UserRole) if current.isValid() else None)
+
+
+class ItemPickerDialog(QDialog):
+    """Browse and pick an item (used next to the intake dialogs' SKU field)."""
+
+    def __init__(self, service: InventoryService, prefix: str = "", parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Select Item")
+        self.setMinimumSize(420, 420)
+
+        layout = QVBoxLayout(self)
+        self.picker = ItemPicker(service, self)
+        layout.addWidget(self.picker)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self._ok_button = buttons.button(QDialogButtonBox.StandardButton.Ok)
+        self._ok_button.setEnabled(False)
+        self.picker.item_selected.connect(
+            lambda item_id: self._ok_button.setEnabled(item_id is not None))
+        self.picker.list_view.doubleClicked.connect(self.accept)
+
+        if prefix:
+            self.picker.set_search_text(prefix)
+
+    def selected_item(self) -> Optional[InventoryItem]:
+        """The picked item, or None."""
+        index = self.picker.list_view.currentIndex()
+        return self.picker.model.item_at(index.row()) if index.isValid() else None
@@ -4,7 +4,8 @@ Dashboard page for identifying key inventory metrics at a glance.
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QFrame, QGridLayout, QSizePolicy
+    QFrame, QGridLayout, QSizePolicy, QTreeWidget, QTreeWidgetItem,
+    QHeaderView
 )
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QColor, QFont
@@ -12,12 +13,9 @@ from PyQt6.QtGui import QColor, QFont
 from PyQt6.QtGui import QColor, QFont
 
 # Matplotlib imports moved to local scope for faster startup
-# import matplotlib
-# matplotlib.use('QtAgg')
-# from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
-# from matplotlib.figure import Figure
-# import matplotlib.pyplot as plt
+# (see ui.components.chart_renderer / chart_view)
 
+from services.events import ChangeEvent, get_event_bus
 from services.reporting_service import ReportingService
 from utils.error_handler import show_error
 from utils.logger import setup_logger
@@ -59,9 +57,14 @@ class DashboardPage(QWidget):
     def __init__(self, service: ReportingService, parent=None):
         super().__init__(parent)
         self.service = service
+        self._refresh_pending = False
         self.init_ui()
         self.load_data()
         
+        # Stay current while shown (e.g. a purchase entered from the menu)
+        unsubscribe = get_event_bus(service.db_manager).subscribe(self.on_change)
+        self.destroyed.connect(lambda *_: unsubscribe())
+        
     def init_ui(self):
         """Initialize UI."""
         layout = QVBoxLayout(self)
@@ -87,35 +90,53 @@ class DashboardPage(QWidget):
         
         layout.addLayout(kpi_layout)
         
-        layout.addLayout(kpi_layout)
-        
         # Charts (Bottom Row)
         self.charts_layout = QHBoxLayout()
         self._init_charts() # Lazy load charts
         layout.addLayout(self.charts_layout)
         
+        # Category hierarchy with subtree totals
+        tree_label = QLabel("Inventory Value by Category")
+        tree_label.setStyleSheet("font-size: 12pt; font-weight: bold; color: #2c3e50;")
+        layout.addWidget(tree_label)
+        
+        self.category_tree = QTreeWidget()
+        self.category_tree.setColumnCount(2)
+        self.category_tree.setHeaderLabels(["Category", "Value (incl. subcategories)"])
+        self.category_tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.category_tree.setMaximumHeight(220)
+        layout.addWidget(self.category_tree)
+        
     def _init_charts(self):
         """Initialize charts with local imports."""
-        # Local import for performance
-        import matplotlib
-        matplotlib.use('QtAgg')
-        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
-        from matplotlib.figure import Figure
-        
-        # Store classes for later use in load_data
-        self.FigureCanvasQTAgg = FigureCanvasQTAgg
-        self.Figure = Figure
-        
-        # Value by Category Chart
-        self.category_figure = Figure(figsize=(5, 4), dpi=100)
-        self.category_canvas = FigureCanvasQTAgg(self.category_figure)
-        self.charts_layout.addWidget(self.category_canvas)
-        
-        # Top Distributed Items Chart
-        self.distributed_figure = Figure(figsize=(5, 4), dpi=100)
-        self.distributed_canvas = FigureCanvasQTAgg(self.distributed_figure)
-        self.charts_layout.addWidget(self.distributed_canvas)
-        
+        # Local import for performance (matplotlib is heavy)
+        from ui.components.chart_renderer import CategoryPieChart, TopItemsBarChart
+        from ui.components.chart_view import ChartView
+        
+        # Figures and artists live as long as the page; each view renders
+        # offscreen on its own worker thread and only blits the result.
+        self.category_chart = ChartView(CategoryPieChart())
+        self.charts_layout.addWidget(self.category_chart)
+        
+        self.distributed_chart = ChartView(TopItemsBarChart())
+        self.charts_layout.addWidget(self.distributed_chart)
+        
+    def on_change(self, event: ChangeEvent):
+        """
+        Schedule a refresh after a committed write.
+        
+        Only while the page is visible (switching to it reloads anyway),
+        and a burst of writes becomes a single reload.
+        """
+        if self.isVisible() and not self._refresh_pending:
+            self._refresh_pending = True
+            QTimer.singleShot(0, self._refresh)
+    
+    def _refresh(self):
+        self._refresh_pending = False
+        if self.isVisible():
+            self.load_data()
+    
     def load_data(self):
         """Load and display dashboard data."""
         try:
@@ -126,104 +147,11 @@ class DashboardPage(QWidget):
             self.low_stock_card.value_label.setText(str(stats['low_stock_count']))
             self.total_items_card.value_label.setText(str(stats['total_items_count']))
             
-            # --- Update Category Chart (Pie) ---
-            self.category_figure.clear()
-            ax1 = self.category_figure.add_subplot(111)
-            
-            categories = stats['value_by_category']
-            if categories:
-                labels = [c['category'] for c in categories]
-                values = [c['value_dollars'] for c in categories]
-                
-            if categories:
-                labels = [c['category'] for c in categories]
-                values = [c['value_dollars'] for c in categories]
-                
-                # Pie chart with labels outside and connecting lines
-                # Import colormap locally
-                import matplotlib.pyplot as plt
-                colors = plt.cm.Set3.colors
-                
-                # Small explode for visual separation
-                explode = [0.05] * len(values)
-                
-                # Define a function to hide small percentages
-                def autopct_format(pct):
-                    return ('%1.1f%%' % pct) if pct >= 5 else ''
-
-                wedges, texts, autotexts = ax1.pie(
-                    values, 
-                    labels=None, # Hide external labels to prevent smashing
-                    autopct=autopct_format,
-                    startangle=90, 
-                    colors=colors,
-                    explode=explode,
-                    pctdistance=0.85,
-                    textprops={'fontsize': 9}
-                )
-                
-                # Style the percentage labels
-                for autotext in autotexts:
-                    autotext.set_color('white')
-                    autotext.set_weight('bold')
-                
-                # Add Legend
-                ax1.legend(
-                    wedges, labels,
-                    title="Categories",
-                    loc="center left",
-                    bbox_to_anchor=(0.9, 0, 0.5, 1),
-                    fontsize='small'
-                )
-                
-                ax1.set_title("Inventory Value by Category", fontsize=10, weight='bold')
-                # Adjust margins to accommodate legend on the right
-                self.category_figure.subplots_adjust(left=0.05, right=0.7, top=0.9, bottom=0.1)
-            else:
-                ax1.text(0.5, 0.5, "No Data", ha='center', va='center')
-                
-            self.category_canvas.draw()
+            # Charts skip the redraw entirely when their data is unchanged
+            self.category_chart.set_data(stats['value_by_category'])
+            self.distributed_chart.set_data(stats['top_distributed_items'])
             
-            # --- Update Distribution Chart (Bar) ---
-            self.distributed_figure.clear()
-            ax2 = self.distributed_figure.add_subplot(111)
-            
-            items = stats['top_distributed_items']
-            if items:
-                names = [i['name'] for i in items]
-                quantities = [i['quantity'] for i in items]
-                
-                # Truncate long names for display
-                display_names = []
-                for name in names:
-                    if len(name) > 20:
-                        display_names.append(name[:17] + "...")
-                    else:
-                        display_names.append(name)
-
-                # Vertical Bar chart
-                bars = ax2.bar(display_names, quantities, color='#3498db')
-                
-                # Add counts on top of bars
-                ax2.bar_label(bars, padding=3)
-                
-                ax2.set_title("Top 5 Distributed Items", pad=20)
-                ax2.set_ylabel("Units")
-                
-                # Dynamic Y-limit to fit labels
-                if quantities:
-                    ax2.set_ylim(0, max(quantities) * 1.2)
-                
-                # Rotate labels if they are long
-                # Import pyplot locally for setp
-                import matplotlib.pyplot as plt
-                plt.setp(ax2.get_xticklabels(), rotation=45, ha='right')
-                # Increase bottom margin for rotated labels
-                self.distributed_figure.subplots_adjust(bottom=0.35, top=0.85)
-            else:
-                ax2.text(0.5, 0.5, "No Data", ha='center', va='center')
-                
-            self.distributed_canvas.draw()
+            self._populate_category_tree(stats.get('category_rollup', []))
             
         except Exception as e:
             show_error(
@@ -232,4 +160,16 @@ class DashboardPage(QWidget):
                 "Failed to load dashboard data. Please check the application logs for details.",
                 exception=e
             )
-
+    
+    def _populate_category_tree(self, rollup: list):
+        """Fill the category tree; rows arrive parents-first in tree order."""
+        self.category_tree.clear()
+        nodes = {}
+        for row in rollup:
+            parent = nodes.get(row['parent_id'])
+            node = QTreeWidgetItem(parent or self.category_tree)
+            node.setText(0, row['category'])
+            node.setText(1, f"${row['value_dollars']:,.2f}")
+            node.setTextAlignment(1, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            nodes[row['category_id']] = node
+        self.category_tree.expandAll()
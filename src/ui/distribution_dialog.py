@@ -1,16 +1,21 @@
 """
-Distribution dialog for recording item distributions with reason codes.
+Distribution dialogs: single distributions with reason codes and
+multi-item client visits.
 """
 
+import uuid
+
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
     QLabel, QLineEdit, QComboBox, QDoubleSpinBox, QPushButton,
-    QTextEdit, QMessageBox
+    QTextEdit, QMessageBox, QTableWidget, QTableWidgetItem, QHeaderView
 )
 from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
 
 from services.inventory_service import InventoryService
 from models.transaction import ReasonCode
+from ui.components.item_picker import ItemPicker
 
 
 class DistributionDialog(QDialog):
@@ -66,11 +71,10 @@ class DistributionDialog(QDialog):
         form = QFormLayout()
         form.setSpacing(15)
         
-        # Item selection
-        self.item_combo = QComboBox()
-        self.load_items()
-        self.item_combo.currentIndexChanged.connect(self.update_available_quantity)
-        form.addRow("Item*:", self.item_combo)
+        # Item selection (fetched on demand as the list scrolls or is searched)
+        self.item_picker = ItemPicker(self.service)
+        self.item_picker.item_selected.connect(self.update_available_quantity)
+        form.addRow("Item*:", self.item_picker)
         
         # Available quantity display
         self.available_label = QLabel("0 units available")
@@ -138,23 +142,9 @@ class DistributionDialog(QDialog):
         # Initialize displays
         self.update_available_quantity()
     
-    def load_items(self):
-        """Load items into combo box."""
-        try:
-            items = self.service.get_all_items()
-            
-            for item in items:
-                self.item_combo.addItem(
-                    f"{item.name} ({item.sku})",
-                    item.id
-                )
-                
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to load items: {e}")
-    
     def update_available_quantity(self):
         """Update available quantity display."""
-        item_id = self.item_combo.currentData()
+        item_id = self.item_picker.current_item_id()
         if not item_id:
             self.available_label.setText("0 units available")
             return
@@ -171,7 +161,7 @@ class DistributionDialog(QDialog):
     
     def update_cogs(self):
         """Update COGS display."""
-        item_id = self.item_combo.currentData()
+        item_id = self.item_picker.current_item_id()
         if not item_id:
             self.cogs_label.setText("$0.00")
             return
@@ -187,7 +177,7 @@ class DistributionDialog(QDialog):
     
     def save_distribution(self):
         """Save distribution transaction."""
-        item_id = self.item_combo.currentData()
+        item_id = self.item_picker.current_item_id()
         if not item_id:
             QMessageBox.warning(self, "Validation Error", "Please select an item")
             return
@@ -247,3 +237,233 @@ class DistributionDialog(QDialog):
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to record distribution: {e}")
+
+
+class BasketDistributionDialog(QDialog):
+    """
+    Dialog for a client visit: many items distributed in one step.
+
+    Items are added to a basket and recorded together with
+    InventoryService.process_distribution_basket(), so a visit of 10-30
+    items is one confirmation and one commit instead of one of each per item.
+    """
+
+    def __init__(self, service: InventoryService, parent=None):
+        """
+        Initialize client visit dialog.
+
+        Args:
+            service: InventoryService instance
+            parent: Parent widget
+        """
+        super().__init__(parent)
+
+        self.service = service
+        self.basket = {}  # item_id -> [InventoryItem, quantity], in adding order
+        self.init_ui()
+
+    def init_ui(self):
+        """Initialize user interface."""
+        self.setWindowTitle("Client Visit")
+        self.setMinimumSize(700, 640)
+
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #ecf0f1;
+            }
+            QLabel#header {
+                background-color: #e67e22;
+                color: white;
+                padding: 20px;
+                font-size: 18pt;
+                font-weight: bold;
+            }
+        """)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        header = QLabel("🧺 Client Visit")
+        header.setObjectName("header")
+        header.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(header)
+
+        body = QVBoxLayout()
+        body.setContentsMargins(30, 20, 30, 20)
+        body.setSpacing(10)
+
+        # Item entry
+        self.item_picker = ItemPicker(self.service)
+        self.item_picker.list_view.setMinimumHeight(120)
+        self.item_picker.list_view.doubleClicked.connect(lambda _index: self.add_to_basket())
+        # Runs after the picker selects the first match: scan + Enter adds it
+        self.item_picker.search_input.returnPressed.connect(self.add_to_basket)
+        body.addWidget(self.item_picker)
+
+        add_row = QHBoxLayout()
+        self.quantity_spin = QDoubleSpinBox()
+        self.quantity_spin.setRange(0.01, 100000)
+        self.quantity_spin.setDecimals(2)
+        self.quantity_spin.setValue(1.0)
+        self.quantity_spin.setSuffix(" units")
+        add_row.addWidget(self.quantity_spin)
+        add_btn = QPushButton("Add to Basket")
+        add_btn.setAutoDefault(False)
+        add_btn.clicked.connect(self.add_to_basket)
+        add_row.addWidget(add_btn)
+        add_row.addStretch()
+        body.addLayout(add_row)
+
+        # Basket
+        self.basket_table = QTableWidget(0, 4)
+        self.basket_table.setHorizontalHeaderLabels(["Item", "Quantity", "Available", "Est. COGS"])
+        self.basket_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.basket_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.basket_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        body.addWidget(self.basket_table)
+
+        basket_buttons = QHBoxLayout()
+        remove_btn = QPushButton("Remove Selected")
+        remove_btn.setAutoDefault(False)
+        remove_btn.clicked.connect(self.remove_selected)
+        basket_buttons.addWidget(remove_btn)
+        basket_buttons.addStretch()
+        self.total_label = QLabel("0 items · COGS $0.00")
+        self.total_label.setStyleSheet("font-size: 14pt; font-weight: bold; color: #e67e22;")
+        basket_buttons.addWidget(self.total_label)
+        body.addLayout(basket_buttons)
+
+        form = QFormLayout()
+        self.reason_combo = QComboBox()
+        self.reason_combo.addItem("Client Distribution", ReasonCode.CLIENT.value)
+        self.reason_combo.addItem("Spoilage/Expiration", ReasonCode.SPOILAGE.value)
+        self.reason_combo.addItem("Internal Use", ReasonCode.INTERNAL.value)
+        form.addRow("Reason*:", self.reason_combo)
+
+        self.notes_input = QLineEdit()
+        self.notes_input.setPlaceholderText("Optional notes (e.g., 'Family of 4')...")
+        form.addRow("Notes:", self.notes_input)
+        body.addLayout(form)
+
+        layout.addLayout(body)
+
+        button_layout = QHBoxLayout()
+        button_layout.setContentsMargins(30, 0, 30, 30)
+        button_layout.addStretch()
+
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.setAutoDefault(False)
+        cancel_btn.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_btn)
+
+        self.save_btn = QPushButton("Record Visit")
+        self.save_btn.setAutoDefault(False)
+        self.save_btn.clicked.connect(self.save_visit)
+        self.save_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #e67e22;
+                color: white;
+                padding: 10px 30px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #d35400;
+            }
+        """)
+        button_layout.addWidget(self.save_btn)
+
+        layout.addLayout(button_layout)
+
+    def add_to_basket(self):
+        """Add the selected item (or more of it) to the basket."""
+        item_id = self.item_picker.current_item_id()
+        if not item_id:
+            QMessageBox.warning(self, "Validation Error", "Please select an item")
+            return
+
+        try:
+            item = self.service.get_item(item_id)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load item: {e}")
+            return
+
+        line = self.basket.setdefault(item_id, [item, 0.0])
+        line[0] = item  # Latest stock and cost
+        line[1] += self.quantity_spin.value()
+        self.refresh_basket()
+        self.quantity_spin.setValue(1.0)
+        self.item_picker.search_input.selectAll()
+        self.item_picker.search_input.setFocus()
+
+    def remove_selected(self):
+        """Remove the selected rows from the basket."""
+        item_ids = list(self.basket)
+        for row in sorted({index.row() for index in self.basket_table.selectedIndexes()}):
+            self.basket.pop(item_ids[row], None)
+        self.refresh_basket()
+
+    def refresh_basket(self):
+        """Redraw the basket table and totals."""
+        self.basket_table.setRowCount(len(self.basket))
+        total_cogs = 0.0
+        for row, (item, quantity) in enumerate(self.basket.values()):
+            cogs = quantity * item.current_unit_cost_dollars
+            total_cogs += cogs
+            short = not item.can_distribute(quantity)
+            cells = (f"{item.name} ({item.sku})", f"{quantity:,.2f}",
+                     f"{item.quantity_on_hand:,.1f}", f"${cogs:,.2f}")
+            for column, text in enumerate(cells):
+                cell = QTableWidgetItem(text)
+                if column:
+                    cell.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                if short:
+                    cell.setForeground(QColor("#e74c3c"))
+                self.basket_table.setItem(row, column, cell)
+        self.total_label.setText(f"{len(self.basket)} items · COGS ${total_cogs:,.2f}")
+
+    def save_visit(self):
+        """Record the whole basket as one visit."""
+        if not self.basket:
+            QMessageBox.warning(self, "Validation Error", "The basket is empty")
+            return
+
+        reply = QMessageBox.question(
+            self,
+            "Confirm Visit",
+            f"Record distribution of {len(self.basket)} items?\n\n"
+            f"Reason: {self.reason_combo.currentText()}\n"
+            f"{self.total_label.text()}",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        try:
+            items, transactions = self.service.process_distribution_basket(
+                [(item_id, quantity) for item_id, (_item, quantity) in self.basket.items()],
+                reason_code=self.reason_combo.currentData(),
+                notes=self.notes_input.text().strip() or None,
+                visit_id=uuid.uuid4().hex
+            )
+        except ValueError as e:
+            # Nothing was recorded; show current stock so the basket can be fixed
+            for item_id, line in self.basket.items():
+                line[0] = self.service.get_item(item_id) or line[0]
+            self.refresh_basket()
+            QMessageBox.warning(self, "Cannot Record Visit", str(e))
+            return
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to record visit: {e}")
+            return
+
+        total_cogs = sum(t.total_financial_impact_dollars for t in transactions)
+        QMessageBox.information(
+            self,
+            "Success",
+            f"Visit recorded!\n\n"
+            f"Items: {len(items)}\n"
+            f"COGS: ${total_cogs:,.2f}"
+        )
+        self.accept()
@@ -6,7 +6,10 @@ Architecture:
     PurchaseDialog    — blue theme, quantity + unit cost, calls process_purchase()
     DonationDialog    — green theme, quantity + FMV, calls process_donation()
 
-Includes SKU type-ahead (QCompleter) for quick item lookup by SKU or name prefix.
+Includes SKU type-ahead (QCompleter) for quick item lookup by SKU or name prefix,
+served from the shared in-memory index (services.autocomplete) after a short
+typing pause, so a barcode scanner's burst of keystrokes costs one lookup.
+"Browse..." opens the lazily loaded item list (ui.components.item_picker).
 """
 
 from PyQt6.QtWidgets import (
@@ -14,10 +17,15 @@ from PyQt6.QtWidgets import (
     QLabel, QLineEdit, QComboBox, QDoubleSpinBox, QPushButton,
     QTextEdit, QMessageBox, QCompleter
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QStandardItemModel, QStandardItem
 
+from services.autocomplete import get_autocomplete_index
 from services.inventory_service import InventoryService
+from ui.components.item_picker import ItemPickerDialog
+
+# Pause in typing before suggestions are looked up; scanners type faster
+SKU_LOOKUP_DEBOUNCE_MS = 120
 
 
 class BaseIntakeDialog(QDialog):
@@ -109,7 +117,13 @@ class BaseIntakeDialog(QDialog):
         self.sku_input.setPlaceholderText("Type 2+ chars for suggestions, or scan SKU")
         self.sku_input.returnPressed.connect(self.search_item)
         self.sku_input.editingFinished.connect(self.search_item)
-        form.addRow("SKU*:", self.sku_input)
+        browse_btn = QPushButton("Browse...")
+        browse_btn.setAutoDefault(False)
+        browse_btn.clicked.connect(self._browse_items)
+        sku_row = QHBoxLayout()
+        sku_row.addWidget(self.sku_input)
+        sku_row.addWidget(browse_btn)
+        form.addRow("SKU*:", sku_row)
 
         self.item_name_display = QLineEdit()
         self.item_name_display.setReadOnly(True)
@@ -213,24 +227,53 @@ class BaseIntakeDialog(QDialog):
         self._completer.setMaxVisibleItems(10)
         self._completer.activated.connect(self._on_sku_selected)
         self.sku_input.setCompleter(self._completer)
+
+        self._sku_index = None  # Shared index, fetched (built) at the first lookup
+        self._sku_match = None  # Last lookup, narrowed as the prefix grows
+        self._sku_timer = QTimer(self)
+        self._sku_timer.setSingleShot(True)
+        self._sku_timer.setInterval(SKU_LOOKUP_DEBOUNCE_MS)
+        self._sku_timer.timeout.connect(self._update_sku_suggestions)
         self.sku_input.textChanged.connect(self._on_sku_text_changed)
 
     def _on_sku_text_changed(self, text: str):
+        """Restart the lookup timer; suggestions follow a pause in typing."""
+        self._sku_timer.start()
+
+    def _update_sku_suggestions(self):
         """Rebuild completer model when user has typed 2+ characters."""
-        text = text.strip()
+        text = self.sku_input.text().strip()
         if len(text) < 2:
+            self._sku_match = None
             self._completer_model.clear()
             return
 
-        items = self.service.search_items_by_prefix(text)
+        if self._sku_index is None:
+            self._sku_index = get_autocomplete_index(self.service.db_manager)
+        previous = self._sku_match
+        self._sku_match = self._sku_index.search(text, previous=previous)
+        if previous is not None and previous.suggestions == self._sku_match.suggestions:
+            return
         self._completer_model.clear()
 
-        for item in items:
-            display = f"{item.sku}  —  {item.name}"
+        for suggestion in self._sku_match.suggestions:
+            display = f"{suggestion.sku}  —  {suggestion.name}"
             std_item = QStandardItem(display)
-            std_item.setData(item.sku, Qt.ItemDataRole.UserRole)       # raw SKU
-            std_item.setData(item.id,  Qt.ItemDataRole.UserRole + 1)   # item ID
+            std_item.setData(suggestion.sku, Qt.ItemDataRole.UserRole)       # raw SKU
+            std_item.setData(suggestion.item_id, Qt.ItemDataRole.UserRole + 1)  # item ID
             self._completer_model.appendRow(std_item)
+        if self.sku_input.hasFocus():
+            self._completer.complete()
+
+    def _browse_items(self):
+        """Pick the item from the full (lazily loaded) item list."""
+        text = self.sku_input.text().strip()
+        dialog = ItemPickerDialog(self.service, text.split("  —  ")[0], parent=self)
+        if dialog.exec():
+            item = dialog.selected_item()
+            if item:
+                self.sku_input.setText(item.sku)
+                self.search_item()
 
     def _on_sku_selected(self, text: str):
         """Handle a completer selection — extract SKU and trigger field population."""
@@ -7,9 +7,10 @@ from PyQt6.QtWidgets import (
     QTableWidget, QTableWidgetItem, QHeaderView,
     QLabel, QLineEdit, QMessageBox, QComboBox, QFileDialog
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QColor
 
+from services.events import ChangeEvent
 from services.inventory_service import InventoryService
 from services.data_service import DataService
 from ui.item_dialog import ItemDialog
@@ -50,8 +51,17 @@ class ItemsPage(QWidget):
         self.service = service
         self.data_service = DataService(service) if service else None
         self.active_filters = {}  # Store active filters: {column_index: filter_value}
+        self.category_names = {}
+        self._cells = {}  # item_id -> the row's SKU cell (follows the row when sorted)
+        self._pending_ids = set()  # Changed items not patched yet
+        self._stale = False  # Changed while hidden: reload when shown
         self.init_ui()
         self.load_items()
+        
+        # Keep rows current as items and transactions change (no reloads)
+        if service:
+            unsubscribe = service.events.subscribe(self.on_change)
+            self.destroyed.connect(lambda *_: unsubscribe())
     
     def init_ui(self):
         """Initialize user interface."""
@@ -169,84 +179,150 @@ class ItemsPage(QWidget):
             
             items = self.service.get_all_items()
             categories = self.service.get_all_categories()
+            self.category_names = {cat.id: cat.name for cat in categories}
             
             # Populate category filter if empty (except "All Categories")
             if self.category_filter.count() <= 1:
                 for cat in categories:
                     self.category_filter.addItem(cat.name, cat.id)
 
+            self._cells = {}
+            self._pending_ids.clear()
+            self._stale = False
             self.table.setRowCount(len(items))
             
             for row, item in enumerate(items):
-                # SKU
-                self.table.setItem(row, 0, QTableWidgetItem(item.sku))
-                
-                # Name
-                self.table.setItem(row, 1, QTableWidgetItem(item.name))
-                
-                # Category
-                category_name = ""
-                item_cat_id = item.category_id
-                
-                if item_cat_id:
-                    for cat in categories:
-                        if cat.id == item_cat_id:
-                            category_name = cat.name
-                            break
-                self.table.setItem(row, 2, QTableWidgetItem(category_name))
-                
-                # Quantity - Use NumericTableWidgetItem
-                qty_item = NumericTableWidgetItem(f"{item.quantity_on_hand:,.1f}")
-                qty_item.setData(Qt.ItemDataRole.UserRole, item.quantity_on_hand) # Store raw value for sorting
-                qty_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-                self.table.setItem(row, 3, qty_item)
-                
-                # UOM column removed
-                
-                # Unit Cost - Use NumericTableWidgetItem
-                cost_item = NumericTableWidgetItem(f"${item.current_unit_cost_dollars:.2f}")
-                cost_item.setData(Qt.ItemDataRole.UserRole, item.current_unit_cost_dollars) # Store raw value
-                cost_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-                self.table.setItem(row, 4, cost_item)
-                
-                # Total Value - Use NumericTableWidgetItem
-                value_item = NumericTableWidgetItem(f"${item.total_inventory_value_dollars:,.2f}")
-                value_item.setData(Qt.ItemDataRole.UserRole, item.total_inventory_value_dollars) # Store raw value
-                value_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-                self.table.setItem(row, 5, value_item)
-                
-                # Status
-                status = "Low Stock" if item.is_below_threshold() else "OK"
-                status_item = QTableWidgetItem(status)
-                if item.is_below_threshold():
-                    status_item.setForeground(QColor("#e74c3c"))
-                else:
-                    status_item.setForeground(QColor("#27ae60"))
-                self.table.setItem(row, 6, status_item)
-                
-                # Store item ID in first column's UserRole for identification
-                # Note: We need to use a different role or ensure we don't conflict with sorting data if we used column 0 for numeric sort (we don't here)
-                # But actually, SKU is column 0 and strings sort fine.
-                # However, let's store the ID in a custom role just to be safe or use UserRole + 1
-                # Standard UserRole is 32 (0x0100).
-                # To avoid conflict with NumericTableWidgetItem which uses UserRole for valid numeric columns (3, 5, 6),
-                # we are safe to use UserRole on column 0 (SKU) as it is not a NumericTableWidgetItem.
-                self.table.item(row, 0).setData(Qt.ItemDataRole.UserRole, item.id)
-                
-                # Also store category ID in the category column for easy filtering
-                self.table.item(row, 2).setData(Qt.ItemDataRole.UserRole, item.category_id)
+                self._set_row(row, item)
 
             self.table.setSortingEnabled(True)
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load items: {e}")
     
+    def _set_row(self, row: int, item):
+        """Fill a table row with an item (sorting must be disabled)."""
+        # SKU
+        sku_item = QTableWidgetItem(item.sku)
+        self.table.setItem(row, 0, sku_item)
+        self._cells[item.id] = sku_item
+        
+        # Name
+        self.table.setItem(row, 1, QTableWidgetItem(item.name))
+        
+        # Category
+        if item.category_id and item.category_id not in self.category_names:
+            # Created since the table was loaded
+            self.category_names = {cat.id: cat.name for cat in self.service.get_all_categories()}
+        category_name = self.category_names.get(item.category_id, "") if item.category_id else ""
+        self.table.setItem(row, 2, QTableWidgetItem(category_name))
+        
+        # Quantity - Use NumericTableWidgetItem
+        qty_item = NumericTableWidgetItem(f"{item.quantity_on_hand:,.1f}")
+        qty_item.setData(Qt.ItemDataRole.UserRole, item.quantity_on_hand) # Store raw value for sorting
+        qty_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.table.setItem(row, 3, qty_item)
+        
+        # UOM column removed
+        
+        # Unit Cost - Use NumericTableWidgetItem
+        cost_item = NumericTableWidgetItem(f"${item.current_unit_cost_dollars:.2f}")
+        cost_item.setData(Qt.ItemDataRole.UserRole, item.current_unit_cost_dollars) # Store raw value
+        cost_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.table.setItem(row, 4, cost_item)
+        
+        # Total Value - Use NumericTableWidgetItem
+        value_item = NumericTableWidgetItem(f"${item.total_inventory_value_dollars:,.2f}")
+        value_item.setData(Qt.ItemDataRole.UserRole, item.total_inventory_value_dollars) # Store raw value
+        value_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.table.setItem(row, 5, value_item)
+        
+        # Status
+        status = "Low Stock" if item.is_below_threshold() else "OK"
+        status_item = QTableWidgetItem(status)
+        if item.is_below_threshold():
+            status_item.setForeground(QColor("#e74c3c"))
+        else:
+            status_item.setForeground(QColor("#27ae60"))
+        self.table.setItem(row, 6, status_item)
+        
+        # Store item ID in first column's UserRole for identification
+        # Note: We need to use a different role or ensure we don't conflict with sorting data if we used column 0 for numeric sort (we don't here)
+        # But actually, SKU is column 0 and strings sort fine.
+        # However, let's store the ID in a custom role just to be safe or use UserRole + 1
+        # Standard UserRole is 32 (0x0100).
+        # To avoid conflict with NumericTableWidgetItem which uses UserRole for valid numeric columns (3, 5, 6),
+        # we are safe to use UserRole on column 0 (SKU) as it is not a NumericTableWidgetItem.
+        self.table.item(row, 0).setData(Qt.ItemDataRole.UserRole, item.id)
+        
+        # Also store category ID in the category column for easy filtering
+        self.table.item(row, 2).setData(Qt.ItemDataRole.UserRole, item.category_id)
+    
+    def on_change(self, event: ChangeEvent):
+        """
+        Queue the rows of the items a committed write changed.
+        
+        Called by the service's event bus, in the writer's call. The ids of
+        a burst of writes are collected and patched once when control
+        returns to the event loop; while the page is hidden nothing is
+        patched and the table reloads when it is shown again.
+        """
+        if not event.item_ids:
+            return
+        if not self.isVisible():
+            self._stale = True
+            return
+        if not self._pending_ids:
+            QTimer.singleShot(0, self._apply_changes)
+        self._pending_ids.update(event.item_ids)
+    
+    def _apply_changes(self):
+        """Patch the rows of the queued items with one query."""
+        item_ids, self._pending_ids = self._pending_ids, set()
+        if not item_ids:
+            return
+        if not self.isVisible():
+            self._stale = True
+            return
+        
+        items = self.service.get_items(item_ids)
+        shown = []
+        self.table.setSortingEnabled(False)
+        for item_id in item_ids:
+            cell = self._cells.get(item_id)
+            item = items.get(item_id)
+            if item is None or not item.is_active:
+                if cell is not None:
+                    self.table.removeRow(cell.row())
+                    del self._cells[item_id]
+                continue
+            if cell is None:
+                row = self.table.rowCount()
+                self.table.insertRow(row)
+            else:
+                row = cell.row()
+            self._set_row(row, item)
+            shown.append(item_id)
+        self.table.setSortingEnabled(True)
+        # Rows may have moved when sorting resumed; the cells know where
+        self._filter_rows(self._cells[item_id].row() for item_id in shown)
+    
+    def showEvent(self, event):
+        """Reload if items changed while the page was hidden."""
+        super().showEvent(event)
+        if self._stale:
+            self.load_items()
+            self.filter_items()
+    
     def filter_items(self):
         """Filter table rows based on search text, category selection, and active click filters."""
+        self._filter_rows(range(self.table.rowCount()))
+    
+    def _filter_rows(self, rows):
+        """Show or hide the given rows according to the current filters."""
         search_text = self.search_input.text().lower()
         category_data = self.category_filter.currentData() # This returns the category ID or None
 
-        for row in range(self.table.rowCount()):
+        for row in rows:
             show_row = True
             
             # 1. Filter by Text (SKU or Name)
@@ -321,8 +397,7 @@ class ItemsPage(QWidget):
     def create_item(self):
         """Create new item."""
         dialog = ItemDialog(self.service, parent=self)
-        if dialog.exec():
-            self.load_items()
+        dialog.exec()  # The new row is added by on_change
     
     def edit_selected_item(self):
         """Edit selected item."""
@@ -337,8 +412,7 @@ class ItemsPage(QWidget):
         
         if item:
             dialog = ItemDialog(self.service, item, parent=self)
-            if dialog.exec():
-                self.load_items()
+            dialog.exec()  # The row is updated by on_change
     
     def delete_selected_item(self):
         """Delete selected item."""
@@ -362,7 +436,6 @@ class ItemsPage(QWidget):
                 item_id = self.table.item(current_row, 0).data(Qt.ItemDataRole.UserRole)
                 self.service.soft_delete_item(item_id)
                 QMessageBox.information(self, "Success", f"Item '{item_name}' deleted")
-                self.load_items()
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to delete item: {e}")
 
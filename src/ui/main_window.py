@@ -9,7 +9,7 @@ from PyQt6.QtWidgets import (
     QLabel, QPushButton, QStackedWidget, QMessageBox,
     QCheckBox, QFileDialog
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QAction, QFont
 import json
 import os
@@ -40,9 +40,18 @@ class MainWindow(QMainWindow):
         self.inventory_service = self.service # Alias for consistency
         self.reporting_service = ReportingService()
         
+        # Idle-time incremental vacuum / WAL checkpoints on a worker thread
+        from database.maintenance import MaintenanceScheduler
+        self.maintenance = MaintenanceScheduler(self.service.db_manager.db_path)
+        self.maintenance.start()
+        
         # Set up UI
         self.init_ui()
         
+        # Once the window is up, offer to save scans of intake sessions a
+        # crash cut short (they would otherwise wait for Rapid Intake)
+        QTimer.singleShot(0, self.check_unfinished_intake)
+        
     def init_ui(self):
         """Initialize user interface."""
         self.setWindowTitle("AI OPS Studio")
@@ -81,6 +90,7 @@ class MainWindow(QMainWindow):
         
     def switch_page(self, index):
         """Switch page and refresh data."""
+        self.maintenance.notify_activity()
         self.content_stack.setCurrentIndex(index)
         if index == 0:
             self.dashboard_page.load_data()
@@ -110,7 +120,7 @@ class MainWindow(QMainWindow):
         restore_action.triggered.connect(self.restore_database)
         file_menu.addAction(restore_action)
         
-        # Compact database option - use QAction with checkable
+        # Compact database option - bounded incremental vacuum + WAL truncate
         self.compact_on_exit_action = QAction("Compact database on exit", self)
         self.compact_on_exit_action.setCheckable(True)
         self.compact_on_exit_action.setChecked(self.get_compact_on_exit_setting())
@@ -142,11 +152,26 @@ class MainWindow(QMainWindow):
         donation_action.triggered.connect(self.show_donation)
         inventory_menu.addAction(donation_action)
         
+        rapid_intake_action = QAction("&Rapid Intake Session", self)
+        rapid_intake_action.setShortcut(f"{modifier}+R")
+        rapid_intake_action.triggered.connect(self.show_rapid_intake)
+        inventory_menu.addAction(rapid_intake_action)
+        
         distribute_action = QAction("D&istribute", self)
         distribute_action.setShortcut(f"{modifier}+I")
         distribute_action.triggered.connect(self.show_distribution)
         inventory_menu.addAction(distribute_action)
         
+        visit_action = QAction("Client &Visit", self)
+        visit_action.setShortcut(f"{modifier}+Shift+I")
+        visit_action.triggered.connect(self.show_client_visit)
+        inventory_menu.addAction(visit_action)
+        
+        inventory_menu.addSeparator()
+        stock_take_action = QAction("Stock &Take...", self)
+        stock_take_action.triggered.connect(self.show_stock_take)
+        inventory_menu.addAction(stock_take_action)
+        
         # Reports menu
         reports_menu = menubar.addMenu("&Reports")
         
@@ -170,6 +195,12 @@ class MainWindow(QMainWindow):
         suppliers_action.triggered.connect(self.show_suppliers_report)
         reports_menu.addAction(suppliers_action)
         
+        reports_menu.addSeparator()
+        
+        period_close_action = QAction("&Month-End Close...", self)
+        period_close_action.triggered.connect(self.show_period_close)
+        reports_menu.addAction(period_close_action)
+        
         # Help menu
         help_menu = menubar.addMenu("&Help")
         
@@ -314,6 +345,15 @@ class MainWindow(QMainWindow):
         )
         buttons_layout.addWidget(donation_btn)
         
+        # Rapid intake button
+        rapid_btn = self.create_intake_card(
+            "⚡ Rapid Intake",
+            "Scan barcodes continuously\nFor food drives and bulk deliveries",
+            "#8e44ad",
+            self.show_rapid_intake
+        )
+        buttons_layout.addWidget(rapid_btn)
+        
         layout.addLayout(buttons_layout)
         layout.addStretch()
         
@@ -342,8 +382,17 @@ class MainWindow(QMainWindow):
             self.show_distribution
         )
         
+        # Client visit button
+        visit_btn = self.create_intake_card(
+            "🧺 Client Visit",
+            "Distribute a whole basket of items\nRecorded together in one step",
+            "#d35400",
+            self.show_client_visit
+        )
+        
         button_container = QHBoxLayout()
         button_container.addWidget(dist_btn)
+        button_container.addWidget(visit_btn)
         button_container.addStretch()
         
         layout.addLayout(button_container)
@@ -495,11 +544,7 @@ class MainWindow(QMainWindow):
         """Show new item dialog."""
         from ui.item_dialog import ItemDialog
         dialog = ItemDialog(self.service, parent=self)
-        if dialog.exec():
-            # Refresh items page if visible
-            if self.content_stack.currentIndex() == 1:
-                items_page = self.content_stack.widget(1)
-                items_page.load_items()
+        dialog.exec()  # The items page adds the row from the change event
     
     def show_purchase(self):
         """Show purchase dialog."""
@@ -513,13 +558,47 @@ class MainWindow(QMainWindow):
         dialog = DonationDialog(self.service, parent=self)
         dialog.exec()
     
+    def show_rapid_intake(self):
+        """Show rapid intake (barcode scanning) dialog."""
+        from ui.rapid_intake_dialog import RapidIntakeDialog
+        dialog = RapidIntakeDialog(self.service, parent=self)
+        dialog.exec()
+    
+    def check_unfinished_intake(self):
+        """Prompt to recover interrupted rapid intake sessions."""
+        from ui.rapid_intake_dialog import recover_interrupted_sessions
+        try:
+            recover_interrupted_sessions(self.service, parent=self)
+        except Exception as e:
+            logger.error(f"Checking for interrupted intake sessions failed: {e}")
+    
     def show_distribution(self):
         """Show distribution dialog."""
         from ui.distribution_dialog import DistributionDialog
         dialog = DistributionDialog(self.service, parent=self)
         dialog.exec()
+    
+    def show_client_visit(self):
+        """Show client visit (basket distribution) dialog."""
+        from ui.distribution_dialog import BasketDistributionDialog
+        dialog = BasketDistributionDialog(self.service, parent=self)
+        dialog.exec()
 
     
+    def show_stock_take(self):
+        """Show stock take (physical count) dialog."""
+        from services.stock_take_service import StockTakeService
+        from ui.stock_take_dialog import StockTakeDialog
+        dialog = StockTakeDialog(StockTakeService(db_manager=self.service.db_manager), parent=self)
+        dialog.exec()
+    
+    def show_period_close(self):
+        """Show month-end close dialog."""
+        from services.period_close_service import PeriodCloseService
+        from ui.period_close_dialog import PeriodCloseDialog
+        dialog = PeriodCloseDialog(PeriodCloseService(db_manager=self.service.db_manager), parent=self)
+        dialog.exec()
+    
     def show_financial_report(self):
         """Show financial report page."""
         self.content_stack.setCurrentIndex(4)  # Reports page
@@ -588,11 +667,17 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """Handle application close event."""
-        # Check if compact on exit is enabled
+        # Stop idle-time maintenance (returns within its bounded step time)
+        self.maintenance.stop()
+        
+        # Check if compact on exit is enabled. Only a bounded number of pages
+        # is released so shutdown time does not grow with database size.
         if self.get_compact_on_exit_setting():
             try:
-                self.service.db_manager.vacuum()
-                logger.info("Database compacted on exit")
+                db_manager = self.service.db_manager
+                released = db_manager.incremental_vacuum()
+                db_manager.checkpoint("TRUNCATE")
+                logger.info(f"Database compacted on exit ({released} pages released)")
             except Exception as e:
                 logger.error(f"Error compacting database: {e}", exc_info=True)
         
@@ -0,0 +1,200 @@
+"""
+Month-end close dialog: close, review and reopen accounting months.
+"""
+
+from datetime import date
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QHeaderView, QMessageBox, QInputDialog
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+
+from services.period_close_service import PeriodCloseService
+
+# Months listed, latest first
+MONTHS_SHOWN = 24
+
+
+class PeriodCloseDialog(QDialog):
+    """Dialog for closing months and reviewing their stored totals."""
+
+    def __init__(self, period_service: PeriodCloseService, parent=None):
+        """
+        Initialize period close dialog.
+
+        Args:
+            period_service: PeriodCloseService instance
+            parent: Parent widget
+        """
+        super().__init__(parent)
+        self.periods = period_service
+        self.init_ui()
+        self.load_periods()
+
+    def init_ui(self):
+        """Initialize user interface."""
+        self.setWindowTitle("Month-End Close")
+        self.setMinimumSize(640, 560)
+
+        layout = QVBoxLayout(self)
+
+        header = QLabel("🔒 Month-End Close")
+        header.setStyleSheet("font-size: 18pt; font-weight: bold; color: #2c3e50;")
+        layout.addWidget(header)
+
+        info = QLabel("Closing a month stores its totals for reporting and locks its "
+                      "transactions against edits and voids until it is reopened.")
+        info.setWordWrap(True)
+        layout.addWidget(info)
+
+        self.period_table = QTableWidget(0, 3)
+        self.period_table.setHorizontalHeaderLabels(["Month", "Status", "Closed At"])
+        self.period_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        self.period_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.period_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.period_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.period_table.verticalHeader().setVisible(False)
+        self.period_table.itemSelectionChanged.connect(self.show_totals)
+        layout.addWidget(self.period_table)
+
+        self.totals_label = QLabel("")
+        self.totals_label.setStyleSheet("font-size: 11pt;")
+        self.totals_label.setWordWrap(True)
+        layout.addWidget(self.totals_label)
+
+        buttons = QHBoxLayout()
+        self.reopen_btn = QPushButton("Reopen Month")
+        self.reopen_btn.setAutoDefault(False)
+        self.reopen_btn.clicked.connect(self.reopen_selected)
+        buttons.addWidget(self.reopen_btn)
+        buttons.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.setAutoDefault(False)
+        close_btn.clicked.connect(self.accept)
+        buttons.addWidget(close_btn)
+        self.close_month_btn = QPushButton("Close Month")
+        self.close_month_btn.setAutoDefault(False)
+        self.close_month_btn.clicked.connect(self.close_selected)
+        self.close_month_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2c3e50;
+                color: white;
+                padding: 10px 30px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:disabled {
+                background-color: #95a5a6;
+            }
+        """)
+        buttons.addWidget(self.close_month_btn)
+        layout.addLayout(buttons)
+
+    # ------------------------------------------------------------------
+    # Periods
+    # ------------------------------------------------------------------
+
+    def load_periods(self):
+        """List the past months (the current one cannot be closed yet)."""
+        closed = {row['period']: row for row in self.periods.get_closed_periods()}
+        month = date.today().replace(day=1)
+        months = []
+        for _ in range(MONTHS_SHOWN):
+            month = date(month.year - (month.month == 1), (month.month - 2) % 12 + 1, 1)
+            months.append(month)
+
+        self.period_table.setRowCount(len(months))
+        for row, month in enumerate(months):
+            period = f"{month:%Y-%m}"
+            closed_row = closed.get(period)
+            cells = (
+                QTableWidgetItem(f"{month:%B %Y}"),
+                QTableWidgetItem("Closed" if closed_row else "Open"),
+                QTableWidgetItem(closed_row['closed_at'] if closed_row else ""),
+            )
+            cells[0].setData(Qt.ItemDataRole.UserRole, (month.year, month.month))
+            cells[1].setForeground(QColor("#27ae60") if closed_row else QColor("#7f8c8d"))
+            for column, cell in enumerate(cells):
+                self.period_table.setItem(row, column, cell)
+        self.period_table.selectRow(0)
+        self.show_totals()
+
+    def selected_month(self):
+        row = self.period_table.currentRow()
+        if row < 0:
+            return None
+        return self.period_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+
+    def show_totals(self):
+        """Show the stored totals of the selected month, if closed."""
+        selected = self.selected_month()
+        is_closed = selected is not None and self.periods.is_closed(*selected)
+        self.close_month_btn.setEnabled(selected is not None and not is_closed)
+        self.reopen_btn.setEnabled(is_closed)
+        if not is_closed:
+            self.totals_label.setText("Open month: totals are computed from the ledger.")
+            return
+
+        totals = self.periods.get_period_totals(*selected)
+        lines = [
+            f"<b>COGS:</b> ${totals['total_cogs_cents'] / 100:,.2f}"
+            + "".join(f" · {row['reason_code'] or 'Other'} ${row['cogs_cents'] / 100:,.2f}"
+                      for row in totals['cogs_by_reason']),
+            f"<b>Donations (FMV):</b> ${totals['total_fmv_cents'] / 100:,.2f} "
+            f"from {len(totals['fmv_by_donor'])} donors",
+            f"<b>Purchases:</b> ${totals['total_purchases_cents'] / 100:,.2f} "
+            f"from {len(totals['purchases_by_supplier'])} suppliers",
+            f"<b>Closing inventory value:</b> ${totals['closing_value_cents'] / 100:,.2f} "
+            f"({len(totals['balances'])} items)",
+        ]
+        if totals['notes']:
+            lines.append(f"<b>Notes:</b> {totals['notes']}")
+        self.totals_label.setText("<br>".join(lines))
+
+    # ------------------------------------------------------------------
+    # Close / reopen
+    # ------------------------------------------------------------------
+
+    def close_selected(self):
+        selected = self.selected_month()
+        if selected is None:
+            return
+        notes, ok = QInputDialog.getText(
+            self, "Close Month", f"Close {selected[0]}-{selected[1]:02d}?\n\nNotes (optional):")
+        if not ok:
+            return
+        try:
+            self.periods.close_period(*selected, notes=notes.strip() or None)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to close month: {e}")
+            return
+        self._reload()
+
+    def reopen_selected(self):
+        selected = self.selected_month()
+        if selected is None:
+            return
+        reply = QMessageBox.question(
+            self,
+            "Reopen Month",
+            f"Reopen {selected[0]}-{selected[1]:02d}?\n\n"
+            "Its stored totals are discarded and its transactions can be edited "
+            "and voided again. Close it again when done.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        try:
+            self.periods.reopen_period(*selected)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to reopen month: {e}")
+            return
+        self._reload()
+
+    def _reload(self):
+        row = self.period_table.currentRow()
+        self.load_periods()
+        self.period_table.selectRow(row)
+        self.show_totals()
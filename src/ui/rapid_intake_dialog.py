@@ -0,0 +1,280 @@
+"""
+Rapid intake dialog: scan barcodes continuously into an IntakeSession.
+
+Each scan (SKU + Enter) is recorded without a confirmation dialog and the
+field is cleared for the next one. Scans are committed in groups in the
+background (services.intake_session); the tally shows every item scanned
+with how much of it is already saved.
+"""
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QLineEdit,
+    QComboBox, QDoubleSpinBox, QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QMessageBox
+)
+from PyQt6.QtCore import Qt, QTimer
+
+from models.transaction import TransactionType
+from services.intake_session import IntakeSession, find_unfinished_journals, recover_session
+from services.inventory_service import InventoryService
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# How often buffered scans are checked for a time-based group commit
+FLUSH_CHECK_MS = 250
+
+
+def recover_interrupted_sessions(service: InventoryService, parent=None) -> int:
+    """
+    Offer to save the scans of intake sessions cut short by a crash.
+
+    Called when the main window starts and when the rapid intake dialog
+    opens; does nothing if no session on the database is unfinished.
+
+    Args:
+        service: InventoryService on the application database
+        parent: Parent widget of the message boxes
+
+    Returns:
+        int: Number of scans saved
+    """
+    journals = find_unfinished_journals(service.db_manager.db_path)
+    if not journals:
+        return 0
+    reply = QMessageBox.question(
+        parent, "Unfinished Intake Sessions",
+        f"{len(journals)} intake session(s) were interrupted before all scans "
+        "were saved.\n\nSave the remaining scans now?",
+        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+    if reply != QMessageBox.StandardButton.Yes:
+        return 0
+    recovered = 0
+    for path in journals:
+        try:
+            recovered += recover_session(service, path)
+        except Exception as e:
+            logger.error(f"Could not recover intake journal {path}: {e}")
+            QMessageBox.warning(parent, "Recovery Failed", f"{path.name}: {e}")
+    QMessageBox.information(parent, "Recovered", f"{recovered} scans saved.")
+    return recovered
+
+
+class RapidIntakeDialog(QDialog):
+    """Continuous barcode intake for food drives and bulk deliveries."""
+
+    def __init__(self, service: InventoryService, parent=None):
+        super().__init__(parent)
+        self.service = service
+        self.session = None
+        self._rows = {}  # item_id -> table row
+
+        self.setWindowTitle("Rapid Intake")
+        self.setMinimumSize(640, 560)
+        self._build_ui()
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(FLUSH_CHECK_MS)
+        self._flush_timer.timeout.connect(self._flush_if_due)
+
+        self._recover_interrupted_sessions()
+
+    def _build_ui(self):
+        layout = QVBoxLayout(self)
+
+        header = QLabel("⚡ Rapid Intake")
+        header.setStyleSheet("font-size: 18pt; font-weight: bold; color: #2c3e50;")
+        layout.addWidget(header)
+
+        form = QFormLayout()
+        self.type_combo = QComboBox()
+        self.type_combo.addItem("Donation", TransactionType.DONATION)
+        self.type_combo.addItem("Purchase", TransactionType.PURCHASE)
+        form.addRow("Type:", self.type_combo)
+
+        self.source_input = QLineEdit()
+        self.source_input.setPlaceholderText("Donor or supplier for the whole session (optional)")
+        form.addRow("From:", self.source_input)
+
+        self.value_spin = QDoubleSpinBox()
+        self.value_spin.setRange(0, 100000)
+        self.value_spin.setDecimals(2)
+        self.value_spin.setPrefix("$")
+        self.value_spin.setSpecialValueText("Default")  # 0 = item cost / no FMV
+        form.addRow("Unit value:", self.value_spin)
+
+        self.quantity_spin = QDoubleSpinBox()
+        self.quantity_spin.setRange(0.01, 10000)
+        self.quantity_spin.setDecimals(2)
+        self.quantity_spin.setValue(1.0)
+        self.quantity_spin.setSuffix(" per scan")
+        form.addRow("Quantity:", self.quantity_spin)
+        layout.addLayout(form)
+
+        self.start_btn = QPushButton("Start Session")
+        self.start_btn.clicked.connect(self.start_session)
+        layout.addWidget(self.start_btn)
+
+        self.scan_input = QLineEdit()
+        self.scan_input.setPlaceholderText("Scan or type a SKU and press Enter")
+        self.scan_input.setStyleSheet("font-size: 14pt; padding: 8px;")
+        self.scan_input.setEnabled(False)
+        self.scan_input.returnPressed.connect(self._on_scan)
+        layout.addWidget(self.scan_input)
+
+        self.feedback_label = QLabel("")
+        layout.addWidget(self.feedback_label)
+
+        self.tally_table = QTableWidget(0, 4)
+        self.tally_table.setHorizontalHeaderLabels(["SKU", "Name", "Scanned", "Saved"])
+        self.tally_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.tally_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.tally_table)
+
+        self.status_label = QLabel("No session")
+        self.status_label.setStyleSheet("color: #7f8c8d;")
+        layout.addWidget(self.status_label)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        self.finish_btn = QPushButton("Finish Session")
+        self.finish_btn.setEnabled(False)
+        self.finish_btn.clicked.connect(self.finish_session)
+        buttons.addWidget(self.finish_btn)
+        close_btn = QPushButton("Close")
+        close_btn.setAutoDefault(False)
+        close_btn.clicked.connect(self.close)
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+    # ------------------------------------------------------------------
+    # Session lifecycle
+    # ------------------------------------------------------------------
+
+    def _recover_interrupted_sessions(self):
+        """Offer to save the scans of sessions cut short by a crash."""
+        recover_interrupted_sessions(self.service, self)
+
+    def start_session(self):
+        """Start a session with the chosen type, source and value."""
+        try:
+            self.session = IntakeSession(
+                self.service,
+                self.type_combo.currentData(),
+                source=self.source_input.text().strip() or None,
+                unit_value_dollars=self.value_spin.value() or None,
+            )
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not start the session: {e}")
+            return
+        for widget in (self.type_combo, self.source_input, self.value_spin, self.start_btn):
+            widget.setEnabled(False)
+        self.scan_input.setEnabled(True)
+        self.finish_btn.setEnabled(True)
+        self.scan_input.setFocus()
+        self._flush_timer.start()
+        self._update_status()
+
+    def finish_session(self) -> bool:
+        """Save the remaining scans and end the session."""
+        if self.session is None:
+            return True
+        try:
+            self.session.close()
+        except Exception as e:
+            QMessageBox.critical(
+                self, "Error",
+                f"Could not save the last scans: {e}\n\n"
+                "They are kept in the session journal and will be offered for "
+                "recovery the next time Rapid Intake is opened.")
+            return False
+        self._refresh_rows()
+        self._flush_timer.stop()
+        self.status_label.setText(
+            f"Session finished: {self.session.scan_count} scans, "
+            f"{len(self.session.tally)} items")
+        self.session = None
+        self.scan_input.setEnabled(False)
+        self.finish_btn.setEnabled(False)
+        for widget in (self.type_combo, self.source_input, self.value_spin, self.start_btn):
+            widget.setEnabled(True)
+        return True
+
+    def closeEvent(self, event):
+        if self.finish_session():
+            event.accept()
+        else:
+            event.ignore()
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+
+    def _on_scan(self):
+        sku = self.scan_input.text().strip()
+        self.scan_input.clear()
+        if not sku or self.session is None:
+            return
+        try:
+            line = self.session.scan(sku, self.quantity_spin.value())
+        except ValueError as e:
+            self.feedback_label.setText(f"❌ {e}")
+            self.feedback_label.setStyleSheet("color: #e74c3c; font-weight: bold;")
+            return
+        except Exception as e:
+            # The scan is journaled; the failed group commit is retried
+            self._report_flush_error(e)
+            return
+        self.feedback_label.setText(f"✅ {line.name}  ({line.quantity:g})")
+        self.feedback_label.setStyleSheet("color: #27ae60; font-weight: bold;")
+        self._set_row(line)
+        self._refresh_rows_if_flushed()
+        self._update_status()
+
+    def _flush_if_due(self):
+        if self.session is None:
+            return
+        try:
+            if self.session.flush_if_due():
+                self._refresh_rows()
+                self._update_status()
+        except Exception as e:
+            self._report_flush_error(e)
+
+    def _report_flush_error(self, error: Exception):
+        logger.error(f"Intake group commit failed: {error}")
+        self.feedback_label.setText(f"⚠️ Saving failed, will retry: {error}")
+        self.feedback_label.setStyleSheet("color: #e67e22; font-weight: bold;")
+
+    # ------------------------------------------------------------------
+    # Tally
+    # ------------------------------------------------------------------
+
+    def _set_row(self, line):
+        """Add or update one item's tally row (newest items on top)."""
+        row = self._rows.get(line.item_id)
+        if row is None:
+            self.tally_table.insertRow(0)
+            self._rows = {item_id: r + 1 for item_id, r in self._rows.items()}
+            self._rows[line.item_id] = row = 0
+            self.tally_table.setItem(row, 0, QTableWidgetItem(line.sku))
+            self.tally_table.setItem(row, 1, QTableWidgetItem(line.name))
+        for column, value in ((2, line.quantity), (3, line.committed_quantity)):
+            cell = QTableWidgetItem(f"{value:,.2f}")
+            cell.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            self.tally_table.setItem(row, column, cell)
+
+    def _refresh_rows_if_flushed(self):
+        if self.session.pending_scans == 0:
+            self._refresh_rows()
+
+    def _refresh_rows(self):
+        """Update the saved column after a group commit."""
+        for line in self.session.tally.values():
+            self._set_row(line)
+
+    def _update_status(self):
+        s = self.session
+        self.status_label.setText(
+            f"{s.scan_count} scans · {len(s.tally)} items · {s.committed_scans} saved "
+            f"in {s.batches} batches · {s.pending_scans} pending")
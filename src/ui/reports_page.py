@@ -128,6 +128,16 @@ class ReportsPage(QWidget):
         )
         grid_layout.addWidget(suppliers_card, 1, 1)
         
+        # Category Rollup Report Card
+        rollup_card = ReportCard(
+            title="Category Rollup",
+            description="Value & distributions by\ncategory tree - Excel Export",
+            icon="🗂️",
+            color="#c0392b",
+            callback=self.generate_category_rollup_report
+        )
+        grid_layout.addWidget(rollup_card, 1, 2)
+        
         # Push items to top-left
         grid_layout.setRowStretch(2, 1)
         grid_layout.setColumnStretch(3, 1)
@@ -169,6 +179,7 @@ class ReportsPage(QWidget):
             "#e67e22": "#d35400",
             "#9b59b6": "#8e44ad",
             "#16a085": "#138d75",
+            "#c0392b": "#a93226",
         }
         return color_map.get(hex_color, hex_color)
     
@@ -439,3 +450,33 @@ class ReportsPage(QWidget):
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to generate report: {e}")
+    
+    def generate_category_rollup_report(self):
+        """Generate category rollup report Excel."""
+        try:
+            start, end = self.get_date_range()
+            
+            # Get data
+            data = self.reporting_service.get_category_rollup(start, end)
+            
+            # Generate Excel
+            filepath = self.excel_generator.generate_category_rollup_report(data)
+            
+            # Ask to open
+            reply = QMessageBox.question(
+                self,
+                "Report Generated",
+                f"Category rollup report generated successfully!\n\n"
+                f"Categories: {len(data['categories'])}\n"
+                f"Total Inventory Value: ${data['total_value_dollars']:,.2f}\n"
+                f"Distributed in Period: {data['total_distributed_qty']:,.0f}\n\n"
+                f"Saved to: {filepath}\n\n"
+                f"Would you like to open the report?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            
+            if reply == QMessageBox.StandardButton.Yes:
+                QDesktopServices.openUrl(QUrl.fromLocalFile(filepath))
+                
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to generate report: {e}")
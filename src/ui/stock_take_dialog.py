@@ -0,0 +1,282 @@
+"""
+Stock take dialog: load physical counts, review variances, post adjustments.
+"""
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox,
+    QDoubleSpinBox, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+    QMessageBox, QFileDialog, QInputDialog
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+
+from services.stock_take_service import StockTakeService
+
+# Value Impact tooltips for lines not valued at weighted average cost
+_ESTIMATED_COST_NOTES = {
+    'last_purchase': "No stock to average: found units valued at the last purchase cost",
+    'unknown': "No stock and never purchased: found units valued at $0",
+}
+
+
+def _signed_dollars(cents: int) -> str:
+    """Format a value change in cents as e.g. '-$10.50' / '+$3.00'."""
+    return f"{'-' if cents < 0 else '+'}${abs(cents) / 100:,.2f}"
+
+
+class StockTakeDialog(QDialog):
+    """Dialog for counting stock and posting the variances."""
+
+    def __init__(self, stock_take_service: StockTakeService, parent=None):
+        """
+        Initialize stock take dialog.
+
+        Args:
+            stock_take_service: StockTakeService instance
+            parent: Parent widget
+        """
+        super().__init__(parent)
+        self.stock_takes = stock_take_service
+        self.init_ui()
+        self.load_stock_takes()
+
+    def init_ui(self):
+        """Initialize user interface."""
+        self.setWindowTitle("Stock Take")
+        self.setMinimumSize(820, 620)
+
+        layout = QVBoxLayout(self)
+
+        header = QLabel("📋 Stock Take")
+        header.setStyleSheet("font-size: 18pt; font-weight: bold; color: #2c3e50;")
+        layout.addWidget(header)
+
+        # Stock take selection
+        select_row = QHBoxLayout()
+        select_row.addWidget(QLabel("Count:"))
+        self.stock_take_combo = QComboBox()
+        self.stock_take_combo.setMinimumWidth(300)
+        self.stock_take_combo.currentIndexChanged.connect(self.refresh_preview)
+        select_row.addWidget(self.stock_take_combo)
+        new_btn = QPushButton("New Count...")
+        new_btn.setAutoDefault(False)
+        new_btn.clicked.connect(self.new_stock_take)
+        select_row.addWidget(new_btn)
+        select_row.addStretch()
+        layout.addLayout(select_row)
+
+        # Count entry
+        entry_row = QHBoxLayout()
+        load_btn = QPushButton("Load Count Sheet...")
+        load_btn.setAutoDefault(False)
+        load_btn.clicked.connect(self.load_count_sheet)
+        entry_row.addWidget(load_btn)
+        self.scan_input = QLineEdit()
+        self.scan_input.setPlaceholderText("Scan or type a SKU and press Enter to count it")
+        self.scan_input.returnPressed.connect(self.record_scan)
+        entry_row.addWidget(self.scan_input, 1)
+        self.quantity_spin = QDoubleSpinBox()
+        self.quantity_spin.setRange(0.01, 100000)
+        self.quantity_spin.setDecimals(2)
+        self.quantity_spin.setValue(1.0)
+        self.quantity_spin.setSuffix(" per scan")
+        entry_row.addWidget(self.quantity_spin)
+        layout.addLayout(entry_row)
+
+        self.feedback_label = QLabel("")
+        layout.addWidget(self.feedback_label)
+
+        # Variance preview
+        self.variance_table = QTableWidget(0, 6)
+        self.variance_table.setHorizontalHeaderLabels(
+            ["SKU", "Name", "System", "Counted", "Variance", "Value Impact"])
+        self.variance_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.variance_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.variance_table.verticalHeader().setVisible(False)
+        layout.addWidget(self.variance_table)
+
+        self.summary_label = QLabel("")
+        self.summary_label.setStyleSheet("font-size: 12pt; font-weight: bold;")
+        layout.addWidget(self.summary_label)
+
+        buttons = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh Preview")
+        refresh_btn.setAutoDefault(False)
+        refresh_btn.clicked.connect(self.refresh_preview)
+        buttons.addWidget(refresh_btn)
+        buttons.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.setAutoDefault(False)
+        close_btn.clicked.connect(self.accept)
+        buttons.addWidget(close_btn)
+        self.post_btn = QPushButton("Post Adjustments")
+        self.post_btn.setAutoDefault(False)
+        self.post_btn.clicked.connect(self.post_adjustments)
+        self.post_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2c3e50;
+                color: white;
+                padding: 10px 30px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:disabled {
+                background-color: #95a5a6;
+            }
+        """)
+        buttons.addWidget(self.post_btn)
+        layout.addLayout(buttons)
+
+    # ------------------------------------------------------------------
+    # Stock takes
+    # ------------------------------------------------------------------
+
+    def current_stock_take_id(self):
+        return self.stock_take_combo.currentData()
+
+    def load_stock_takes(self, select_id=None):
+        """Fill the selector with the open stock takes."""
+        self.stock_take_combo.blockSignals(True)
+        self.stock_take_combo.clear()
+        for stock_take in self.stock_takes.get_stock_takes(open_only=True):
+            self.stock_take_combo.addItem(
+                f"#{stock_take['id']} {stock_take['name']} "
+                f"({stock_take['counted_items']} items counted)", stock_take['id'])
+        if select_id is not None:
+            self.stock_take_combo.setCurrentIndex(self.stock_take_combo.findData(select_id))
+        self.stock_take_combo.blockSignals(False)
+
+        has_open = self.stock_take_combo.count() > 0
+        self.scan_input.setEnabled(has_open)
+        self.post_btn.setEnabled(has_open)
+        self.refresh_preview()
+
+    def new_stock_take(self):
+        name, ok = QInputDialog.getText(self, "New Count", "Name (e.g. 'Aisle 3 - March'):")
+        if not ok or not name.strip():
+            return
+        try:
+            stock_take_id = self.stock_takes.start(name)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to start count: {e}")
+            return
+        self.load_stock_takes(select_id=stock_take_id)
+        self.scan_input.setFocus()
+
+    # ------------------------------------------------------------------
+    # Counting
+    # ------------------------------------------------------------------
+
+    def load_count_sheet(self):
+        stock_take_id = self.current_stock_take_id()
+        if stock_take_id is None:
+            QMessageBox.warning(self, "No Count", "Start a new count first")
+            return
+        file_name, _ = QFileDialog.getOpenFileName(
+            self, "Load Count Sheet", "", "CSV Files (*.csv);;All Files (*)")
+        if not file_name:
+            return
+        try:
+            recorded, errors = self.stock_takes.import_count_sheet(stock_take_id, file_name)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load count sheet: {e}")
+            return
+
+        msg = f"Count sheet loaded\n\nRows recorded: {recorded}"
+        if errors:
+            msg += "\n\nErrors:\n" + "\n".join(errors[:10])
+            if len(errors) > 10:
+                msg += f"\n...and {len(errors) - 10} more."
+            QMessageBox.warning(self, "Count Sheet", msg)
+        else:
+            QMessageBox.information(self, "Count Sheet", msg)
+        self.load_stock_takes(select_id=stock_take_id)
+
+    def record_scan(self):
+        sku = self.scan_input.text().strip()
+        self.scan_input.clear()
+        stock_take_id = self.current_stock_take_id()
+        if not sku or stock_take_id is None:
+            return
+        try:
+            unknown = self.stock_takes.record_counts(
+                stock_take_id, [(sku, self.quantity_spin.value())])
+            error = f"Unknown SKU: {sku}" if unknown else None
+        except ValueError as e:
+            error = str(e)
+        if error:
+            self.feedback_label.setText(f"❌ {error}")
+            self.feedback_label.setStyleSheet("color: #e74c3c; font-weight: bold;")
+        else:
+            # The preview is refreshed on demand; recomputing it per scan
+            # would slow scanning down on large counts
+            self.feedback_label.setText(f"✅ Counted {self.quantity_spin.value():g} × {sku}")
+            self.feedback_label.setStyleSheet("color: #27ae60; font-weight: bold;")
+
+    # ------------------------------------------------------------------
+    # Preview and posting
+    # ------------------------------------------------------------------
+
+    def refresh_preview(self):
+        """Show the variances of the selected stock take."""
+        stock_take_id = self.current_stock_take_id()
+        self.variance_table.setRowCount(0)
+        if stock_take_id is None:
+            self.summary_label.setText("No open counts. Start a new count.")
+            return
+
+        preview = self.stock_takes.preview(stock_take_id)
+        variances = preview['variances']
+        self.variance_table.setUpdatesEnabled(False)
+        self.variance_table.setRowCount(len(variances))
+        for row, v in enumerate(variances):
+            color = QColor("#e74c3c") if v.variance < 0 else QColor("#27ae60")
+            estimated = v.unit_cost_source != 'average'
+            cells = (v.sku, v.name, f"{v.system_quantity:,.2f}", f"{v.counted_quantity:,.2f}",
+                     f"{v.variance:+,.2f}",
+                     _signed_dollars(v.value_change_cents) + (" *" if estimated else ""))
+            for column, text in enumerate(cells):
+                cell = QTableWidgetItem(text)
+                if column >= 2:
+                    cell.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                if column >= 4:
+                    cell.setForeground(color)
+                if column == 5 and estimated:
+                    cell.setToolTip(_ESTIMATED_COST_NOTES[v.unit_cost_source])
+                self.variance_table.setItem(row, column, cell)
+        self.variance_table.setUpdatesEnabled(True)
+
+        self.summary_label.setText(
+            f"{preview['counted_items']:,} counted · {len(variances):,} with variance · "
+            f"shrink ${preview['shrink_value_cents'] / 100:,.2f} · "
+            f"overage ${preview['overage_value_cents'] / 100:,.2f} · "
+            f"net {_signed_dollars(preview['net_value_cents'])}"
+            + (f" · * {len(preview['estimated_cost']):,} found on items with no stock: "
+               "check their value" if preview['estimated_cost'] else ""))
+
+    def post_adjustments(self):
+        stock_take_id = self.current_stock_take_id()
+        if stock_take_id is None:
+            return
+        preview = self.stock_takes.preview(stock_take_id)
+        reply = QMessageBox.question(
+            self,
+            "Post Adjustments",
+            f"Post {len(preview['variances']):,} count adjustments?\n\n"
+            f"Net inventory value change: {_signed_dollars(preview['net_value_cents'])}\n\n"
+            + (f"{len(preview['estimated_cost']):,} items had no stock; their found units "
+               "are valued at the last purchase cost (or $0 if never purchased).\n\n"
+               if preview['estimated_cost'] else "") +
+            "Quantities of the counted items will be set to the counts. "
+            "This cannot be undone as a batch.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        try:
+            posted = self.stock_takes.post(stock_take_id)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to post adjustments: {e}")
+            return
+        QMessageBox.information(self, "Posted", f"{posted:,} adjustments posted.")
+        self.load_stock_takes()
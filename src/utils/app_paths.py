@@ -55,3 +55,15 @@ def get_logs_dir() -> Path:
     logs_dir = get_app_data_dir() / 'logs'
     logs_dir.mkdir(parents=True, exist_ok=True)
     return logs_dir
+
+
+def get_intake_journal_dir() -> Path:
+    """
+    Get the rapid-intake journal directory in AppData.
+    
+    Returns:
+        Path: Path to the journal directory, created if it doesn't exist
+    """
+    journal_dir = get_app_data_dir() / 'intake_journal'
+    journal_dir.mkdir(parents=True, exist_ok=True)
+    return journal_dir
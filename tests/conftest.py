@@ -11,6 +11,9 @@ import pytest
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
 
+SCHEMA_PATH = src_path / "database" / "schema.sql"
+BASELINE_SCHEMA_PATH = Path(__file__).parent / "fixtures" / "baseline_schema.sql"
+
 
 @pytest.fixture(autouse=True)
 def isolated_db():
@@ -32,12 +35,48 @@ def isolated_db():
     reset_db_manager()
 
     # Initialise a fresh in-memory database and apply the schema
-    schema_path = Path(__file__).parent.parent / "src" / "database" / "schema.sql"
     manager = get_db_manager(":memory:")
-    with open(schema_path) as f:
-        manager.get_connection().executescript(f.read())
+    manager.get_connection().executescript(SCHEMA_PATH.read_text())
 
     yield manager
 
     # Tear down after the test
     reset_db_manager()
+
+
+@pytest.fixture
+def schema_sql():
+    """The text of schema.sql, for tests that create extra databases."""
+    return SCHEMA_PATH.read_text()
+
+
+@pytest.fixture
+def baseline_schema_sql():
+    """
+    The schema of the first release, for databases that need migrating.
+
+    Pinned in tests/fixtures so migration tests do not depend on how the
+    current schema.sql is laid out.
+    """
+    return BASELINE_SCHEMA_PATH.read_text()
+
+
+@pytest.fixture
+def file_db(tmp_path, schema_sql):
+    """
+    Provide a fresh file database as the application database.
+
+    For tests that need a real file: WAL mode, other connections or
+    processes, attached archives, migrations. Replaces the in-memory
+    database of ``isolated_db`` as the global DatabaseManager; the file is
+    ``file_db.db_path``.
+    """
+    from database.connection import get_db_manager, reset_db_manager
+
+    reset_db_manager()
+    manager = get_db_manager(str(tmp_path / "inventory.db"))
+    manager.get_connection().executescript(schema_sql)
+
+    yield manager
+
+    reset_db_manager()
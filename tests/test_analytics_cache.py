@@ -0,0 +1,107 @@
+"""
+Tests for the analytics result cache.
+
+Covers:
+- Repeated calls are served from the cache
+- Equivalent argument spellings share one entry
+- Writes through this connection invalidate the cache
+- Commits from another connection invalidate the cache
+- LRU eviction and statistics
+"""
+
+import sqlite3
+
+import pytest
+
+from services.analytics_service import AnalyticsService
+from services.inventory_service import InventoryService
+from services.query_cache import QueryCache
+
+@pytest.fixture
+def stocked():
+    svc = InventoryService()
+    item = svc.create_item("CACHE-1", "Beans", category_id=3)
+    svc.process_purchase(item.id, 50, 1.00)
+    svc.process_distribution(item.id, 5, "CLIENT")
+    return svc, item
+
+
+def test_repeat_calls_hit_cache(stocked):
+    analytics = AnalyticsService()
+
+    first = analytics.get_inventory_forecast(days_ahead=30)
+    second = analytics.get_inventory_forecast(30, 90)
+    assert second is first
+
+    stats = analytics.get_cache_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['size'] == 1
+
+    analytics.get_inventory_forecast(days_ahead=60)
+    assert analytics.get_cache_stats()['misses'] == 2
+
+
+def test_write_invalidates_cache(stocked):
+    svc, item = stocked
+    analytics = AnalyticsService()
+
+    before = analytics.get_seasonal_trends(year=2026)
+    assert analytics.get_seasonal_trends(year=2026) is before
+
+    svc.process_distribution(item.id, 3, "CLIENT")
+    after = analytics.get_seasonal_trends(year=2026)
+    assert after is not before
+    assert analytics.get_cache_stats()['invalidations'] == 1
+
+    # A read-only call must not invalidate anything
+    svc.get_all_items()
+    assert analytics.get_seasonal_trends(year=2026) is after
+
+
+def test_commit_from_other_connection_invalidates(file_db):
+    db_path = file_db.db_path
+    analytics = AnalyticsService(db_path)
+    assert analytics.get_donor_impact_summary()['total_donors'] == 0
+    assert analytics.get_donor_impact_summary()['total_donors'] == 0
+    assert analytics.get_cache_stats()['hits'] == 1
+
+    other = sqlite3.connect(db_path)
+    other.execute(
+        "INSERT INTO inventory_items (sku, name, quantity_on_hand) VALUES ('EXT-1', 'Rice', 4)"
+    )
+    other.execute("""
+        INSERT INTO inventory_transactions
+            (item_id, transaction_type, quantity_change, donor, fair_market_value_cents)
+        VALUES (1, 'DONATION', 4, 'Local Church', 800)
+    """)
+    other.commit()
+    other.close()
+
+    assert analytics.get_donor_impact_summary()['total_donors'] == 1
+
+
+def test_lru_eviction_and_size_cap():
+    cache = QueryCache(max_entries=2)
+    cache.validate(1)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == (True, 1)  # 'a' is now most recently used
+    cache.put('c', 3)
+
+    assert cache.get('b') == (False, None)
+    assert cache.get('a') == (True, 1)
+    stats = cache.get_stats()
+    assert stats['evictions'] == 1
+    assert stats['size'] == 2
+    assert stats['hit_rate'] == pytest.approx(2 / 3, abs=1e-4)
+
+    cache.validate(2)
+    assert cache.get('a') == (False, None)
+    assert cache.get_stats()['invalidations'] == 1
+
+
+def test_cache_can_be_disabled(stocked):
+    analytics = AnalyticsService(cache_size=0)
+    assert analytics.get_category_trends() is not analytics.get_category_trends()
+    assert analytics.get_cache_stats()['hits'] == 0
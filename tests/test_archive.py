@@ -0,0 +1,162 @@
+"""
+Tests for moving closed years into the attached archive database.
+
+Reports and aggregates are captured before archiving and must be identical
+afterwards, while the hot ledger only keeps the open year.
+"""
+
+import sqlite3
+from datetime import date, datetime
+
+import pytest
+
+from database.archive import archive_closed_years, get_archive_info, get_archive_path
+from database.maintenance import migrate_to_incremental_vacuum
+from database.migrations import rebuild_supplier_totals
+from services.analytics_service import AnalyticsService
+from services.inventory_service import InventoryService
+from services.reporting_service import ReportingService
+
+THIS_YEAR = datetime.now().year
+
+
+def _reports():
+    reporting = ReportingService()
+    analytics = AnalyticsService()
+    return {
+        'financial': reporting.get_financial_report_data(),
+        'financial_2024': reporting.get_financial_report_data(date(2024, 1, 1), date(2024, 12, 31)),
+        'impact': reporting.get_impact_report_data(),
+        'suppliers': reporting.get_suppliers_report_data(),
+        'dashboard': reporting.get_dashboard_stats(),
+        'seasonal_2024': analytics.get_seasonal_trends(2024),
+        'donors': analytics.get_donor_impact_summary(),
+    }
+
+
+@pytest.fixture
+def ledger(file_db):
+    """Three years of activity in a file database."""
+    manager = file_db
+    svc = InventoryService()
+    beans = svc.create_item("ARC-1", "Beans")
+    rice = svc.create_item("ARC-2", "Rice")
+    for year in (2024, 2025, THIS_YEAR):
+        first = svc.process_purchase(beans.id, 50, 1.00, supplier="Acme Foods", notes="Net 30")[1]
+        svc.process_donation(rice.id, 20, 2.00, donor=f"Donor {year % 2}")
+        svc.process_distribution(beans.id, 10, "CLIENT")
+        last = svc.process_distribution(rice.id, 5, "CLIENT")[1]
+        manager.get_connection().execute(
+            "UPDATE inventory_transactions SET transaction_date = ? || printf('%02d', id) "
+            "WHERE id BETWEEN ? AND ?",
+            (f"{year}-06-15 10:00:", first.id, last.id))
+
+    # A closed-year purchase voided this year stays hot with its correction
+    voided = manager.get_connection().execute(
+        "SELECT id FROM inventory_transactions WHERE transaction_date LIKE '2025%' "
+        "AND transaction_type = 'PURCHASE'").fetchone()[0]
+    svc.void_transaction(voided, "Returned")
+    conn = manager.get_connection()
+    rebuild_supplier_totals(conn)
+    conn.commit()
+
+    return manager, voided
+
+
+def test_archiving_keeps_reports_and_aggregates(ledger):
+    manager, voided = ledger
+    conn = manager.get_connection()
+    before = _reports()
+    aggregates = [
+        [tuple(row) for row in conn.execute(f"SELECT * FROM {table} ORDER BY 1")]
+        for table in ('kpi_item_distributed', 'kpi_supplier_totals', 'kpi_supplier_notes')
+    ]
+
+    result = manager.archive_closed_years()
+    assert result['moved'] == 7
+    assert result['archive_path'] == get_archive_path(manager.db_path)
+
+    conn = manager.get_connection()
+    hot_years = {row[0] for row in conn.execute(
+        "SELECT DISTINCT strftime('%Y', transaction_date) FROM inventory_transactions")}
+    assert hot_years == {'2025', str(THIS_YEAR)}
+    assert conn.execute(
+        "SELECT COUNT(*) FROM inventory_transactions WHERE transaction_date < ?",
+        (f"{THIS_YEAR}-01-01",)).fetchone()[0] == 1
+    assert conn.execute("SELECT transaction_type FROM inventory_transactions WHERE id = ?",
+                        (voided,)).fetchone()[0] == 'PURCHASE'
+
+    assert _reports() == before
+    assert [
+        [tuple(row) for row in conn.execute(f"SELECT * FROM {table} ORDER BY 1")]
+        for table in ('kpi_item_distributed', 'kpi_supplier_totals', 'kpi_supplier_notes')
+    ] == aggregates
+
+    info = get_archive_info(manager.db_path)
+    assert info['years'] == [{'year': 2024, 'transactions': 4},
+                             {'year': 2025, 'transactions': 3}]
+    assert manager.get_database_info()['archive']['exists']
+
+
+def test_archive_is_read_only_and_mapped(ledger):
+    manager, _voided = ledger
+    manager.archive_closed_years()
+
+    # A fresh connection attaches the existing archive
+    manager.close()
+    conn = manager.get_connection()
+    assert conn.execute("PRAGMA archive.mmap_size").fetchone()[0] > 0
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        conn.execute("DELETE FROM archive.archived_transactions")
+    assert conn.execute("SELECT COUNT(*) FROM ledger_history").fetchone()[0] == 13
+
+    # Writes still go to the hot ledger
+    InventoryService().process_distribution(1, 1, "CLIENT")
+    assert conn.execute("SELECT COUNT(*) FROM ledger_history").fetchone()[0] == 14
+
+
+def test_interrupted_run_is_completed(ledger):
+    manager, _voided = ledger
+    manager.archive_closed_years(2025)
+
+    # Simulate a crash after the archive copy committed: a 2025 row is in
+    # both files until the next run removes it from the hot ledger
+    archive = sqlite3.connect(get_archive_path(manager.db_path))
+    archive.execute("ATTACH DATABASE ? AS hot", (manager.db_path,))
+    archive.execute("""
+        INSERT INTO archived_transactions
+        SELECT * FROM hot.inventory_transactions
+        WHERE transaction_date LIKE '2025%' AND transaction_type = 'DONATION'
+    """)
+    archive.commit()
+    archive.close()
+
+    assert manager.archive_closed_years()['moved'] == 3
+    assert manager.archive_closed_years()['moved'] == 0
+    conn = manager.get_connection()
+    assert tuple(conn.execute(
+        "SELECT COUNT(*), COUNT(DISTINCT id) FROM ledger_history").fetchone()) == (13, 13)
+
+
+def test_hot_file_shrinks(ledger):
+    manager, _voided = ledger
+    migrate_to_incremental_vacuum(manager.db_path)
+    conn = manager.get_connection()
+    conn.executemany("""
+        INSERT INTO inventory_transactions
+            (item_id, transaction_type, quantity_change, notes, transaction_date)
+        VALUES (1, 'DONATION', 1, ?, '2023-03-01 09:00:00')
+    """, [("x" * 200,)] * 2000)
+    conn.commit()
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+
+    manager.archive_closed_years()
+    assert conn.execute("PRAGMA page_count").fetchone()[0] < pages / 2
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+
+def test_in_memory_database_has_history_view(isolated_db):
+    conn = isolated_db.get_connection()
+    assert conn.execute("SELECT COUNT(*) FROM ledger_history").fetchone()[0] == 0
+    with pytest.raises(ValueError):
+        archive_closed_years(":memory:")
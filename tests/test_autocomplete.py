@@ -0,0 +1,82 @@
+"""
+Tests for item lookup: the in-memory autocomplete index and paged prefix search.
+"""
+
+from database.connection import get_db_manager
+from services.autocomplete import get_autocomplete_index
+from services.inventory_service import InventoryService
+
+
+def _skus(match):
+    return [s.sku for s in match.suggestions]
+
+
+def test_matches_prefix_search():
+    svc = InventoryService()
+    for n, name in enumerate(["Black Beans", "Baked Beans", "Rice", "Canned Corn", "Beef Stew"]):
+        svc.create_item(f"SKU-{n:03d}", name)
+    index = get_autocomplete_index(get_db_manager())
+    assert get_autocomplete_index(get_db_manager()) is index
+
+    for prefix in ("b", "BA", "sku-00", "rice", "zzz"):
+        expected = [i.sku for i in svc.search_items_by_prefix(prefix)]
+        found = _skus(index.search(prefix))
+        # The index also matches name words, the query only the start
+        assert set(expected) <= set(found)
+    assert _skus(index.search("bea")) == ["SKU-000", "SKU-001"]
+    assert _skus(index.search("SKU-", limit=2)) == ["SKU-000", "SKU-001"]
+
+
+def test_narrowing_matches_fresh_lookup():
+    svc = InventoryService()
+    for n in range(40):
+        svc.create_item(f"BC-{n:04d}", f"Item {n}")
+    svc.create_item("XB-0001", "Rice")
+    index = get_autocomplete_index(get_db_manager())
+
+    match = None
+    for typed in ("BC", "BC-", "BC-0", "BC-00", "BC-003", "BC-0031"):
+        match = index.search(typed, previous=match)
+        fresh = index.search(typed)
+        assert match.suggestions == fresh.suggestions
+        if match.item_ids is not None and fresh.item_ids is not None:
+            assert sorted(match.item_ids) == sorted(fresh.item_ids)
+    assert _skus(match) == ["BC-0031"]
+    assert index.search("BC-00319", previous=match).item_ids == ()
+
+
+def test_follows_item_changes():
+    svc = InventoryService()
+    rice = svc.create_item("RICE-1", "Rice")
+    index = get_autocomplete_index(get_db_manager())
+    stale = index.search("ri")
+
+    oats = svc.create_item("OATS-1", "Rolled Oats")
+    svc.update_item(rice.id, name="Jasmine Rice")
+    assert _skus(index.search("ro")) == ["OATS-1"]
+    assert _skus(index.search("jas")) == ["RICE-1"]
+    assert _skus(index.search("ri", previous=stale)) == ["RICE-1"]
+
+    svc.soft_delete_item(oats.id)
+    assert _skus(index.search("oat")) == []
+    svc.process_purchase(rice.id, 5, 1.00)
+    assert len(index) == 1
+
+
+def test_prefix_search_pages():
+    svc = InventoryService()
+    for n in range(25):
+        svc.create_item(f"PG-{n:03d}", f"Page item {n}")
+    svc.soft_delete_item(svc.get_item_by_sku("PG-003").id)
+
+    pages, after = [], None
+    while True:
+        page = svc.search_items_by_prefix("", limit=10, after_sku=after)
+        if not page:
+            break
+        pages.append([i.sku for i in page])
+        after = page[-1].sku
+    assert [len(p) for p in pages] == [10, 10, 4]
+    assert sum(pages, []) == [f"PG-{n:03d}" for n in range(25) if n != 3]
+    assert [i.sku for i in svc.search_items_by_prefix("page item 2", after_sku="PG-020")] == [
+        "PG-021", "PG-022", "PG-023", "PG-024"]
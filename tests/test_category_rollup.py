@@ -0,0 +1,194 @@
+"""
+Tests for the category closure table and subtree rollups.
+
+The closure table is compared against a recursive walk of
+item_categories.parent_id after inserts, moves and deletes, and every
+rollup total is compared against the same figure summed per subtree in
+Python.
+"""
+
+import sqlite3
+from datetime import date
+
+import pytest
+
+from database.migrations import migrate_database
+from services.analytics_service import AnalyticsService
+from services.inventory_service import InventoryService
+from services.reporting_service import ReportingService
+
+
+
+def _expected_closure(conn):
+    """(ancestor, descendant, depth) for every path, walked from parent_id."""
+    parents = {row[0]: row[1] for row in conn.execute(
+        "SELECT id, parent_id FROM item_categories")}
+    paths = set()
+    for category_id in parents:
+        node, depth = category_id, 0
+        while node is not None:
+            paths.add((node, category_id, depth))
+            node, depth = parents[node], depth + 1
+    return paths
+
+
+def _closure(conn):
+    return {tuple(row) for row in conn.execute(
+        "SELECT ancestor_id, descendant_id, depth FROM category_closure")}
+
+
+def _subtree(conn, category_id):
+    return {row[0] for row in conn.execute(
+        "SELECT descendant_id FROM category_closure WHERE ancestor_id = ?",
+        (category_id,))}
+
+
+@pytest.fixture
+def stocked(isolated_db):
+    """Items in nested categories, one uncategorized, one distribution voided."""
+    svc = InventoryService()
+    conn = isolated_db.get_connection()
+    conn.execute("INSERT INTO item_categories (id, name, parent_id) VALUES (10, 'Soup', 3)")
+    conn.commit()
+
+    soup = svc.create_item("ROLL-1", "Tomato Soup", category_id=10)
+    beans = svc.create_item("ROLL-2", "Beans", category_id=3)
+    soap = svc.create_item("ROLL-3", "Soap", category_id=7)
+    loose = svc.create_item("ROLL-4", "Mystery Box")
+
+    svc.process_purchase(soup.id, 30, 1.50)
+    svc.process_purchase(beans.id, 20, 1.00)
+    svc.process_donation(soap.id, 10, 2.00)
+    svc.process_purchase(loose.id, 5, 4.00)
+    svc.process_distribution(soup.id, 6, "CLIENT")
+    svc.process_distribution(soap.id, 3, "CLIENT")
+    _, voided = svc.process_distribution(beans.id, 8, "CLIENT")
+    svc.void_transaction(voided.id, "Entered twice")
+    return svc, conn
+
+
+def test_closure_follows_insert_move_and_delete(isolated_db):
+    conn = isolated_db.get_connection()
+    assert _closure(conn) == _expected_closure(conn)
+
+    conn.execute("INSERT INTO item_categories (id, name, parent_id) VALUES (10, 'Soup', 3)")
+    conn.execute("INSERT INTO item_categories (id, name, parent_id) VALUES (11, 'Chowder', 10)")
+    assert _closure(conn) == _expected_closure(conn)
+    assert _subtree(conn, 1) >= {3, 10, 11}
+
+    # Moving a subtree carries its descendants along
+    conn.execute("UPDATE item_categories SET parent_id = 2 WHERE id = 3")
+    assert _closure(conn) == _expected_closure(conn)
+    assert 11 in _subtree(conn, 2) and 11 not in _subtree(conn, 1)
+
+    conn.execute("UPDATE item_categories SET parent_id = NULL WHERE id = 10")
+    assert _closure(conn) == _expected_closure(conn)
+
+    conn.execute("DELETE FROM item_categories WHERE id = 11")
+    assert _closure(conn) == _expected_closure(conn)
+
+
+def test_cycles_are_rejected(isolated_db):
+    conn = isolated_db.get_connection()
+    with pytest.raises(sqlite3.IntegrityError, match="own subcategory"):
+        conn.execute("UPDATE item_categories SET parent_id = 3 WHERE id = 1")
+    with pytest.raises(sqlite3.IntegrityError, match="own subcategory"):
+        conn.execute("UPDATE item_categories SET parent_id = 1 WHERE id = 1")
+    assert _closure(conn) == _expected_closure(conn)
+
+
+def test_rollup_matches_per_subtree_sums(stocked):
+    _svc, conn = stocked
+    rollup = ReportingService().get_category_rollup()
+
+    for category in rollup['categories']:
+        members = _subtree(conn, category['category_id'])
+        items = [row for row in conn.execute(
+            "SELECT category_id, quantity_on_hand, total_cost_basis_cents "
+            "FROM inventory_items WHERE is_active = 1")
+            if row[0] in members]
+        distributed = sum(abs(row[1]) for row in conn.execute("""
+            SELECT i.category_id, t.quantity_change
+            FROM inventory_transactions t JOIN inventory_items i ON t.item_id = i.id
+            WHERE t.transaction_type = 'DISTRIBUTION' AND t.is_voided = 0
+        """) if row[0] in members)
+
+        assert category['item_count'] == len(items)
+        assert category['quantity_on_hand'] == pytest.approx(sum(r[1] for r in items))
+        assert category['value_cents'] == sum(r[2] for r in items)
+        assert category['distributed_qty'] == pytest.approx(distributed)
+
+    by_name = {c['name']: c for c in rollup['categories']}
+    assert by_name['Food']['item_count'] == 2
+    assert by_name['Soup']['depth'] == 2
+    assert by_name['Food']['distributed_qty'] == 6
+    assert rollup['uncategorized']['value_cents'] == 2000
+    total = conn.execute(
+        "SELECT SUM(total_cost_basis_cents) FROM inventory_items WHERE is_active = 1"
+    ).fetchone()[0]
+    assert rollup['total_value_cents'] == total
+    assert rollup['total_distributed_qty'] == 9
+
+    # Children directly follow their parent
+    names = [c['name'] for c in rollup['categories']]
+    assert names.index('Canned Goods') + 1 == names.index('Soup')
+
+    # Distributions outside the period are excluded
+    empty = ReportingService().get_category_rollup(date(2000, 1, 1), date(2000, 12, 31))
+    assert empty['total_distributed_qty'] == 0
+    assert empty['total_value_cents'] == total
+
+
+def test_dashboard_and_stock_status_rollups(stocked):
+    svc, _conn = stocked
+    reporting = ReportingService()
+
+    stats = reporting.get_dashboard_stats()
+    rollup = {c['category']: c['value_dollars'] for c in stats['category_rollup']}
+    # Donations carry no cost basis, so Non-Food has no value
+    assert rollup == pytest.approx({'Food': 56.0, 'Canned Goods': 56.0, 'Soup': 36.0})
+
+    # Moving a category re-homes its whole subtree
+    svc.db_manager.get_connection().execute(
+        "UPDATE item_categories SET parent_id = 2 WHERE id = 10")
+    rollup = {c['category']: c['value_dollars']
+              for c in reporting.get_dashboard_stats()['category_rollup']}
+    assert rollup == pytest.approx({'Food': 20.0, 'Canned Goods': 20.0,
+                                    'Non-Food': 36.0, 'Soup': 36.0})
+
+    status = reporting.get_stock_status_data()
+    assert {c['name'] for c in status['category_rollup']} == \
+        {'Food', 'Canned Goods', 'Non-Food', 'Soup', 'Hygiene'}
+
+
+def test_category_trends_rollup(stocked):
+    analytics = AnalyticsService()
+    year = date.today().year
+
+    flat = {c['category_name']: c['quantity']
+            for c in analytics.get_category_trends(year)['categories']}
+    assert flat == {'Soup': 6, 'Hygiene': 3}
+
+    trends = analytics.get_category_trends(year, rollup=True)
+    rolled = {c['category_name']: c for c in trends['categories']}
+    assert {name: c['quantity'] for name, c in rolled.items()} == {
+        'Food': 6, 'Canned Goods': 6, 'Soup': 6, 'Non-Food': 3, 'Hygiene': 3
+    }
+    assert trends['total_quantity'] == 9
+    assert rolled['Food']['percentage'] == pytest.approx(66.7)
+    assert rolled['Soup']['parent_id'] == 3
+
+
+def test_migration_backfills_closure(tmp_path, baseline_schema_sql):
+    """A database created before the closure table gets it rebuilt."""
+    db_path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(baseline_schema_sql)
+    conn.execute("INSERT INTO item_categories (id, name, parent_id) VALUES (10, 'Soup', 3)")
+    conn.commit()
+    conn.close()
+
+    assert 'rebuild_category_closure' in migrate_database(db_path)
+    conn = sqlite3.connect(db_path)
+    assert _closure(conn) == _expected_closure(conn)
+    conn.close()
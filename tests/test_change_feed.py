@@ -0,0 +1,137 @@
+"""
+Tests for change data capture and incremental (delta) exports.
+"""
+
+import csv
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from database.archive import archive_closed_years
+from database.compact_ledger import migrate_to_compact_ledger
+from database.connection import get_db_manager, reset_db_manager
+from database.migrations import migrate_database
+from services.change_feed_service import ChangeFeedService
+from services.inventory_service import InventoryService
+
+def _read(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return [(row['op'], int(row['id'])) for row in csv.DictReader(f)]
+
+
+def _log_size():
+    return get_db_manager().get_connection().execute(
+        "SELECT COUNT(*) FROM change_log").fetchone()[0]
+
+
+def test_snapshot_then_deltas(tmp_path):
+    svc = InventoryService()
+    beans = svc.create_item("CDC-1", "Beans")
+    _, first = svc.process_purchase(beans.id, 50, 1.00, supplier="Acme Foods")
+    feed = ChangeFeedService()
+    assert _log_size() == 0  # Nothing is logged without a consumer
+
+    snapshot = feed.export_changes("accounting", str(tmp_path))
+    assert snapshot['snapshot'] and (snapshot['items'], snapshot['transactions']) == (1, 1)
+    assert [Path(p).name for p in snapshot['files']] == \
+        ["items_snapshot_0.csv", "transactions_snapshot_0.csv"]
+    assert feed.get_watermark("accounting") == 0
+
+    # Several changes to a row export its current state once
+    rice = svc.create_item("CDC-2", "Rice")
+    svc.process_donation(rice.id, 10, 2.00, donor="St. Mary's Church")
+    _, handed_out = svc.process_distribution(beans.id, 5, "CLIENT")
+    svc.void_transaction(handed_out.id, "Entered twice")
+    svc.update_item(beans.id, name="Black Beans")
+    temp = svc.create_item("CDC-3", "Typo")
+    conn = get_db_manager().get_connection()
+    conn.execute("DELETE FROM inventory_items WHERE id = ?", (temp.id,))
+    conn.commit()
+
+    delta = feed.export_changes("accounting", str(tmp_path))
+    assert not delta['snapshot'] and delta['from_seq'] == 0
+    items_file, transactions_file = delta['files']
+    assert _read(items_file) == [('upsert', beans.id), ('upsert', rice.id), ('delete', temp.id)]
+    with open(items_file, newline='', encoding='utf-8') as f:
+        assert next(csv.DictReader(f))['name'] == "Black Beans"
+    changed = _read(transactions_file)
+    assert [op for op, _ in changed] == ['upsert'] * 3  # donation, voided distribution, correction
+    assert first.id not in {row_id for _, row_id in changed}
+    assert feed.get_watermark("accounting") == delta['to_seq']
+    assert _log_size() == 0  # Pruned once the only consumer has exported
+
+    # Nothing changed: nothing written, the watermark stays
+    assert feed.export_changes("accounting", str(tmp_path))['files'] == []
+    assert feed.get_watermark("accounting") == delta['to_seq']
+
+
+def test_watermarks_paging_and_pruning():
+    svc = InventoryService()
+    feed = ChangeFeedService()
+    with pytest.raises(ValueError, match="Unknown consumer"):
+        feed.acknowledge("accounting", 0)
+    conn = get_db_manager().get_connection()
+    conn.executemany("INSERT INTO change_consumers (name, watermark) VALUES (?, 0)",
+                     [("accounting",), ("central",)])
+    conn.commit()
+
+    items = [svc.create_item(f"PG-{n}", f"Item {n}") for n in range(5)]
+    part = feed.get_changes(0, max_changes=3)
+    assert [item['sku'] for item in part.items] == ["PG-0", "PG-1", "PG-2"]
+    rest = feed.get_changes(part.to_seq, max_changes=100)
+    assert [item['sku'] for item in rest.items] == ["PG-3", "PG-4"]
+    assert feed.get_changes(rest.to_seq).is_empty
+
+    # The log is pruned to the slowest consumer
+    feed.acknowledge("accounting", rest.to_seq)
+    assert _log_size() == 5
+    feed.acknowledge("central", part.to_seq)
+    assert _log_size() == 2
+    with pytest.raises(ValueError, match="cannot move back"):
+        feed.acknowledge("central", 0)
+    with pytest.raises(ValueError):
+        feed.get_changes(0, max_changes=0)
+
+    # Logging stops with the last consumer
+    feed.remove_consumer("central")
+    assert _log_size() == 0
+    feed.remove_consumer("accounting")
+    svc.update_item(items[0].id, name="Renamed")
+    assert _log_size() == 0
+
+
+def test_compact_ledger_and_archive_are_captured(file_db, tmp_path):
+    db_path = file_db.db_path
+    svc = InventoryService()
+    beans = svc.create_item("CMP-1", "Beans")
+    _, old = svc.process_purchase(beans.id, 50, 1.00)
+    _, recent = svc.process_distribution(beans.id, 5, "CLIENT")
+    conn = get_db_manager().get_connection()
+    conn.execute("UPDATE inventory_transactions SET transaction_date = '2020-03-01' "
+                 "WHERE id = ?", (old.id,))
+    conn.commit()
+    reset_db_manager()
+    migrate_to_compact_ledger(db_path, batch_size=1)
+    migrate_database(db_path)
+
+    svc = InventoryService(db_path)
+    feed = ChangeFeedService(db_path)
+    snapshot = feed.export_changes("accounting", str(tmp_path / "out"))
+    assert snapshot['transactions'] == 2
+
+    # Writes through the compact view are logged from ledger_entries;
+    # archiving a closed year is not a deletion
+    _, purchase = svc.process_purchase(beans.id, 10, 1.50, supplier="Acme Foods")
+    svc.void_transaction(recent.id, "Wrong item")
+    assert archive_closed_years(db_path, before_year=2021)['moved'] == 1
+
+    changes = feed.get_changes(feed.get_watermark("accounting"))
+    assert [row['id'] for row in changes.transactions] == \
+        [recent.id, purchase.id, purchase.id + 1]
+    assert changes.transactions[0]['is_voided'] == 1
+    assert changes.deleted_transaction_ids == []
+    trigger_count = sqlite3.connect(db_path).execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE name LIKE 'change_log_ledger_%'"
+    ).fetchone()[0]
+    assert trigger_count == 3
@@ -0,0 +1,98 @@
+"""
+Tests for the offscreen dashboard chart renderers.
+
+Covers:
+- Unchanged data skips the redraw
+- Same-shape data updates artists in place (no rebuild)
+- In-place pie update matches a freshly built pie
+- Shape changes / empty data rebuild cleanly
+- Rendered frame size and buffer length
+"""
+
+import pytest
+
+from ui.components.chart_renderer import CategoryPieChart, TopItemsBarChart
+
+
+CATEGORIES = [
+    {'category': 'Canned Goods', 'value_dollars': 120.0},
+    {'category': 'Hygiene', 'value_dollars': 60.0},
+    {'category': 'Dry Goods', 'value_dollars': 20.0},
+]
+
+ITEMS = [
+    {'name': 'Canned Corn', 'quantity': 40},
+    {'name': 'A Very Long Item Name That Gets Truncated', 'quantity': 25},
+]
+
+
+def test_unchanged_data_skips_redraw():
+    chart = CategoryPieChart()
+    assert chart.update(CATEGORIES) is True
+    chart.render()
+    assert chart.needs_render is False
+
+    assert chart.update([dict(c) for c in CATEGORIES]) is False
+    assert chart.needs_render is False
+
+
+def test_pie_update_reuses_artists_and_matches_fresh_layout():
+    chart = CategoryPieChart()
+    chart.update(CATEGORIES)
+    wedges = list(chart.wedges)
+
+    changed = [dict(c) for c in CATEGORIES]
+    changed[0]['value_dollars'] = 30.0
+    assert chart.update(changed) is True
+    assert chart.wedges == wedges  # Same artist objects
+
+    fresh = CategoryPieChart()
+    fresh.update(changed)
+    for reused, built in zip(chart.wedges, fresh.wedges):
+        assert reused.theta1 == pytest.approx(built.theta1)
+        assert reused.theta2 == pytest.approx(built.theta2)
+        assert reused.center == pytest.approx(built.center)
+    assert [t.get_text() for t in chart.autotexts] == [t.get_text() for t in fresh.autotexts]
+
+
+def test_pie_rebuilds_when_category_count_changes():
+    chart = CategoryPieChart()
+    chart.update(CATEGORIES)
+    chart.update(CATEGORIES[:2])
+    assert len(chart.wedges) == 2
+    assert [t.get_text() for t in chart.legend.get_texts()] == ['Canned Goods', 'Hygiene']
+
+
+def test_empty_data_shows_placeholder():
+    chart = CategoryPieChart()
+    chart.update(CATEGORIES)
+    assert chart.update([]) is True
+    assert chart.wedges == []
+    chart.render()
+
+
+def test_bar_update_in_place():
+    chart = TopItemsBarChart()
+    chart.update(ITEMS)
+    bars = list(chart.bars)
+
+    chart.update([{'name': 'Canned Corn', 'quantity': 80}, ITEMS[1]])
+    assert list(chart.bars) == bars
+    assert bars[0].get_height() == 80
+    assert chart.bar_labels[0].get_text() == '80'
+    assert chart.ax.get_ylim()[1] == pytest.approx(96)
+    labels = [t.get_text() for t in chart.ax.get_xticklabels()]
+    assert labels[1] == 'A Very Long Item ...'
+
+
+def test_render_frame_matches_size():
+    chart = TopItemsBarChart(width_px=320, height_px=200)
+    chart.update(ITEMS)
+    frame = chart.render()
+    assert (frame.width, frame.height) == (320, 200)
+    assert len(frame.data) == 320 * 200 * 4
+
+    assert chart.set_size(400, 300) is True
+    frame = chart.render()
+    assert (frame.width, frame.height) == (400, 300)
+    assert chart.set_size(400, 300) is False
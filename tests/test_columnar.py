@@ -0,0 +1,210 @@
+"""
+Tests for the columnar item/ledger frame.
+
+Every vectorized aggregate is compared with the equivalent SQL or
+row-at-a-time computation on the same data, including voided rows.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from database.columnar import ColumnarFrame, get_shared_frame, read_consumption_rates
+from services.inventory_service import InventoryService
+
+
+@pytest.fixture
+def ledger(isolated_db):
+    """Items and backdated transactions, one distribution voided."""
+    svc = InventoryService()
+    beans = svc.create_item("COL-1", "Beans", category_id=3)
+    soap = svc.create_item("COL-2", "Soap", category_id=7)
+    rice = svc.create_item("COL-3", "Rice")
+
+    svc.process_purchase(beans.id, 100, 1.25, supplier="Acme Foods")
+    svc.process_purchase(soap.id, 40, 2.00, supplier="Acme Foods")
+    svc.process_donation(rice.id, 60, 1.50, donor="Local Church")
+    svc.process_donation(beans.id, 20, 1.00, donor="Local Church")
+    svc.process_donation(soap.id, 10, 0.50, donor="Scout Troop")
+    svc.process_donation(rice.id, 5, 0.0, donor="")
+
+    _, voided = svc.process_distribution(beans.id, 9, "CLIENT")
+    for qty in (3, 4, 2, 6):
+        svc.process_distribution(beans.id, qty, "CLIENT")
+    svc.process_distribution(rice.id, 7, "SPOILAGE")
+    svc.process_distribution(soap.id, 5, "CLIENT")
+    svc.void_transaction(voided.id, "Entered twice")
+
+    # Spread the history across days and months
+    conn = isolated_db.get_connection()
+    base = datetime(2026, 3, 15, 10, 30)
+    for n, (txn_id,) in enumerate(conn.execute(
+            "SELECT id FROM inventory_transactions ORDER BY id").fetchall()):
+        when = base - timedelta(days=9 * (n % 7), hours=n)
+        conn.execute(
+            "UPDATE inventory_transactions SET transaction_date = ? WHERE id = ?",
+            (when.isoformat(sep=' '), txn_id)
+        )
+    conn.commit()
+    return svc, conn
+
+
+def _reference_rates(conn, start, decay=0.7):
+    """Row-at-a-time weighted consumption (the previous dict path)."""
+    daily = defaultdict(lambda: defaultdict(float))
+    for row in conn.execute("""
+        SELECT item_id, DATE(transaction_date) AS day, ABS(quantity_change) AS qty
+        FROM inventory_transactions
+        WHERE transaction_type = 'DISTRIBUTION' AND is_voided = 0
+          AND transaction_date >= ?
+    """, (start.isoformat(sep=' '),)):
+        daily[row['item_id']][row['day']] += row['qty']
+    rates = {}
+    for item_id, days in daily.items():
+        values = [days[d] for d in sorted(days)]
+        n = len(values)
+        weights = [decay ** (n - 1 - i) for i in range(n)]
+        rates[item_id] = (sum(v * w for v, w in zip(values, weights)) / sum(weights), n)
+    return rates
+
+
+def test_consumption_rates_match_row_path(ledger):
+    _svc, conn = ledger
+    frame = ColumnarFrame()
+    frame.load(conn)
+
+    start = datetime(2026, 1, 1)
+    expected = _reference_rates(conn, start)
+    # The frame and the windowed SQL read (used by the forecast) agree
+    for rates in (frame.consumption_rates(start), read_consumption_rates(conn, start)):
+        assert rates.keys() == expected.keys()
+        for item_id, (rate, n) in expected.items():
+            assert rates[item_id][0] == pytest.approx(rate)
+            assert rates[item_id][1] == n
+
+
+def test_consumption_window_starts_at_the_cutoff_time(isolated_db):
+    svc = InventoryService()
+    item = svc.create_item("COL-9", "Oats")
+    svc.process_purchase(item.id, 50, 1.00)
+    conn = isolated_db.get_connection()
+    # Both stored separators, before and after the cutoff on its day
+    for qty, when in ((4, "2026-03-10T08:00:00"), (8, "2026-03-10 09:00:00"),
+                      (2, "2026-03-10T13:00:00"), (3, "2026-03-10 14:00:00")):
+        txn = svc.process_distribution(item.id, qty, "CLIENT")[1]
+        conn.execute("UPDATE inventory_transactions SET transaction_date = ? WHERE id = ?",
+                     (when, txn.id))
+    conn.commit()
+
+    start = datetime(2026, 3, 10, 12, 0)
+    frame = ColumnarFrame()
+    frame.load(conn)
+    assert read_consumption_rates(conn, start) == frame.consumption_rates(start) == \
+        {item.id: (5.0, 1)}
+
+
+def test_monthly_and_category_totals_match_sql(ledger):
+    _svc, conn = ledger
+    frame = ColumnarFrame(chunk_size=3)  # Force several chunks
+    frame.load(conn)
+
+    totals = frame.monthly_totals(2026, 'DISTRIBUTION', 'total_financial_impact_cents')
+    for row in conn.execute("""
+        SELECT CAST(strftime('%m', transaction_date) AS INTEGER) AS month,
+               SUM(ABS(quantity_change)) AS qty,
+               SUM(ABS(total_financial_impact_cents)) AS value
+        FROM inventory_transactions
+        WHERE transaction_type = 'DISTRIBUTION' AND is_voided = 0
+          AND strftime('%Y', transaction_date) = '2026'
+        GROUP BY month
+    """):
+        assert totals['quantity'][row['month'] - 1] == pytest.approx(row['qty'])
+        assert totals['value_cents'][row['month'] - 1] == pytest.approx(row['value'])
+
+    expected = {
+        row['category_id']: (row['qty'], row['value'])
+        for row in conn.execute("""
+            SELECT IFNULL(i.category_id, -1) AS category_id,
+                   SUM(ABS(t.quantity_change)) AS qty,
+                   SUM(ABS(t.total_financial_impact_cents)) AS value
+            FROM inventory_transactions t JOIN inventory_items i ON t.item_id = i.id
+            WHERE t.transaction_type = 'DISTRIBUTION' AND t.is_voided = 0
+            GROUP BY IFNULL(i.category_id, -1)
+        """)
+    }
+    assert frame.category_totals() == pytest.approx(expected)
+
+
+def test_donor_totals_match_sql(ledger):
+    _svc, conn = ledger
+    frame = ColumnarFrame()
+    frame.load(conn)
+
+    expected = [
+        (row['donor'], row['n'], row['qty'], row['fmv'])
+        for row in conn.execute("""
+            SELECT donor, COUNT(*) AS n, SUM(quantity_change) AS qty,
+                   SUM(fair_market_value_cents) AS fmv
+            FROM inventory_transactions
+            WHERE transaction_type = 'DONATION' AND is_voided = 0
+              AND donor IS NOT NULL AND donor != ''
+            GROUP BY donor ORDER BY fmv DESC
+        """)
+    ]
+    actual = [
+        (d['donor'], d['donation_count'], d['total_quantity'], d['total_fmv_cents'])
+        for d in frame.donor_totals()
+    ]
+    assert actual == expected
+
+
+def test_incremental_refresh_appends_and_tracks_voids(ledger, isolated_db):
+    svc, conn = ledger
+    frame = get_shared_frame(isolated_db)
+    assert get_shared_frame(isolated_db) is frame
+    version = frame.data_version
+    ids_before = frame.ledger.id.copy()
+
+    item = svc.get_item_by_sku("COL-3")
+    _, dist = svc.process_distribution(item.id, 1, "CLIENT")
+    svc.void_transaction(dist.id, "Mistake")
+
+    assert get_shared_frame(isolated_db) is frame
+    assert frame.data_version != version
+    assert list(frame.ledger.id[:len(ids_before)]) == list(ids_before)
+
+    fresh = ColumnarFrame()
+    fresh.load(conn)
+    assert list(frame.ledger.id) == list(fresh.ledger.id)
+    assert list(frame.ledger.is_voided) == list(fresh.ledger.is_voided)
+    assert list(frame.ledger.item_index) == list(fresh.ledger.item_index)
+
+    # A deleted row forces a full reload
+    conn.execute("DELETE FROM inventory_transactions WHERE id = ?", (int(fresh.ledger.id[-1]),))
+    conn.commit()
+    assert len(get_shared_frame(isolated_db).ledger) == len(fresh.ledger) - 1
+
+
+def test_to_arrow_uses_dictionary_columns(ledger):
+    pa = pytest.importorskip("pyarrow")
+    _svc, conn = ledger
+    frame = ColumnarFrame()
+    frame.load(conn)
+
+    table = frame.to_arrow()
+    assert table.num_rows == len(frame.ledger)
+    assert pa.types.is_dictionary(table.schema.field('donor').type)
+    donors = table.column('donor').to_pylist()
+    expected = [row[0] for row in conn.execute(
+        "SELECT donor FROM inventory_transactions ORDER BY id")]
+    assert donors == expected
+    assert set(table.column('sku').to_pylist()) == {"COL-1", "COL-2", "COL-3"}
+
+
+def test_empty_database(isolated_db):
+    frame = get_shared_frame(isolated_db)
+    assert len(frame.ledger) == 0
+    assert frame.consumption_rates(date(2026, 1, 1)) == {}
+    assert frame.donor_totals() == []
+    assert frame.category_totals() == {}
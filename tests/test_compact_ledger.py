@@ -0,0 +1,247 @@
+"""
+Tests for the compact ledger layout and its online migration.
+
+The same sequence of operations is run against a wide-layout database and
+a compact one; the rows read back through inventory_transactions and every
+trigger-maintained aggregate must be identical.
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from database.compact_ledger import (
+    is_compact_ledger, ledger_storage_stats, migrate_to_compact_ledger
+)
+from database.connection import get_db_manager, reset_db_manager
+from database.migrations import migrate_database, rebuild_supplier_totals
+from services.donor_service import DonorService
+from services.inventory_service import InventoryService
+
+# Ledger and derived tables, without the columns holding "now" timestamps
+_SNAPSHOT_QUERIES = {
+    'inventory_transactions': """
+        SELECT id, item_id, transaction_type, quantity_change, unit_cost_cents,
+               fair_market_value_cents, total_financial_impact_cents, reason_code,
+               supplier, supplier_id, donor, donor_id, notes, created_by, is_voided,
+               ref_transaction_id
+        FROM inventory_transactions ORDER BY id
+    """,
+    'kpi_item_distributed': "SELECT * FROM kpi_item_distributed ORDER BY item_id",
+    'kpi_supplier_totals': """
+        SELECT supplier_id, purchase_count, total_quantity, total_cost_cents
+        FROM kpi_supplier_totals ORDER BY supplier_id
+    """,
+    'kpi_supplier_notes': "SELECT * FROM kpi_supplier_notes ORDER BY supplier_id, note",
+    'donors': "SELECT id, name, normalized_key, merged_into_id FROM donors ORDER BY id",
+    'suppliers': "SELECT id, name, normalized_key FROM suppliers ORDER BY id",
+}
+
+
+def _snapshot(conn):
+    return {table: [tuple(row) for row in conn.execute(query)]
+            for table, query in _SNAPSHOT_QUERIES.items()}
+
+
+def _open(db_path):
+    """Point the services at an existing file database, migrated."""
+    reset_db_manager()
+    migrate_database(str(db_path))
+    conn = get_db_manager(str(db_path)).get_connection()
+    return InventoryService(), conn
+
+
+def _seed(svc):
+    beans = svc.create_item("CMP-1", "Beans")
+    rice = svc.create_item("CMP-2", "Rice")
+    svc.process_purchase(beans.id, 100, 1.25, supplier="Acme Foods", notes="Net 30")
+    svc.process_purchase(rice.id, 40, 2.00, supplier="ACME foods.", notes="Net 30")
+    svc.process_donation(beans.id, 20, 1.00, donor="St. Mary's Church")
+    svc.process_donation(rice.id, 10, 2.00, donor="st marys church", notes="Holiday drive")
+    svc.process_distribution(beans.id, 15, "CLIENT")
+    return beans, rice
+
+
+def _exercise(svc, conn, beans, rice):
+    """Writes covering every trigger path; returns values to compare."""
+    _, purchase = svc.process_purchase(rice.id, 25, 0.80, supplier="Valley Farms",
+                                       notes="Pallet rebate")
+    _, distribution = svc.process_distribution(rice.id, 5, "SPOILAGE", notes="Water damage")
+    svc.void_transaction(distribution.id, "Not spoiled")
+    svc.void_transaction(purchase.id, "Returned")
+    svc.process_donation(beans.id, 3, 0.50, donor="Saint Marys Church")
+
+    donors = DonorService()
+    moved = donors.merge_donors(donors.find_donor("Saint Marys Church")['id'],
+                                donors.find_donor("St Marys Church")['id'])
+
+    conn.execute("UPDATE inventory_transactions SET notes = 'Thank-you sent' WHERE id = 3")
+    conn.execute("UPDATE inventory_transactions SET created_by = 'alex' WHERE id = 1")
+    conn.execute("DELETE FROM inventory_transactions WHERE reason_code = 'VOID'")
+    conn.commit()
+    return purchase.id, distribution.id, moved
+
+
+@pytest.fixture
+def wide_and_compact(file_db, tmp_path):
+    """Two seeded databases, the second converted to the compact layout."""
+    paths = [Path(file_db.db_path), tmp_path / "compact.db"]
+    _seed(InventoryService())
+    copy = sqlite3.connect(paths[1])
+    file_db.get_connection().backup(copy)
+    copy.close()
+    reset_db_manager()
+    migrate_to_compact_ledger(str(paths[1]), batch_size=2)
+    return paths
+
+
+def test_migration_preserves_rows_and_aggregates(wide_and_compact):
+    wide_path, compact_path = wide_and_compact
+    wide = sqlite3.connect(wide_path)
+    compact = sqlite3.connect(compact_path)
+
+    assert is_compact_ledger(compact) and not is_compact_ledger(wide)
+    assert _snapshot(compact) == _snapshot(wide)
+    assert [row[1] for row in compact.execute("PRAGMA table_info(inventory_transactions)")] == \
+        [row[1] for row in wide.execute("PRAGMA table_info(inventory_transactions)")]
+    assert compact.execute("SELECT transaction_date FROM inventory_transactions").fetchall() == \
+        wide.execute("SELECT transaction_date FROM inventory_transactions").fetchall()
+
+    # Only rows with notes or a non-canonical spelling need a details row
+    assert compact.execute("SELECT COUNT(*) FROM ledger_details").fetchone()[0] == 3
+    wide.close()
+    compact.close()
+
+
+def test_writes_through_view_match_wide_layout(wide_and_compact):
+    results = []
+    for path in wide_and_compact:
+        svc, conn = _open(path)
+        beans, rice = svc.get_item_by_sku("CMP-1"), svc.get_item_by_sku("CMP-2")
+        results.append((_exercise(svc, conn, beans, rice), _snapshot(conn),
+                        [tuple(row) for row in conn.execute(
+                            "SELECT id, sku, quantity_on_hand, total_cost_basis_cents "
+                            "FROM inventory_items ORDER BY id")]))
+
+    wide, compact = results
+    # Returned ids and moved counts do not rely on lastrowid / rowcount
+    assert compact[0] == wide[0]
+    assert compact[0][2] == 1
+    assert compact[1] == wide[1]
+    assert compact[2] == wide[2]
+
+    # Editing a purchase's notes or date also keeps the supplier aggregates
+    # current (the wide layout only follows voids and relinks)
+    conn.execute("UPDATE inventory_transactions SET notes = 'Net 45' WHERE notes = 'Net 30'")
+    conn.execute("UPDATE inventory_transactions SET transaction_date = '2026-01-0' || id")
+    incremental = _snapshot(conn), conn.execute(
+        "SELECT first_purchase, last_purchase FROM kpi_supplier_totals").fetchall()
+    rebuild_supplier_totals(conn)
+    assert (_snapshot(conn), conn.execute(
+        "SELECT first_purchase, last_purchase FROM kpi_supplier_totals").fetchall()) == incremental
+    assert incremental[0]['kpi_supplier_notes'][0][1] == 'Net 45'
+
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("""
+            INSERT INTO inventory_transactions (item_id, transaction_type, quantity_change)
+            VALUES (1, 'DISTRIBUTION', 5)
+        """)
+    with pytest.raises(sqlite3.IntegrityError, match="cannot be changed"):
+        conn.execute("UPDATE inventory_transactions SET id = 999 WHERE id = 1")
+
+
+def test_online_migration_picks_up_concurrent_writes(file_db):
+    db_path = file_db.db_path
+    beans, rice = _seed(InventoryService())
+    reset_db_manager()
+
+    writer = sqlite3.connect(db_path)
+    expected = {}
+
+    def write_between_batches(copied, _total):
+        # Change rows that were already copied, and add new ones
+        if copied == 2:
+            writer.execute("UPDATE inventory_transactions SET is_voided = 1 WHERE id = 1")
+            writer.execute("UPDATE inventory_transactions SET notes = 'late' WHERE id = 2")
+            writer.execute("DELETE FROM inventory_transactions WHERE id = 5")
+            writer.execute("""
+                INSERT INTO inventory_transactions
+                    (item_id, transaction_type, quantity_change, supplier, notes)
+                VALUES (?, 'PURCHASE', 7, 'Valley Farms', 'added during copy')
+            """, (rice.id,))
+            writer.commit()
+            expected.update(_snapshot(writer))
+
+    stats = migrate_to_compact_ledger(db_path, batch_size=2,
+                                      progress=write_between_batches)
+    writer.close()
+
+    assert stats['batches'] == 3
+    assert stats['cutover_rows'] >= 3
+    conn = sqlite3.connect(db_path)
+    assert is_compact_ledger(conn)
+    assert _snapshot(conn) == expected
+    rows = expected['inventory_transactions']
+    assert [row[0] for row in rows] == [1, 2, 3, 4, 6]
+    assert rows[0][14] == 1 and rows[1][12] == 'late'
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name LIKE 'ledger_migration%'"
+                        ).fetchall() == []
+
+    # Ids keep increasing after the cutover
+    conn.execute("""
+        INSERT INTO inventory_transactions (item_id, transaction_type, quantity_change)
+        VALUES (?, 'DONATION', 1)
+    """, (beans.id,))
+    assert conn.execute("SELECT MAX(id) FROM inventory_transactions").fetchone()[0] == 7
+    conn.close()
+
+
+def test_compact_database_stays_migratable(wide_and_compact):
+    _wide_path, compact_path = wide_and_compact
+    before = sqlite3.connect(compact_path)
+    rows = [tuple(row) for row in before.execute("SELECT * FROM inventory_transactions")]
+    before.close()
+
+    assert migrate_database(str(compact_path)) == []
+    assert migrate_to_compact_ledger(str(compact_path)) == \
+        {'rows': 0, 'batches': 0, 'cutover_rows': 0}
+
+    conn = sqlite3.connect(compact_path)
+    assert [tuple(row) for row in conn.execute("SELECT * FROM inventory_transactions")] == rows
+    assert conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE tbl_name = 'inventory_transactions' "
+        "AND type IN ('index', 'trigger')"
+    ).fetchone()[0] == 3
+    conn.close()
+
+    with pytest.raises(ValueError):
+        migrate_to_compact_ledger(str(compact_path), batch_size=0)
+
+
+def test_compact_layout_uses_fewer_pages(file_db):
+    db_path = file_db.db_path
+    conn = file_db.get_connection()
+    beans, rice = _seed(InventoryService())
+    conn.executemany("""
+        INSERT INTO inventory_transactions
+            (item_id, transaction_type, quantity_change, unit_cost_cents, supplier, donor,
+             reason_code, transaction_date)
+        VALUES (?, ?, ?, 125, ?, ?, ?, '2026-01-01 09:00:00')
+    """, [
+        (beans.id, 'PURCHASE', 5, 'Acme Foods', None, None) if n % 3 == 0 else
+        (rice.id, 'DONATION', 5, None, 'Local Church', None) if n % 3 == 1 else
+        (beans.id, 'DISTRIBUTION', -1, None, None, 'CLIENT')
+        for n in range(3000)
+    ])
+    conn.commit()
+    wide = ledger_storage_stats(conn)
+    reset_db_manager()
+
+    migrate_to_compact_ledger(db_path, batch_size=1000)
+    conn = sqlite3.connect(db_path)
+    compact = ledger_storage_stats(conn)
+    conn.close()
+
+    assert compact['table_pages'] < wide['table_pages']
+    assert compact['index_pages'] < wide['index_pages']
@@ -0,0 +1,111 @@
+"""
+Tests for the compact (slotted) model variants and compiled row mappers.
+
+Covers:
+- Compact items/transactions match the dataclass models field for field
+- Timestamps stay raw until accessed, then are parsed once
+- Mappers work on sqlite3.Row and plain tuples, and tolerate older schemas
+- Compact objects have no per-instance __dict__
+"""
+
+import sqlite3
+
+import pytest
+
+from models import (
+    Category, CompactCategory, CompactItem, CompactTransaction, InventoryItem,
+    TransactionType, compile_row_mapper, map_rows
+)
+from models.compact import _share
+from services.inventory_service import InventoryService
+
+
+@pytest.fixture
+def history():
+    svc = InventoryService()
+    item = svc.create_item("COMPACT-1", "Beans", category_id=3, reorder_threshold=50)
+    svc.process_purchase(item.id, 20, 1.25, supplier="Acme Foods")
+    svc.process_donation(item.id, 10, 2.00, donor="Local Church")
+    svc.process_distribution(item.id, 4, "CLIENT")
+    return svc, item
+
+
+def test_compact_items_match_dataclass(history):
+    svc, _item = history
+    full = svc.get_all_items()
+    compact = svc.get_all_items(compact=True)
+
+    assert [c.to_dict() for c in compact] == [f.to_dict() for f in full]
+    assert compact[0].to_model() == full[0]
+    assert compact[0].is_below_threshold() is True
+
+
+def test_compact_transactions_match_dataclass(history):
+    svc, item = history
+    full = svc.get_item_transactions(item.id)
+    compact = svc.get_item_transactions(item.id, compact=True)
+
+    assert [c.to_dict() for c in compact] == [f.to_dict() for f in full]
+    assert [c.to_model() for c in compact] == full
+    assert compact[0].transaction_type is TransactionType.DISTRIBUTION
+    assert compact[0].is_voided is False
+
+    # Repeated names share one string, from a bounded cache
+    again = svc.get_item_transactions(item.id, compact=True)
+    assert again[-1].supplier is compact[-1].supplier
+    assert again[0].created_by is compact[1].created_by
+    info = _share.cache_info()
+    assert info.maxsize is not None and info.currsize <= info.maxsize
+
+
+def test_timestamps_are_parsed_lazily(history):
+    svc, item = history
+    txn = svc.get_item_transactions(item.id, limit=1, compact=True)[0]
+
+    assert isinstance(txn._transaction_date, str)
+    parsed = txn.transaction_date
+    assert parsed == svc.get_item_transactions(item.id, limit=1)[0].transaction_date
+    assert txn._transaction_date is parsed  # Cached after first access
+
+
+def test_mapper_on_tuples_and_caching(isolated_db, history):
+    conn = isolated_db.get_connection()
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute("SELECT * FROM item_categories ORDER BY id")
+
+    categories = map_rows(cursor, CompactCategory)
+    expected = [
+        Category.from_db_row(row)
+        for row in conn.execute("SELECT * FROM item_categories ORDER BY id")
+    ]
+    assert [c.to_model() for c in categories] == expected
+
+    assert compile_row_mapper(cursor.description, CompactCategory) is \
+        compile_row_mapper(cursor.description, CompactCategory)
+
+
+def test_mapper_fills_columns_missing_from_older_schema():
+    conn = sqlite3.connect(":memory:")
+    cursor = conn.execute(
+        "SELECT 1 AS id, 7 AS item_id, 'PURCHASE' AS transaction_type, "
+        "5.0 AS quantity_change, '2026-01-02 03:04:05' AS transaction_date"
+    )
+    txn = map_rows(cursor, CompactTransaction)[0]
+    assert txn.is_voided is False
+    assert txn.ref_transaction_id is None
+    assert txn.created_by == "system"
+    assert txn.transaction_date.day == 2
+
+    cursor = conn.execute("SELECT 1 AS id, 'X' AS name")
+    with pytest.raises(ValueError, match="sku"):
+        map_rows(cursor, CompactItem)
+
+
+def test_compact_models_are_slotted(history):
+    svc, _item = history
+    item = svc.get_all_items(compact=True)[0]
+    assert not hasattr(item, '__dict__')
+    with pytest.raises(AttributeError):
+        item.unexpected = 1
+    assert isinstance(item.to_model(), InventoryItem)
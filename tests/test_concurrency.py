@@ -0,0 +1,61 @@
+"""
+Tests for DatabaseManager's locking settings with several connections
+(see scripts/load_test_stations.py for the multi-process load harness).
+"""
+
+import sqlite3
+
+import pytest
+
+from database.connection import DatabaseManager
+from services.inventory_service import InventoryService
+
+@pytest.fixture
+def station_db(file_db):
+    svc = InventoryService(db_manager=file_db)
+    item = svc.create_item("LOCK-1", "Beans")
+    svc.process_purchase(item.id, 100, 1.00)
+    return file_db.db_path, item.id
+
+
+def test_immediate_transactions_take_the_write_lock_first(station_db):
+    db_path, item_id = station_db
+    # IMMEDIATE is the default
+    station_a = DatabaseManager(db_path)
+    station_b = DatabaseManager(db_path, busy_timeout_ms=0)
+
+    with station_a.transaction() as conn:
+        conn.execute("SELECT quantity_on_hand FROM inventory_items WHERE id = ?", (item_id,))
+        # Another station cannot write between this read and A's update
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            InventoryService(db_manager=station_b).process_distribution(item_id, 5, "CLIENT")
+
+    item = InventoryService(db_manager=station_b).process_distribution(item_id, 5, "CLIENT")[0]
+    assert item.quantity_on_hand == 95
+    station_a.close()
+    station_b.close()
+
+
+def test_implicit_transactions_do_not_lock_reads(station_db):
+    db_path, item_id = station_db
+    station_a = DatabaseManager(db_path, begin_mode=None)
+    station_b = DatabaseManager(db_path, busy_timeout_ms=0)
+
+    with station_a.transaction() as conn:
+        conn.execute("SELECT quantity_on_hand FROM inventory_items WHERE id = ?", (item_id,))
+        item = InventoryService(db_manager=station_b).process_distribution(item_id, 5, "CLIENT")[0]
+    assert item.quantity_on_hand == 95
+    station_a.close()
+    station_b.close()
+
+
+def test_unknown_settings_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        DatabaseManager(str(tmp_path / "x.db"), journal_mode="MEMORYX")
+    with pytest.raises(ValueError):
+        DatabaseManager(str(tmp_path / "x.db"), begin_mode="later")
+    manager = DatabaseManager(str(tmp_path / "x.db"))
+    with pytest.raises(ValueError):
+        with manager.transaction("later"):
+            pass
+    manager.close()
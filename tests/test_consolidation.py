@@ -0,0 +1,101 @@
+"""
+Tests for network-wide reports over several pantry databases.
+"""
+
+import pytest
+
+from database.connection import (
+    close_db_managers, get_db_manager, get_db_manager_for_path, reset_db_manager
+)
+from services.consolidation_service import ConsolidationService
+from services.inventory_service import InventoryService
+from services.reporting_service import ReportingService
+
+def _create_pantry(path, schema_sql, beans_qty, donor):
+    reset_db_manager()
+    get_db_manager(str(path)).get_connection().executescript(schema_sql)
+    svc = InventoryService()
+    beans = svc.create_item("NET-1", "Beans", reorder_threshold=30)
+    svc.process_purchase(beans.id, beans_qty, 1.00, supplier="Acme Foods")
+    svc.process_distribution(beans.id, 10, "CLIENT")
+    rice = svc.create_item(f"LOCAL-{path.stem}", "Rice")
+    svc.process_donation(rice.id, 5, 2.00, donor=donor)
+    reset_db_manager()
+
+
+@pytest.fixture
+def network(tmp_path, schema_sql):
+    """Three pantries sharing one SKU and one donor (spelled differently)."""
+    paths = []
+    for name, beans_qty, donor in (("north", 50, "St. Mary's Church"),
+                                   ("south", 20, "st marys church"),
+                                   ("east", 100, "Food Drive")):
+        path = tmp_path / f"{name}.db"
+        _create_pantry(path, schema_sql, beans_qty, donor)
+        paths.append(str(path))
+    yield paths
+    close_db_managers()
+
+
+def test_path_managers_are_independent(network, schema_sql):
+    north, south, _east = network
+    app = get_db_manager(":memory:")
+    app.get_connection().executescript(schema_sql)
+    assert get_db_manager_for_path(north) is get_db_manager_for_path(north)
+    assert get_db_manager_for_path(north) is not get_db_manager_for_path(south)
+    assert get_db_manager_for_path(north) is not app
+
+    report = ReportingService(db_manager=get_db_manager_for_path(north)).get_stock_status_data()
+    assert report['total_value_cents'] == 4000
+    assert ReportingService().get_stock_status_data()['total_items'] == 0
+
+
+def test_consolidated_reports_match_pantry_totals(network):
+    result = ConsolidationService(network).get_consolidated_reports()
+
+    assert result['pantries'] == ['east', 'north', 'south']
+    assert result['errors'] == {}
+    assert set(result['timings']) == {'east', 'north', 'south'}
+
+    financial = result['financial']
+    assert financial['total_cogs_cents'] == 3000
+    assert financial['client_cogs_cents'] == 3000
+    assert {row['pantry'] for row in financial['distributions']} == {'east', 'north', 'south'}
+
+    impact = result['impact']
+    assert impact['total_donations_fmv_cents'] == 3000
+    assert impact['pantries']['north']['donation_count'] == 1
+
+    stock = result['stock']
+    beans = next(item for item in stock['items'] if item['sku'] == 'NET-1')
+    assert beans['quantity'] == 140
+    assert beans['by_pantry'] == {'east': 90, 'north': 40, 'south': 10}
+    assert beans['low_stock_pantries'] == ['south']
+    assert stock['total_items'] == 4
+    assert stock['total_value_cents'] == 14000  # Donations carry no cost basis
+
+    donors = result['donors']
+    assert donors['total_donors'] == 2
+    assert donors['donors'][0]['donation_count'] == 2
+    assert donors['donors'][0]['pantries'] == ['north', 'south']
+
+
+def test_parallel_and_in_process_runs_agree(network):
+    parallel = ConsolidationService(network, max_workers=3).get_consolidated_reports()
+    in_process = ConsolidationService(network, max_workers=1).get_consolidated_reports()
+    for report in ('financial', 'impact', 'stock', 'donors'):
+        assert parallel[report] == in_process[report]
+
+
+def test_unreadable_pantry_is_reported(network, tmp_path):
+    pantries = {'north': network[0], 'closed': str(tmp_path / "missing.db")}
+    result = ConsolidationService(pantries).get_consolidated_reports(['financial'])
+    assert result['pantries'] == ['north']
+    assert 'closed' in result['errors']
+    assert result['financial']['total_cogs_cents'] == 1000
+    assert not (tmp_path / "missing.db").exists()
+
+    with pytest.raises(ValueError):
+        ConsolidationService(network).get_consolidated_reports(['forecast'])
+    with pytest.raises(ValueError):
+        ConsolidationService([])
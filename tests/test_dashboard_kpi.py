@@ -0,0 +1,171 @@
+"""
+Tests for the trigger-maintained dashboard KPI tables.
+
+Every test compares ReportingService.get_dashboard_stats() (which reads the
+KPI tables) against the same aggregates computed directly from the base
+tables, after a sequence of writes.
+"""
+
+import re
+import sqlite3
+
+import pytest
+
+from services.inventory_service import InventoryService
+from services.reporting_service import ReportingService
+from database.connection import reset_db_manager
+from database.migrations import migrate_database
+
+
+def _expected_stats(conn):
+    """Compute dashboard stats from scratch (the pre-KPI queries)."""
+    row = conn.execute("""
+        SELECT COUNT(*),
+               COALESCE(SUM(CASE WHEN quantity_on_hand < reorder_threshold THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(total_cost_basis_cents), 0)
+        FROM inventory_items WHERE is_active = 1
+    """).fetchone()
+    by_category = {
+        r[0]: r[1] / 100.0 for r in conn.execute("""
+            SELECT c.name, SUM(i.total_cost_basis_cents) AS v
+            FROM inventory_items i JOIN item_categories c ON i.category_id = c.id
+            WHERE i.is_active = 1 GROUP BY c.name HAVING v > 0
+        """)
+    }
+    distributed = {
+        r[0]: r[1] for r in conn.execute("""
+            SELECT i.name, ABS(SUM(t.quantity_change))
+            FROM inventory_transactions t JOIN inventory_items i ON t.item_id = i.id
+            WHERE t.transaction_type = 'DISTRIBUTION' AND t.is_voided = 0
+            GROUP BY i.name
+        """)
+    }
+    return row[0], row[1], row[2] / 100.0, by_category, distributed
+
+
+def _assert_kpis_match(conn, stats):
+    total, low, value, by_category, distributed = _expected_stats(conn)
+    assert stats['total_items_count'] == total
+    assert stats['low_stock_count'] == low
+    assert stats['total_inventory_value_dollars'] == pytest.approx(value)
+    assert {c['category']: c['value_dollars'] for c in stats['value_by_category']} == \
+        pytest.approx(by_category)
+    top = sorted(distributed.items(), key=lambda kv: kv[1], reverse=True)[:5]
+    assert [(i['name'], i['quantity']) for i in stats['top_distributed_items']] == \
+        [(name, qty) for name, qty in top if qty > 0]
+
+
+@pytest.fixture
+def services():
+    return InventoryService(), ReportingService()
+
+
+def test_empty_database(services, isolated_db):
+    _svc, reporting = services
+    stats = reporting.get_dashboard_stats()
+    assert stats['total_items_count'] == 0
+    assert stats['low_stock_count'] == 0
+    assert stats['total_inventory_value_dollars'] == 0
+    assert stats['value_by_category'] == []
+    assert stats['top_distributed_items'] == []
+
+
+def test_kpis_follow_writes_and_voids(services, isolated_db):
+    svc, reporting = services
+    conn = isolated_db.get_connection()
+
+    a = svc.create_item("KPI-A", "Beans", category_id=3, reorder_threshold=5)
+    b = svc.create_item("KPI-B", "Soap", category_id=7, reorder_threshold=50)
+    c = svc.create_item("KPI-C", "Rice", category_id=4)
+    _assert_kpis_match(conn, reporting.get_dashboard_stats())
+
+    svc.process_purchase(a.id, 20, 1.25)
+    svc.process_purchase(b.id, 10, 3.00)
+    svc.process_donation(c.id, 30, 2.00)
+    _, dist_a = svc.process_distribution(a.id, 4, "CLIENT")
+    svc.process_distribution(c.id, 7, "CLIENT")
+    _, dist_c = svc.process_distribution(c.id, 2, "SPOILAGE")
+    _assert_kpis_match(conn, reporting.get_dashboard_stats())
+
+    # Voids restore stock and remove distributed quantity
+    svc.void_transaction(dist_a.id, "Entered twice")
+    svc.void_transaction(dist_c.id, "Wrong item")
+    _assert_kpis_match(conn, reporting.get_dashboard_stats())
+
+    # Edits: threshold change, category move, deactivation
+    svc.update_item(a.id, reorder_threshold=100)
+    svc.update_item(b.id, category_id=8)
+    svc.soft_delete_item(c.id)
+    _assert_kpis_match(conn, reporting.get_dashboard_stats())
+
+    stats = reporting.get_dashboard_stats()
+    assert stats['low_stock_count'] == 2
+    assert stats['total_items_count'] == 2
+
+
+def test_items_without_threshold_are_never_low(file_db):
+    """A NULL reorder threshold, also in a database with the old trigger bodies."""
+    conn = file_db.get_connection()
+    for name in ('kpi_item_insert', 'kpi_item_update', 'kpi_item_delete'):
+        sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = ?", (name,)).fetchone()[0]
+        conn.execute(f"DROP TRIGGER {name}")
+        conn.execute(re.sub(r"IFNULL\((.*?), 0\)", r"(\1)", sql))
+    conn.commit()
+    insert = ("INSERT INTO inventory_items (sku, name, reorder_threshold) "
+              "VALUES ('KPI-N', 'Loose Tea', NULL)")
+    with pytest.raises(sqlite3.IntegrityError, match="low_stock_count"):
+        conn.execute(insert)
+    conn.rollback()
+
+    # Migrating re-creates the triggers
+    reset_db_manager()
+    migrate_database(file_db.db_path)
+    svc = InventoryService(file_db.db_path)
+    conn = svc.db_manager.get_connection()
+    item_id = conn.execute(insert).lastrowid
+    conn.commit()
+    svc.process_purchase(item_id, 5, 1.00)
+    svc.process_distribution(item_id, 2, "CLIENT")
+    reporting = ReportingService()
+    _assert_kpis_match(conn, reporting.get_dashboard_stats())
+    assert reporting.get_dashboard_stats()['low_stock_count'] == 0
+
+    svc.update_item(item_id, reorder_threshold=10)
+    assert reporting.get_dashboard_stats()['low_stock_count'] == 1
+    conn.execute("UPDATE inventory_items SET reorder_threshold = NULL")
+    conn.execute("INSERT INTO inventory_items (sku, name) VALUES ('KPI-M', 'Mint')")
+    conn.commit()
+    _assert_kpis_match(conn, reporting.get_dashboard_stats())
+    assert reporting.get_dashboard_stats()['low_stock_count'] == 1  # Mint: default threshold
+
+
+def test_migration_backfills_existing_database(tmp_path, baseline_schema_sql):
+    """An old database without KPI tables is backfilled from its contents."""
+    db_path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(baseline_schema_sql)
+    conn.execute("""
+        INSERT INTO inventory_items (sku, name, category_id, quantity_on_hand,
+                                     total_cost_basis_cents, reorder_threshold)
+        VALUES ('OLD-1', 'Old Item', 3, 4, 800, 10)
+    """)
+    conn.execute("""
+        INSERT INTO inventory_transactions (item_id, transaction_type, quantity_change)
+        VALUES (1, 'DISTRIBUTION', -6)
+    """)
+    conn.commit()
+    conn.close()
+
+    assert migrate_database(db_path) == [
+        'rebuild_dashboard_kpis', 'rebuild_category_closure', 'rebuild_donors',
+        'rebuild_suppliers', 'backfill_void_values'
+    ]
+    assert migrate_database(db_path) == []
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute(
+        "SELECT total_items, low_stock_count, total_value_cents FROM dashboard_kpi"
+    ).fetchone() == (1, 1, 800)
+    assert conn.execute("SELECT * FROM kpi_category_value").fetchall() == [(3, 800)]
+    assert conn.execute("SELECT * FROM kpi_item_distributed").fetchall() == [(1, 6.0)]
+    conn.close()
@@ -0,0 +1,142 @@
+"""
+Tests for client-visit distribution baskets.
+
+Covers:
+- A basket books exactly what one process_distribution() per line would
+- All-or-nothing validation (stock checked for every line up front)
+- Visit linking and change events
+- Another station cannot write between the stock check and the basket
+- Baskets on the compact ledger layout
+"""
+
+import sqlite3
+
+import pytest
+
+from database.compact_ledger import migrate_to_compact_ledger
+from database.connection import DatabaseManager, get_db_manager, reset_db_manager
+from services.events import TransactionsAdded
+from services.inventory_service import InventoryService
+
+def _stock(svc):
+    """Items A-C with uneven costs, so per-line COGS rounding matters."""
+    items = []
+    for sku, quantity, cost in (("BSK-A", 30, 1.17), ("BSK-B", 7, 2.33), ("BSK-C", 12, 0.99)):
+        item = svc.create_item(sku, f"Item {sku[-1]}")
+        svc.process_purchase(item.id, quantity, cost)
+        items.append(item)
+    svc.process_purchase(items[0].id, 11, 1.41)
+    return items
+
+
+def _state(svc, items):
+    return [(i.quantity_on_hand, i.total_cost_basis_cents)
+            for i in (svc.get_item(item.id) for item in items)]
+
+
+def test_basket_matches_single_distributions(schema_sql):
+    svc = InventoryService()
+    a, b, c = _stock(svc)
+    lines = [(a.id, 3), (b.id, 2.5), (a.id, 4), (c.id, 12), (b.id, 1)]
+
+    singles = [svc.process_distribution(item_id, quantity, "CLIENT")[1]
+               for item_id, quantity in lines]
+    expected = _state(svc, (a, b, c))
+
+    # Same starting point in a fresh database
+    reset_db_manager()
+    get_db_manager(":memory:").get_connection().executescript(schema_sql)
+    svc = InventoryService()
+    a, b, c = _stock(svc)
+    events = []
+    svc.events.subscribe(events.append)
+
+    items, transactions = svc.process_distribution_basket(
+        lines, "CLIENT", notes="Family of 4", visit_id="visit-1")
+
+    assert [item.id for item in items] == [a.id, b.id, c.id]
+    assert [(i.quantity_on_hand, i.total_cost_basis_cents) for i in items] == expected
+    assert _state(svc, (a, b, c)) == expected
+    assert [(t.item_id, t.quantity_change, t.unit_cost_cents, t.total_financial_impact_cents)
+            for t in transactions] == \
+        [(t.item_id, t.quantity_change, t.unit_cost_cents, t.total_financial_impact_cents)
+         for t in singles]
+    assert {t.notes for t in transactions} == {"Family of 4"}
+
+    assert [t.id for t in svc.get_visit_transactions("visit-1")] == [t.id for t in transactions]
+    assert svc.get_visit_transactions("unknown") == []
+    # One event for the whole visit
+    assert events == [TransactionsAdded(
+        tuple(t.id for t in transactions), (a.id, b.id, c.id), "DISTRIBUTION")]
+
+
+def test_basket_locks_before_checking_stock(file_db):
+    a, b, _c = _stock(InventoryService())
+    # Implicit transactions: the basket must take the write lock itself
+    station_a = DatabaseManager(file_db.db_path, begin_mode=None)
+    station_b = InventoryService(db_manager=DatabaseManager(file_db.db_path, busy_timeout_ms=0))
+    attempts = []
+
+    def other_station_writes(sql):
+        # Another station distributes while this one reads the basket's stock
+        if sql.startswith("SELECT * FROM inventory_items") and not attempts:
+            try:
+                station_b.process_distribution(a.id, 5, "CLIENT")
+                attempts.append("written")
+            except sqlite3.OperationalError as e:
+                attempts.append(str(e))
+
+    conn = station_a.get_connection()
+    conn.set_trace_callback(other_station_writes)
+    items, transactions = InventoryService(db_manager=station_a).process_distribution_basket(
+        [(a.id, 2), (b.id, 1)], "CLIENT", visit_id="visit-lock")
+    conn.set_trace_callback(None)
+
+    assert attempts == ["database is locked"]
+    assert [item.quantity_on_hand for item in items] == [39, 6]
+    # Only the basket's own transactions are linked to the visit
+    svc = InventoryService()
+    assert [t.id for t in svc.get_visit_transactions("visit-lock")] == \
+        [t.id for t in transactions]
+    assert [(t.item_id, t.quantity_change) for t in transactions] == [(a.id, -2), (b.id, -1)]
+    station_a.close()
+    station_b.db_manager.close()
+
+
+def test_basket_is_all_or_nothing():
+    svc = InventoryService()
+    a, b, c = _stock(svc)
+    before = _state(svc, (a, b, c))
+    conn = get_db_manager().get_connection()
+    count = conn.execute("SELECT COUNT(*) FROM inventory_transactions").fetchone()[0]
+
+    # B is short only across its two lines; C is short outright; both are named
+    with pytest.raises(ValueError, match=r"Item B .*requested: 8.*Item C"):
+        svc.process_distribution_basket([(a.id, 5), (b.id, 4), (b.id, 4), (c.id, 13)])
+    with pytest.raises(ValueError, match="not found"):
+        svc.process_distribution_basket([(a.id, 1), (9999, 1)])
+    with pytest.raises(ValueError, match="positive"):
+        svc.process_distribution_basket([(a.id, 1), (b.id, 0)])
+    with pytest.raises(ValueError, match="empty"):
+        svc.process_distribution_basket([])
+
+    svc.process_distribution_basket([(a.id, 1)], visit_id="visit-2")
+    with pytest.raises(ValueError, match="already recorded"):
+        svc.process_distribution_basket([(b.id, 1)], visit_id="visit-2")
+
+    assert _state(svc, (b, c)) == before[1:]
+    assert conn.execute("SELECT COUNT(*) FROM inventory_transactions").fetchone()[0] == count + 1
+
+
+def test_basket_on_compact_ledger(file_db):
+    db_path = file_db.db_path
+    a, b, _c = _stock(InventoryService())
+    reset_db_manager()
+    migrate_to_compact_ledger(db_path)
+
+    svc = InventoryService(db_path)
+    _items, transactions = svc.process_distribution_basket(
+        [(a.id, 2), (b.id, 1)], visit_id="visit-3")
+
+    assert [(t.item_id, t.quantity_change) for t in transactions] == [(a.id, -2), (b.id, -1)]
+    assert [t.id for t in svc.get_visit_transactions("visit-3")] == [t.id for t in transactions]
@@ -0,0 +1,208 @@
+"""
+Tests for the donors dimension.
+
+Covers:
+- Trigger linking of donations to donors by normalized name
+- Integer-keyed donor analytics
+- Fuzzy merge suggestions and merging
+- Migration of a database created before the donors table
+"""
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from database.migrations import migrate_database, name_key_sql
+from services.analytics_service import AnalyticsService
+from services.donor_service import DonorService, donor_tokens
+from services.inventory_service import InventoryService
+
+
+
+@pytest.fixture
+def donations(isolated_db):
+    """Donations under several spellings of the same donors."""
+    svc = InventoryService()
+    item = svc.create_item("DON-1", "Beans")
+    for donor, fmv in [
+        ("St. Mary's Church", 1.00),
+        ("st marys church", 2.00),
+        ("  ST MARY'S CHURCH ", 1.00),
+        ("Saint Marys Church", 3.00),
+        ("First Baptist Church", 5.00),
+        ("First Baptist Chruch", 1.00),
+        ("Lions Club", 2.00),
+        ("", 4.00),
+        (None, 4.00),
+    ]:
+        svc.process_donation(item.id, 10, fmv, donor=donor)
+    return svc, item
+
+
+def test_spelling_variants_share_a_donor(donations):
+    service = DonorService()
+    donors = {d['name']: d for d in service.get_donors()}
+
+    assert set(donors) == {
+        "St. Mary's Church", "Saint Marys Church", "First Baptist Church",
+        "First Baptist Chruch", "Lions Club",
+    }
+    assert donors["St. Mary's Church"]['donation_count'] == 3
+    assert service.find_donor("ST. MARYS  CHURCH")['id'] == donors["St. Mary's Church"]['id']
+    assert service.find_donor("Unknown Donor") is None
+
+
+def test_donor_summary_groups_by_donor_id(donations, isolated_db):
+    summary = AnalyticsService().get_donor_impact_summary()
+    by_name = {d['donor']: d for d in summary['donors']}
+
+    assert by_name["St. Mary's Church"]['donation_count'] == 3
+    assert by_name["St. Mary's Church"]['total_fmv_cents'] == 4000
+    assert summary['total_donors'] == 5
+
+    conn = isolated_db.get_connection()
+    unlinked = conn.execute("""
+        SELECT COUNT(*) FROM inventory_transactions
+        WHERE donor_id IS NULL AND TRIM(IFNULL(donor, '')) != ''
+    """).fetchone()[0]
+    assert unlinked == 0
+    expected = conn.execute("""
+        SELECT SUM(fair_market_value_cents) FROM inventory_transactions
+        WHERE transaction_type = 'DONATION' AND TRIM(IFNULL(donor, '')) != ''
+    """).fetchone()[0]
+    assert summary['total_fmv_cents'] == expected
+
+
+def test_suggest_merges(donations):
+    suggestions = DonorService().suggest_merges()
+    pairs = {(s['donor'], s['duplicate']): s['score'] for s in suggestions}
+
+    # "St" expands to "saint", so these are an exact token match
+    assert pairs[("St. Mary's Church", "Saint Marys Church")] == 1.0
+    assert pairs[("First Baptist Church", "First Baptist Chruch")] >= 0.75
+    assert not any("Lions Club" in pair for pair in pairs)
+
+    # Blocks larger than the limit are never compared
+    assert DonorService().suggest_merges(max_block_size=1) == []
+    with pytest.raises(ValueError):
+        DonorService().suggest_merges(threshold=0)
+
+
+def test_merge_donors(donations):
+    svc, item = donations
+    service = DonorService()
+    keep = service.find_donor("St Marys Church")['id']
+    duplicate = service.find_donor("Saint Marys Church")['id']
+
+    assert service.merge_donors(duplicate, keep) == 1
+    summary = AnalyticsService().get_donor_impact_summary()
+    assert {d['donor']: d['donation_count'] for d in summary['donors']}["St. Mary's Church"] == 4
+    assert duplicate not in {d['id'] for d in service.get_donors()}
+
+    # New donations under the merged spelling go to the surviving donor
+    svc.process_donation(item.id, 1, 1.00, donor="Saint Mary's Church")
+    assert service.find_donor("saint marys church")['id'] == keep
+    assert {d['id']: d['donation_count'] for d in service.get_donors()}[keep] == 5
+
+    with pytest.raises(ValueError, match="already merged"):
+        service.merge_donors(duplicate, keep)
+    with pytest.raises(ValueError, match="itself"):
+        service.merge_donors(keep, duplicate)
+    with pytest.raises(ValueError, match="not found"):
+        service.merge_donors(keep, 9999)
+
+
+def test_merge_after_archiving(file_db):
+    """Archived donations of a merged-away donor count for the target."""
+    svc = InventoryService()
+    item = svc.create_item("DON-2", "Rice")
+    last_year = datetime.now().year - 1
+    svc.process_donation(item.id, 10, 1.00, donor="Food Bank West")
+    svc.process_donation(item.id, 5, 2.00, donor="Westside Food Bank")
+    file_db.get_connection().execute(
+        "UPDATE inventory_transactions SET transaction_date = ?", (f"{last_year}-06-01 10:00:00",))
+    svc.process_donation(item.id, 4, 1.00, donor="Food Bank West")
+    file_db.archive_closed_years()
+
+    service = DonorService()
+    keep = service.find_donor("Food Bank West")['id']
+    duplicate = service.find_donor("Westside Food Bank")['id']
+    # The archived donation stays on the duplicate's id
+    assert service.merge_donors(duplicate, keep) == 0
+
+    summary = AnalyticsService().get_donor_impact_summary()
+    assert [(d['donor_id'], d['donation_count'], d['total_fmv_cents'])
+            for d in summary['donors']] == [(keep, 3, 2400)]
+    counts = {d['id']: d['donation_count'] for d in service.get_donors(include_merged=True)}
+    assert counts == {keep: 3, duplicate: 0}
+    retention = AnalyticsService().get_donor_retention(years=2)['retention_data']
+    assert [r['total_donors'] for r in retention] == [1, 1]
+    assert retention[1]['returning_donors'] == 1
+
+
+def test_retention_counts_donor_ids(donations, isolated_db):
+    conn = isolated_db.get_connection()
+    last_year = datetime.now().year - 1
+    conn.execute(
+        "UPDATE inventory_transactions SET transaction_date = ? WHERE donor = ?",
+        (f"{last_year}-06-01 10:00:00", "st marys church")
+    )
+    conn.execute(
+        "UPDATE inventory_transactions SET transaction_date = ? WHERE donor = ?",
+        (f"{last_year}-06-01 10:00:00", "Lions Club")
+    )
+    conn.commit()
+
+    retention = AnalyticsService().get_donor_retention(years=2)['retention_data']
+    assert retention[0]['total_donors'] == 2
+    # St. Mary's gave both years under different spellings; Lions Club lapsed
+    assert retention[1]['returning_donors'] == 1
+    assert retention[1]['new_donors'] == 3
+
+
+def test_trigger_uses_name_key_sql(isolated_db):
+    """The key expression pasted into schema.sql matches name_key_sql()."""
+    sql = isolated_db.get_connection().execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'donors_link_transaction'"
+    ).fetchone()[0]
+    assert sql.count(name_key_sql('NEW.donor')) == 2
+
+
+def test_donor_tokens():
+    assert donor_tokens("the st marys church") == ["church", "marys", "saint"]
+    assert donor_tokens("smith sons inc") == ["smith", "sons"]
+
+
+def test_migration_backfills_donors(tmp_path, baseline_schema_sql):
+    """A database created before the donors table gets it backfilled."""
+    db_path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(baseline_schema_sql)
+    conn.execute("INSERT INTO inventory_items (sku, name) VALUES ('OLD-1', 'Old Item')")
+    conn.executemany("""
+        INSERT INTO inventory_transactions (item_id, transaction_type, quantity_change, donor)
+        VALUES (1, 'DONATION', 5, ?)
+    """, [("Food Bank West",), ("food bank west.",), (None,), ("Rotary",)])
+    conn.commit()
+    conn.close()
+
+    assert 'rebuild_donors' in migrate_database(db_path)
+    assert migrate_database(db_path) == []
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT id, name FROM donors ORDER BY id").fetchall() == [
+        (1, "Food Bank West"), (2, "Rotary")
+    ]
+    assert [row[0] for row in conn.execute(
+        "SELECT donor_id FROM inventory_transactions ORDER BY id")] == [1, 1, None, 2]
+
+    # New inserts are linked by the trigger
+    conn.execute("""
+        INSERT INTO inventory_transactions (item_id, transaction_type, quantity_change, donor)
+        VALUES (1, 'DONATION', 5, 'FOOD BANK WEST')
+    """)
+    assert conn.execute(
+        "SELECT donor_id FROM inventory_transactions ORDER BY id DESC LIMIT 1"
+    ).fetchone()[0] == 1
+    conn.close()
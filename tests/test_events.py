@@ -0,0 +1,181 @@
+"""
+Tests for change events and the selective analytics cache eviction they drive.
+
+Covers:
+- Events carry the affected ids and are published after the commit
+- Unsubscribing, weak subscriptions and failing handlers
+- One bus per database
+- Announced writes only evict the analytics results depending on them
+"""
+
+import gc
+
+import pytest
+
+from database.connection import DatabaseManager, get_db_manager
+from services.analytics_service import AnalyticsService
+from services.donor_service import DonorService
+from services.events import (
+    DonorsMerged, ItemCreated, ItemUpdated, TransactionAdded,
+    TransactionVoided, get_event_bus
+)
+from services.inventory_service import InventoryService
+
+
+@pytest.fixture
+def recorded():
+    svc = InventoryService()
+    events = []
+    unsubscribe = svc.events.subscribe(events.append)
+    yield svc, events
+    unsubscribe()
+
+
+def test_write_events_carry_ids(recorded):
+    svc, events = recorded
+    item = svc.create_item("EVT-1", "Beans")
+    item, purchase = svc.process_purchase(item.id, 10, 1.00)
+    _item, donation = svc.process_donation(item.id, 5, 7.50, donor="Local Church")
+    _item, distribution = svc.process_distribution(item.id, 4, "CLIENT")
+    svc.void_transaction(distribution.id, "Entered twice")
+    svc.soft_delete_item(item.id)
+
+    correction_id = events[4].correction_id
+    assert events == [
+        ItemCreated(item.id),
+        TransactionAdded(purchase.id, item.id, "PURCHASE"),
+        TransactionAdded(donation.id, item.id, "DONATION"),
+        TransactionAdded(distribution.id, item.id, "DISTRIBUTION"),
+        TransactionVoided(distribution.id, correction_id, item.id, "DISTRIBUTION"),
+        ItemUpdated(item.id, is_active=False),
+    ]
+    assert correction_id != distribution.id
+    assert all(event.item_ids == (item.id,) for event in events)
+
+
+def test_events_published_after_commit(recorded):
+    svc, events = recorded
+    item = svc.create_item("EVT-2", "Rice")
+    seen = []
+    conn = get_db_manager().get_connection()
+
+    def check(event):
+        # The write is visible and nothing is left uncommitted
+        seen.append((conn.in_transaction, conn.execute(
+            "SELECT quantity_on_hand FROM inventory_items WHERE id = ?",
+            (item.id,)).fetchone()[0]))
+
+    svc.events.subscribe(check, TransactionAdded)
+    svc.process_purchase(item.id, 8, 2.00)
+    assert seen == [(False, 8)]
+
+    # Failed writes publish nothing
+    with pytest.raises(ValueError):
+        svc.process_distribution(item.id, 100, "CLIENT")
+    assert len(seen) == 1
+    assert events[-1] == TransactionAdded(events[-1].transaction_id, item.id, "PURCHASE")
+
+
+def test_subscriptions():
+    svc = InventoryService()
+    bus = svc.events
+    calls = []
+
+    def failing(event):
+        raise RuntimeError("handler bug")
+
+    bus.subscribe(failing)
+    unsubscribe = bus.subscribe(calls.append, ItemCreated)
+    item = svc.create_item("EVT-3", "Pasta")  # failing handler does not stop the write
+    svc.process_purchase(item.id, 3, 1.00)     # not an ItemCreated
+    unsubscribe()
+    svc.create_item("EVT-4", "Soup")
+    assert calls == [ItemCreated(item.id)]
+
+    class Listener:
+        def __init__(self):
+            self.events = []
+
+        def on_change(self, event):
+            self.events.append(event)
+
+    listener = Listener()
+    count = bus.subscriber_count()
+    bus.subscribe(listener.on_change, weak=True)
+    svc.create_item("EVT-5", "Oats")
+    assert len(listener.events) == 1
+    del listener
+    gc.collect()
+    svc.create_item("EVT-6", "Corn")
+    assert bus.subscriber_count() == count
+
+
+def test_bus_per_database(tmp_path):
+    other = DatabaseManager(str(tmp_path / "other.db"))
+    assert get_event_bus(other) is not get_event_bus(get_db_manager())
+    assert get_event_bus(other) is get_event_bus(other)
+    other.close()
+
+
+def test_announced_writes_evict_selectively():
+    svc = InventoryService()
+    item = svc.create_item("EVT-7", "Beans", category_id=3)
+    svc.process_purchase(item.id, 50, 1.00)
+    svc.process_donation(item.id, 10, 20.00, donor="Local Church")
+    svc.process_donation(item.id, 2, 4.00, donor="Local Church Inc")
+    svc.process_distribution(item.id, 5, "CLIENT")
+    analytics = AnalyticsService()
+
+    donors = analytics.get_donor_impact_summary()
+    assert donors['total_donors'] == 2
+    forecast = analytics.get_inventory_forecast()
+    svc.process_distribution(item.id, 5, "CLIENT")
+
+    assert analytics.get_donor_impact_summary() is donors
+    assert analytics.get_inventory_forecast() is not forecast
+    assert analytics.get_inventory_forecast()[0]['current_quantity'] == 52
+
+    forecast = analytics.get_inventory_forecast()
+    merged = []
+    svc.events.subscribe(merged.append, DonorsMerged)
+    ids = [row[0] for row in get_db_manager().get_connection().execute(
+        "SELECT id FROM donors ORDER BY id")]
+    DonorService().merge_donors(ids[1], ids[0])
+
+    assert merged == [DonorsMerged(ids[1], ids[0])]
+    assert analytics.get_donor_impact_summary()['total_donors'] == 1
+    assert analytics.get_inventory_forecast() is forecast
+
+
+def test_batched_writes_evict_like_single_writes():
+    svc = InventoryService()
+    beans = svc.create_item("EVT-9", "Beans")
+    rice = svc.create_item("EVT-10", "Rice")
+    svc.process_purchase(beans.id, 20, 1.00)
+    svc.process_donation(rice.id, 20, 2.00, donor="Local Church")
+    analytics = AnalyticsService()
+    donors = analytics.get_donor_impact_summary()
+    forecast = analytics.get_inventory_forecast()
+
+    svc.process_distribution_basket([(beans.id, 2), (rice.id, 1), (beans.id, 1)], "CLIENT")
+    assert analytics.get_donor_impact_summary() is donors
+    assert analytics.get_inventory_forecast() is not forecast
+    assert svc.get_items([rice.id, beans.id, 9999]).keys() == {beans.id, rice.id}
+
+
+def test_unannounced_write_still_clears_everything():
+    svc = InventoryService()
+    item = svc.create_item("EVT-8", "Rice")
+    svc.process_donation(item.id, 10, 20.00, donor="Local Church")
+    analytics = AnalyticsService()
+    donors = analytics.get_donor_impact_summary()
+
+    # Written on the same connection without going through a service,
+    # then followed by an announced write
+    conn = get_db_manager().get_connection()
+    conn.execute("UPDATE donors SET name = 'St. Mary Church'")
+    conn.commit()
+    svc.process_purchase(item.id, 5, 1.00)
+
+    assert analytics.get_donor_impact_summary() is not donors
+
@@ -0,0 +1,144 @@
+"""
+Tests for rapid-scan intake sessions: buffered group commits, the live
+tally and journal recovery after a crash.
+"""
+
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from database.connection import get_db_manager
+from models.transaction import TransactionType
+from services.events import TransactionsAdded
+from services.intake_session import (
+    IntakeSession, find_unfinished_journals, recover_session
+)
+from services.inventory_service import InventoryService
+from services.period_close_service import PeriodCloseService
+
+
+@pytest.fixture
+def svc():
+    service = InventoryService()
+    for sku, name in (("111", "Beans"), ("222", "Rice"), ("333", "Soup")):
+        service.create_item(sku, name)
+    return service
+
+
+def _ledger(sku):
+    return get_db_manager().get_connection().execute("""
+        SELECT COUNT(*), COALESCE(SUM(t.quantity_change), 0), COALESCE(SUM(t.fair_market_value_cents), 0)
+        FROM inventory_transactions t JOIN inventory_items i ON i.id = t.item_id
+        WHERE i.sku = ?
+    """, (sku,)).fetchone()
+
+
+def test_scans_merge_into_group_commits(svc, tmp_path):
+    session = IntakeSession(svc, source="Food Drive", unit_value_dollars=1.50,
+                            flush_every=5, flush_interval_ms=60_000, journal_dir=tmp_path)
+    for sku in ["111", "111", "222", "111", "333", "222", "111", "111", "222", "333", "111", "222"]:
+        session.scan(sku)
+
+    assert (session.batches, session.committed_scans, session.pending_scans) == (2, 10, 2)
+    beans = session.tally[svc.get_item_by_sku("111").id]
+    assert (beans.quantity, beans.scans) == (6, 6)
+    # Ten scans of three items in two batches: one ledger row per item per batch
+    assert _ledger("111")[0] == 2
+    assert svc.get_item_by_sku("111").quantity_on_hand == beans.committed_quantity
+
+    session.scan("333", quantity=4, unit_value_dollars=2.00)
+    assert session.close() == 3
+    assert not session.journal_path.exists()
+    assert [svc.get_item_by_sku(sku).quantity_on_hand for sku in ("111", "222", "333")] == [6, 4, 6]
+    assert _ledger("333")[2] == 2 * 150 + 4 * 200
+    row = get_db_manager().get_connection().execute(
+        "SELECT committed_seq, closed_at IS NOT NULL FROM intake_sessions").fetchone()
+    assert tuple(row) == (13, 1)
+    donors = get_db_manager().get_connection().execute("SELECT name FROM donors").fetchall()
+    assert [r[0] for r in donors] == ["Food Drive"]
+
+
+def test_interval_flush_and_rejected_scans(svc, tmp_path):
+    session = IntakeSession(svc, flush_every=100, flush_interval_ms=0, journal_dir=tmp_path)
+    session.scan("111")
+    session.scan("111")
+    assert (session.batches, session.pending_scans) == (2, 0)
+
+    with pytest.raises(ValueError, match="Unknown SKU"):
+        session.scan("999")
+    with pytest.raises(ValueError):
+        session.scan("111", quantity=0)
+    assert session.scan_count == 2
+    session.close()
+
+
+def test_batch_matches_single_purchases(svc):
+    single = svc.create_item("P-1", "Flour")
+    batched = svc.create_item("P-2", "Flour")
+    lines = [(10, 1.25), (3, 0.99), (7, 2.10)]
+    for quantity, cost in lines:
+        svc.process_purchase(single.id, quantity, cost, supplier="Wholesale")
+    events = []
+    svc.events.subscribe(events.append)
+    ids = svc.process_intake_batch(
+        TransactionType.PURCHASE,
+        [(batched.id, quantity, cost, "2026-10-18T10:00:00") for quantity, cost in lines],
+        source="Wholesale")
+
+    assert len(ids) == 3 and ids == sorted(ids)
+    assert events == [TransactionsAdded(tuple(ids), (batched.id,), "PURCHASE")]
+    a, b = svc.get_item(single.id), svc.get_item(batched.id)
+    assert (a.quantity_on_hand, a.total_cost_basis_cents) == (b.quantity_on_hand, b.total_cost_basis_cents)
+
+    with pytest.raises(ValueError):
+        svc.process_intake_batch(TransactionType.PURCHASE,
+                                 [(batched.id, 1, 1.0, "2026-10-18"), (9999, 1, 1.0, "2026-10-18")])
+    assert svc.get_item(batched.id).quantity_on_hand == 20  # all or nothing
+
+
+def test_recovery_replays_only_uncommitted_scans(svc, tmp_path):
+    session = IntakeSession(svc, source="Church", flush_every=3,
+                            flush_interval_ms=60_000, journal_dir=tmp_path)
+    for sku in ["111", "222", "111", "333", "111"]:
+        session.scan(sku)
+    assert (session.committed_scans, session.pending_scans) == (3, 2)
+    # Crash: the buffer is lost, the last journal line was half written
+    session._journal.write('{"seq": 6, "item_')
+    session._journal.close()
+
+    journals = find_unfinished_journals(":memory:", tmp_path)
+    assert journals == [session.journal_path]
+    assert find_unfinished_journals(str(tmp_path / "other.db"), tmp_path) == []
+
+    assert recover_session(svc, journals[0]) == 2
+    assert [svc.get_item_by_sku(sku).quantity_on_hand for sku in ("111", "222", "333")] == [3, 1, 1]
+    assert find_unfinished_journals(":memory:", tmp_path) == []
+
+
+def test_recovery_rebooks_scans_from_a_month_closed_since_the_crash(svc, tmp_path):
+    session = IntakeSession(svc, source="Church", notes="Food drive", flush_every=100,
+                            flush_interval_ms=60_000, journal_dir=tmp_path)
+    for sku in ["111", "111", "222"]:
+        session.scan(sku)
+    session._journal.close()
+
+    # The scans were taken last month, and that month was closed before recovery
+    last_month = (date.today().replace(day=1) - timedelta(days=1)).replace(day=1)
+    lines = session.journal_path.read_text().splitlines()
+    records = [json.loads(line) for line in lines]
+    for record in records:
+        if 'at' in record:
+            record['at'] = f"{last_month:%Y-%m}-15T10:00:00"
+    session.journal_path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    PeriodCloseService().close_period(last_month.year, last_month.month)
+
+    assert recover_session(svc, session.journal_path) == 3
+    assert [svc.get_item_by_sku(sku).quantity_on_hand for sku in ("111", "222")] == [2, 1]
+    rows = get_db_manager().get_connection().execute(
+        "SELECT DATE(transaction_date), notes FROM inventory_transactions"
+    ).fetchall()
+    assert {row[0] for row in rows} == {date.today().isoformat()}
+    assert all(row[1].startswith("Food drive (Recovered intake: scans from closed period(s) "
+                                 f"{last_month:%Y-%m}") for row in rows)
+    assert find_unfinished_journals(":memory:", tmp_path) == []
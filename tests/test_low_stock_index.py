@@ -0,0 +1,89 @@
+"""
+Tests for the generated low-stock columns on inventory_items and their
+partial indexes.
+"""
+
+import sqlite3
+
+from database.connection import get_db_manager
+from database.migrations import migrate_database
+from services.inventory_service import InventoryService
+from services.reporting_service import ReportingService
+
+
+
+def test_flags_follow_transactions():
+    svc = InventoryService()
+    beans = svc.create_item("LOW-1", "Beans", reorder_threshold=20)
+    rice = svc.create_item("LOW-2", "Rice", reorder_threshold=5)
+    svc.create_item("LOW-3", "Pasta", reorder_threshold=0)
+    svc.process_purchase(beans.id, 30, 1.25)
+    svc.process_purchase(rice.id, 3, 0.99)
+
+    assert [i.sku for i in svc.get_items_below_threshold()] == ["LOW-2"]
+
+    svc.process_distribution(beans.id, 15, "CLIENT")
+    assert [i.name for i in svc.get_items_below_threshold()] == ["Beans", "Rice"]
+
+    svc.process_distribution(rice.id, 3, "CLIENT")
+    svc.soft_delete_item(beans.id)
+    conn = get_db_manager().get_connection()
+    rows = conn.execute("""
+        SELECT sku, is_low_stock, is_zero_stock, current_unit_cost_cents
+        FROM inventory_items ORDER BY sku
+    """).fetchall()
+    assert [tuple(r) for r in rows] == [
+        ("LOW-1", 0, 0, 125), ("LOW-2", 1, 1, 0), ("LOW-3", 0, 1, 0)]
+    assert [i.sku for i in svc.get_items_below_threshold()] == ["LOW-2"]
+
+    report = ReportingService().get_stock_status_data()
+    assert report['zero_stock_count'] == 2
+    assert report['below_threshold_count'] == 0
+
+
+def test_unit_cost_matches_model():
+    svc = InventoryService()
+    conn = get_db_manager().get_connection()
+    for n, (qty, cost) in enumerate([(3, 1.00), (7, 0.33), (4, 0.05), (6, 2.49), (2, 0.01)]):
+        item = svc.create_item(f"COST-{n}", f"Item {n}")
+        svc.process_purchase(item.id, qty, cost)
+        item = svc.process_purchase(item.id, 1, 0.02)[0]
+        item = svc.process_distribution(item.id, 1, "CLIENT")[0]
+        generated = conn.execute(
+            "SELECT current_unit_cost_cents FROM inventory_items WHERE id = ?", (item.id,)
+        ).fetchone()[0]
+        assert generated == item.current_unit_cost_cents
+
+
+def test_low_stock_queries_use_partial_indexes():
+    conn = get_db_manager().get_connection()
+    for query in ("SELECT * FROM inventory_items WHERE is_low_stock = 1 ORDER BY name",
+                  "SELECT COUNT(*) FROM inventory_items WHERE is_low_stock = 1"):
+        plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}"))
+        assert "idx_items_low_stock" in plan
+
+
+def test_migration_adds_generated_columns(tmp_path, baseline_schema_sql):
+    db_path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(baseline_schema_sql)
+    conn.execute("""
+        INSERT INTO inventory_items (sku, name, quantity_on_hand, reorder_threshold,
+                                     total_cost_basis_cents)
+        VALUES ('OLD-1', 'Old', 4, 10, 1000), ('OLD-2', 'Stocked', 50, 10, 0)
+    """)
+    conn.commit()
+    conn.close()
+
+    migrate_database(db_path)
+    migrate_database(db_path)
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("""
+        SELECT sku, is_low_stock, is_zero_stock, current_unit_cost_cents
+        FROM inventory_items ORDER BY sku
+    """).fetchall() == [("OLD-1", 1, 0, 250), ("OLD-2", 0, 0, 0)]
+    indexes = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {'idx_items_low_stock', 'idx_items_zero_stock'} <= indexes
+    conn.close()
@@ -0,0 +1,144 @@
+"""
+Tests for idle-time database maintenance (incremental vacuum + WAL checkpoints).
+
+Covers:
+- Migrating an existing database to auto_vacuum=INCREMENTAL
+- Bounded incremental_vacuum releases at most N pages
+- Maintenance step / metrics shape
+- Scheduler starts and stops promptly, converting legacy databases when idle
+"""
+
+import sqlite3
+import time
+
+import pytest
+
+from database.maintenance import (
+    AUTO_VACUUM_INCREMENTAL,
+    MaintenanceScheduler,
+    get_auto_vacuum_mode,
+    get_maintenance_metrics,
+    incremental_vacuum,
+    migrate_to_incremental_vacuum,
+    run_maintenance_step,
+)
+
+@pytest.fixture
+def legacy_db(tmp_path, baseline_schema_sql):
+    """A file database created without incremental auto-vacuum, with free pages."""
+    db_path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(baseline_schema_sql)
+    conn.execute("CREATE TABLE filler (data BLOB)")
+    conn.executemany("INSERT INTO filler VALUES (?)", [(b"x" * 4000,) for _ in range(500)])
+    conn.commit()
+    conn.execute("DELETE FROM filler")
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def test_new_database_uses_incremental_vacuum(file_db):
+    """Fresh databases created from schema.sql are incremental from the start."""
+    assert get_auto_vacuum_mode(file_db.get_connection()) == AUTO_VACUUM_INCREMENTAL
+
+
+def test_migrate_to_incremental_vacuum(legacy_db):
+    """Legacy databases are migrated once; a second call is a no-op."""
+    assert migrate_to_incremental_vacuum(legacy_db) is True
+    assert migrate_to_incremental_vacuum(legacy_db) is False
+
+    conn = sqlite3.connect(legacy_db)
+    assert get_auto_vacuum_mode(conn) == AUTO_VACUUM_INCREMENTAL
+    conn.close()
+
+
+def test_incremental_vacuum_is_bounded(file_db):
+    """Each call releases at most max_pages pages."""
+    conn = file_db.get_connection()
+    conn.execute("CREATE TABLE filler (data BLOB)")
+    conn.executemany("INSERT INTO filler VALUES (?)", [(b"x" * 4000,) for _ in range(300)])
+    conn.commit()
+    conn.execute("DELETE FROM filler")
+    conn.commit()
+
+    free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    assert free_before > 50
+
+    released = incremental_vacuum(conn, max_pages=50)
+    assert released == 50
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == free_before - 50
+
+
+def test_incremental_vacuum_noop_on_legacy_db(legacy_db):
+    """Without INCREMENTAL mode nothing is released (and nothing blocks)."""
+    conn = sqlite3.connect(legacy_db)
+    assert incremental_vacuum(conn, max_pages=50) == 0
+    conn.close()
+
+
+def test_run_maintenance_step_and_metrics(legacy_db):
+    """A maintenance step trims pages and checkpoints the WAL."""
+    migrate_to_incremental_vacuum(legacy_db)
+    conn = sqlite3.connect(legacy_db)
+    conn.execute("CREATE TABLE filler2 (data BLOB)")
+    conn.executemany("INSERT INTO filler2 VALUES (?)", [(b"y" * 4000,) for _ in range(100)])
+    conn.commit()
+    conn.execute("DELETE FROM filler2")
+    conn.commit()
+
+    step = run_maintenance_step(conn, legacy_db, max_pages=10, wal_truncate_bytes=0)
+    assert step['pages_released'] == 10
+    assert step['checkpoint']['mode'] == "TRUNCATE"
+
+    metrics = get_maintenance_metrics(conn, legacy_db)
+    assert metrics['auto_vacuum'] == "INCREMENTAL"
+    assert metrics['freelist_count'] > 0
+    assert metrics['wal_size_bytes'] == 0
+    conn.close()
+
+
+def test_scheduler_runs_and_stops_quickly(legacy_db):
+    """The background thread performs steps when idle and stops promptly."""
+    migrate_to_incremental_vacuum(legacy_db)
+    scheduler = MaintenanceScheduler(legacy_db, interval_seconds=0.01, idle_seconds=0)
+    scheduler.start()
+    try:
+        deadline = time.monotonic() + 5
+        while scheduler.get_metrics()['runs'] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert scheduler.get_metrics()['runs'] > 0
+    finally:
+        started = time.monotonic()
+        scheduler.stop()
+        assert time.monotonic() - started < 1.0
+    assert not scheduler.is_running
+
+
+def test_scheduler_converts_legacy_database_when_idle(legacy_db):
+    """The one-time VACUUM runs on the worker, only once the app is idle."""
+    scheduler = MaintenanceScheduler(legacy_db, interval_seconds=0.01, idle_seconds=0.3)
+    scheduler.start()
+    try:
+        time.sleep(0.1)
+        conn = sqlite3.connect(legacy_db)
+        assert get_auto_vacuum_mode(conn) != AUTO_VACUUM_INCREMENTAL
+        conn.close()
+
+        deadline = time.monotonic() + 5
+        while scheduler.get_metrics()['runs'] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert scheduler.get_metrics()['auto_vacuum'] == "INCREMENTAL"
+        conn = sqlite3.connect(legacy_db)
+        assert get_auto_vacuum_mode(conn) == AUTO_VACUUM_INCREMENTAL
+        conn.close()
+    finally:
+        scheduler.stop()
+
+
+def test_scheduler_ignores_memory_database():
+    """In-memory databases cannot be shared with a worker connection."""
+    scheduler = MaintenanceScheduler(":memory:")
+    scheduler.start()
+    assert not scheduler.is_running
+    scheduler.stop()
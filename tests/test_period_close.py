@@ -0,0 +1,223 @@
+"""
+Tests for month-end close: stored period totals, the period lock and reports
+reading the stored totals.
+"""
+
+import sqlite3
+from datetime import date, timedelta
+import pytest
+
+from database.compact_ledger import migrate_to_compact_ledger
+from database.connection import reset_db_manager
+from database.migrations import migrate_database
+from services.inventory_service import InventoryService
+from services.period_close_service import PeriodCloseService
+from services.reporting_service import ReportingService
+
+# The two months before the current one
+LAST_MONTH = (date.today().replace(day=1) - timedelta(days=1)).replace(day=1)
+EARLIER_MONTH = (LAST_MONTH - timedelta(days=1)).replace(day=1)
+
+
+def _backdate(svc, first_id, last_id, month):
+    svc.db_manager.get_connection().execute(
+        "UPDATE inventory_transactions SET transaction_date = ? WHERE id BETWEEN ? AND ?",
+        (f"{month:%Y-%m}-10 09:00:00", first_id, last_id))
+
+
+def _seed(svc):
+    """Activity in the earlier month, then in last month and this month."""
+    beans = svc.create_item("PC-1", "Beans")
+    rice = svc.create_item("PC-2", "Rice")
+    first = svc.process_purchase(beans.id, 100, 1.25, supplier="Acme Foods")[1]
+    svc.process_purchase(rice.id, 40, 2.00, supplier="ACME foods.")
+    svc.process_donation(rice.id, 10, 2.00, donor="St. Mary's Church")
+    svc.process_distribution(beans.id, 15, "CLIENT")
+    svc.process_distribution(rice.id, 4, "SPOILAGE")
+    spoiled = svc.process_distribution(beans.id, 5, "SPOILAGE")[1]
+    svc.void_transaction(spoiled.id, "Recounted")
+    last = svc.process_distribution(beans.id, 3, "INTERNAL")[1]
+    _backdate(svc, first.id, last.id, EARLIER_MONTH)
+    closing = {item.id: (item.quantity_on_hand, item.total_cost_basis_cents)
+               for item in (svc.get_item(beans.id), svc.get_item(rice.id))}
+
+    # Later activity, including a void of a purchase and a donation
+    first = svc.process_purchase(beans.id, 20, 1.75, supplier="Valley Farms")[1]
+    svc.process_distribution(rice.id, 6, "CLIENT")
+    donation = svc.process_donation(beans.id, 8, 0.50, donor="Anonymous")[1]
+    svc.void_transaction(donation.id, "Duplicate")
+    _backdate(svc, first.id, donation.id + 1, LAST_MONTH)
+    purchase = svc.process_purchase(rice.id, 10, 3.00)[1]
+    svc.void_transaction(first.id, "Returned")
+    svc.process_distribution(beans.id, 2, "CLIENT")
+    return beans, rice, purchase, closing
+
+
+def test_close_stores_period_totals(isolated_db):
+    svc = InventoryService()
+    beans, rice, _, closing = _seed(svc)
+    reporting = ReportingService()
+    period_end = LAST_MONTH - timedelta(days=1)
+    live = (reporting.get_financial_report_data(EARLIER_MONTH, period_end),
+            reporting.get_impact_report_data(EARLIER_MONTH, period_end),
+            reporting.get_purchases_report_data(EARLIER_MONTH, period_end))
+
+    periods = PeriodCloseService()
+    totals = periods.close_period(EARLIER_MONTH.year, EARLIER_MONTH.month, notes="Reconciled")
+    assert totals['period'] == f"{EARLIER_MONTH:%Y-%m}"
+    assert totals['notes'] == "Reconciled"
+    assert [(row['reason_code'], row['distribution_count'], row['cogs_cents'])
+            for row in totals['cogs_by_reason']] == \
+        [("CLIENT", 1, 1875), ("SPOILAGE", 1, 640), ("INTERNAL", 1, 375)]
+    assert [(row['donor'], row['fmv_cents']) for row in totals['fmv_by_donor']] == \
+        [("St. Mary's Church", 2000)]
+    # Both spellings are one supplier
+    assert [(row['supplier'], row['purchase_count'], row['cost_cents'])
+            for row in totals['purchases_by_supplier']] == [("Acme Foods", 2, 20500)]
+    assert {row['item_id']: (row['quantity_on_hand'], row['total_cost_basis_cents'])
+            for row in totals['balances']} == closing
+    assert totals['closing_value_cents'] == sum(value for _, value in closing.values())
+    assert periods.get_closed_periods()[0]['period'] == totals['period']
+
+    # Reports on the closed month read the stored totals
+    frozen = (reporting.get_financial_report_data(EARLIER_MONTH, period_end),
+              reporting.get_impact_report_data(EARLIER_MONTH, period_end),
+              reporting.get_purchases_report_data(EARLIER_MONTH, period_end))
+    for before, after in zip(live, frozen):
+        assert after['closed_periods'] == [totals['period']]
+        after['closed_periods'] = []
+        if 'unique_suppliers' in after:
+            # Counted by supplier, not by spelling
+            assert (after.pop('unique_suppliers'), before.pop('unique_suppliers')) == (1, 2)
+        assert after == before
+
+    summary = reporting.get_financial_report_data(EARLIER_MONTH, period_end,
+                                                  include_details=False)
+    assert summary['distributions'] == []
+    assert summary['total_cogs_cents'] == 2890
+    assert summary['distribution_count'] == 3
+    summary = reporting.get_purchases_report_data(EARLIER_MONTH, period_end,
+                                                  include_details=False)
+    assert (summary['total_purchases'], summary['total_cost_cents'],
+            summary['unique_suppliers']) == (2, 20500, 1)
+
+    # Partly open ranges still read the ledger
+    open_range = reporting.get_financial_report_data(EARLIER_MONTH, date.today())
+    assert open_range['closed_periods'] == []
+
+
+def test_closed_period_is_locked_until_reopened(isolated_db):
+    svc = InventoryService()
+    _seed(svc)
+    conn = svc.db_manager.get_connection()
+    periods = PeriodCloseService()
+    periods.close_period(EARLIER_MONTH.year, EARLIER_MONTH.month)
+
+    with pytest.raises(ValueError, match="already closed"):
+        periods.close_period(EARLIER_MONTH.year, EARLIER_MONTH.month)
+    with pytest.raises(ValueError, match="has not ended"):
+        periods.close_period(date.today().year, date.today().month)
+    with pytest.raises(ValueError, match="Invalid month"):
+        periods.close_period(2026, 13)
+
+    with pytest.raises(ValueError, match="closed period"):
+        svc.void_transaction(1, "Wrong price")
+    with pytest.raises(sqlite3.IntegrityError, match="closed period"):
+        conn.execute("UPDATE inventory_transactions SET quantity_change = 90 WHERE id = 1")
+    with pytest.raises(sqlite3.IntegrityError, match="closed period"):
+        conn.execute("UPDATE inventory_transactions SET transaction_date = ? WHERE id = 1",
+                     (f"{LAST_MONTH:%Y-%m}-01",))
+    with pytest.raises(sqlite3.IntegrityError, match="closed period"):
+        conn.execute(
+            "INSERT INTO inventory_transactions (item_id, transaction_type, quantity_change, "
+            "transaction_date) VALUES (1, 'DONATION', 5, ?)", (f"{EARLIER_MONTH:%Y-%m}-20",))
+    # Moving a later transaction into the closed month is rejected too
+    with pytest.raises(sqlite3.IntegrityError, match="closed period"):
+        conn.execute("UPDATE inventory_transactions SET transaction_date = ? WHERE id = 10",
+                     (f"{EARLIER_MONTH:%Y-%m}-20",))
+    conn.execute("UPDATE inventory_transactions SET notes = 'Invoice 1142' WHERE id = 1")
+    assert conn.execute("SELECT notes FROM inventory_transactions WHERE id = 1").fetchone()[0] == \
+        "Invoice 1142"
+
+    periods.reopen_period(EARLIER_MONTH.year, EARLIER_MONTH.month)
+    assert not periods.is_closed(EARLIER_MONTH.year, EARLIER_MONTH.month)
+    for table in ('period_cogs', 'period_donations', 'period_purchases', 'period_balances'):
+        assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0
+    svc.void_transaction(4, "Wrong client")
+    with pytest.raises(ValueError, match="not closed"):
+        periods.reopen_period(EARLIER_MONTH.year, EARLIER_MONTH.month)
+
+
+def test_compact_ledger_close_and_lock(file_db):
+    db_path = file_db.db_path
+    beans, rice, purchase, closing = _seed(InventoryService())
+    reset_db_manager()
+    migrate_to_compact_ledger(db_path, batch_size=3)
+    migrate_database(db_path)
+
+    svc = InventoryService(db_path=db_path)
+    periods = PeriodCloseService()
+    periods.close_period(EARLIER_MONTH.year, EARLIER_MONTH.month)
+    periods.close_period(LAST_MONTH.year, LAST_MONTH.month)
+    totals = periods.get_period_totals(EARLIER_MONTH.year, EARLIER_MONTH.month)
+    assert {row['item_id']: (row['quantity_on_hand'], row['total_cost_basis_cents'])
+            for row in totals['balances']} == closing
+    assert sum(row['cogs_cents'] for row in totals['cogs_by_reason']) == 2890
+
+    # Last month's balances include the purchase voided this month
+    later = periods.get_period_totals(LAST_MONTH.year, LAST_MONTH.month)
+    assert {row['item_id']: row['quantity_on_hand'] for row in later['balances']} == \
+        {beans.id: closing[beans.id][0] + 20, rice.id: closing[rice.id][0] - 6}
+
+    conn = svc.db_manager.get_connection()
+    with pytest.raises(sqlite3.IntegrityError, match="closed period"):
+        conn.execute("UPDATE inventory_transactions SET reason_code = 'CLIENT' WHERE id = 5")
+    with pytest.raises(ValueError, match="closed period"):
+        svc.void_transaction(1, "Wrong price")
+    svc.void_transaction(purchase.id, "Returned")
+
+
+def test_balances_follow_a_void_clamped_at_zero_cost(isolated_db):
+    svc = InventoryService()
+    beans = svc.create_item("PC-1", "Beans")
+    first = svc.process_purchase(beans.id, 10, 1.00)[1]
+    _backdate(svc, first.id, first.id, EARLIER_MONTH)
+
+    # Most of the cost goes out before the purchase is voided: the cost
+    # basis floors at 0 instead of dropping by the purchase's full $50
+    first = svc.process_purchase(beans.id, 10, 5.00)[1]
+    svc.process_donation(beans.id, 10, 1.00, donor="Anonymous")
+    last = svc.process_distribution(beans.id, 15, "CLIENT")[1]
+    _backdate(svc, first.id, last.id, LAST_MONTH)
+    item, _, correction = svc.void_transaction(first.id, "Returned")
+    assert (item.quantity_on_hand, item.total_cost_basis_cents) == (5, 0)
+    assert correction.total_financial_impact_cents == -3000
+
+    totals = PeriodCloseService().close_period(EARLIER_MONTH.year, EARLIER_MONTH.month)
+    assert [(row['item_id'], row['quantity_on_hand'], row['total_cost_basis_cents'])
+            for row in totals['balances']] == [(beans.id, 10, 1000)]
+
+
+def test_migration_stores_the_value_of_older_voids(tmp_path, baseline_schema_sql):
+    db_path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(baseline_schema_sql)
+    conn.execute("INSERT INTO inventory_items (sku, name, category_id) VALUES ('PC-1', 'Beans', 3)")
+    conn.executemany("""
+        INSERT INTO inventory_transactions
+            (item_id, transaction_type, quantity_change, unit_cost_cents,
+             total_financial_impact_cents, ref_transaction_id)
+        VALUES (1, ?, ?, ?, ?, ?)
+    """, [('PURCHASE', 10, 125, 0, None), ('DISTRIBUTION', -4, 125, 500, None),
+          ('DONATION', 6, 0, 0, None), ('CORRECTION', -10, 125, 0, 1),
+          ('CORRECTION', 4, 125, 0, 2), ('CORRECTION', -6, 0, 0, 3),
+          ('CORRECTION', 2, 0, 300, None)])
+    conn.commit()
+    conn.close()
+
+    assert 'backfill_void_values' in migrate_database(db_path)
+    conn = sqlite3.connect(db_path)
+    assert [row[0] for row in conn.execute(
+        "SELECT total_financial_impact_cents FROM inventory_transactions "
+        "WHERE transaction_type = 'CORRECTION' ORDER BY id")] == [-1250, 500, 0, 300]
+    conn.close()
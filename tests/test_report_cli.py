@@ -0,0 +1,84 @@
+"""
+Tests for headless batch report generation (report_cli / BatchReportService).
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from database.connection import get_db_manager, reset_db_manager
+from services.batch_report_service import REPORTS, BatchReportService
+from services.inventory_service import InventoryService
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+
+@pytest.fixture
+def pantry_db(file_db):
+    """A file database with a little activity."""
+    db_path = Path(file_db.db_path)
+    svc = InventoryService()
+    beans = svc.create_item("CLI-1", "Beans")
+    svc.process_purchase(beans.id, 40, 1.50, supplier="Acme Foods")
+    svc.process_donation(beans.id, 10, 1.00, donor="Food Drive")
+    svc.process_distribution(beans.id, 12, "CLIENT")
+    reset_db_manager()
+    return db_path
+
+
+def test_all_reports_in_one_run(pantry_db, tmp_path):
+    out = tmp_path / "out"
+    service = BatchReportService(get_db_manager(str(pantry_db)), out)
+    outputs = service.run(list(REPORTS), ['native', 'json'])
+
+    assert set(outputs) == set(REPORTS)
+    for files in outputs.values():
+        assert len(files) == 2 and all(Path(f).exists() for f in files)
+    assert Path(outputs['financial'][0]).suffix == '.pdf'
+    assert Path(outputs['impact'][0]).suffix == '.xlsx'
+
+    financial = json.loads(Path(outputs['financial'][1]).read_text())
+    assert financial['financial']['total_cogs_cents'] == 1440  # 12 at the weighted average $1.20
+
+    # Each dataset is queried once, however many outputs use it
+    queries = [t['stage'] for t in service.timings
+               if t['stage'].startswith('query') and not t.get('reused')]
+    assert len(queries) == len(set(queries))
+    assert "total" in service.format_timings()
+
+    service.get_dataset('stock')
+    assert service.timings[-1]['reused']
+    with pytest.raises(ValueError):
+        service.run(['financial'], ['csv'])
+
+
+def test_cli_runs_without_qt(pantry_db, tmp_path):
+    script = (
+        "import sys, runpy\n"
+        f"sys.argv = ['report_cli.py', '--db', {str(pantry_db)!r}, '--reports', "
+        f"'financial,trends', '--format', 'json', '--output-dir', {str(tmp_path / 'out')!r}]\n"
+        "try:\n"
+        f"    runpy.run_path({str(SRC_DIR / 'report_cli.py')!r}, run_name='__main__')\n"
+        "except SystemExit as e:\n"
+        "    assert e.code == 0, e.code\n"
+        "print(sorted(m for m in sys.modules if m.startswith('PyQt')))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                            timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert "financial:" in result.stdout and "trends:" in result.stdout
+    assert "query seasonal" in result.stdout
+    assert result.stdout.strip().endswith("[]")
+    assert len(list((tmp_path / "out").glob("*.json"))) == 2
+
+
+def test_cli_rejects_bad_arguments(tmp_path, capsys):
+    from report_cli import main
+
+    assert main(["--db", str(tmp_path / "missing.db"), "--reports", "financial"]) == 1
+    with pytest.raises(SystemExit):
+        main(["--db", "x.db", "--reports", "payroll"])
+    assert "unknown report" in capsys.readouterr().err
@@ -0,0 +1,166 @@
+"""
+Tests for stock takes: loading counts, variance preview and batch posting.
+"""
+
+import pytest
+
+from database.connection import get_db_manager
+from services.events import StockTakePosted
+from services.inventory_service import InventoryService
+from services.stock_take_service import StockTakeService
+
+
+@pytest.fixture
+def stocked():
+    svc = InventoryService()
+    items = {}
+    for sku, quantity, cost in (("ST-1", 40, 1.17), ("ST-2", 10, 2.50),
+                                ("ST-3", 25, 0.80), ("ST-4", 5, 3.00)):
+        item = svc.create_item(sku, f"Item {sku}")
+        svc.process_purchase(item.id, quantity, cost)
+        items[sku] = item.id
+    svc.process_donation(items["ST-2"], 6, 1.00)  # Lowers ST-2's average cost
+    return svc, items
+
+
+def test_count_sheet_and_scans(stocked, tmp_path):
+    svc, items = stocked
+    stock_takes = StockTakeService()
+    stock_take_id = stock_takes.start("Aisle 1")
+
+    sheet = tmp_path / "counts.csv"
+    sheet.write_text(
+        "SKU,Name,Count\n"
+        "ST-1,Beans,30\n"
+        "ST-2,Rice,10\n"
+        "NOPE,Unknown,4\n"
+        "ST-2,Rice (backroom),6\n"
+        "ST-3,Soup,lots\n"
+        ",,\n"
+        "NOPE,Unknown,1\n"
+    )
+    recorded, errors = stock_takes.import_count_sheet(stock_take_id, str(sheet))
+    assert recorded == 3
+    assert errors == ["Row 3: Unknown SKU NOPE", "Row 5: Invalid count 'lots'",
+                      "Row 7: Unknown SKU NOPE"]
+
+    # Scans add to the count; a re-imported sheet replaces it
+    assert stock_takes.record_counts(stock_take_id, [("ST-3", 1)] * 27 + [("X", 1)]) == ["X"]
+    assert stock_takes.record_counts(stock_take_id, [(" ST-1 ", 2)]) == []
+    sheet.write_text("sku,qty\nST-2,15\n")
+    assert stock_takes.import_count_sheet(stock_take_id, str(sheet)) == (1, [])
+
+    counts = dict(get_db_manager().get_connection().execute(
+        "SELECT item_id, counted_quantity FROM stock_take_counts WHERE stock_take_id = ?",
+        (stock_take_id,)).fetchall())
+    assert counts == {items["ST-1"]: 32, items["ST-2"]: 15, items["ST-3"]: 27}
+    assert stock_takes.get_stock_takes(open_only=True)[0]['counted_items'] == 3
+
+    with pytest.raises(ValueError, match="negative"):
+        stock_takes.record_counts(stock_take_id, [("ST-1", -1)])
+    bad = tmp_path / "bad.csv"
+    bad.write_text("item,count\nST-1,3\n")
+    assert stock_takes.import_count_sheet(stock_take_id, str(bad)) == \
+        (0, ["Missing required column: sku"])
+
+
+def test_preview_then_post(stocked):
+    svc, items = stocked
+    stock_takes = StockTakeService()
+    stock_take_id = stock_takes.start("Full count", notes="Year end")
+    stock_takes.record_counts(stock_take_id, [
+        ("ST-1", 33), ("ST-2", 16), ("ST-3", 31), ("ST-4", 5)])
+
+    preview = stock_takes.preview(stock_take_id)
+    assert preview['counted_items'] == 4
+    by_sku = {v.sku: v for v in preview['variances']}
+    assert set(by_sku) == {"ST-1", "ST-3"}        # ST-2 and ST-4 match the system
+    assert by_sku["ST-1"].variance == -7
+    assert by_sku["ST-1"].value_change_cents == -round(7 * 117)
+    assert by_sku["ST-3"].value_change_cents == 6 * 80
+    assert preview['shrink_quantity'] == 7 and preview['overage_quantity'] == 6
+    assert preview['net_value_cents'] == 6 * 80 - 7 * 117
+
+    # A distribution after the preview is included in the posted variance
+    svc.process_distribution(items["ST-1"], 3, "CLIENT")
+    events = []
+    svc.events.subscribe(events.append, StockTakePosted)
+    before = {sku: svc.get_item(item_id) for sku, item_id in items.items()}
+
+    assert stock_takes.post(stock_take_id) == 2
+
+    beans, soup = svc.get_item(items["ST-1"]), svc.get_item(items["ST-3"])
+    assert beans.quantity_on_hand == 33 and soup.quantity_on_hand == 31
+    assert soup.current_unit_cost_cents == before["ST-3"].current_unit_cost_cents
+    assert beans.total_cost_basis_cents == before["ST-1"].total_cost_basis_cents - 4 * 117
+    assert svc.get_item(items["ST-4"]).total_cost_basis_cents == \
+        before["ST-4"].total_cost_basis_cents
+
+    corrections = svc.get_item_transactions(items["ST-1"], limit=1)
+    assert corrections[0].transaction_type.value == "CORRECTION"
+    assert corrections[0].quantity_change == -4
+    assert corrections[0].reason_code == "COUNT"
+    assert corrections[0].notes == f"Stock take #{stock_take_id} (Full count): Year end"
+    assert events == [StockTakePosted(stock_take_id, tuple(sorted((items["ST-1"], items["ST-3"]))))]
+
+    audit = get_db_manager().get_connection().execute("""
+        SELECT item_id, system_quantity, transaction_id FROM stock_take_counts
+        WHERE stock_take_id = ? ORDER BY item_id
+    """, (stock_take_id,)).fetchall()
+    assert [(row[0], row[1]) for row in audit] == [
+        (items["ST-1"], 37), (items["ST-2"], 16), (items["ST-3"], 25), (items["ST-4"], 5)]
+    assert audit[0][2] == corrections[0].id
+    assert audit[1][2] is None and audit[3][2] is None
+
+    with pytest.raises(ValueError, match="already posted"):
+        stock_takes.post(stock_take_id)
+    with pytest.raises(ValueError, match="already posted"):
+        stock_takes.record_counts(stock_take_id, [("ST-1", 1)])
+    assert stock_takes.get_stock_takes(open_only=True) == []
+
+
+def test_found_units_of_items_without_stock(stocked):
+    svc, items = stocked
+    svc.process_distribution(items["ST-4"], 5, "CLIENT")   # Out of stock, bought at $3.00
+    never_bought = svc.create_item("ST-5", "Item ST-5")
+    svc.process_purchase(items["ST-4"], 2, 9.99)
+    voided = svc.get_item_transactions(items["ST-4"], limit=1)[0]
+    svc.void_transaction(voided.id, "Wrong item")            # Voided: not the last cost
+    stock_takes = StockTakeService()
+    stock_take_id = stock_takes.start("Back room")
+    stock_takes.record_counts(stock_take_id, [("ST-4", 4), ("ST-5", 2), ("ST-3", 26)])
+
+    preview = stock_takes.preview(stock_take_id)
+    by_sku = {v.sku: v for v in preview['variances']}
+    assert (by_sku["ST-4"].unit_cost_cents, by_sku["ST-4"].value_change_cents,
+            by_sku["ST-4"].unit_cost_source) == (300, 1200, 'last_purchase')
+    assert (by_sku["ST-5"].value_change_cents, by_sku["ST-5"].unit_cost_source) == (0, 'unknown')
+    assert by_sku["ST-3"].unit_cost_source == 'average'
+    assert [v.sku for v in preview['estimated_cost']] == ["ST-4", "ST-5"]
+
+    stock_takes.post(stock_take_id)
+    item = svc.get_item(items["ST-4"])
+    assert (item.quantity_on_hand, item.total_cost_basis_cents) == (4, 1200)
+    correction = svc.get_item_transactions(items["ST-4"], limit=1)[0]
+    assert (correction.unit_cost_cents, correction.total_financial_impact_cents) == (300, 1200)
+    assert svc.get_item(never_bought.id).quantity_on_hand == 2
+
+
+def test_post_many_items_in_one_batch():
+    conn = InventoryService().db_manager.get_connection()
+    conn.executemany(
+        "INSERT INTO inventory_items (sku, name, quantity_on_hand, total_cost_basis_cents) "
+        "VALUES (?, ?, ?, ?)",
+        [(f"BULK-{n:05d}", f"Bulk {n}", 10, 1000) for n in range(2000)])
+    conn.commit()
+    stock_takes = StockTakeService()
+    stock_take_id = stock_takes.start("Bulk")
+    stock_takes.record_counts(stock_take_id, [(f"BULK-{n:05d}", n % 20) for n in range(2000)])
+
+    assert stock_takes.post(stock_take_id) == 1900
+    assert conn.execute(
+        "SELECT SUM(quantity_on_hand) FROM inventory_items WHERE sku LIKE 'BULK-%'"
+    ).fetchone()[0] == sum(n % 20 for n in range(2000))
+    assert conn.execute(
+        "SELECT COUNT(*) FROM stock_take_counts WHERE transaction_id IS NOT NULL"
+    ).fetchone()[0] == 1900
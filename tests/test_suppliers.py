@@ -0,0 +1,164 @@
+"""
+Tests for the supplier dimension and trigger-maintained supplier aggregates.
+
+The suppliers report (which reads the aggregate tables) is compared with the
+same figures computed directly from non-voided purchases after purchases,
+voids and deletes.
+"""
+
+import sqlite3
+from collections import defaultdict
+
+import pytest
+
+from database.migrations import migrate_database, name_key_sql, rebuild_supplier_totals
+from services.inventory_service import InventoryService
+from services.reporting_service import ReportingService
+
+
+
+def _expected_suppliers(conn):
+    """Per-supplier figures from the ledger, keyed by supplier_id."""
+    expected = {}
+    notes = defaultdict(list)
+    for row in conn.execute("""
+        SELECT supplier_id, quantity_change, unit_cost_cents, transaction_date, notes
+        FROM inventory_transactions
+        WHERE transaction_type = 'PURCHASE' AND is_voided = 0
+          AND supplier_id IS NOT NULL
+        ORDER BY id
+    """):
+        totals = expected.setdefault(row[0], [0, 0.0, 0.0, row[3], row[3]])
+        totals[0] += 1
+        totals[1] += row[1]
+        totals[2] += row[1] * row[2]
+        totals[3] = min(totals[3], row[3])
+        totals[4] = max(totals[4], row[3])
+        note = (row[4] or '').strip()
+        if note and note.lower() != 'none' and note not in notes[row[0]]:
+            notes[row[0]].append(note)
+    return {
+        supplier_id: (*totals, ' | '.join(notes[supplier_id]))
+        for supplier_id, totals in expected.items()
+    }
+
+
+def _assert_report_matches(conn):
+    report = ReportingService().get_suppliers_report_data()
+    actual = {
+        s['supplier_id']: (s['purchase_count'], s['total_quantity'], s['total_cost_cents'],
+                           s['first_purchase'], s['last_purchase'], s['notes'])
+        for s in report['suppliers']
+    }
+    assert actual == pytest.approx(_expected_suppliers(conn))
+    return report
+
+
+@pytest.fixture
+def purchases(isolated_db):
+    svc = InventoryService()
+    beans = svc.create_item("SUP-1", "Beans")
+    rice = svc.create_item("SUP-2", "Rice")
+
+    svc.process_purchase(beans.id, 100, 1.25, supplier="Acme Foods", notes="Net 30")
+    svc.process_purchase(rice.id, 40, 2.00, supplier="ACME foods.", notes="Net 30")
+    svc.process_purchase(beans.id, 10, 1.50, supplier="Acme Foods", notes="None")
+    svc.process_purchase(rice.id, 25, 0.80, supplier="Valley Farms", notes="Pallet rebate")
+    svc.process_purchase(rice.id, 5, 1.00)
+    return svc, isolated_db.get_connection()
+
+
+def test_report_groups_spellings_and_dedupes_notes(purchases):
+    _svc, conn = purchases
+    report = _assert_report_matches(conn)
+
+    by_name = {s['supplier']: s for s in report['suppliers']}
+    assert set(by_name) == {"Acme Foods", "Valley Farms"}
+    assert by_name["Acme Foods"]['purchase_count'] == 3
+    assert by_name["Acme Foods"]['notes'] == "Net 30"
+    assert report['total_purchases'] == 4
+    assert report['total_cost_dollars'] == pytest.approx(125 + 80 + 15 + 20)
+
+
+def test_voided_purchases_are_excluded(purchases):
+    svc, conn = purchases
+    txn_id = conn.execute(
+        "SELECT id FROM inventory_transactions WHERE supplier = 'Valley Farms'"
+    ).fetchone()[0]
+    svc.void_transaction(txn_id, "Returned")
+
+    report = _assert_report_matches(conn)
+    assert "Valley Farms" not in {s['supplier'] for s in report['suppliers']}
+    assert report['total_purchases'] == 3
+
+    # Voiding the most recent Acme purchase moves last_purchase back
+    conn.execute("""
+        UPDATE inventory_transactions SET transaction_date = '2026-01-0' || id || ' 09:00:00'
+        WHERE transaction_type = 'PURCHASE'
+    """)
+    rebuild_supplier_totals(conn)
+    latest = conn.execute("""
+        SELECT id FROM inventory_transactions
+        WHERE supplier LIKE 'acme%' COLLATE NOCASE ORDER BY transaction_date DESC
+    """).fetchone()[0]
+    svc.void_transaction(latest, "Wrong supplier")
+    _assert_report_matches(conn)
+
+    # Deleting a purchase (e.g. by a repair script) also updates the totals
+    conn.execute("DELETE FROM inventory_transactions WHERE transaction_type = 'CORRECTION'")
+    conn.execute("DELETE FROM inventory_transactions WHERE notes = 'Net 30' AND is_voided = 0")
+    report = _assert_report_matches(conn)
+    assert report['suppliers'] == []
+    assert conn.execute("SELECT COUNT(*) FROM kpi_supplier_notes").fetchone()[0] == 0
+
+
+def test_rebuild_matches_incremental_tables(purchases):
+    _svc, conn = purchases
+    incremental = (
+        conn.execute("SELECT * FROM kpi_supplier_totals ORDER BY supplier_id").fetchall(),
+        conn.execute("SELECT * FROM kpi_supplier_notes ORDER BY supplier_id, note").fetchall(),
+    )
+    rebuild_supplier_totals(conn)
+    rebuilt = (
+        conn.execute("SELECT * FROM kpi_supplier_totals ORDER BY supplier_id").fetchall(),
+        conn.execute("SELECT * FROM kpi_supplier_notes ORDER BY supplier_id, note").fetchall(),
+    )
+    assert [tuple(r) for r in rebuilt[0]] == pytest.approx([tuple(r) for r in incremental[0]])
+    assert [tuple(r) for r in rebuilt[1]] == [tuple(r) for r in incremental[1]]
+
+
+def test_trigger_uses_name_key_sql(isolated_db):
+    """The key expression pasted into schema.sql matches name_key_sql()."""
+    sql = isolated_db.get_connection().execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'suppliers_link_transaction'"
+    ).fetchone()[0]
+    assert sql.count(name_key_sql('NEW.supplier')) == 2
+
+
+def test_migration_backfills_suppliers(tmp_path, baseline_schema_sql):
+    """A database created before the supplier tables gets them backfilled."""
+    db_path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(baseline_schema_sql)
+    conn.execute("INSERT INTO inventory_items (sku, name) VALUES ('OLD-1', 'Old Item')")
+    conn.executemany("""
+        INSERT INTO inventory_transactions
+            (item_id, transaction_type, quantity_change, unit_cost_cents, supplier, notes, is_voided)
+        VALUES (1, 'PURCHASE', ?, ?, ?, ?, ?)
+    """, [(10, 100, "Acme", "Net 30", 0), (5, 200, "acme", "Net 30", 0),
+          (7, 300, "Acme", "Damaged", 1), (2, 50, "Valley", None, 0)])
+    conn.commit()
+    conn.close()
+
+    assert 'rebuild_suppliers' in migrate_database(db_path)
+    assert migrate_database(db_path) == []
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("""
+        SELECT supplier_id, purchase_count, total_quantity, total_cost_cents
+        FROM kpi_supplier_totals ORDER BY supplier_id
+    """).fetchall() == [(1, 2, 15.0, 2000.0), (2, 1, 2.0, 100.0)]
+    assert conn.execute("SELECT supplier_id, note, purchase_count FROM kpi_supplier_notes").fetchall() == [
+        (1, "Net 30", 2)
+    ]
+    conn.close()
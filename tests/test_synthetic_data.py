@@ -0,0 +1,130 @@
+"""
+Tests for the synthetic data generator.
+
+The generated ledger is replayed through the InventoryItem model; item
+state must match exactly, as if every row had gone through the services.
+"""
+
+import sqlite3
+from datetime import date
+
+import pytest
+
+from database.connection import get_db_manager, reset_db_manager
+from database.synthetic_data import SyntheticDataConfig, generate_database
+from models.item import InventoryItem
+from services.inventory_service import InventoryService
+from services.reporting_service import ReportingService
+
+CONFIG = SyntheticDataConfig(items=40, transactions=4000, years=2, donors=30, suppliers=6,
+                             void_rate=0.05, seed=7, end_date=date(2026, 6, 30),
+                             batch_size=700)
+
+
+@pytest.fixture
+def generated(tmp_path):
+    db_path = tmp_path / "synthetic.db"
+    stats = generate_database(str(db_path), CONFIG)
+    conn = sqlite3.connect(db_path)
+    yield db_path, stats, conn
+    conn.close()
+    reset_db_manager()
+
+
+def _replay(conn):
+    """Item state from the ledger, using the model's arithmetic."""
+    items = {row[0]: InventoryItem(id=row[0], sku='', name='') for row in
+             conn.execute("SELECT id FROM inventory_items")}
+    ledger = {}
+    for row in conn.execute("""
+        SELECT id, item_id, transaction_type, quantity_change, unit_cost_cents,
+               total_financial_impact_cents, ref_transaction_id
+        FROM inventory_transactions ORDER BY id
+    """):
+        tx_id, item_id, tx_type, qty, unit_cost, impact, ref = row
+        item = items[item_id]
+        ledger[tx_id] = row
+        if tx_type == 'PURCHASE':
+            item.quantity_on_hand, item.total_cost_basis_cents = \
+                item.calculate_purchase_state(qty, int(qty * unit_cost))
+        elif tx_type == 'DONATION':
+            item.quantity_on_hand += qty
+        elif tx_type == 'DISTRIBUTION':
+            assert unit_cost == item.current_unit_cost_cents
+            item.quantity_on_hand, item.total_cost_basis_cents, cogs = \
+                item.calculate_distribution_state(-qty)
+            assert cogs == impact
+        else:
+            original = ledger[ref]
+            if original[2] == 'PURCHASE':
+                item.quantity_on_hand -= original[3]
+                item.total_cost_basis_cents = max(
+                    0, item.total_cost_basis_cents - int(original[3] * original[4]))
+            elif original[2] == 'DONATION':
+                item.quantity_on_hand -= original[3]
+            else:
+                item.quantity_on_hand -= original[3]
+                item.total_cost_basis_cents += original[5]
+    return {item_id: (item.quantity_on_hand, item.total_cost_basis_cents)
+            for item_id, item in items.items()}
+
+
+def test_item_state_matches_ledger_replay(generated):
+    _db_path, stats, conn = generated
+    assert stats['transactions'] == 4000 + stats['voided']
+    stored = {row[0]: (row[1], row[2]) for row in conn.execute(
+        "SELECT id, quantity_on_hand, total_cost_basis_cents FROM inventory_items")}
+    assert stored == _replay(conn)
+
+    # Every correction reverses a voided transaction
+    assert conn.execute("""
+        SELECT COUNT(*) FROM inventory_transactions c
+        JOIN inventory_transactions o ON o.id = c.ref_transaction_id
+        WHERE c.transaction_type = 'CORRECTION' AND o.is_voided = 1
+    """).fetchone()[0] == stats['voided'] > 0
+
+
+def test_generation_is_deterministic(generated, tmp_path):
+    _db_path, _stats, conn = generated
+    generate_database(str(tmp_path / "again.db"), CONFIG)
+    again = sqlite3.connect(tmp_path / "again.db")
+    for query in ("SELECT * FROM inventory_transactions ORDER BY id",
+                  "SELECT id, sku, name, quantity_on_hand, total_cost_basis_cents "
+                  "FROM inventory_items ORDER BY id",
+                  "SELECT * FROM kpi_supplier_totals ORDER BY supplier_id"):
+        assert conn.execute(query).fetchall() == again.execute(query).fetchall()
+    again.close()
+
+    with pytest.raises(FileExistsError):
+        generate_database(str(tmp_path / "again.db"), CONFIG)
+    with pytest.raises(ValueError):
+        generate_database(str(tmp_path / "bad.db"), SyntheticDataConfig(void_rate=1.5))
+
+
+def test_schema_and_aggregates_are_complete(generated, schema_sql):
+    db_path, _stats, conn = generated
+    fresh = sqlite3.connect(":memory:")
+    fresh.executescript(schema_sql)
+    objects = "SELECT type, name FROM sqlite_master ORDER BY type, name"
+    assert set(conn.execute(objects)) - {('table', 'sqlite_stat1')} == set(fresh.execute(objects))
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+    # Holiday season is busier than late winter
+    monthly = dict(conn.execute("""
+        SELECT strftime('%m', transaction_date), COUNT(*) FROM inventory_transactions
+        WHERE transaction_type = 'DISTRIBUTION' GROUP BY 1
+    """).fetchall())
+    assert monthly['12'] > monthly['02'] * 1.2
+
+    # The application works against the generated file
+    reset_db_manager()
+    get_db_manager(str(db_path))
+    kpis = ReportingService().get_dashboard_stats()
+    assert kpis['total_items_count'] == 40
+    item = InventoryService().get_all_items()[0]
+    before = conn.execute("SELECT quantity_distributed FROM kpi_item_distributed "
+                          "WHERE item_id = ?", (item.id,)).fetchone()[0]
+    InventoryService().process_purchase(item.id, 5, 1.00)
+    InventoryService().process_distribution(item.id, 5, "CLIENT")
+    assert conn.execute("SELECT quantity_distributed FROM kpi_item_distributed "
+                        "WHERE item_id = ?", (item.id,)).fetchone()[0] == before + 5